@@ -0,0 +1,1199 @@
+"""基线结构：接入 Alembic 前由 create_all 与 migrations/*.sql 维护的全部表
+
+表结构为接入 Alembic 时模型的冻结快照（不引用 app.models），之后新增的表、列与索引
+由各自的迁移负责，此处不得再修改：
+- 已有数据库：表均已存在，checkfirst 跳过，相当于 stamp，后续迁移照常建表并回填数据；
+- 新库：建齐快照中的表，再由后续迁移逐步升级到最新结构。
+
+Revision ID: 0001_baseline_schema
+Revises:
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import context, op
+
+revision = '0001_baseline_schema'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def snapshot() -> sa.MetaData:
+    """接入 Alembic 时的表结构"""
+    metadata = sa.MetaData()
+    sa.Table(
+        'activity', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False, comment='活动标题'),
+        sa.Column('cover_image', sa.String(length=500), nullable=True, comment='封面图片'),
+        sa.Column('description', sa.Text(), nullable=True, comment='活动描述'),
+        sa.Column('content', sa.Text(), nullable=True, comment='活动详情'),
+        sa.Column('start_time', sa.DateTime(), nullable=False, comment='开始时间'),
+        sa.Column('end_time', sa.DateTime(), nullable=False, comment='结束时间'),
+        sa.Column('registration_deadline', sa.DateTime(), nullable=True, comment='报名截止时间'),
+        sa.Column('location', sa.String(length=200), nullable=True, comment='活动地点'),
+        sa.Column('venue_id', sa.Integer(), nullable=True, comment='关联场地ID'),
+        sa.Column('max_participants', sa.Integer(), nullable=True, comment='最大参与人数，0表示不限'),
+        sa.Column('current_participants', sa.Integer(), nullable=True, comment='当前报名人数'),
+        sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=True, comment='报名费用（金币）'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态'),
+        sa.Column('tags', sa.String(length=200), nullable=True, comment='标签，逗号分隔'),
+        sa.Column('sort_order', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'activity_registration', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('activity_id', sa.Integer(), nullable=False, comment='活动ID'),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('name', sa.String(length=50), nullable=True, comment='报名姓名'),
+        sa.Column('phone', sa.String(length=20), nullable=True, comment='联系电话'),
+        sa.Column('remark', sa.String(length=500), nullable=True, comment='备注'),
+        sa.Column('pay_amount', sa.Numeric(precision=10, scale=2), nullable=True, comment='支付金额'),
+        sa.Column('pay_time', sa.DateTime(), nullable=True, comment='支付时间'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态：registered/cancelled/attended'),
+        sa.Column('check_in_time', sa.DateTime(), nullable=True, comment='签到时间'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'announcement', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('title', sa.String(length=200), nullable=False, comment='公告标题'),
+        sa.Column('content', sa.Text(), nullable=False, comment='公告内容'),
+        sa.Column('type', sa.String(length=20), nullable=True, comment='类型：normal/important/urgent'),
+        sa.Column('target', sa.String(length=20), nullable=True, comment='目标：all/member/coach'),
+        sa.Column('is_top', sa.Boolean(), nullable=True, comment='是否置顶'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态：draft/published/offline'),
+        sa.Column('publish_time', sa.DateTime(), nullable=True, comment='发布时间'),
+        sa.Column('start_time', sa.DateTime(), nullable=True, comment='生效开始时间'),
+        sa.Column('end_time', sa.DateTime(), nullable=True, comment='生效结束时间'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'banner', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('title', sa.String(length=100), nullable=False, comment='标题'),
+        sa.Column('image', sa.String(length=500), nullable=False, comment='图片URL'),
+        sa.Column('link_type', sa.String(length=20), nullable=True, comment='跳转类型：none/page/activity/url'),
+        sa.Column('link_value', sa.String(length=500), nullable=True, comment='跳转值'),
+        sa.Column('position', sa.String(length=20), nullable=True, comment='显示位置：home/activity/mall'),
+        sa.Column('sort_order', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('start_time', sa.DateTime(), nullable=True, comment='开始时间'),
+        sa.Column('end_time', sa.DateTime(), nullable=True, comment='结束时间'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'coach_settlement', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('settlement_no', sa.String(length=32), nullable=False, comment='结算单号'),
+        sa.Column('coach_id', sa.Integer(), nullable=False, comment='教练ID'),
+        sa.Column('period_start', sa.Date(), nullable=False, comment='结算开始日期'),
+        sa.Column('period_end', sa.Date(), nullable=False, comment='结算结束日期'),
+        sa.Column('total_lessons', sa.Integer(), nullable=True, comment='总课时数'),
+        sa.Column('total_amount', sa.Numeric(precision=10, scale=2), nullable=True, comment='总金额'),
+        sa.Column('platform_fee', sa.Numeric(precision=10, scale=2), nullable=True, comment='平台服务费'),
+        sa.Column('settlement_amount', sa.Numeric(precision=10, scale=2), nullable=True, comment='结算金额'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态：pending/confirmed/paid'),
+        sa.Column('pay_time', sa.DateTime(), nullable=True, comment='支付时间'),
+        sa.Column('pay_account', sa.String(length=100), nullable=True, comment='收款账户'),
+        sa.Column('pay_remark', sa.String(length=200), nullable=True, comment='支付备注'),
+        sa.Column('remark', sa.Text(), nullable=True, comment='备注'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('settlement_no'),
+    )
+    sa.Table(
+        'consume_record', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('consume_type', sa.String(length=20), nullable=False, comment='类型：venue/coach/food/activity/mall'),
+        sa.Column('order_id', sa.Integer(), nullable=True, comment='关联订单ID'),
+        sa.Column('order_no', sa.String(length=32), nullable=True, comment='关联订单号'),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False, comment='消费金额（金币）'),
+        sa.Column('title', sa.String(length=200), nullable=True, comment='消费描述'),
+        sa.Column('coupon_id', sa.Integer(), nullable=True, comment='使用的优惠券ID'),
+        sa.Column('discount_amount', sa.Numeric(precision=10, scale=2), nullable=True, comment='优惠金额'),
+        sa.Column('actual_amount', sa.Numeric(precision=10, scale=2), nullable=True, comment='实际支付金额'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'coupon_pack', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False, comment='合集名称'),
+        sa.Column('description', sa.Text(), nullable=True, comment='合集描述'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'feedback', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('category', sa.String(length=20), nullable=True, comment='类型：suggestion/bug/complaint/other'),
+        sa.Column('content', sa.Text(), nullable=False, comment='反馈内容'),
+        sa.Column('images', sa.Text(), nullable=True, comment='图片URL列表，JSON数组字符串'),
+        sa.Column('contact', sa.String(length=50), nullable=True, comment='联系方式（选填）'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态：pending/processing/resolved/closed'),
+        sa.Column('admin_reply', sa.Text(), nullable=True, comment='管理员回复'),
+        sa.Column('reply_time', sa.DateTime(), nullable=True, comment='回复时间'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'finance_stat', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('stat_date', sa.Date(), nullable=False, comment='统计日期'),
+        sa.Column('recharge_amount', sa.Numeric(precision=12, scale=2), nullable=True, comment='充值金额'),
+        sa.Column('recharge_count', sa.Integer(), nullable=True, comment='充值笔数'),
+        sa.Column('venue_consume', sa.Numeric(precision=12, scale=2), nullable=True, comment='场馆消费'),
+        sa.Column('coach_consume', sa.Numeric(precision=12, scale=2), nullable=True, comment='教练消费'),
+        sa.Column('food_consume', sa.Numeric(precision=12, scale=2), nullable=True, comment='餐饮消费'),
+        sa.Column('activity_consume', sa.Numeric(precision=12, scale=2), nullable=True, comment='活动消费'),
+        sa.Column('mall_consume', sa.Numeric(precision=12, scale=2), nullable=True, comment='商城消费'),
+        sa.Column('total_consume', sa.Numeric(precision=12, scale=2), nullable=True, comment='总消费'),
+        sa.Column('refund_amount', sa.Numeric(precision=12, scale=2), nullable=True, comment='退款金额'),
+        sa.Column('refund_count', sa.Integer(), nullable=True, comment='退款笔数'),
+        sa.Column('coach_settlement', sa.Numeric(precision=12, scale=2), nullable=True, comment='教练结算金额'),
+        sa.Column('new_members', sa.Integer(), nullable=True, comment='新增会员数'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('stat_date'),
+    )
+    sa.Table(
+        'food_category', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False, comment='分类名称'),
+        sa.Column('icon', sa.String(length=200), nullable=True, comment='分类图标'),
+        sa.Column('sort_order', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'food_item', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False, comment='分类ID'),
+        sa.Column('name', sa.String(length=100), nullable=False, comment='商品名称'),
+        sa.Column('image', sa.String(length=500), nullable=True, comment='商品图片'),
+        sa.Column('description', sa.Text(), nullable=True, comment='商品描述'),
+        sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False, comment='价格（金币）'),
+        sa.Column('original_price', sa.Numeric(precision=10, scale=2), nullable=True, comment='原价'),
+        sa.Column('stock', sa.Integer(), nullable=True, comment='库存'),
+        sa.Column('sales', sa.Integer(), nullable=True, comment='销量'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否上架'),
+        sa.Column('is_recommend', sa.Boolean(), nullable=True, comment='是否推荐'),
+        sa.Column('tags', sa.String(length=200), nullable=True, comment='标签，逗号分隔'),
+        sa.Column('sort_order', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'food_order', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('order_no', sa.String(length=32), nullable=False, comment='订单号'),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('total_amount', sa.Numeric(precision=10, scale=2), nullable=False, comment='总金额'),
+        sa.Column('pay_amount', sa.Numeric(precision=10, scale=2), nullable=False, comment='实付金额'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态：unpaid/pending/paid/preparing/ready/completed/cancelled'),
+        sa.Column('remark', sa.String(length=500), nullable=True, comment='备注'),
+        sa.Column('table_no', sa.String(length=20), nullable=True, comment='桌号'),
+        sa.Column('order_type', sa.String(length=20), nullable=True, comment='订单类型：immediate立即取餐/scheduled预约取餐'),
+        sa.Column('scheduled_time', sa.String(length=50), nullable=True, comment='预约取餐时间，格式：HH:MM'),
+        sa.Column('scheduled_date', sa.String(length=20), nullable=True, comment='预约取餐日期，格式：YYYY-MM-DD'),
+        sa.Column('pay_type', sa.String(length=20), nullable=True, comment='支付方式：coin/wechat'),
+        sa.Column('out_trade_no', sa.String(length=64), nullable=True, comment='微信支付商户订单号'),
+        sa.Column('transaction_id', sa.String(length=64), nullable=True, comment='微信支付交易号'),
+        sa.Column('pay_time', sa.String(length=50), nullable=True, comment='支付时间'),
+        sa.Column('complete_time', sa.String(length=50), nullable=True, comment='完成时间'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('order_no'),
+    )
+    sa.Table(
+        'food_order_item', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('order_id', sa.Integer(), nullable=False, comment='订单ID'),
+        sa.Column('food_id', sa.Integer(), nullable=False, comment='商品ID'),
+        sa.Column('food_name', sa.String(length=100), nullable=True, comment='商品名称'),
+        sa.Column('food_image', sa.String(length=500), nullable=True, comment='商品图片'),
+        sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False, comment='单价'),
+        sa.Column('quantity', sa.Integer(), nullable=True, comment='数量'),
+        sa.Column('subtotal', sa.Numeric(precision=10, scale=2), nullable=False, comment='小计'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'member_coupon', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('template_id', sa.Integer(), nullable=False, comment='模板ID'),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('name', sa.String(length=100), nullable=True, comment='券名称'),
+        sa.Column('type', sa.String(length=20), nullable=True, comment='类型'),
+        sa.Column('discount_value', sa.Numeric(precision=10, scale=2), nullable=True, comment='优惠值'),
+        sa.Column('min_amount', sa.Numeric(precision=10, scale=2), nullable=True, comment='最低消费'),
+        sa.Column('experience_days', sa.Integer(), nullable=True, comment='体验天数'),
+        sa.Column('experience_level_id', sa.Integer(), nullable=True, comment='体验会员等级ID'),
+        sa.Column('start_time', sa.DateTime(), nullable=True, comment='生效时间'),
+        sa.Column('end_time', sa.DateTime(), nullable=True, comment='失效时间'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态：unused/used/expired'),
+        sa.Column('use_time', sa.DateTime(), nullable=True, comment='使用时间'),
+        sa.Column('order_type', sa.String(length=20), nullable=True, comment='订单类型'),
+        sa.Column('order_id', sa.Integer(), nullable=True, comment='订单ID'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'member_level', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False, comment='等级名称'),
+        sa.Column('level', sa.Integer(), nullable=False, comment='等级值'),
+        sa.Column('type', sa.String(length=20), nullable=True, comment='等级类型: normal/fitness/ball/vip'),
+        sa.Column('discount', sa.Numeric(precision=3, scale=2), nullable=True, comment='折扣率'),
+        sa.Column('icon', sa.String(length=255), nullable=True, comment='等级图标'),
+        sa.Column('description', sa.Text(), nullable=True, comment='等级描述'),
+        sa.Column('venue_permissions', sa.Text(), nullable=True, comment='场馆权限，JSON格式'),
+        sa.Column('benefits', sa.Text(), nullable=True, comment='会员权益说明'),
+        sa.Column('status', sa.Boolean(), nullable=True, comment='状态'),
+        sa.Column('level_code', sa.String(length=20), nullable=False, comment='等级代码: S/SS/SSS'),
+        sa.Column('booking_range_days', sa.Integer(), nullable=True, comment='可预约天数范围'),
+        sa.Column('booking_max_count', sa.Integer(), nullable=True, comment='预约次数上限'),
+        sa.Column('booking_period', sa.String(length=20), nullable=True, comment='预约周期: day/week/month'),
+        sa.Column('food_discount_rate', sa.Numeric(precision=3, scale=2), nullable=True, comment='餐食折扣率（白天8:00-18:00）'),
+        sa.Column('monthly_coupon_count', sa.Integer(), nullable=True, comment='每月发放咖啡券数量'),
+        sa.Column('can_book_golf', sa.Boolean(), nullable=True, comment='是否可预约高尔夫'),
+        sa.Column('theme_color', sa.String(length=20), nullable=True, comment='UI主题颜色'),
+        sa.Column('theme_gradient', sa.String(length=100), nullable=True, comment='UI渐变色'),
+        sa.Column('can_book_venue', sa.Boolean(), nullable=True, comment='是否可预约场馆'),
+        sa.Column('daily_free_hours', sa.Integer(), nullable=True, comment='每日免费场馆小时数（SSS=2）'),
+        sa.Column('monthly_invite_count', sa.Integer(), nullable=True, comment='每月邀请朋友次数（SS=1, SSS=10）'),
+        sa.Column('display_benefits', sa.Text(), nullable=True, comment='展示型权益JSON数组'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('level'),
+    )
+    sa.Table(
+        'member_tag', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False, comment='标签名称'),
+        sa.Column('color', sa.String(length=20), nullable=True, comment='标签颜色'),
+        sa.Column('status', sa.Boolean(), nullable=True, comment='状态'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'message', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('receiver_type', sa.String(length=20), nullable=False, comment='接收者类型：member/coach/all'),
+        sa.Column('receiver_id', sa.Integer(), nullable=True, comment='接收者ID，all时为空'),
+        sa.Column('type', sa.String(length=20), nullable=False, comment='类型：system/activity/order/reservation'),
+        sa.Column('title', sa.String(length=200), nullable=False, comment='消息标题'),
+        sa.Column('content', sa.Text(), nullable=False, comment='消息内容'),
+        sa.Column('biz_type', sa.String(length=20), nullable=True, comment='业务类型'),
+        sa.Column('biz_id', sa.Integer(), nullable=True, comment='业务ID'),
+        sa.Column('is_read', sa.Boolean(), nullable=True, comment='是否已读'),
+        sa.Column('read_time', sa.DateTime(), nullable=True, comment='阅读时间'),
+        sa.Column('push_status', sa.String(length=20), nullable=True, comment='推送状态：pending/sent/failed'),
+        sa.Column('push_time', sa.DateTime(), nullable=True, comment='推送时间'),
+        sa.Column('push_result', sa.Text(), nullable=True, comment='推送结果'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'message_template', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('code', sa.String(length=50), nullable=False, comment='模板编码'),
+        sa.Column('name', sa.String(length=100), nullable=False, comment='模板名称'),
+        sa.Column('type', sa.String(length=20), nullable=False, comment='类型：system/activity/order/reservation'),
+        sa.Column('title', sa.String(length=200), nullable=False, comment='消息标题'),
+        sa.Column('content', sa.Text(), nullable=False, comment='消息内容模板'),
+        sa.Column('variables', sa.Text(), nullable=True, comment='变量说明，JSON格式'),
+        sa.Column('push_wechat', sa.Boolean(), nullable=True, comment='是否推送微信订阅消息'),
+        sa.Column('wechat_template_id', sa.String(length=100), nullable=True, comment='微信订阅消息模板ID'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('code'),
+    )
+    sa.Table(
+        'product', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('category_id', sa.Integer(), nullable=False, comment='分类ID'),
+        sa.Column('name', sa.String(length=100), nullable=False, comment='商品名称'),
+        sa.Column('image', sa.String(length=500), nullable=True, comment='商品主图'),
+        sa.Column('images', sa.Text(), nullable=True, comment='商品图片列表，JSON格式'),
+        sa.Column('description', sa.Text(), nullable=True, comment='商品描述'),
+        sa.Column('content', sa.Text(), nullable=True, comment='商品详情'),
+        sa.Column('points', sa.Integer(), nullable=False, comment='所需积分'),
+        sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=True, comment='额外金币价格'),
+        sa.Column('market_price', sa.Numeric(precision=10, scale=2), nullable=True, comment='市场价'),
+        sa.Column('stock', sa.Integer(), nullable=True, comment='库存'),
+        sa.Column('sales', sa.Integer(), nullable=True, comment='兑换量'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否上架'),
+        sa.Column('is_recommend', sa.Boolean(), nullable=True, comment='是否推荐'),
+        sa.Column('tags', sa.String(length=200), nullable=True, comment='标签，逗号分隔'),
+        sa.Column('sort_order', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'product_category', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False, comment='分类名称'),
+        sa.Column('icon', sa.String(length=200), nullable=True, comment='分类图标'),
+        sa.Column('sort_order', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'product_order', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('order_no', sa.String(length=32), nullable=False, comment='订单号'),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('product_id', sa.Integer(), nullable=False, comment='商品ID'),
+        sa.Column('product_name', sa.String(length=100), nullable=True, comment='商品名称'),
+        sa.Column('product_image', sa.String(length=500), nullable=True, comment='商品图片'),
+        sa.Column('quantity', sa.Integer(), nullable=True, comment='兑换数量'),
+        sa.Column('points_used', sa.Integer(), nullable=True, comment='消耗积分'),
+        sa.Column('coins_used', sa.Numeric(precision=10, scale=2), nullable=True, comment='消耗金币'),
+        sa.Column('receiver_name', sa.String(length=50), nullable=True, comment='收货人姓名'),
+        sa.Column('receiver_phone', sa.String(length=20), nullable=True, comment='收货人电话'),
+        sa.Column('receiver_address', sa.String(length=200), nullable=True, comment='收货地址'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态：pending/shipped/completed/cancelled'),
+        sa.Column('express_company', sa.String(length=50), nullable=True, comment='快递公司'),
+        sa.Column('express_no', sa.String(length=50), nullable=True, comment='快递单号'),
+        sa.Column('ship_time', sa.String(length=50), nullable=True, comment='发货时间'),
+        sa.Column('complete_time', sa.String(length=50), nullable=True, comment='完成时间'),
+        sa.Column('remark', sa.String(length=500), nullable=True, comment='备注'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('order_no'),
+    )
+    sa.Table(
+        'recharge_order', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('order_no', sa.String(length=32), nullable=False, comment='订单号'),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False, comment='充值金额（元）'),
+        sa.Column('coins', sa.Integer(), nullable=False, comment='获得金币'),
+        sa.Column('bonus_coins', sa.Integer(), nullable=True, comment='赠送金币'),
+        sa.Column('pay_type', sa.String(length=20), nullable=True, comment='支付方式：wechat/alipay'),
+        sa.Column('transaction_id', sa.String(length=64), nullable=True, comment='微信支付交易号'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态：pending/paid/failed/refunded'),
+        sa.Column('pay_time', sa.DateTime(), nullable=True, comment='支付时间'),
+        sa.Column('expire_time', sa.DateTime(), nullable=True, comment='过期时间'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('order_no'),
+    )
+    sa.Table(
+        'recharge_package', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False, comment='套餐名称'),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False, comment='充值金额(元)'),
+        sa.Column('coin_amount', sa.Integer(), nullable=False, comment='获得金币数'),
+        sa.Column('bonus_coins', sa.Integer(), nullable=True, comment='赠送金币数'),
+        sa.Column('sort_order', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'review_point_config', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('base_points', sa.Integer(), nullable=True, comment='基础积分（纯评分）'),
+        sa.Column('text_bonus', sa.Integer(), nullable=True, comment='文字评论额外积分'),
+        sa.Column('image_bonus', sa.Integer(), nullable=True, comment='图片评论额外积分'),
+        sa.Column('max_daily_reviews', sa.Integer(), nullable=True, comment='每日最多可获积分的评论次数'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'sys_department', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False, comment='部门名称'),
+        sa.Column('parent_id', sa.Integer(), nullable=True, comment='上级部门ID'),
+        sa.Column('sort', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('status', sa.Boolean(), nullable=True, comment='状态'),
+        sa.Column('remark', sa.String(length=255), nullable=True, comment='备注'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.ForeignKeyConstraint(['parent_id'], ['sys_department.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'sys_permission', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False, comment='权限名称'),
+        sa.Column('code', sa.String(length=100), nullable=False, comment='权限编码'),
+        sa.Column('type', sa.String(length=20), nullable=False, comment='权限类型: menu/button'),
+        sa.Column('parent_id', sa.Integer(), nullable=True, comment='上级权限ID'),
+        sa.Column('path', sa.String(length=200), nullable=True, comment='路由路径'),
+        sa.Column('component', sa.String(length=200), nullable=True, comment='组件路径'),
+        sa.Column('icon', sa.String(length=50), nullable=True, comment='图标'),
+        sa.Column('sort', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('status', sa.Boolean(), nullable=True, comment='状态'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['parent_id'], ['sys_permission.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('code'),
+    )
+    sa.Table(
+        'sys_role', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False, comment='角色名称'),
+        sa.Column('code', sa.String(length=50), nullable=False, comment='角色编码'),
+        sa.Column('sort', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('status', sa.Boolean(), nullable=True, comment='状态'),
+        sa.Column('remark', sa.String(length=255), nullable=True, comment='备注'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('code'),
+        sa.UniqueConstraint('name'),
+    )
+    sa.Table(
+        'ui_block_config', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('block_code', sa.String(length=50), nullable=False, comment='区块编码'),
+        sa.Column('block_name', sa.String(length=100), nullable=False, comment='区块名称'),
+        sa.Column('page_code', sa.String(length=50), nullable=False, comment='所属页面编码'),
+        sa.Column('block_type', sa.String(length=30), nullable=False, comment='区块类型：banner/quick_entry/list/scroll/custom'),
+        sa.Column('config', sa.JSON(), nullable=True, comment='区块配置JSON'),
+        sa.Column('style_config', sa.JSON(), nullable=True, comment='样式配置JSON'),
+        sa.Column('data_source', sa.JSON(), nullable=True, comment='数据源配置'),
+        sa.Column('sort_order', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'ui_config_version', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False, comment='版本号'),
+        sa.Column('version_name', sa.String(length=100), nullable=True, comment='版本名称'),
+        sa.Column('config_snapshot', sa.JSON(), nullable=False, comment='配置快照JSON'),
+        sa.Column('published_by', sa.Integer(), nullable=True, comment='发布人ID'),
+        sa.Column('publish_note', sa.Text(), nullable=True, comment='发布说明'),
+        sa.Column('is_current', sa.Boolean(), nullable=True, comment='是否为当前版本'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'ui_icon', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('code', sa.String(length=50), nullable=False, comment='图标编码，如 tabbar-home'),
+        sa.Column('name', sa.String(length=100), nullable=False, comment='图标名称，如 首页图标'),
+        sa.Column('app_type', sa.String(length=20), nullable=False, comment='应用类型：user/coach'),
+        sa.Column('category', sa.String(length=50), nullable=True, comment='分类：tabbar/menu/function/other'),
+        sa.Column('icon_normal', sa.String(length=500), nullable=True, comment='普通状态图标URL'),
+        sa.Column('icon_active', sa.String(length=500), nullable=True, comment='选中状态图标URL'),
+        sa.Column('description', sa.Text(), nullable=True, comment='使用说明'),
+        sa.Column('sort_order', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'ui_image', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('code', sa.String(length=50), nullable=False, comment='图片编码，如 empty-state'),
+        sa.Column('name', sa.String(length=100), nullable=False, comment='图片名称'),
+        sa.Column('app_type', sa.String(length=20), nullable=False, comment='应用类型：user/coach/admin'),
+        sa.Column('category', sa.String(length=50), nullable=True, comment='分类：background/empty/icon/logo/other'),
+        sa.Column('image_url', sa.String(length=500), nullable=False, comment='图片URL'),
+        sa.Column('suggested_width', sa.Integer(), nullable=True, comment='建议宽度(px)'),
+        sa.Column('suggested_height', sa.Integer(), nullable=True, comment='建议高度(px)'),
+        sa.Column('description', sa.Text(), nullable=True, comment='使用说明'),
+        sa.Column('sort_order', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'ui_menu_item', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('menu_code', sa.String(length=50), nullable=False, comment='菜单编码'),
+        sa.Column('menu_type', sa.String(length=30), nullable=False, comment='菜单类型：quick_entry/tabbar/profile_menu/more_menu'),
+        sa.Column('block_id', sa.Integer(), nullable=True, comment='所属区块ID'),
+        sa.Column('title', sa.String(length=50), nullable=False, comment='菜单标题'),
+        sa.Column('subtitle', sa.String(length=100), nullable=True, comment='副标题'),
+        sa.Column('icon', sa.String(length=500), nullable=True, comment='图标URL'),
+        sa.Column('icon_active', sa.String(length=500), nullable=True, comment='选中状态图标URL（tabbar用）'),
+        sa.Column('link_type', sa.String(length=20), nullable=True, comment='跳转类型：page/tab/webview/miniprogram/none'),
+        sa.Column('link_value', sa.String(length=500), nullable=True, comment='跳转值：页面路径/URL/小程序appId'),
+        sa.Column('link_params', sa.JSON(), nullable=True, comment='跳转参数JSON'),
+        sa.Column('show_condition', sa.JSON(), nullable=True, comment='显示条件'),
+        sa.Column('badge_type', sa.String(length=20), nullable=True, comment='角标类型：none/dot/number/text'),
+        sa.Column('badge_value', sa.String(length=50), nullable=True, comment='角标值'),
+        sa.Column('sort_order', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('is_visible', sa.Boolean(), nullable=True, comment='是否显示'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'ui_page_config', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('page_code', sa.String(length=50), nullable=False, comment='页面编码：home/venue/activity/profile'),
+        sa.Column('page_name', sa.String(length=100), nullable=False, comment='页面名称'),
+        sa.Column('page_type', sa.String(length=20), nullable=True, comment='页面类型：tabbar/normal'),
+        sa.Column('blocks_config', sa.JSON(), nullable=True, comment='区块配置JSON'),
+        sa.Column('style_config', sa.JSON(), nullable=True, comment='页面样式配置JSON'),
+        sa.Column('version', sa.Integer(), nullable=True, comment='配置版本号'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态：draft/published'),
+        sa.Column('published_at', sa.DateTime(), nullable=True, comment='发布时间'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('page_code'),
+    )
+    sa.Table(
+        'ui_theme', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('code', sa.String(length=50), nullable=False, comment='主题编码，如 wimbledon'),
+        sa.Column('name', sa.String(length=100), nullable=False, comment='主题名称，如 温网风格'),
+        sa.Column('app_type', sa.String(length=20), nullable=False, comment='应用类型：user/coach/admin'),
+        sa.Column('colors', sa.Text(), nullable=False, comment='颜色配置JSON'),
+        sa.Column('preview_image', sa.String(length=500), nullable=True, comment='主题预览图URL'),
+        sa.Column('description', sa.Text(), nullable=True, comment='主题说明'),
+        sa.Column('is_current', sa.Boolean(), nullable=True, comment='是否当前主题'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'upload_blob', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('sha256', sa.String(length=64), nullable=False, comment='文件内容 SHA-256'),
+        sa.Column('storage_path', sa.String(length=255), nullable=False, comment='存储路径（相对上传目录），如 blobs/ab/<sha256>.jpg'),
+        sa.Column('size', sa.Integer(), nullable=False, comment='文件大小（字节）'),
+        sa.Column('content_type', sa.String(length=100), nullable=True, comment='文件类型'),
+        sa.Column('ref_count', sa.Integer(), nullable=False, comment='引用计数'),
+        sa.Column('released_at', sa.DateTime(), nullable=True, comment='引用计数归零时间（GC 宽限期起点）'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('sha256'),
+        sa.Index('idx_upload_blob_gc', 'ref_count', 'released_at'),
+    )
+    sa.Table(
+        'venue_type', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=50), nullable=False, comment='类型名称'),
+        sa.Column('icon', sa.String(length=255), nullable=True, comment='图标'),
+        sa.Column('sort', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('status', sa.Boolean(), nullable=True, comment='状态'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'coupon_template', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False, comment='券名称'),
+        sa.Column('type', sa.String(length=20), nullable=False, comment='类型：discount/cash/gift/experience'),
+        sa.Column('discount_value', sa.Numeric(precision=10, scale=2), nullable=True, comment='优惠值（折扣率或金额）'),
+        sa.Column('min_amount', sa.Numeric(precision=10, scale=2), nullable=True, comment='最低消费金额'),
+        sa.Column('max_discount', sa.Numeric(precision=10, scale=2), nullable=True, comment='最大优惠金额'),
+        sa.Column('experience_days', sa.Integer(), nullable=True, comment='体验天数（体验券专用）'),
+        sa.Column('experience_level_id', sa.Integer(), nullable=True, comment='体验会员等级ID'),
+        sa.Column('applicable_type', sa.String(length=20), nullable=True, comment='适用类型：all/venue/food/coach'),
+        sa.Column('applicable_ids', sa.String(length=500), nullable=True, comment='适用ID列表，逗号分隔'),
+        sa.Column('valid_days', sa.Integer(), nullable=True, comment='有效天数（领取后）'),
+        sa.Column('start_time', sa.DateTime(), nullable=True, comment='固定开始时间'),
+        sa.Column('end_time', sa.DateTime(), nullable=True, comment='固定结束时间'),
+        sa.Column('total_count', sa.Integer(), nullable=True, comment='发放总量，0表示不限'),
+        sa.Column('issued_count', sa.Integer(), nullable=True, comment='已发放数量'),
+        sa.Column('per_limit', sa.Integer(), nullable=True, comment='每人限领'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('description', sa.Text(), nullable=True, comment='使用说明'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.ForeignKeyConstraint(['experience_level_id'], ['member_level.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'member', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('openid', sa.String(length=100), nullable=True, comment='微信OpenID'),
+        sa.Column('unionid', sa.String(length=100), nullable=True, comment='微信UnionID'),
+        sa.Column('session_key', sa.String(length=100), nullable=True, comment='微信会话密钥'),
+        sa.Column('nickname', sa.String(length=50), nullable=True, comment='昵称'),
+        sa.Column('phone', sa.String(length=20), nullable=True, comment='手机号'),
+        sa.Column('avatar', sa.String(length=255), nullable=True, comment='头像'),
+        sa.Column('real_name', sa.String(length=50), nullable=True, comment='真实姓名'),
+        sa.Column('gender', sa.Integer(), nullable=True, comment='性别: 0未知 1男 2女'),
+        sa.Column('birthday', sa.DateTime(), nullable=True, comment='生日'),
+        sa.Column('level_id', sa.Integer(), nullable=True, comment='会员等级ID'),
+        sa.Column('member_expire_time', sa.DateTime(), nullable=True, comment='会员到期时间'),
+        sa.Column('coin_balance', sa.Numeric(precision=10, scale=2), nullable=True, comment='金币余额'),
+        sa.Column('point_balance', sa.Integer(), nullable=True, comment='积分余额'),
+        sa.Column('subscription_start_date', sa.Date(), nullable=True, comment='订阅开始日期（用于计算发券周期）'),
+        sa.Column('subscription_status', sa.String(length=20), nullable=True, comment='订阅状态: inactive/active/expired'),
+        sa.Column('last_coupon_issued_at', sa.DateTime(), nullable=True, comment='上次发券时间'),
+        sa.Column('penalty_status', sa.String(length=20), nullable=True, comment='惩罚状态: normal/penalized'),
+        sa.Column('penalty_booking_range_days', sa.Integer(), nullable=True, comment='惩罚期间可预约天数'),
+        sa.Column('penalty_booking_max_count', sa.Integer(), nullable=True, comment='惩罚期间预约上限'),
+        sa.Column('penalty_start_at', sa.DateTime(), nullable=True, comment='惩罚开始时间'),
+        sa.Column('penalty_end_at', sa.DateTime(), nullable=True, comment='惩罚结束时间（可选：自动恢复）'),
+        sa.Column('penalty_reason', sa.String(length=255), nullable=True, comment='惩罚原因'),
+        sa.Column('status', sa.Boolean(), nullable=True, comment='状态'),
+        sa.Column('face_image_url', sa.String(length=500), nullable=True, comment='人脸照片URL'),
+        sa.Column('face_feature_id', sa.String(length=100), nullable=True, comment='人脸特征ID(腾讯云)'),
+        sa.Column('face_registered_at', sa.DateTime(), nullable=True, comment='人脸注册时间'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.ForeignKeyConstraint(['level_id'], ['member_level.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('openid'),
+    )
+    sa.Table(
+        'member_card', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False, comment='套餐名称'),
+        sa.Column('level_id', sa.Integer(), nullable=False, comment='会员等级ID'),
+        sa.Column('original_price', sa.Numeric(precision=10, scale=2), nullable=False, comment='原价'),
+        sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False, comment='售价'),
+        sa.Column('duration_days', sa.Integer(), nullable=False, comment='有效天数'),
+        sa.Column('bonus_coins', sa.Numeric(precision=10, scale=2), nullable=True, comment='赠送金币'),
+        sa.Column('bonus_points', sa.Integer(), nullable=True, comment='赠送积分'),
+        sa.Column('cover_image', sa.String(length=500), nullable=True, comment='封面图'),
+        sa.Column('description', sa.Text(), nullable=True, comment='套餐描述'),
+        sa.Column('highlights', sa.Text(), nullable=True, comment='套餐亮点，JSON数组'),
+        sa.Column('sort_order', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('is_recommended', sa.Boolean(), nullable=True, comment='是否推荐'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否上架'),
+        sa.Column('sales_count', sa.Integer(), nullable=True, comment='销量'),
+        sa.Column('welcome_coupon_pack_id', sa.Integer(), nullable=True, comment='入会赠送优惠券合集ID'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.ForeignKeyConstraint(['level_id'], ['member_level.id'], ),
+        sa.ForeignKeyConstraint(['welcome_coupon_pack_id'], ['coupon_pack.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'point_rule_config', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False, comment='规则名称'),
+        sa.Column('description', sa.String(length=500), nullable=True, comment='规则描述'),
+        sa.Column('rule_type', sa.String(length=20), nullable=False, comment='规则类型: duration/daily'),
+        sa.Column('venue_type_id', sa.Integer(), nullable=True, comment='适用场馆类型ID'),
+        sa.Column('duration_unit', sa.Integer(), nullable=True, comment='时长单位(分钟)'),
+        sa.Column('points_per_unit', sa.Integer(), nullable=True, comment='每单位时长积分'),
+        sa.Column('max_daily_points', sa.Integer(), nullable=True, comment='每日积分上限'),
+        sa.Column('daily_fixed_points', sa.Integer(), nullable=True, comment='每日打卡固定积分'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('priority', sa.Integer(), nullable=True, comment='优先级(越大越优先)'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['venue_type_id'], ['venue_type.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'sys_role_permission', metadata,
+        sa.Column('role_id', sa.Integer(), nullable=False),
+        sa.Column('permission_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['permission_id'], ['sys_permission.id'], ),
+        sa.ForeignKeyConstraint(['role_id'], ['sys_role.id'], ),
+        sa.PrimaryKeyConstraint('role_id', 'permission_id'),
+    )
+    sa.Table(
+        'sys_user', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('username', sa.String(length=50), nullable=False, comment='用户名'),
+        sa.Column('password', sa.String(length=255), nullable=False, comment='密码'),
+        sa.Column('name', sa.String(length=50), nullable=False, comment='姓名'),
+        sa.Column('phone', sa.String(length=20), nullable=True, comment='手机号'),
+        sa.Column('email', sa.String(length=100), nullable=True, comment='邮箱'),
+        sa.Column('avatar', sa.String(length=255), nullable=True, comment='头像'),
+        sa.Column('department_id', sa.Integer(), nullable=True, comment='部门ID'),
+        sa.Column('status', sa.Boolean(), nullable=True, comment='状态'),
+        sa.Column('remark', sa.String(length=255), nullable=True, comment='备注'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.ForeignKeyConstraint(['department_id'], ['sys_department.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('username'),
+    )
+    sa.Table(
+        'venue', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('name', sa.String(length=100), nullable=False, comment='场馆名称'),
+        sa.Column('type_id', sa.Integer(), nullable=False, comment='场馆类型ID'),
+        sa.Column('location', sa.String(length=255), nullable=True, comment='场馆位置'),
+        sa.Column('capacity', sa.Integer(), nullable=True, comment='容纳人数'),
+        sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=True, comment='每小时价格(金币)'),
+        sa.Column('images', sa.Text(), nullable=True, comment='场馆图片(JSON)'),
+        sa.Column('description', sa.Text(), nullable=True, comment='场馆描述'),
+        sa.Column('facilities', sa.Text(), nullable=True, comment='设施设备(JSON)'),
+        sa.Column('gate_id', sa.String(length=50), nullable=True, comment='关联闸机ID'),
+        sa.Column('status', sa.Integer(), nullable=True, comment='状态: 0停用 1空闲 2使用中'),
+        sa.Column('sort', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.ForeignKeyConstraint(['type_id'], ['venue_type.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'venue_type_config', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('venue_type_id', sa.Integer(), nullable=False, comment='场馆类型ID'),
+        sa.Column('is_golf', sa.Boolean(), nullable=True, comment='是否为高尔夫场地'),
+        sa.Column('min_level_code', sa.String(length=20), nullable=True, comment='最低可预约等级'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['venue_type_id'], ['venue_type.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('venue_type_id', name='uk_venue_type'),
+    )
+    sa.Table(
+        'coach', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=True, comment='关联会员ID'),
+        sa.Column('coach_no', sa.String(length=50), nullable=False, comment='教练编号'),
+        sa.Column('name', sa.String(length=50), nullable=False, comment='教练姓名'),
+        sa.Column('phone', sa.String(length=20), nullable=False, comment='联系电话'),
+        sa.Column('avatar', sa.String(length=255), nullable=True, comment='头像'),
+        sa.Column('gender', sa.Integer(), nullable=True, comment='性别: 0未知 1男 2女'),
+        sa.Column('type', sa.String(length=20), nullable=True, comment='教练类型: technical技术 entertainment娱乐'),
+        sa.Column('level', sa.Integer(), nullable=True, comment='教练星级 1-5'),
+        sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=True, comment='课时单价(金币)'),
+        sa.Column('introduction', sa.Text(), nullable=True, comment='教练介绍'),
+        sa.Column('skills', sa.Text(), nullable=True, comment='技能标签(JSON)'),
+        sa.Column('certificates', sa.Text(), nullable=True, comment='资质证书(JSON)'),
+        sa.Column('photos', sa.Text(), nullable=True, comment='教练照片(JSON)'),
+        sa.Column('status', sa.Integer(), nullable=True, comment='状态: 0离职 1在职 2休假'),
+        sa.Column('total_courses', sa.Integer(), nullable=True, comment='累计课程数'),
+        sa.Column('total_income', sa.Numeric(precision=10, scale=2), nullable=True, comment='累计收入'),
+        sa.Column('coin_balance', sa.Numeric(precision=10, scale=2), nullable=True, comment='金币余额'),
+        sa.Column('point_balance', sa.Integer(), nullable=True, comment='积分余额'),
+        sa.Column('pending_income', sa.Numeric(precision=10, scale=2), nullable=True, comment='待结算收入'),
+        sa.Column('invite_code', sa.String(length=20), nullable=True, comment='邀请码'),
+        sa.Column('tags', sa.String(length=255), nullable=True, comment='标签(逗号分隔)'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.ForeignKeyConstraint(['member_id'], ['member.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('coach_no'),
+    )
+    sa.Table(
+        'coach_application', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='申请人会员ID'),
+        sa.Column('name', sa.String(length=50), nullable=False, comment='姓名'),
+        sa.Column('phone', sa.String(length=20), nullable=False, comment='联系电话'),
+        sa.Column('type', sa.String(length=20), nullable=False, comment='申请类型: technical技术 entertainment娱乐'),
+        sa.Column('introduction', sa.Text(), nullable=True, comment='个人介绍'),
+        sa.Column('skills', sa.Text(), nullable=True, comment='技能特长(JSON)'),
+        sa.Column('certificates', sa.Text(), nullable=True, comment='资质证书(JSON)'),
+        sa.Column('status', sa.Integer(), nullable=True, comment='状态: 0待审核 1通过 2拒绝'),
+        sa.Column('audit_time', sa.DateTime(), nullable=True, comment='审核时间'),
+        sa.Column('audit_user_id', sa.Integer(), nullable=True, comment='审核人ID'),
+        sa.Column('audit_remark', sa.String(length=255), nullable=True, comment='审核备注'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['member_id'], ['member.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'coin_record', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('type', sa.String(length=20), nullable=False, comment='类型: income/expense'),
+        sa.Column('amount', sa.Numeric(precision=10, scale=2), nullable=False, comment='金额'),
+        sa.Column('balance', sa.Numeric(precision=10, scale=2), nullable=False, comment='变动后余额'),
+        sa.Column('source', sa.String(length=50), nullable=False, comment='来源'),
+        sa.Column('remark', sa.String(length=255), nullable=True, comment='备注'),
+        sa.Column('operator_id', sa.Integer(), nullable=True, comment='操作人ID'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['member_id'], ['member.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'coupon_pack_item', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('pack_id', sa.Integer(), nullable=False, comment='合集ID'),
+        sa.Column('template_id', sa.Integer(), nullable=False, comment='券模板ID'),
+        sa.Column('quantity', sa.Integer(), nullable=True, comment='数量'),
+        sa.Column('sort_order', sa.Integer(), nullable=True, comment='排序'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['pack_id'], ['coupon_pack.id'], ),
+        sa.ForeignKeyConstraint(['template_id'], ['coupon_template.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('pack_id', 'template_id', name='uk_pack_template'),
+    )
+    sa.Table(
+        'gate_check_record', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('venue_id', sa.Integer(), nullable=False, comment='场馆ID'),
+        sa.Column('gate_id', sa.String(length=50), nullable=True, comment='闸机设备ID'),
+        sa.Column('check_in_time', sa.DateTime(), nullable=False, comment='入场时间'),
+        sa.Column('check_out_time', sa.DateTime(), nullable=True, comment='出场时间'),
+        sa.Column('duration', sa.Integer(), nullable=True, comment='停留时长(分钟)'),
+        sa.Column('points_earned', sa.Integer(), nullable=True, comment='获得积分'),
+        sa.Column('points_settled', sa.Boolean(), nullable=True, comment='积分是否已结算'),
+        sa.Column('check_date', sa.Date(), nullable=False, comment='打卡日期'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['member_id'], ['member.id'], ),
+        sa.ForeignKeyConstraint(['venue_id'], ['venue.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'leaderboard', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('period_type', sa.String(length=20), nullable=False, comment='周期类型'),
+        sa.Column('period_key', sa.String(length=20), nullable=False, comment='周期标识'),
+        sa.Column('venue_type_id', sa.Integer(), nullable=True, comment='场馆类型ID'),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('rank', sa.Integer(), nullable=False, comment='排名'),
+        sa.Column('total_duration', sa.Integer(), nullable=True, comment='总时长(分钟)'),
+        sa.Column('check_count', sa.Integer(), nullable=True, comment='打卡次数'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['member_id'], ['member.id'], ),
+        sa.ForeignKeyConstraint(['venue_type_id'], ['venue_type.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'member_card_order', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('order_no', sa.String(length=50), nullable=False, comment='订单号'),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('card_id', sa.Integer(), nullable=False, comment='会员卡套餐ID'),
+        sa.Column('original_price', sa.Numeric(precision=10, scale=2), nullable=False, comment='原价'),
+        sa.Column('pay_amount', sa.Numeric(precision=10, scale=2), nullable=False, comment='实付金额'),
+        sa.Column('bonus_coins', sa.Numeric(precision=10, scale=2), nullable=True, comment='赠送金币'),
+        sa.Column('bonus_points', sa.Integer(), nullable=True, comment='赠送积分'),
+        sa.Column('level_id', sa.Integer(), nullable=True, comment='开通的会员等级ID'),
+        sa.Column('duration_days', sa.Integer(), nullable=True, comment='有效天数'),
+        sa.Column('start_time', sa.DateTime(), nullable=True, comment='会员开始时间'),
+        sa.Column('expire_time', sa.DateTime(), nullable=True, comment='会员到期时间'),
+        sa.Column('pay_type', sa.String(length=20), nullable=True, comment='支付方式: coin/wechat'),
+        sa.Column('pay_time', sa.DateTime(), nullable=True, comment='支付时间'),
+        sa.Column('transaction_id', sa.String(length=100), nullable=True, comment='微信支付交易号'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态: pending/paid/cancelled/refunded'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['card_id'], ['member_card.id'], ),
+        sa.ForeignKeyConstraint(['member_id'], ['member.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('order_no'),
+    )
+    sa.Table(
+        'member_coupon_issuance', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('level_code', sa.String(length=20), nullable=False, comment='发券时的会员等级(SS/SSS)'),
+        sa.Column('coupon_count', sa.Integer(), nullable=False, comment='发券数量'),
+        sa.Column('issue_date', sa.Date(), nullable=False, comment='发券日期'),
+        sa.Column('issue_month', sa.String(length=20), nullable=False, comment='发券周期标识: YYYY-MM(月度) 或 YYYY-MM-DD(日度)'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='发券状态: success/failed'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['member_id'], ['member.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('member_id', 'issue_month', 'level_code', name='uk_member_period_level'),
+    )
+    sa.Table(
+        'member_invitation', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('inviter_id', sa.Integer(), nullable=False, comment='邀请人会员ID'),
+        sa.Column('invite_code', sa.String(length=32), nullable=False, comment='邀请码'),
+        sa.Column('invite_month', sa.String(length=7), nullable=False, comment='邀请月份 YYYY-MM'),
+        sa.Column('invitee_id', sa.Integer(), nullable=True, comment='被邀请人会员ID'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态: pending/used/expired'),
+        sa.Column('used_at', sa.DateTime(), nullable=True, comment='使用时间'),
+        sa.Column('expire_at', sa.DateTime(), nullable=False, comment='过期时间'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['invitee_id'], ['member.id'], ),
+        sa.ForeignKeyConstraint(['inviter_id'], ['member.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('invite_code'),
+    )
+    sa.Table(
+        'member_tag_relation', metadata,
+        sa.Column('member_id', sa.Integer(), nullable=False),
+        sa.Column('tag_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['member_id'], ['member.id'], ),
+        sa.ForeignKeyConstraint(['tag_id'], ['member_tag.id'], ),
+        sa.PrimaryKeyConstraint('member_id', 'tag_id'),
+    )
+    sa.Table(
+        'point_record', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('type', sa.String(length=20), nullable=False, comment='类型: income/expense'),
+        sa.Column('amount', sa.Integer(), nullable=False, comment='数量'),
+        sa.Column('balance', sa.Integer(), nullable=False, comment='变动后余额'),
+        sa.Column('source', sa.String(length=50), nullable=False, comment='来源'),
+        sa.Column('remark', sa.String(length=255), nullable=True, comment='备注'),
+        sa.Column('operator_id', sa.Integer(), nullable=True, comment='操作人ID'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['member_id'], ['member.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'service_review', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('order_type', sa.String(length=20), nullable=False, comment='订单类型: reservation/food/mall'),
+        sa.Column('order_id', sa.Integer(), nullable=False, comment='订单ID'),
+        sa.Column('rating', sa.Integer(), nullable=False, comment='评分: 1-5星'),
+        sa.Column('content', sa.Text(), nullable=True, comment='评论内容'),
+        sa.Column('images', sa.Text(), nullable=True, comment='图片URL列表，JSON数组'),
+        sa.Column('points_awarded', sa.Integer(), nullable=True, comment='已发放积分数'),
+        sa.Column('points_settled', sa.Boolean(), nullable=True, comment='积分是否已结算'),
+        sa.Column('is_visible', sa.Boolean(), nullable=True, comment='是否显示（管理员可隐藏）'),
+        sa.Column('admin_reply', sa.Text(), nullable=True, comment='管理员回复'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.ForeignKeyConstraint(['member_id'], ['member.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('member_id', 'order_type', 'order_id', name='uk_member_order_review'),
+    )
+    sa.Table(
+        'sys_user_role', metadata,
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('role_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['role_id'], ['sys_role.id'], ),
+        sa.ForeignKeyConstraint(['user_id'], ['sys_user.id'], ),
+        sa.PrimaryKeyConstraint('user_id', 'role_id'),
+    )
+    sa.Table(
+        'team', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('creator_id', sa.Integer(), nullable=False, comment='发起人ID'),
+        sa.Column('title', sa.String(length=100), nullable=False, comment='组队标题'),
+        sa.Column('sport_type', sa.String(length=20), nullable=False, comment='运动类型：golf/pickleball/tennis/squash'),
+        sa.Column('description', sa.Text(), nullable=True, comment='组队描述'),
+        sa.Column('activity_date', sa.String(length=20), nullable=False, comment='活动日期 YYYY-MM-DD'),
+        sa.Column('activity_time', sa.String(length=20), nullable=False, comment='活动时间 HH:MM'),
+        sa.Column('location', sa.String(length=200), nullable=True, comment='活动地点'),
+        sa.Column('venue_id', sa.Integer(), nullable=True, comment='关联场馆ID'),
+        sa.Column('max_members', sa.Integer(), nullable=True, comment='最大人数'),
+        sa.Column('current_members', sa.Integer(), nullable=True, comment='当前人数'),
+        sa.Column('fee_type', sa.String(length=20), nullable=True, comment='费用类型：free免费/AA均摊/fixed固定'),
+        sa.Column('fee_amount', sa.Integer(), nullable=True, comment='费用金额（金币）'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态：recruiting招募中/full已满员/completed已完成/cancelled已取消'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.ForeignKeyConstraint(['creator_id'], ['member.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'venue_price_rule', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('venue_id', sa.Integer(), nullable=False, comment='场馆ID'),
+        sa.Column('day_of_week', sa.Integer(), nullable=False, comment='星期几: 0=周一, 1=周二 ... 6=周日'),
+        sa.Column('hour', sa.Integer(), nullable=False, comment='小时: 0-23'),
+        sa.Column('price', sa.Numeric(precision=10, scale=2), nullable=False, comment='该时段价格(元)'),
+        sa.Column('is_active', sa.Boolean(), nullable=True, comment='是否启用'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.ForeignKeyConstraint(['venue_id'], ['venue.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('venue_id', 'day_of_week', 'hour', name='uk_venue_day_hour'),
+    )
+    sa.Table(
+        'coach_schedule', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('coach_id', sa.Integer(), nullable=False, comment='教练ID'),
+        sa.Column('date', sa.Date(), nullable=False, comment='日期'),
+        sa.Column('time_slot', sa.String(length=5), nullable=False, comment='时间段 HH:MM'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态: available可用 unavailable不可用 reserved已预约'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['coach_id'], ['coach.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'reservation', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('reservation_no', sa.String(length=50), nullable=False, comment='预约编号'),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('venue_id', sa.Integer(), nullable=False, comment='场馆ID'),
+        sa.Column('coach_id', sa.Integer(), nullable=True, comment='教练ID'),
+        sa.Column('reservation_date', sa.Date(), nullable=False, comment='预约日期'),
+        sa.Column('start_time', sa.Time(), nullable=False, comment='开始时间'),
+        sa.Column('end_time', sa.Time(), nullable=False, comment='结束时间'),
+        sa.Column('duration', sa.Integer(), nullable=False, comment='时长(分钟)'),
+        sa.Column('venue_price', sa.Numeric(precision=10, scale=2), nullable=True, comment='场馆费用(金币)'),
+        sa.Column('coach_price', sa.Numeric(precision=10, scale=2), nullable=True, comment='教练费用(金币)'),
+        sa.Column('total_price', sa.Numeric(precision=10, scale=2), nullable=True, comment='总费用(金币)'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='预约状态'),
+        sa.Column('type', sa.String(length=20), nullable=True, comment='类型: normal普通 activity活动'),
+        sa.Column('is_verified', sa.Boolean(), nullable=True, comment='是否已核销'),
+        sa.Column('verified_at', sa.DateTime(), nullable=True, comment='核销时间'),
+        sa.Column('verified_by', sa.String(length=50), nullable=True, comment='核销人（员工ID或设备ID）'),
+        sa.Column('no_show', sa.Boolean(), nullable=True, comment='是否爽约（预约时间已过未核销）'),
+        sa.Column('no_show_processed', sa.Boolean(), nullable=True, comment='爽约是否已处理（计入违约）'),
+        sa.Column('is_settled', sa.Boolean(), nullable=True, comment='是否已结算'),
+        sa.Column('settled_at', sa.DateTime(), nullable=True, comment='结算时间'),
+        sa.Column('rating', sa.Integer(), nullable=True, comment='评分 1-5'),
+        sa.Column('comment', sa.Text(), nullable=True, comment='评价内容'),
+        sa.Column('pay_type', sa.String(length=20), nullable=True, comment='支付方式: coin/wechat'),
+        sa.Column('out_trade_no', sa.String(length=50), nullable=True, comment='微信订单号'),
+        sa.Column('transaction_id', sa.String(length=100), nullable=True, comment='微信交易流水号'),
+        sa.Column('remark', sa.String(length=255), nullable=True, comment='备注'),
+        sa.Column('cancel_reason', sa.String(length=255), nullable=True, comment='取消原因'),
+        sa.Column('cancel_time', sa.DateTime(), nullable=True, comment='取消时间'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.Column('is_deleted', sa.Boolean(), nullable=False, comment='是否删除'),
+        sa.Column('deleted_at', sa.DateTime(), nullable=True, comment='删除时间'),
+        sa.ForeignKeyConstraint(['coach_id'], ['coach.id'], ),
+        sa.ForeignKeyConstraint(['member_id'], ['member.id'], ),
+        sa.ForeignKeyConstraint(['venue_id'], ['venue.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('out_trade_no'),
+        sa.UniqueConstraint('reservation_no'),
+    )
+    sa.Table(
+        'team_member', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('team_id', sa.Integer(), nullable=False, comment='组队ID'),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='成员ID'),
+        sa.Column('status', sa.String(length=20), nullable=True, comment='状态：joined已加入/quit已退出'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['member_id'], ['member.id'], ),
+        sa.ForeignKeyConstraint(['team_id'], ['team.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    sa.Table(
+        'member_violation', metadata,
+        sa.Column('id', sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('reservation_id', sa.Integer(), nullable=False, comment='关联预约ID'),
+        sa.Column('violation_type', sa.String(length=20), nullable=False, comment='违约类型: no_show'),
+        sa.Column('violation_date', sa.Date(), nullable=False, comment='违约日期'),
+        sa.Column('original_level_code', sa.String(length=20), nullable=True, comment='违约时的会员等级'),
+        sa.Column('penalty_applied', sa.Boolean(), nullable=True, comment='是否已应用惩罚'),
+        sa.Column('penalty_applied_at', sa.DateTime(), nullable=True, comment='惩罚应用时间'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.ForeignKeyConstraint(['member_id'], ['member.id'], ),
+        sa.ForeignKeyConstraint(['reservation_id'], ['reservation.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.Index('idx_member_date', 'member_id', 'violation_date'),
+        sa.Index('idx_member_processed', 'member_id', 'penalty_applied'),
+    )
+    return metadata
+
+
+def upgrade() -> None:
+    metadata = snapshot()
+    if context.is_offline_mode():
+        for table in metadata.sorted_tables:
+            op.execute(sa.schema.CreateTable(table))
+            for index in table.indexes:
+                op.execute(sa.schema.CreateIndex(index))
+        return
+    metadata.create_all(bind=op.get_bind(), checkfirst=True)
+
+
+def downgrade() -> None:
+    # 基线不可回退（不删除业务表）
+    pass
@@ -0,0 +1,53 @@
+"""热点查询复合索引
+
+- reservation: 场馆日历/冲突检测、会员订单列表、教练日程
+- gate_check_record: 当日未出场记录
+- leaderboard: 周期 + 场馆类型按名次分页
+- member_coupon: 会员可用券
+- message: 会员/教练消息列表与未读数
+
+大表（gate_check_record、reservation）在 MySQL 8 上为 ONLINE DDL，不锁写。
+
+Revision ID: 0002_hot_query_indexes
+Revises: 0001_baseline_schema
+Create Date: 2026-10-19
+"""
+from alembic import context, op
+
+from app.core.indexes import create_index_if_missing, drop_index_if_exists
+
+revision = '0002_hot_query_indexes'
+down_revision = '0001_baseline_schema'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('idx_reservation_venue_date_status', 'reservation', ['venue_id', 'reservation_date', 'status']),
+    ('idx_reservation_member_created', 'reservation', ['member_id', 'created_at']),
+    ('idx_reservation_coach_date', 'reservation', ['coach_id', 'reservation_date']),
+    ('idx_gate_check_member_date_out', 'gate_check_record', ['member_id', 'check_date', 'check_out_time']),
+    ('idx_leaderboard_period_rank', 'leaderboard', ['period_type', 'period_key', 'venue_type_id', 'rank']),
+    ('idx_member_coupon_member_status_end', 'member_coupon', ['member_id', 'status', 'end_time']),
+    ('idx_message_receiver_read', 'message', ['receiver_type', 'receiver_id', 'is_read']),
+]
+
+
+def upgrade() -> None:
+    if context.is_offline_mode():
+        # 离线导出 SQL 时无法检查已有索引，直接输出建索引语句
+        for name, table, columns in INDEXES:
+            op.create_index(name, table, columns)
+        return
+    conn = op.get_bind()
+    for name, table, columns in INDEXES:
+        create_index_if_missing(conn, name, table, columns)
+
+
+def downgrade() -> None:
+    if context.is_offline_mode():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table)
+        return
+    conn = op.get_bind()
+    for name, table, _ in reversed(INDEXES):
+        drop_index_if_exists(conn, name, table)
@@ -0,0 +1,42 @@
+"""支付回调去重账本 payment_notify_log
+
+transaction_id 唯一约束保证同一笔微信支付交易在多 worker 并发重试下只处理一次。
+按表是否存在幂等创建，可重复执行。
+
+Revision ID: 0003_payment_notify_log
+Revises: 0002_hot_query_indexes
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import context, op
+
+revision = '0003_payment_notify_log'
+down_revision = '0002_hot_query_indexes'
+branch_labels = None
+depends_on = None
+
+TABLE = 'payment_notify_log'
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode() and TABLE in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        TABLE,
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('transaction_id', sa.String(64), nullable=False, comment='微信支付交易号'),
+        sa.Column('out_trade_no', sa.String(64), nullable=False, comment='商户订单号'),
+        sa.Column('order_type', sa.String(20), nullable=False, comment='订单类型：recharge/member_card/reservation'),
+        sa.Column('trade_state', sa.String(32), comment='交易状态'),
+        sa.Column('result', sa.String(20), comment='处理结果：applied/ignored'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.UniqueConstraint('transaction_id'),
+    )
+    op.create_index('idx_payment_notify_out_trade_no', TABLE, ['out_trade_no'])
+
+
+def downgrade() -> None:
+    if not context.is_offline_mode() and TABLE not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.drop_table(TABLE)
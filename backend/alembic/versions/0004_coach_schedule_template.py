@@ -0,0 +1,116 @@
+"""教练排期改为每周模板 + 日期例外
+
+新增 coach_weekly_schedule（每教练每星期几一行）与 coach_schedule_exception（日期区间例外），
+两者都以小时掩码保存可用/不可用状态。已有的按小时排期行（coach_schedule）按「教练 + 日期」
+合并为单日例外：同一小时重复的行取一条，状态非 available 的均视为不可用（已预约由预约表体现）。
+
+coach_schedule 表保留不删，回退时删除新表即可恢复旧结构（回退前在新结构上的修改会丢失）。
+表已存在时跳过建表；是否迁移旧数据按例外表是否为空判断，与表由谁建无关，重复执行不会重复写入。
+
+Revision ID: 0004_coach_schedule_template
+Revises: 0003_payment_notify_log
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import context, op
+
+revision = '0004_coach_schedule_template'
+down_revision = '0003_payment_notify_log'
+branch_labels = None
+depends_on = None
+
+WEEKLY = 'coach_weekly_schedule'
+EXCEPTION = 'coach_schedule_exception'
+
+
+def _copy_hourly_rows() -> None:
+    """INSERT ... SELECT：按 (教练, 日期) 汇总旧排期行的小时位"""
+    legacy = sa.table(
+        'coach_schedule',
+        sa.column('coach_id', sa.Integer), sa.column('date', sa.Date),
+        sa.column('time_slot', sa.String), sa.column('status', sa.String),
+    )
+    exception = sa.table(
+        EXCEPTION,
+        sa.column('coach_id', sa.Integer), sa.column('start_date', sa.Date), sa.column('end_date', sa.Date),
+        sa.column('available_mask', sa.Integer), sa.column('unavailable_mask', sa.Integer),
+        sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime),
+    )
+
+    # 每个 (教练, 日期, 小时) 一行；同一小时既有可用又有不可用时按可用处理
+    hour = sa.cast(sa.func.substr(legacy.c.time_slot, 1, 2), sa.Integer)
+    slots = (
+        sa.select(
+            legacy.c.coach_id,
+            legacy.c.date,
+            hour.label('hour'),
+            sa.func.min(sa.case((legacy.c.status == 'available', 0), else_=1)).label('blocked'),
+        )
+        .where(hour >= 0, hour < 24)
+        .group_by(legacy.c.coach_id, legacy.c.date, hour)
+        .subquery()
+    )
+    bit = sa.literal(1).op('<<')(slots.c.hour)
+    masks = (
+        sa.select(
+            slots.c.coach_id,
+            slots.c.date,
+            slots.c.date,
+            sa.func.sum(sa.case((slots.c.blocked == 0, bit), else_=0)),
+            sa.func.sum(sa.case((slots.c.blocked == 1, bit), else_=0)),
+            sa.func.now(),
+            sa.func.now(),
+        )
+        .group_by(slots.c.coach_id, slots.c.date)
+    )
+    op.execute(exception.insert().from_select(
+        ['coach_id', 'start_date', 'end_date', 'available_mask', 'unavailable_mask', 'created_at', 'updated_at'],
+        masks
+    ))
+
+
+def _is_empty(table: str) -> bool:
+    return op.get_bind().execute(sa.select(sa.literal(1)).select_from(sa.table(table)).limit(1)).first() is None
+
+
+def upgrade() -> None:
+    offline = context.is_offline_mode()
+    existing = set() if offline else set(sa.inspect(op.get_bind()).get_table_names())
+
+    if WEEKLY not in existing:
+        op.create_table(
+            WEEKLY,
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('coach_id', sa.Integer(), sa.ForeignKey('coach.id'), nullable=False, comment='教练ID'),
+            sa.Column('weekday', sa.Integer(), nullable=False, comment='星期几：0周一 ... 6周日'),
+            sa.Column('available_mask', sa.Integer(), nullable=False, comment='可用小时掩码'),
+            sa.Column('unavailable_mask', sa.Integer(), nullable=False, comment='不可用小时掩码'),
+            sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+            sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+            sa.UniqueConstraint('coach_id', 'weekday', name='uk_coach_weekly_schedule'),
+        )
+
+    if EXCEPTION not in existing:
+        op.create_table(
+            EXCEPTION,
+            sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+            sa.Column('coach_id', sa.Integer(), sa.ForeignKey('coach.id'), nullable=False, comment='教练ID'),
+            sa.Column('start_date', sa.Date(), nullable=False, comment='开始日期'),
+            sa.Column('end_date', sa.Date(), nullable=False, comment='结束日期（含）'),
+            sa.Column('available_mask', sa.Integer(), nullable=False, comment='可用小时掩码'),
+            sa.Column('unavailable_mask', sa.Integer(), nullable=False, comment='不可用小时掩码'),
+            sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+            sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        )
+        op.create_index('idx_coach_schedule_exception_range', EXCEPTION, ['coach_id', 'end_date', 'start_date'])
+
+    if offline or ('coach_schedule' in existing and _is_empty(EXCEPTION)):
+        _copy_hourly_rows()
+
+
+def downgrade() -> None:
+    offline = context.is_offline_mode()
+    existing = set() if offline else set(sa.inspect(op.get_bind()).get_table_names())
+    for table in (EXCEPTION, WEEKLY):
+        if offline or table in existing:
+            op.drop_table(table)
@@ -0,0 +1,74 @@
+"""会员每日预约时长台账 member_daily_usage
+
+SSS 免费额度检查改为按 (会员, 日期) 读取台账，台账随预约写入在同一事务内增减（见 app.models.daily_usage）。
+台账为空时按现有 reservation（未取消、未删除）汇总回填（与表是否本次新建无关）；
+表已存在时跳过建表，台账已有数据时跳过回填。
+
+Revision ID: 0005_member_daily_usage
+Revises: 0004_coach_schedule_template
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import context, op
+
+revision = '0005_member_daily_usage'
+down_revision = '0004_coach_schedule_template'
+branch_labels = None
+depends_on = None
+
+TABLE = 'member_daily_usage'
+
+
+def _backfill() -> None:
+    reservation = sa.table(
+        'reservation',
+        sa.column('member_id', sa.Integer), sa.column('reservation_date', sa.Date),
+        sa.column('duration', sa.Integer), sa.column('status', sa.String), sa.column('is_deleted', sa.Boolean),
+    )
+    usage = sa.table(
+        TABLE,
+        sa.column('member_id', sa.Integer), sa.column('usage_date', sa.Date), sa.column('used_minutes', sa.Integer),
+        sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime),
+    )
+    totals = (
+        sa.select(
+            reservation.c.member_id,
+            reservation.c.reservation_date,
+            sa.func.sum(reservation.c.duration),
+            sa.func.now(),
+            sa.func.now(),
+        )
+        .where(reservation.c.status != 'cancelled', reservation.c.is_deleted == sa.false())
+        .group_by(reservation.c.member_id, reservation.c.reservation_date)
+    )
+    op.execute(usage.insert().from_select(
+        ['member_id', 'usage_date', 'used_minutes', 'created_at', 'updated_at'], totals
+    ))
+
+
+def _is_empty(table: str) -> bool:
+    return op.get_bind().execute(sa.select(sa.literal(1)).select_from(sa.table(table)).limit(1)).first() is None
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode() and TABLE in sa.inspect(op.get_bind()).get_table_names():
+        if _is_empty(TABLE):
+            _backfill()
+        return
+    op.create_table(
+        TABLE,
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('member_id', sa.Integer(), sa.ForeignKey('member.id'), nullable=False, comment='会员ID'),
+        sa.Column('usage_date', sa.Date(), nullable=False, comment='预约日期'),
+        sa.Column('used_minutes', sa.Integer(), nullable=False, comment='已预约分钟数'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.UniqueConstraint('member_id', 'usage_date', name='uk_member_daily_usage'),
+    )
+    _backfill()
+
+
+def downgrade() -> None:
+    if not context.is_offline_mode() and TABLE not in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.drop_table(TABLE)
@@ -0,0 +1,95 @@
+"""积分商城库存：秒杀标记、每人限购与限购台账 member_product_purchase
+
+product 增加 is_flash_sale（秒杀商品走进程内库存令牌池）与 purchase_limit（每人限兑，0 为不限）；
+限购台账按 (会员, 商品) 记录已兑换数量，台账为空时按现有未取消订单汇总回填（与表是否本次新建无关）。
+列与表已存在时跳过。
+
+Revision ID: 0006_mall_inventory
+Revises: 0005_member_daily_usage
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import context, op
+
+revision = '0006_mall_inventory'
+down_revision = '0005_member_daily_usage'
+branch_labels = None
+depends_on = None
+
+TABLE = 'member_product_purchase'
+PRODUCT_COLUMNS = (
+    sa.Column('is_flash_sale', sa.Boolean(), nullable=True, server_default=sa.false(),
+              comment='是否秒杀商品（进程内预分配库存令牌）'),
+    sa.Column('purchase_limit', sa.Integer(), nullable=True, server_default='0', comment='每人限兑数量，0为不限'),
+)
+
+
+def _backfill() -> None:
+    order = sa.table(
+        'product_order',
+        sa.column('member_id', sa.Integer), sa.column('product_id', sa.Integer),
+        sa.column('quantity', sa.Integer), sa.column('status', sa.String),
+    )
+    purchase = sa.table(
+        TABLE,
+        sa.column('member_id', sa.Integer), sa.column('product_id', sa.Integer), sa.column('quantity', sa.Integer),
+        sa.column('created_at', sa.DateTime), sa.column('updated_at', sa.DateTime),
+    )
+    totals = (
+        sa.select(
+            order.c.member_id,
+            order.c.product_id,
+            sa.func.sum(sa.func.coalesce(order.c.quantity, 1)),
+            sa.func.now(),
+            sa.func.now(),
+        )
+        .where(order.c.status != 'cancelled')
+        .group_by(order.c.member_id, order.c.product_id)
+    )
+    op.execute(purchase.insert().from_select(
+        ['member_id', 'product_id', 'quantity', 'created_at', 'updated_at'], totals
+    ))
+
+
+def _is_empty(table: str) -> bool:
+    return op.get_bind().execute(sa.select(sa.literal(1)).select_from(sa.table(table)).limit(1)).first() is None
+
+
+def upgrade() -> None:
+    offline = context.is_offline_mode()
+    inspector = None if offline else sa.inspect(op.get_bind())
+
+    existing = set() if offline else {c['name'] for c in inspector.get_columns('product')}
+    for column in PRODUCT_COLUMNS:
+        if column.name not in existing:
+            op.add_column('product', column.copy())
+
+    if not offline and TABLE in inspector.get_table_names():
+        if _is_empty(TABLE):
+            _backfill()
+        return
+    op.create_table(
+        TABLE,
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('member_id', sa.Integer(), nullable=False, comment='会员ID'),
+        sa.Column('product_id', sa.Integer(), nullable=False, comment='商品ID'),
+        sa.Column('quantity', sa.Integer(), nullable=False, comment='已兑换数量'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.UniqueConstraint('member_id', 'product_id', name='uk_member_product_purchase'),
+    )
+    _backfill()
+
+
+def downgrade() -> None:
+    offline = context.is_offline_mode()
+    inspector = None if offline else sa.inspect(op.get_bind())
+
+    if offline or TABLE in inspector.get_table_names():
+        op.drop_table(TABLE)
+
+    existing = None if offline else {c['name'] for c in inspector.get_columns('product')}
+    with op.batch_alter_table('product') as batch:
+        for column in PRODUCT_COLUMNS:
+            if existing is None or column.name in existing:
+                batch.drop_column(column.name)
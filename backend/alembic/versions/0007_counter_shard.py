@@ -0,0 +1,41 @@
+"""热点计数分片表 counter_shard
+
+活动报名人数、优惠券已发放量拆成多行分片计数，并发增减分散到不同行。
+分片在首次使用时按业务表当前值与容量懒创建，不需要回填。
+表已存在时跳过，可重复执行。
+
+Revision ID: 0007_counter_shard
+Revises: 0006_mall_inventory
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import context, op
+
+revision = '0007_counter_shard'
+down_revision = '0006_mall_inventory'
+branch_labels = None
+depends_on = None
+
+TABLE = 'counter_shard'
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode() and TABLE in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        TABLE,
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('name', sa.String(50), nullable=False, comment='计数名称，如 activity_participants'),
+        sa.Column('key', sa.Integer(), nullable=False, comment='业务主键，如活动ID'),
+        sa.Column('shard', sa.Integer(), nullable=False, comment='分片序号'),
+        sa.Column('value', sa.Integer(), nullable=False, comment='分片计数'),
+        sa.Column('capacity', sa.Integer(), nullable=True, comment='分片容量份额，NULL为不限'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.UniqueConstraint('name', 'key', 'shard', name='uk_counter_shard'),
+    )
+
+
+def downgrade() -> None:
+    if context.is_offline_mode() or TABLE in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_table(TABLE)
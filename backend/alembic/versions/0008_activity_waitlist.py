@@ -0,0 +1,54 @@
+"""活动候补：候补名额与候补人数列、报名表按活动 + 状态的索引
+
+activity 增加 waitlist_limit（0 为不开放候补）与 waitlist_count；
+activity_registration 增加 (activity_id, status) 索引，候补递补与报名名单按此查询。
+列与索引已存在时跳过，可重复执行。
+
+Revision ID: 0008_activity_waitlist
+Revises: 0007_counter_shard
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import context, op
+
+from app.core.indexes import create_index_if_missing, drop_index_if_exists
+
+revision = '0008_activity_waitlist'
+down_revision = '0007_counter_shard'
+branch_labels = None
+depends_on = None
+
+ACTIVITY_COLUMNS = (
+    sa.Column('waitlist_limit', sa.Integer(), nullable=True, server_default='0', comment='候补名额，0表示不开放候补'),
+    sa.Column('waitlist_count', sa.Integer(), nullable=True, server_default='0', comment='当前候补人数'),
+)
+INDEX = ('idx_activity_registration_activity_status', 'activity_registration', ['activity_id', 'status'])
+
+
+def upgrade() -> None:
+    offline = context.is_offline_mode()
+    existing = set() if offline else {c['name'] for c in sa.inspect(op.get_bind()).get_columns('activity')}
+    for column in ACTIVITY_COLUMNS:
+        if column.name not in existing:
+            op.add_column('activity', column.copy())
+
+    name, table, columns = INDEX
+    if offline:
+        op.create_index(name, table, columns)
+    else:
+        create_index_if_missing(op.get_bind(), name, table, columns)
+
+
+def downgrade() -> None:
+    offline = context.is_offline_mode()
+    name, table, _ = INDEX
+    if offline:
+        op.drop_index(name, table_name=table)
+    else:
+        drop_index_if_exists(op.get_bind(), name, table)
+
+    existing = None if offline else {c['name'] for c in sa.inspect(op.get_bind()).get_columns('activity')}
+    with op.batch_alter_table('activity') as batch:
+        for column in ACTIVITY_COLUMNS:
+            if existing is None or column.name in existing:
+                batch.drop_column(column.name)
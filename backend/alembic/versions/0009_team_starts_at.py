@@ -0,0 +1,99 @@
+"""组队开始时间：team.starts_at（DATETIME）与 (status, sport_type, starts_at) 索引
+
+原 activity_date / activity_time 为字符串，按字典序比较在未补零的日期（如 2026-3-27）上出错，
+也无法走范围索引。新增 starts_at 并按两列回填（兼容未补零写法，无法解析的保持 NULL，不再出现在组队广场），
+字符串列保留为派生输出。列与索引已存在时跳过，回填只处理 starts_at 为空的行，可重复执行。
+
+Revision ID: 0009_team_starts_at
+Revises: 0008_activity_waitlist
+Create Date: 2026-10-19
+"""
+import re
+from datetime import datetime
+from typing import Optional
+
+import sqlalchemy as sa
+from alembic import context, op
+
+from app.core.indexes import create_index_if_missing, drop_index_if_exists
+
+revision = '0009_team_starts_at'
+down_revision = '0008_activity_waitlist'
+branch_labels = None
+depends_on = None
+
+COLUMN = sa.Column('starts_at', sa.DateTime(), nullable=True, comment='活动开始时间')
+INDEX = ('idx_team_status_sport_starts', 'team', ['status', 'sport_type', 'starts_at'])
+
+# 解析规则按本迁移编写时冻结（与 app.services.team_listing 当时的实现一致），之后修改解析器不影响本迁移
+_DATE_RE = re.compile(r"^\s*(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})\s*$")
+_TIME_RE = re.compile(r"^\s*(\d{1,2})[:：](\d{1,2})(?:[:：]\d{1,2})?\s*$")
+
+
+def parse_starts_at(activity_date: Optional[str], activity_time: Optional[str]) -> Optional[datetime]:
+    """日期 + 时间字符串 -> 开始时间（兼容 2026-3-27、9:5 等未补零写法），无法解析返回 None"""
+    date_match = _DATE_RE.match(activity_date or "")
+    time_match = _TIME_RE.match(activity_time or "")
+    if not date_match or not time_match:
+        return None
+    try:
+        return datetime(*(int(v) for v in date_match.groups()), *(int(v) for v in time_match.groups()))
+    except ValueError:
+        return None
+
+
+team = sa.table(
+    'team',
+    sa.column('id', sa.Integer), sa.column('activity_date', sa.String),
+    sa.column('activity_time', sa.String), sa.column('starts_at', sa.DateTime),
+)
+
+
+def _backfill(conn) -> None:
+    rows = conn.execute(
+        sa.select(team.c.id, team.c.activity_date, team.c.activity_time).where(team.c.starts_at.is_(None))
+    ).all()
+    values = [
+        {"_id": row.id, "starts_at": starts_at}
+        for row in rows
+        if (starts_at := parse_starts_at(row.activity_date, row.activity_time)) is not None
+    ]
+    if values:
+        conn.execute(
+            team.update().where(team.c.id == sa.bindparam('_id')).values(starts_at=sa.bindparam('starts_at')),
+            values,
+        )
+
+
+def upgrade() -> None:
+    name, table, columns = INDEX
+    if context.is_offline_mode():
+        op.add_column(table, COLUMN.copy())
+        if context.get_context().dialect.name == 'mysql':
+            # 离线导出无法逐行解析；MySQL 的 %m/%d/%H/%i 兼容未补零写法，无法解析的得到 NULL
+            op.execute(
+                "UPDATE team SET starts_at = STR_TO_DATE(CONCAT(activity_date, ' ', activity_time), '%Y-%m-%d %H:%i') "
+                "WHERE starts_at IS NULL"
+            )
+        op.create_index(name, table, columns)
+        return
+
+    conn = op.get_bind()
+    if COLUMN.name not in {c['name'] for c in sa.inspect(conn).get_columns(table)}:
+        op.add_column(table, COLUMN.copy())
+    _backfill(conn)
+    create_index_if_missing(conn, name, table, columns)
+
+
+def downgrade() -> None:
+    name, table, _ = INDEX
+    if context.is_offline_mode():
+        op.drop_index(name, table_name=table)
+        op.drop_column(table, COLUMN.name)
+        return
+
+    conn = op.get_bind()
+    drop_index_if_exists(conn, name, table)
+    if COLUMN.name in {c['name'] for c in sa.inspect(conn).get_columns(table)}:
+        with op.batch_alter_table(table) as batch:
+            batch.drop_column(COLUMN.name)
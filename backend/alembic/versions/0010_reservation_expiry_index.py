@@ -0,0 +1,35 @@
+"""未支付预约超时关单：reservation (status, created_at) 索引
+
+兜底扫描按 status = 'unpaid' AND created_at < 截止时间 查询已超时订单，启动预热按同一索引装载未到期订单。
+大表在 MySQL 8 上为 ONLINE DDL，不锁写。
+
+Revision ID: 0010_reservation_expiry_index
+Revises: 0009_team_starts_at
+Create Date: 2026-10-19
+"""
+from alembic import context, op
+
+from app.core.indexes import create_index_if_missing, drop_index_if_exists
+
+revision = '0010_reservation_expiry_index'
+down_revision = '0009_team_starts_at'
+branch_labels = None
+depends_on = None
+
+INDEX = ('idx_reservation_status_created', 'reservation', ['status', 'created_at'])
+
+
+def upgrade() -> None:
+    name, table, columns = INDEX
+    if context.is_offline_mode():
+        op.create_index(name, table, columns)
+        return
+    create_index_if_missing(op.get_bind(), name, table, columns)
+
+
+def downgrade() -> None:
+    name, table, _ = INDEX
+    if context.is_offline_mode():
+        op.drop_index(name, table_name=table)
+        return
+    drop_index_if_exists(op.get_bind(), name, table)
@@ -0,0 +1,40 @@
+"""秒杀库存令牌租约 flash_sale_lease
+
+各进程从 product.stock 预分配的秒杀令牌按 (持有进程, 商品) 记账：stock + 租约合计 = 剩余可售库存。
+后台改库存按租约折算，崩溃进程的租约心跳超时后归还 stock。
+部署时各进程池内尚未记账的令牌随停机归还，不需要回填。表已存在时跳过，可重复执行。
+
+Revision ID: 0011_flash_sale_lease
+Revises: 0010_reservation_expiry_index
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import context, op
+
+revision = '0011_flash_sale_lease'
+down_revision = '0010_reservation_expiry_index'
+branch_labels = None
+depends_on = None
+
+TABLE = 'flash_sale_lease'
+
+
+def upgrade() -> None:
+    if not context.is_offline_mode() and TABLE in sa.inspect(op.get_bind()).get_table_names():
+        return
+    op.create_table(
+        TABLE,
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('owner', sa.String(64), nullable=False, comment='持有进程：主机名:进程号:启动标识'),
+        sa.Column('product_id', sa.Integer(), nullable=False, comment='商品ID'),
+        sa.Column('quantity', sa.Integer(), nullable=False, comment='已预分配未售出的令牌数'),
+        sa.Column('heartbeat_at', sa.DateTime(), nullable=False, comment='持有进程最近心跳时间（UTC）'),
+        sa.Column('created_at', sa.DateTime(), nullable=False, comment='创建时间'),
+        sa.Column('updated_at', sa.DateTime(), nullable=False, comment='更新时间'),
+        sa.UniqueConstraint('owner', 'product_id', name='uk_flash_sale_lease'),
+    )
+
+
+def downgrade() -> None:
+    if context.is_offline_mode() or TABLE in sa.inspect(op.get_bind()).get_table_names():
+        op.drop_table(TABLE)
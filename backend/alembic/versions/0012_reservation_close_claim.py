@@ -0,0 +1,38 @@
+"""未支付预约超时关单认领：reservation.close_claimed_at
+
+各 worker 的时间轮与兜底扫描会拿到同一批到期订单，关单前按此列条件认领，每单只由一个 worker 调用微信关单。
+已有订单均为未认领（NULL），不需要回填。列已存在时跳过，可重复执行。
+
+Revision ID: 0012_reservation_close_claim
+Revises: 0011_flash_sale_lease
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import context, op
+
+revision = '0012_reservation_close_claim'
+down_revision = '0011_flash_sale_lease'
+branch_labels = None
+depends_on = None
+
+TABLE = 'reservation'
+COLUMN = sa.Column('close_claimed_at', sa.DateTime(), nullable=True,
+                   comment='超时关单认领时间（同一订单只由一个 worker 关单）')
+
+
+def _has_column(conn) -> bool:
+    return COLUMN.name in {c['name'] for c in sa.inspect(conn).get_columns(TABLE)}
+
+
+def upgrade() -> None:
+    if context.is_offline_mode() or not _has_column(op.get_bind()):
+        op.add_column(TABLE, COLUMN.copy())
+
+
+def downgrade() -> None:
+    if context.is_offline_mode():
+        op.drop_column(TABLE, COLUMN.name)
+        return
+    if _has_column(op.get_bind()):
+        with op.batch_alter_table(TABLE) as batch:
+            batch.drop_column(COLUMN.name)
@@ -0,0 +1,60 @@
+"""活动报名去重：activity_registration.active_key 与 (activity_id, member_id, active_key) 唯一索引
+
+有效报名（报名/候补/签到）active_key 为 1，取消后为 NULL（唯一索引不约束 NULL），
+同一会员在同一活动只能有一条有效报名，并发重复报名在写入时失败。
+回填：每个 (活动, 会员) 只把最早的一条未取消报名标为有效；此前并发产生的重复报名保持 NULL，
+仍按原状态显示在报名名单中，由运营核对后取消。列与索引已存在时跳过，可重复执行。
+
+Revision ID: 0013_activity_registration_active
+Revises: 0012_reservation_close_claim
+Create Date: 2026-10-19
+"""
+import sqlalchemy as sa
+from alembic import context, op
+
+revision = '0013_activity_registration_active'
+down_revision = '0012_reservation_close_claim'
+branch_labels = None
+depends_on = None
+
+TABLE = 'activity_registration'
+COLUMN = sa.Column('active_key', sa.Integer(), nullable=True, comment='有效报名标记：有效为1，取消为NULL')
+INDEX = ('uq_activity_registration_active', ['activity_id', 'member_id', 'active_key'])
+
+# 派生表包一层：MySQL 不允许 UPDATE 的子查询直接读同一张表
+BACKFILL = (
+    "UPDATE activity_registration SET active_key = 1 WHERE active_key IS NULL AND id IN ("
+    "SELECT id FROM (SELECT MIN(id) AS id FROM activity_registration "
+    "WHERE status <> 'cancelled' GROUP BY activity_id, member_id) AS first_active)"
+)
+
+
+def upgrade() -> None:
+    name, columns = INDEX
+    if context.is_offline_mode():
+        op.add_column(TABLE, COLUMN.copy())
+        op.execute(BACKFILL)
+        op.create_index(name, TABLE, columns, unique=True)
+        return
+
+    inspector = sa.inspect(op.get_bind())
+    if COLUMN.name not in {c['name'] for c in inspector.get_columns(TABLE)}:
+        op.add_column(TABLE, COLUMN.copy())
+    op.execute(BACKFILL)
+    if name not in {i['name'] for i in inspector.get_indexes(TABLE)}:
+        op.create_index(name, TABLE, columns, unique=True)
+
+
+def downgrade() -> None:
+    name, _ = INDEX
+    if context.is_offline_mode():
+        op.drop_index(name, table_name=TABLE)
+        op.drop_column(TABLE, COLUMN.name)
+        return
+
+    inspector = sa.inspect(op.get_bind())
+    if name in {i['name'] for i in inspector.get_indexes(TABLE)}:
+        op.drop_index(name, table_name=TABLE)
+    if COLUMN.name in {c['name'] for c in inspector.get_columns(TABLE)}:
+        with op.batch_alter_table(TABLE) as batch:
+            batch.drop_column(COLUMN.name)
@@ -1,9 +1,11 @@
 from typing import Generator, Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 
-from app.core.database import SessionLocal, get_db
+from app.core.database import SessionLocal, get_db, get_async_db
 from app.core.security import decode_token
 from app.models import SysUser, Coach, Member
 
@@ -133,3 +135,58 @@ def get_current_member_optional(
     if member_id is None:
         return None
     return db.query(Member).filter(Member.id == member_id, Member.is_deleted == False).first()
+
+
+# ==================== 异步会员鉴权（配合 get_async_db 使用） ====================
+
+def _member_id_from_token(token: Optional[str]) -> Optional[int]:
+    """从会员 Token 中解析 member_id，无效时返回 None"""
+    if not token:
+        return None
+    payload = decode_token(token)
+    if payload is None:
+        return None
+    return payload.get("member_id")
+
+
+async def _load_member_async(db: AsyncSession, member_id: int) -> Optional[Member]:
+    """异步加载会员（预加载等级，避免异步会话中触发懒加载）"""
+    result = await db.execute(
+        select(Member)
+        .options(selectinload(Member.level))
+        .where(Member.id == member_id, Member.is_deleted == False)
+    )
+    return result.scalar_one_or_none()
+
+
+async def get_current_member_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(coach_oauth2_scheme)
+) -> Member:
+    """获取当前会员（异步版）"""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="无效的认证凭据",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    member_id = _member_id_from_token(token)
+    if member_id is None:
+        raise credentials_exception
+
+    member = await _load_member_async(db, member_id)
+    if member is None:
+        raise credentials_exception
+
+    return member
+
+
+async def get_current_member_optional_async(
+    db: AsyncSession = Depends(get_async_db),
+    token: str = Depends(coach_oauth2_scheme)
+) -> Optional[Member]:
+    """获取当前会员（异步版，可选，Token无效/缺失时返回 None）"""
+    member_id = _member_id_from_token(token)
+    if member_id is None:
+        return None
+    return await _load_member_async(db, member_id)
@@ -9,6 +9,7 @@ from app.api.deps import get_current_user
 from app.models.activity import Activity, ActivityRegistration
 from app.models.member import Member
 from app.schemas.response import ResponseModel, PageResponseModel
+from app.services import activity_enrollment, counter_service
 
 router = APIRouter()
 
@@ -48,6 +49,7 @@ def get_activity_list(
                 "location": item.location,
                 "max_participants": item.max_participants,
                 "current_participants": item.current_participants,
+                "waitlist_count": item.waitlist_count or 0,
                 "price": float(item.price) if item.price else 0,
                 "status": item.status,
                 "created_at": item.created_at.strftime("%Y-%m-%d %H:%M:%S") if item.created_at else None
@@ -87,6 +89,8 @@ def get_activity(
         "venue_id": activity.venue_id,
         "max_participants": activity.max_participants,
         "current_participants": activity.current_participants,
+        "waitlist_limit": activity.waitlist_limit or 0,
+        "waitlist_count": activity.waitlist_count or 0,
         "price": float(activity.price) if activity.price else 0,
         "status": activity.status,
         "tags": activity.tags,
@@ -112,6 +116,7 @@ def create_activity(
         location=data.get("location"),
         venue_id=data.get("venue_id"),
         max_participants=data.get("max_participants", 0),
+        waitlist_limit=data.get("waitlist_limit", 0),
         price=data.get("price", 0),
         status=data.get("status", "draft"),
         tags=data.get("tags"),
@@ -140,12 +145,20 @@ def update_activity(
     if not activity:
         return ResponseModel(code=404, message="活动不存在")
 
+    if "max_participants" in data:
+        # 名额变更：已报名分片折回活动，下次报名按新名额重建分片
+        counter_service.reset(db, counter_service.ACTIVITY_PARTICIPANTS, activity_id)
+
     for key, value in data.items():
         if key in ["start_time", "end_time", "registration_deadline"] and value:
             value = datetime.strptime(value, "%Y-%m-%d %H:%M")
         if hasattr(activity, key):
             setattr(activity, key, value)
 
+    if "max_participants" in data:
+        # 扩容后空出的名额按顺序递补候补
+        activity_enrollment.promote_waitlist(db, activity)
+
     db.commit()
     return ResponseModel(message="更新成功")
 
@@ -249,6 +262,9 @@ def check_in_registration(
     if not registration:
         return ResponseModel(code=404, message="报名记录不存在")
 
+    if registration.status not in ("registered", "attended"):
+        return ResponseModel(code=400, message="该报名为候补或已取消，不能签到")
+
     registration.check_in_time = datetime.now()
     registration.status = "attended"
     db.commit()
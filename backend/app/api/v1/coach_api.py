@@ -11,9 +11,11 @@ from app.core.database import get_db
 from app.core.security import verify_password, create_access_token
 from app.core.config import settings
 from app.core.wechat import coach_wechat_service, WeChatAPIError
-from app.models import Coach, Reservation, CoachSchedule, Member
+from app.models import Coach, Reservation, CoachWeeklySchedule, Member
 from app.schemas.common import ResponseModel, PageResult
 from app.api.deps import get_current_coach
+from app.services import coach_schedule_service
+from app.services.coach_availability import coach_availability, coach_range_view, to_date
 
 router = APIRouter()
 
@@ -435,42 +437,17 @@ def get_coach_schedule(
     db: Session = Depends(get_db)
 ):
     """获取教练排期"""
-    schedules = db.query(CoachSchedule).filter(
-        CoachSchedule.coach_id == current_coach.id,
-        CoachSchedule.date >= start_date,
-        CoachSchedule.date <= end_date
-    ).all()
-
-    # 获取已预约的时间段
-    reservations = db.query(Reservation).filter(
-        Reservation.coach_id == current_coach.id,
-        Reservation.reservation_date >= start_date,
-        Reservation.reservation_date <= end_date,
-        Reservation.status.in_(["pending", "confirmed", "in_progress"]),
-        Reservation.is_deleted == False
-    ).all()
-
-    # 组织数据
-    result = {}
-    for s in schedules:
-        date_str = str(s.date)
-        if date_str not in result:
-            result[date_str] = {}
-        result[date_str][s.time_slot] = s.status
-
-    # 标记已预约的时间段
-    for r in reservations:
-        date_str = str(r.reservation_date)
-        if date_str not in result:
-            result[date_str] = {}
-        # 获取预约的所有小时段
-        start_hour = r.start_time.hour
-        end_hour = r.end_time.hour
-        for hour in range(start_hour, end_hour):
-            time_slot = f"{hour:02d}:00"
-            result[date_str][time_slot] = "reserved"
+    try:
+        start, end = to_date(start_date), to_date(end_date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="日期格式错误")
+    if end < start:
+        raise HTTPException(status_code=400, detail="结束日期不能早于开始日期")
+    if (end - start).days + 1 > settings.COACH_SCHEDULE_MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"查询区间不能超过{settings.COACH_SCHEDULE_MAX_RANGE_DAYS}天")
 
-    return ResponseModel(data=result)
+    vectors = coach_availability.get_range(db, current_coach.id, start, end)
+    return ResponseModel(data=coach_range_view(vectors))
 
 
 @router.post("/schedule", response_model=ResponseModel)
@@ -484,6 +461,9 @@ def update_coach_schedule(
         date_str = data.get("date")
         time_slot = data.get("time")
         new_status = data.get("status")
+        if new_status not in coach_schedule_service.SCHEDULE_STATUSES:
+            raise HTTPException(status_code=400, detail="排期状态无效")
+        day = to_date(date_str)
 
         # 检查是否已被预约
         start_hour = int(time_slot.split(":")[0])
@@ -499,23 +479,8 @@ def update_coach_schedule(
         if existing:
             raise HTTPException(status_code=400, detail="该时间段已被预约")
 
-        # 更新或创建排期
-        schedule = db.query(CoachSchedule).filter(
-            CoachSchedule.coach_id == current_coach.id,
-            CoachSchedule.date == date_str,
-            CoachSchedule.time_slot == time_slot
-        ).first()
-
-        if schedule:
-            schedule.status = new_status
-        else:
-            schedule = CoachSchedule(
-                coach_id=current_coach.id,
-                date=date_str,
-                time_slot=time_slot,
-                status=new_status
-            )
-            db.add(schedule)
+        # 写入当天的排期例外
+        coach_schedule_service.set_slot(db, current_coach.id, day, start_hour, new_status)
 
         db.commit()
         return ResponseModel(message="更新成功")
@@ -537,36 +502,67 @@ def batch_update_schedule(
         start_date = data.get("start_date")
         end_date = data.get("end_date")
         new_status = data.get("status")
+        if new_status not in coach_schedule_service.SCHEDULE_STATUSES:
+            raise HTTPException(status_code=400, detail="排期状态无效")
 
-        # 删除现有的非预约排期
-        db.query(CoachSchedule).filter(
-            CoachSchedule.coach_id == current_coach.id,
-            CoachSchedule.date >= start_date,
-            CoachSchedule.date <= end_date
-        ).delete()
-
-        # 生成新的排期
-        current = datetime.strptime(start_date, "%Y-%m-%d").date()
+        # 区间内营业时段统一设为该状态：一条区间例外替换被完全覆盖的旧例外
+        start = datetime.strptime(start_date, "%Y-%m-%d").date()
         end = datetime.strptime(end_date, "%Y-%m-%d").date()
-
-        while current <= end:
-            for hour in range(8, 22):
-                schedule = CoachSchedule(
-                    coach_id=current_coach.id,
-                    date=current,
-                    time_slot=f"{hour:02d}:00",
-                    status=new_status
-                )
-                db.add(schedule)
-            current += timedelta(days=1)
+        coach_schedule_service.set_range(db, current_coach.id, start, end, new_status)
 
         db.commit()
         return ResponseModel(message="批量更新成功")
+    except HTTPException:
+        raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"批量更新排期失败: {str(e)}")
 
 
+@router.get("/schedule/weekly", response_model=ResponseModel)
+def get_weekly_schedule(
+    current_coach: Coach = Depends(get_current_coach),
+    db: Session = Depends(get_db)
+):
+    """获取每周排期模板：星期几(0周一) -> {时段: 状态}"""
+    rows = db.query(CoachWeeklySchedule).filter(CoachWeeklySchedule.coach_id == current_coach.id).all()
+    result = {}
+    for row in rows:
+        slots = {}
+        for hour in range(24):
+            if row.available_mask >> hour & 1:
+                slots[f"{hour:02d}:00"] = "available"
+            elif row.unavailable_mask >> hour & 1:
+                slots[f"{hour:02d}:00"] = "unavailable"
+        result[row.weekday] = slots
+    return ResponseModel(data=result)
+
+
+@router.post("/schedule/weekly", response_model=ResponseModel)
+def update_weekly_schedule(
+    data: dict,
+    current_coach: Coach = Depends(get_current_coach),
+    db: Session = Depends(get_db)
+):
+    """设置每周排期模板（weekdays: 星期几列表，0周一；times: 时段列表，默认营业时段）"""
+    weekdays = data.get("weekdays") or []
+    new_status = data.get("status")
+    if new_status not in coach_schedule_service.SCHEDULE_STATUSES:
+        raise HTTPException(status_code=400, detail="排期状态无效")
+    if not weekdays or any(not isinstance(w, int) or not 0 <= w <= 6 for w in weekdays):
+        raise HTTPException(status_code=400, detail="星期参数无效")
+
+    try:
+        times = data.get("times")
+        hours = [int(t.split(":")[0]) for t in times] if times else coach_schedule_service.BUSINESS_HOURS
+        coach_schedule_service.set_weekly(db, current_coach.id, weekdays, new_status, hours)
+        db.commit()
+        return ResponseModel(message="更新成功")
+    except Exception as e:
+        db.rollback()
+        raise HTTPException(status_code=500, detail=f"更新每周排期失败: {str(e)}")
+
+
 # ==================== 钱包与收入 ====================
 
 @router.get("/wallet", response_model=ResponseModel)
@@ -10,6 +10,7 @@ from app.api.deps import get_current_user
 from app.models.coupon import CouponTemplate, MemberCoupon
 from app.models.member import Member, MemberLevel
 from app.schemas.response import ResponseModel, PageResponseModel
+from app.services import counter_service
 from app.core.wechat import user_wechat_service, subscribe_message_helper, WeChatAPIError
 
 router = APIRouter()
@@ -232,6 +233,10 @@ def update_template(
     if not template:
         return ResponseModel(code=404, message="模板不存在")
 
+    if "total_count" in data:
+        # 总量变更：已发放分片折回模板，下次发放按新总量重建分片
+        counter_service.reset(db, counter_service.COUPON_ISSUED, template_id)
+
     for key, value in data.items():
         if key in ["start_time", "end_time"] and value:
             value = datetime.strptime(value, "%Y-%m-%d %H:%M")
@@ -295,10 +300,6 @@ def issue_coupon(
     notifications_to_send = []  # 收集需要发送通知的会员信息
 
     for member_id in member_ids:
-        # 检查是否超过总量限制
-        if template.total_count > 0 and template.issued_count >= template.total_count:
-            break
-
         # 检查会员是否存在
         member = db.query(Member).filter(Member.id == member_id).first()
         if not member:
@@ -312,6 +313,10 @@ def issue_coupon(
         if existing_count >= template.per_limit:
             continue
 
+        # 占用发放名额（超过总量限制即停止）
+        if not counter_service.claim(db, counter_service.COUPON_ISSUED, template_id):
+            break
+
         # 计算有效期
         if template.valid_days:
             start_time = datetime.now()
@@ -335,7 +340,6 @@ def issue_coupon(
             experience_level_id=template.experience_level_id
         )
         db.add(coupon)
-        template.issued_count += 1
         success_count += 1
 
         # 收集需要发送通知的会员信息（只有有openid的会员才能收到通知）
@@ -17,6 +17,7 @@ from app.models.reservation import Reservation
 from app.models.activity import ActivityRegistration
 from app.models.mall import ProductOrder
 from app.schemas.response import ResponseModel, PageResponseModel
+from app.services.catalog_cache import catalog_cache, TAG_RECHARGE_PACKAGES
 
 router = APIRouter()
 
@@ -596,6 +597,7 @@ def create_recharge_package(
     pkg = RechargePackage(**data.model_dump())
     db.add(pkg)
     db.commit()
+    catalog_cache.invalidate(TAG_RECHARGE_PACKAGES)
     db.refresh(pkg)
     return ResponseModel(data={"id": pkg.id, "name": pkg.name})
 
@@ -619,6 +621,7 @@ def update_recharge_package(
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(pkg, key, value)
     db.commit()
+    catalog_cache.invalidate(TAG_RECHARGE_PACKAGES)
     return ResponseModel(message="更新成功")
 
 
@@ -639,4 +642,5 @@ def delete_recharge_package(
 
     pkg.is_deleted = True
     db.commit()
+    catalog_cache.invalidate(TAG_RECHARGE_PACKAGES)
     return ResponseModel(message="删除成功")
@@ -7,10 +7,11 @@ from sqlalchemy import func, or_
 from datetime import datetime, date, timedelta
 
 from app.core.database import get_db
-from app.models import Member, Venue, VenueType, PointRecord
+from app.models import Member, Venue, VenueType
 from app.models.checkin import GateCheckRecord, PointRuleConfig
 from app.schemas.response import ResponseModel
 from app.schemas.checkin import GateCheckInRequest
+from app.services import wallet_service
 
 router = APIRouter()
 
@@ -175,19 +176,11 @@ def gate_checkin(
             record.points_earned = points
             record.points_settled = True
 
-            # 更新会员积分余额
-            member.point_balance = (member.point_balance or 0) + points
-
-            # 记录积分流水
-            point_record = PointRecord(
-                member_id=member.id,
-                type="income",
-                amount=points,
-                balance=member.point_balance,
-                source="运动打卡",
-                remark=f"在{venue.name}运动{duration}分钟"
+            # 积分原子入账并记录流水
+            wallet_service.credit(
+                db, member.id, wallet_service.POINT, points,
+                source="运动打卡", remark=f"在{venue.name}运动{duration}分钟"
             )
-            db.add(point_record)
 
         db.commit()
 
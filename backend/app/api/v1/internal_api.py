@@ -6,7 +6,7 @@
 约定：
   - 鉴权：请求头 `X-Service-Token`，与 settings.INTERNAL_SERVICE_TOKEN 比对
   - 用户身份：请求头 `X-User-Unionid`，后端据此反查 Member 后注入下游函数
-  - 业务逻辑：薄封装 member_api 中的现有函数，零逻辑重复
+  - 业务逻辑：薄封装会员端接口（app/api/v1/member/）中的现有函数，零逻辑重复
 """
 import logging
 from typing import Optional
@@ -18,7 +18,7 @@ from app.core.config import settings
 from app.core.database import get_db
 from app.models import Member
 from app.schemas.common import ResponseModel
-from app.api.v1 import member_api
+from app.api.v1.member import booking, home, orders, venues
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
@@ -67,7 +67,7 @@ def internal_get_venue_types(
     db: Session = Depends(get_db),
     _: None = Depends(require_service_token),
 ):
-    return member_api.get_venue_types(db=db)
+    return venues.get_venue_types(db=db)
 
 
 @router.get("/venues", response_model=ResponseModel)
@@ -78,7 +78,7 @@ def internal_get_venues(
     db: Session = Depends(get_db),
     _: None = Depends(require_service_token),
 ):
-    return member_api.get_venues(type_id=type_id, page=page, limit=limit, db=db)
+    return venues.get_venues(type_id=type_id, page=page, limit=limit, db=db)
 
 
 @router.get("/venues/{venue_id}/slots", response_model=ResponseModel)
@@ -88,7 +88,7 @@ def internal_get_venue_slots(
     db: Session = Depends(get_db),
     _: None = Depends(require_service_token),
 ):
-    return member_api.get_venue_slots(venue_id=venue_id, date=date, db=db)
+    return venues.get_venue_slots(venue_id=venue_id, date=date, db=db)
 
 
 @router.get("/activities", response_model=ResponseModel)
@@ -99,7 +99,7 @@ def internal_get_activities(
     db: Session = Depends(get_db),
     _: None = Depends(require_service_token),
 ):
-    return member_api.get_activities(page=page, limit=limit, status=status, db=db)
+    return home.get_activities(page=page, limit=limit, status=status, db=db)
 
 
 # ==================== 需用户身份的端点（X-User-Unionid 解析为 Member） ====================
@@ -126,17 +126,17 @@ def internal_create_reservation(
     db: Session = Depends(get_db),
 ):
     """下单预订。data 字段与 /api/v1/member/reservations 完全一致。"""
-    return member_api.create_reservation(data=data, current_member=member, db=db)
+    return booking.create_reservation(data=data, current_member=member, db=db)
 
 
 @router.post("/reservations/{reservation_id}/cancel", response_model=ResponseModel)
 def internal_cancel_reservation(
     reservation_id: int,
-    payload: member_api.CancelReservationRequest,
+    payload: booking.CancelReservationRequest,
     member: Member = Depends(get_member_by_unionid),
     db: Session = Depends(get_db),
 ):
-    return member_api.cancel_my_reservation(
+    return booking.cancel_my_reservation(
         reservation_id=reservation_id,
         payload=payload,
         current_member=member,
@@ -153,7 +153,7 @@ def internal_get_orders(
     member: Member = Depends(get_member_by_unionid),
     db: Session = Depends(get_db),
 ):
-    return member_api.get_member_orders(
+    return orders.get_member_orders(
         status=status, type=type, page=page, limit=limit,
         current_member=member, db=db,
     )
@@ -167,7 +167,7 @@ def internal_get_reservations(
     member: Member = Depends(get_member_by_unionid),
     db: Session = Depends(get_db),
 ):
-    return member_api.get_member_reservations(
+    return booking.get_member_reservations(
         status=status, page=page, limit=limit,
         current_member=member, db=db,
     )
@@ -179,7 +179,7 @@ def internal_enroll_activity(
     member: Member = Depends(get_member_by_unionid),
     db: Session = Depends(get_db),
 ):
-    return member_api.enroll_activity(
+    return home.enroll_activity(
         activity_id=activity_id, db=db, current_member=member,
     )
 
@@ -190,6 +190,6 @@ def internal_cancel_enrollment(
     member: Member = Depends(get_member_by_unionid),
     db: Session = Depends(get_db),
 ):
-    return member_api.cancel_enrollment(
+    return home.cancel_enrollment(
         activity_id=activity_id, db=db, current_member=member,
     )
@@ -8,6 +8,8 @@ from app.api.deps import get_current_user
 from app.models.mall import ProductCategory, Product, ProductOrder
 from app.models.member import Member
 from app.schemas.response import ResponseModel, PageResponseModel
+from app.services.catalog_cache import catalog_cache, TAG_MALL_CATEGORIES
+from app.services.mall_inventory import flash_sale_pool, leased_stock, set_stock
 
 router = APIRouter()
 
@@ -48,6 +50,7 @@ def create_category(
     )
     db.add(category)
     db.commit()
+    catalog_cache.invalidate(TAG_MALL_CATEGORIES)
     db.refresh(category)
 
     return ResponseModel(message="创建成功", data={"id": category.id})
@@ -74,6 +77,7 @@ def update_category(
             setattr(category, key, value)
 
     db.commit()
+    catalog_cache.invalidate(TAG_MALL_CATEGORIES)
     return ResponseModel(message="更新成功")
 
 
@@ -94,6 +98,7 @@ def delete_category(
 
     category.is_deleted = True
     db.commit()
+    catalog_cache.invalidate(TAG_MALL_CATEGORIES)
     return ResponseModel(message="删除成功")
 
 
@@ -122,6 +127,8 @@ def get_products(
     total = query.count()
     items = query.order_by(Product.sort_order.desc(), Product.id.desc())\
         .offset((page - 1) * page_size).limit(page_size).all()
+    # 剩余库存含各进程已预分配未售出的秒杀令牌
+    leased = leased_stock(db, [item.id for item in items])
 
     result_list = []
     for item in items:
@@ -136,7 +143,7 @@ def get_products(
             "points": item.points,
             "price": float(item.price) if item.price else 0,
             "market_price": float(item.market_price) if item.market_price else None,
-            "stock": item.stock,
+            "stock": (item.stock or 0) + leased.get(item.id, 0),
             "sales": item.sales,
             "is_active": item.is_active,
             "is_recommend": item.is_recommend,
@@ -180,8 +187,10 @@ def get_product(
         "points": product.points,
         "price": float(product.price) if product.price else 0,
         "market_price": float(product.market_price) if product.market_price else None,
-        "stock": product.stock,
+        "stock": (product.stock or 0) + leased_stock(db, [product.id]).get(product.id, 0),
         "sales": product.sales,
+        "is_flash_sale": product.is_flash_sale,
+        "purchase_limit": product.purchase_limit or 0,
         "is_active": product.is_active,
         "is_recommend": product.is_recommend,
         "tags": product.tags,
@@ -207,6 +216,8 @@ def create_product(
         price=data.get("price", 0),
         market_price=data.get("market_price"),
         stock=data.get("stock", 999),
+        is_flash_sale=data.get("is_flash_sale", False),
+        purchase_limit=data.get("purchase_limit", 0),
         is_active=data.get("is_active", True),
         is_recommend=data.get("is_recommend", False),
         tags=data.get("tags"),
@@ -235,6 +246,19 @@ def update_product(
     if not product:
         return ResponseModel(code=404, message="商品不存在")
 
+    # 秒杀商品先把本进程池内未用完的令牌退回 stock；后台填写的是剩余可售库存，
+    # 按其他进程仍持有的令牌折算 stock，不直接覆盖
+    flash_sale_pool.release(product.id)
+    data = dict(data)
+    stock = data.pop("stock", None)
+    if stock is not None:
+        try:
+            set_stock(db, product.id, int(stock))
+        except ValueError as e:
+            db.rollback()
+            return ResponseModel(code=400, message=str(e))
+    db.refresh(product)
+
     for key, value in data.items():
         if hasattr(product, key):
             setattr(product, key, value)
@@ -0,0 +1,32 @@
+"""会员端小程序API（按功能拆分的路由模块）
+
+各模块挂在同一前缀 /api/v1/member 下，由 main.py 按 FEATURES 逐个懒加载：
+请求只会导入其路径所属的功能模块。本文件只登记路径归属，不导入任何功能模块。
+
+新增接口时，路径首段须登记在对应模块的 FEATURES 项中（tests/test_member_serializers.py 校验）。
+"""
+from fastapi import APIRouter
+
+# (模块名, 该模块负责的路径首段)；顺序即匹配顺序
+FEATURES = [
+    ("account", ("/auth", "/wx-login", "/coach", "/profile", "/profile-v2", "/coin-records",
+                 "/point-records", "/reviews", "/invite", "/face", "/feedback")),
+    ("home", ("/banners", "/activities", "/ui-config", "/announcements")),
+    ("venues", ("/venues", "/venue-types", "/venue-calendar")),
+    ("booking", ("/coaches", "/reservations", "/booking-permission")),
+    ("orders", ("/orders",)),
+    ("cards", ("/recharge", "/cards", "/coupons", "/card-orders", "/recharge-packages")),
+    ("mall", ("/mall",)),
+    ("teams", ("/team-categories", "/teams", "/my-teams")),
+    ("checkin", ("/checkin", "/leaderboard")),
+]
+
+
+def build_router() -> APIRouter:
+    """导入全部功能模块并合并为一个路由（急加载、测试及 member_api 兼容入口使用）"""
+    import importlib
+
+    router = APIRouter()
+    for name, _ in FEATURES:
+        router.include_router(importlib.import_module(f"{__name__}.{name}").router)
+    return router
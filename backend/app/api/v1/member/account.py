@@ -0,0 +1,836 @@
+"""会员端API：登录认证、会员信息、教练申请、金币/积分记录、评论、邀请、人脸、意见反馈"""
+import logging
+import json
+from datetime import date, datetime, timedelta
+from typing import Optional
+from pydantic import BaseModel, Field, validator
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db, get_async_db
+from app.core.security import create_access_token
+from app.core.config import settings
+from app.core.wechat import user_wechat_service, WeChatAPIError, is_request_error
+from app.models import Member, Coach, CoinRecord, PointRecord
+from app.models.coach import CoachApplication
+from app.schemas.common import ResponseModel
+from app.services import daily_usage_service
+from app.api.deps import get_current_member, get_current_member_async
+from app.api.v1.member.serializers import level_name, money
+from app.core.responses import json_response
+
+router = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== 认证相关 ====================
+
+class MemberLoginRequest(BaseModel):
+    phone: str
+    code: Optional[str] = None
+
+
+class WxLoginRequest(BaseModel):
+    code: str
+    nickname: Optional[str] = None
+    avatar: Optional[str] = None
+
+
+class PhoneCodeRequest(BaseModel):
+    code: str
+
+
+@router.post("/auth/login", response_model=ResponseModel)
+def member_login(
+    data: MemberLoginRequest,
+    db: Session = Depends(get_db)
+):
+    """会员登录（手机号）"""
+    member = db.query(Member).filter(
+        Member.phone == data.phone,
+        Member.is_deleted == False
+    ).first()
+
+    if not member:
+        # 自动注册
+        member = Member(
+            phone=data.phone,
+            nickname=f"用户{data.phone[-4:]}",
+            status=True
+        )
+        db.add(member)
+        db.commit()
+        db.refresh(member)
+
+    if not member.status:
+        raise HTTPException(status_code=403, detail="账号已被禁用")
+
+    access_token = create_access_token(
+        data={"member_id": member.id, "phone": member.phone},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
+    # 计算会员状态
+    is_member = (
+        member.subscription_status == 'active'
+        and member.member_expire_time
+        and member.member_expire_time > datetime.now()
+    )
+    level_code = member.level.level_code if member.level else "S"
+
+    return ResponseModel(data={
+        "access_token": access_token,
+        "token_type": "bearer",
+        "member_info": {
+            "id": member.id,
+            "nickname": member.nickname,
+            "avatar": member.avatar,
+            "phone": member.phone,
+            "coin_balance": float(member.coin_balance or 0),
+            "point_balance": member.point_balance or 0,
+            "is_member": is_member,
+            "level_code": level_code,
+            "membership_type": level_code,
+            "member_expire_time": str(member.member_expire_time) if member.member_expire_time else None,
+            # 兼容旧字段
+            "member_level": level_code,
+            "level_name": level_name(level_code)
+        }
+    })
+
+
+@router.post("/auth/wx-login", response_model=ResponseModel)
+async def member_wx_login(
+    data: WxLoginRequest,
+    db: Session = Depends(get_db)
+):
+    """微信登录（code换取openid）"""
+    try:
+        # 调用微信API获取openid和session_key
+        wx_result = await user_wechat_service.code2session(data.code)
+        openid = wx_result.get("openid")
+        unionid = wx_result.get("unionid")
+        session_key = wx_result.get("session_key")
+    except WeChatAPIError as e:
+        logger.error(f"微信登录失败: {e.errmsg}, code: {data.code}")
+        raise HTTPException(status_code=400, detail="微信登录失败，请重试")
+    except Exception as e:
+        if is_request_error(e):
+            logger.error(f"网络请求失败: {str(e)}, code: {data.code}")
+            raise HTTPException(status_code=503, detail="网络连接失败，请稍后重试")
+        logger.exception(f"登录处理异常，code: {data.code}, 错误: {str(e)}")
+        raise HTTPException(status_code=500, detail="登录失败，请稍后重试")
+
+    if not openid:
+        raise HTTPException(status_code=400, detail="获取用户信息失败")
+
+    # 查找或创建会员
+    member = db.query(Member).filter(
+        Member.openid == openid,
+        Member.is_deleted == False
+    ).first()
+
+    is_new_user = False
+    if not member:
+        is_new_user = True
+        member = Member(
+            openid=openid,
+            unionid=unionid,
+            nickname=data.nickname or "微信用户",
+            avatar=data.avatar,
+            status=True
+        )
+        db.add(member)
+        db.commit()
+        db.refresh(member)
+    else:
+        # 更新用户信息
+        if data.nickname:
+            member.nickname = data.nickname
+        if data.avatar:
+            member.avatar = data.avatar
+        if unionid:
+            member.unionid = unionid
+        db.commit()
+
+    if not member.status:
+        raise HTTPException(status_code=403, detail="账号已被禁用")
+
+    access_token = create_access_token(
+        data={"member_id": member.id, "openid": openid},
+        expires_delta=timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+    )
+
+    # 存储session_key（用于后续解密手机号等）
+    member.session_key = session_key
+    db.commit()
+
+    return ResponseModel(data={
+        "access_token": access_token,
+        "token_type": "bearer",
+        "is_new_user": is_new_user,
+        "openid": openid,
+        "member_info": {
+            "id": member.id,
+            "nickname": member.nickname,
+            "avatar": member.avatar,
+            "phone": member.phone,
+            "coin_balance": float(member.coin_balance or 0),
+            "point_balance": member.point_balance or 0,
+            "member_level": member.level.level_code if member.level else "S",
+            "level_code": member.level.level_code if member.level else "S",
+            "level_name": level_name(member.level.level_code if member.level else "S")
+        }
+    })
+
+
+@router.post("/auth/phone", response_model=ResponseModel)
+async def get_member_phone(
+    data: PhoneCodeRequest,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """获取用户手机号（通过button的getPhoneNumber获取的code）"""
+    try:
+        phone_info = await user_wechat_service.get_phone_number(data.code)
+        phone = phone_info.get("purePhoneNumber") or phone_info.get("phoneNumber")
+    except WeChatAPIError as e:
+        raise HTTPException(status_code=400, detail=f"获取手机号失败: {e.errmsg}")
+
+    if not phone:
+        raise HTTPException(status_code=400, detail="获取手机号失败")
+
+    # 检查手机号是否已被其他用户绑定
+    existing = db.query(Member).filter(
+        Member.phone == phone,
+        Member.id != current_member.id,
+        Member.is_deleted == False
+    ).first()
+
+    if existing:
+        raise HTTPException(status_code=400, detail="该手机号已被其他账号绑定")
+
+    # 绑定手机号
+    current_member.phone = phone
+    db.commit()
+
+    return ResponseModel(message="绑定成功", data={"phone": phone})
+
+
+# ==================== 教练申请 ====================
+
+class CoachApplyRequest(BaseModel):
+    """教练申请请求"""
+    name: str
+    phone: str
+    type: str = "technical"  # technical技术教练 / entertainment娱乐教练
+    introduction: Optional[str] = None
+    skills: Optional[str] = None  # JSON字符串
+    certificates: Optional[str] = None  # JSON字符串
+
+
+@router.post("/coach/apply", response_model=ResponseModel)
+def apply_for_coach(
+    data: CoachApplyRequest,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """申请成为教练"""
+    # 检查是否已经是教练
+    existing_coach = db.query(Coach).filter(
+        Coach.member_id == current_member.id,
+        Coach.is_deleted == False
+    ).first()
+
+    if existing_coach:
+        raise HTTPException(status_code=400, detail="您已经是教练，无需重复申请")
+
+    # 检查是否有待审核的申请
+    pending_application = db.query(CoachApplication).filter(
+        CoachApplication.member_id == current_member.id,
+        CoachApplication.status == 0  # 待审核
+    ).first()
+
+    if pending_application:
+        raise HTTPException(status_code=400, detail="您有待审核的申请，请耐心等待")
+
+    # 创建申请
+    application = CoachApplication(
+        member_id=current_member.id,
+        name=data.name,
+        phone=data.phone,
+        type=data.type,
+        introduction=data.introduction,
+        skills=data.skills,
+        certificates=data.certificates,
+        status=0  # 待审核
+    )
+    db.add(application)
+    db.commit()
+    db.refresh(application)
+
+    return ResponseModel(
+        message="申请提交成功，请等待审核",
+        data={"application_id": application.id}
+    )
+
+
+@router.get("/coach/apply/status", response_model=ResponseModel)
+def get_coach_apply_status(
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """获取教练申请状态"""
+    # 检查是否已经是教练
+    coach = db.query(Coach).filter(
+        Coach.member_id == current_member.id,
+        Coach.is_deleted == False
+    ).first()
+
+    if coach:
+        return ResponseModel(data={
+            "status": "approved",
+            "is_coach": True,
+            "coach_id": coach.id,
+            "coach_name": coach.name,
+            "message": "您已是认证教练"
+        })
+
+    # 查找最新的申请记录
+    application = db.query(CoachApplication).filter(
+        CoachApplication.member_id == current_member.id
+    ).order_by(CoachApplication.created_at.desc()).first()
+
+    if not application:
+        return ResponseModel(data={
+            "status": "none",
+            "is_coach": False,
+            "message": "您还未提交教练申请"
+        })
+
+    status_map = {
+        0: {"status": "pending", "message": "申请审核中，请耐心等待"},
+        1: {"status": "approved", "message": "申请已通过"},
+        2: {"status": "rejected", "message": f"申请被拒绝：{application.audit_remark or '未说明原因'}"}
+    }
+
+    result = status_map.get(application.status, {"status": "unknown", "message": "未知状态"})
+    result["is_coach"] = False
+    result["application_id"] = application.id
+
+    return ResponseModel(data=result)
+
+
+# ==================== 会员信息 ====================
+
+@router.get("/profile", response_model=ResponseModel)
+async def get_member_profile(
+    current_member: Member = Depends(get_current_member_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取会员信息（异步会话；邀请/发券等同步服务经 run_sync 在同一会话内执行）"""
+    is_member = (
+        current_member.subscription_status == 'active'
+        and current_member.member_expire_time
+        and current_member.member_expire_time > datetime.now()
+    )
+    level_code = current_member.level.level_code if current_member.level else "S"
+    level = current_member.level
+
+    level_info = {
+        "level_id": level.id if level else None,
+        "level_name": level_name(level_code),
+        "level_code": level_code,
+        "level_icon": level.icon if level else None,
+        "theme_color": level.theme_color if level else "#999999",
+        "theme_gradient": level.theme_gradient if level else None,
+        # 兼容旧字段
+        "member_level": level_code
+    }
+
+    extra_info = await db.run_sync(_build_profile_extra_info, current_member)
+
+    return ResponseModel(data={
+        "id": current_member.id,
+        "nickname": current_member.nickname,
+        "avatar": current_member.avatar,
+        "phone": current_member.phone,
+        "real_name": current_member.real_name,
+        "gender": current_member.gender,
+        **level_info,
+        **extra_info,
+        "is_member": is_member,
+        "membership_type": level_code,
+        "member_expire_time": str(current_member.member_expire_time) if current_member.member_expire_time else None,
+        "coin_balance": float(current_member.coin_balance or 0),
+        "point_balance": current_member.point_balance or 0
+    })
+
+
+def _build_profile_extra_info(db: Session, current_member: Member) -> dict:
+    """会员信息附加字段：邀请剩余次数、免费时长、自动发券（同步服务，在 run_sync 中执行）"""
+    level = current_member.level
+
+    # 邀请和免费时长信息
+    extra_info = {}
+    if level:
+        from app.services.invitation_service import InvitationService
+        inv_service = InvitationService(db)
+        invite_stats = inv_service.get_monthly_stats(current_member.id)
+        extra_info["monthly_invite_remaining"] = invite_stats["remaining"]
+
+        daily_free_hours = getattr(level, 'daily_free_hours', 0) or 0
+        extra_info["daily_free_hours"] = daily_free_hours
+        if daily_free_hours > 0:
+            used = daily_usage_service.get_used_minutes(db, current_member.id, date.today())
+            extra_info["daily_free_hours_remaining"] = max(0, (daily_free_hours * 60 - used) / 60)
+
+    # 触发优惠券自动发放（SS月度券 / SSS每日饮品券）
+    try:
+        from app.services.monthly_coupon_service import MonthlyCouponService
+        coupon_svc = MonthlyCouponService(db)
+        monthly_result = coupon_svc.check_and_issue_monthly(current_member)
+        daily_result = coupon_svc.check_and_issue_daily(current_member)
+        if monthly_result:
+            extra_info["monthly_coupon_issued"] = True
+        if daily_result:
+            extra_info["daily_coupon_issued"] = True
+    except Exception:
+        pass  # 发券失败不影响 profile 返回
+
+    return extra_info
+
+
+class UpdateProfileRequest(BaseModel):
+    nickname: Optional[str] = Field(None, max_length=50)
+    avatar: Optional[str] = Field(None, max_length=500)
+    gender: Optional[int] = Field(None, ge=0, le=2)
+
+    @validator('nickname')
+    def validate_nickname(cls, v):
+        if v is not None:
+            v = v.strip()
+            if len(v) == 0:
+                raise ValueError('昵称不能为空')
+        return v
+
+    @validator('avatar')
+    def validate_avatar(cls, v):
+        if v is not None:
+            if not v.startswith('/uploads/') and not v.startswith('https://'):
+                raise ValueError('无效的头像地址')
+        return v
+
+
+@router.put("/profile", response_model=ResponseModel)
+def update_member_profile(
+    data: UpdateProfileRequest,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """会员更新个人资料（昵称、头像）"""
+    if data.nickname is not None:
+        current_member.nickname = data.nickname
+    if data.avatar is not None:
+        current_member.avatar = data.avatar
+    if data.gender is not None:
+        current_member.gender = data.gender
+
+    try:
+        db.commit()
+        db.refresh(current_member)
+    except Exception:
+        db.rollback()
+        raise HTTPException(status_code=500, detail="更新资料失败")
+
+    return ResponseModel(data={
+        "id": current_member.id,
+        "nickname": current_member.nickname,
+        "avatar": current_member.avatar,
+        "phone": current_member.phone,
+        "gender": current_member.gender
+    })
+
+
+# ==================== 金币/积分记录 ====================
+
+@router.get("/coin-records", response_model=ResponseModel)
+def get_coin_records(
+    page: int = 1,
+    limit: int = 20,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """获取金币记录"""
+    records = db.query(CoinRecord).filter(
+        CoinRecord.member_id == current_member.id
+    ).order_by(CoinRecord.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
+
+    result = []
+    for r in records:
+        result.append({
+            "id": r.id,
+            "type": r.type,
+            "amount": money(r.amount),
+            "balance": money(r.balance),
+            "source": r.source,
+            "remark": r.remark,
+            "created_at": str(r.created_at) if r.created_at else None
+        })
+
+    return json_response(result)
+
+
+@router.get("/point-records", response_model=ResponseModel)
+def get_point_records(
+    page: int = 1,
+    limit: int = 20,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """获取积分记录"""
+    records = db.query(PointRecord).filter(
+        PointRecord.member_id == current_member.id
+    ).order_by(PointRecord.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
+
+    result = []
+    for r in records:
+        result.append({
+            "id": r.id,
+            "type": r.type,
+            "amount": r.amount,
+            "balance": r.balance,
+            "source": r.source,
+            "remark": r.remark,
+            "created_at": str(r.created_at) if r.created_at else None
+        })
+
+    return json_response(result)
+
+
+# ==================== 微信登录别名 ====================
+
+@router.post("/wx-login", response_model=ResponseModel)
+async def wx_login_alias(
+    data: WxLoginRequest,
+    db: Session = Depends(get_db)
+):
+    """微信登录（别名路由）"""
+    return await member_wx_login(data, db)
+
+
+# ==================== 订阅会员制新增接口 ====================
+
+@router.get("/profile-v2", response_model=ResponseModel)
+def get_member_profile_v2(
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """
+    获取会员信息（三级会员制版本 S/SS/SSS）
+
+    返回包含等级信息、订阅状态、预约权限、邀请信息、免费时长等完整数据
+    """
+    # SS级月度券自动发放
+    from app.services.monthly_coupon_service import MonthlyCouponService
+    coupon_service = MonthlyCouponService(db)
+    coupon_result = coupon_service.check_and_issue(current_member)
+
+    # 基础信息
+    profile = {
+        "id": current_member.id,
+        "nickname": current_member.nickname,
+        "avatar": current_member.avatar,
+        "phone": current_member.phone,
+        "real_name": current_member.real_name,
+        "gender": current_member.gender,
+        "coin_balance": float(current_member.coin_balance or 0),
+        "point_balance": current_member.point_balance or 0
+    }
+
+    level = current_member.level
+
+    # 等级信息
+    level_info = {
+        "level_code": "S",
+        "level_name": "S级会员",
+        "level": 0,
+        "theme_color": "#999999",
+        "theme_gradient": "linear-gradient(135deg, #999999, #666666)"
+    }
+
+    if level:
+        level_info = {
+            "level_code": level.level_code,
+            "level_name": level.name,
+            "level": level.level,
+            "theme_color": level.theme_color or "#999999",
+            "theme_gradient": level.theme_gradient or "linear-gradient(135deg, #999999, #666666)",
+            "icon": level.icon,
+            "description": level.description,
+            "display_benefits": json.loads(level.display_benefits) if level.display_benefits else []
+        }
+
+    # 订阅信息
+    subscription_info = {
+        "status": current_member.subscription_status or "inactive",
+        "start_date": str(current_member.subscription_start_date) if current_member.subscription_start_date else None,
+        "expire_date": str(current_member.member_expire_time.date()) if current_member.member_expire_time else None,
+        "next_coupon_date": None
+    }
+
+    # 预约权限信息
+    can_book = bool(level and getattr(level, 'can_book_venue', False))
+    booking_privileges = {
+        "can_book": can_book,
+        "booking_range_days": level.booking_range_days if level else 0,
+        "can_book_golf": level.can_book_golf if level else False,
+    }
+
+    # 邀请信息
+    from app.services.invitation_service import InvitationService
+    inv_service = InvitationService(db)
+    invite_info = inv_service.get_monthly_stats(current_member.id)
+
+    # SSS免费时长信息
+    free_usage_info = None
+    daily_free_hours = getattr(level, 'daily_free_hours', 0) or 0 if level else 0
+    if daily_free_hours > 0:
+        used_minutes = daily_usage_service.get_used_minutes(db, current_member.id, date.today())
+        remaining = max(0, daily_free_hours * 60 - used_minutes)
+        free_usage_info = {
+            "daily_free_hours": daily_free_hours,
+            "used_minutes": used_minutes,
+            "remaining_minutes": remaining,
+            "remaining_hours": round(remaining / 60, 1)
+        }
+
+    result = {
+        **profile,
+        "level_info": level_info,
+        "subscription_info": subscription_info,
+        "booking_privileges": booking_privileges,
+        "invite_info": invite_info,
+    }
+    if free_usage_info:
+        result["free_usage_info"] = free_usage_info
+    if coupon_result:
+        result["monthly_coupon_issued"] = coupon_result
+
+    return ResponseModel(data=result)
+
+
+# ==================== 评论相关 ====================
+
+@router.post("/reviews", response_model=ResponseModel)
+def submit_review(
+    data: dict,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """提交评论"""
+    from app.services.review_service import ReviewService
+    service = ReviewService(db)
+    result = service.submit_review(
+        member=current_member,
+        order_type=data.get("order_type", "reservation"),
+        order_id=data.get("order_id"),
+        rating=data.get("rating", 5),
+        content=data.get("content"),
+        images=json.dumps(data.get("images", []))
+    )
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    return ResponseModel(data=result)
+
+
+@router.get("/reviews", response_model=ResponseModel)
+def get_my_reviews(
+    page: int = 1,
+    limit: int = 10,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """获取我的评论列表"""
+    from app.models.review import ServiceReview
+    query = db.query(ServiceReview).filter(
+        ServiceReview.member_id == current_member.id,
+        ServiceReview.is_deleted == False
+    )
+    reviews = query.order_by(ServiceReview.created_at.desc()).offset(
+        (page - 1) * limit
+    ).limit(limit).all()
+
+    result = []
+    for r in reviews:
+        result.append({
+            "id": r.id,
+            "order_type": r.order_type,
+            "order_id": r.order_id,
+            "rating": r.rating,
+            "content": r.content,
+            "images": r.images,
+            "points_awarded": r.points_awarded,
+            "admin_reply": r.admin_reply,
+            "created_at": str(r.created_at) if r.created_at else None
+        })
+    return ResponseModel(data=result)
+
+
+# ==================== 邀请功能 ====================
+
+@router.post("/invite/generate", response_model=ResponseModel)
+def generate_invite_code(
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """生成邀请码"""
+    from app.services.invitation_service import InvitationService
+    service = InvitationService(db)
+    result = service.generate_invite(current_member)
+    if not result["success"]:
+        return ResponseModel(code=400, message=result["reason"], data=result)
+    return ResponseModel(data=result)
+
+
+@router.get("/invite/stats", response_model=ResponseModel)
+def get_invite_stats(
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """获取本月邀请统计"""
+    from app.services.invitation_service import InvitationService
+    service = InvitationService(db)
+    return ResponseModel(data=service.get_monthly_stats(current_member.id))
+
+
+@router.get("/invite/history", response_model=ResponseModel)
+def get_invite_history(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """获取邀请记录"""
+    from app.services.invitation_service import InvitationService
+    service = InvitationService(db)
+    return ResponseModel(data=service.get_history(current_member.id, page, page_size))
+
+
+@router.post("/invite/{code}/accept", response_model=ResponseModel)
+def accept_invite_code(
+    code: str,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """使用邀请码"""
+    from app.services.invitation_service import InvitationService
+    service = InvitationService(db)
+    result = service.accept_invite(code, current_member)
+    if not result["success"]:
+        return ResponseModel(code=400, message=result["reason"])
+    return ResponseModel(data=result)
+
+
+# ==================== 人脸识别（预留） ====================
+
+@router.post("/face/register", response_model=ResponseModel)
+def register_face(
+    data: dict,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """注册人脸（预留接口）"""
+    return ResponseModel(code=501, message="人脸识别功能暂未开放，敬请期待")
+
+
+@router.get("/face/status", response_model=ResponseModel)
+def get_face_status(
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """获取人脸注册状态"""
+    return ResponseModel(data={
+        "is_registered": bool(current_member.face_feature_id),
+        "registered_at": str(current_member.face_registered_at) if current_member.face_registered_at else None
+    })
+
+
+# ==================== 意见反馈 ====================
+
+class FeedbackCreate(BaseModel):
+    category: str = "suggestion"
+    content: str
+    images: Optional[str] = None
+    contact: Optional[str] = None
+
+
+@router.post("/feedback", response_model=ResponseModel)
+def submit_feedback(
+    data: FeedbackCreate,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """提交意见反馈"""
+    from app.models.feedback import Feedback
+
+    if not data.content or len(data.content.strip()) < 10:
+        raise HTTPException(status_code=400, detail="反馈内容至少10个字")
+
+    if data.category not in ("suggestion", "bug", "complaint", "other"):
+        raise HTTPException(status_code=400, detail="无效的反馈类型")
+
+    feedback = Feedback(
+        member_id=current_member.id,
+        category=data.category,
+        content=data.content.strip(),
+        images=data.images,
+        contact=data.contact
+    )
+    db.add(feedback)
+    db.commit()
+    db.refresh(feedback)
+
+    return ResponseModel(data={"id": feedback.id}, message="提交成功")
+
+
+@router.get("/feedback", response_model=ResponseModel)
+def get_my_feedback(
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """获取我的反馈列表"""
+    from app.models.feedback import Feedback
+
+    query = db.query(Feedback).filter(
+        Feedback.member_id == current_member.id,
+        Feedback.is_deleted == False
+    ).order_by(Feedback.created_at.desc())
+
+    total = query.count()
+    items = query.offset((page - 1) * page_size).limit(page_size).all()
+
+    result = []
+    for f in items:
+        result.append({
+            "id": f.id,
+            "category": f.category,
+            "content": f.content,
+            "images": f.images,
+            "status": f.status,
+            "admin_reply": f.admin_reply,
+            "reply_time": f.reply_time,
+            "created_at": str(f.created_at) if f.created_at else None
+        })
+
+    return ResponseModel(data={
+        "list": result,
+        "total": total,
+        "page": page,
+        "page_size": page_size
+    })
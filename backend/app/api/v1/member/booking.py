@@ -0,0 +1,580 @@
+"""会员端API：教练、预约下单/支付状态/取消/核销、预约权限"""
+import logging
+import json
+from datetime import date, datetime, timedelta
+from typing import Optional
+from pydantic import BaseModel
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.database import get_db
+from app.models import Member, Coach, Reservation
+from app.core.wechat_pay import wechat_pay
+from app.models.coupon import MemberCoupon
+from app.schemas.common import ResponseModel
+from app.services.booking_context import BookingContext
+from app.services.booking_service import BookingService
+from app.services import daily_usage_service, payment_notify_service, wallet_service
+from app.services.coach_availability import coach_availability, member_day_slots, to_date
+from app.services.reservation_expiry import reservation_expiry
+from app.api.deps import get_current_member
+from app.api.v1.member.serializers import coach_card, coach_detail, money
+from app.core.responses import json_response
+
+router = APIRouter()
+
+logger = logging.getLogger(__name__)
+
+
+# ==================== 教练相关 ====================
+
+@router.get("/coaches", response_model=ResponseModel)
+def get_coaches(
+    type: Optional[str] = None,
+    page: int = 1,
+    limit: int = 10,
+    db: Session = Depends(get_db)
+):
+    """获取教练列表"""
+    query = db.query(Coach).filter(Coach.is_deleted == False, Coach.status == 1)
+
+    if type:
+        query = query.filter(Coach.type == type)
+
+    coaches = query.offset((page - 1) * limit).limit(limit).all()
+
+    return json_response([coach_card(c) for c in coaches])
+
+
+@router.get("/coaches/{coach_id}", response_model=ResponseModel)
+def get_coach_detail(coach_id: int, db: Session = Depends(get_db)):
+    """获取教练详情"""
+    coach = db.query(Coach).filter(
+        Coach.id == coach_id,
+        Coach.is_deleted == False
+    ).first()
+
+    if not coach:
+        raise HTTPException(status_code=404, detail="教练不存在")
+
+    return ResponseModel(data=coach_detail(coach))
+
+
+@router.get("/coaches/{coach_id}/schedule", response_model=ResponseModel)
+def get_coach_schedule(
+    coach_id: int,
+    date: str = Query(...),
+    db: Session = Depends(get_db)
+):
+    """获取教练排期"""
+    try:
+        day = to_date(date)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="日期格式错误")
+    # 先确认教练存在，再读写可用性缓存
+    if not db.query(Coach.id).filter(Coach.id == coach_id, Coach.is_deleted == False).first():
+        raise HTTPException(status_code=404, detail="教练不存在")
+
+    vector = coach_availability.get_day(db, coach_id, day)
+    return ResponseModel(data=member_day_slots(vector))
+
+
+# ==================== 预约相关 ====================
+
+@router.post("/reservations", response_model=ResponseModel)
+def create_reservation(
+    data: dict,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """创建预约（三级会员制版本：S拒绝/SS仅当天/SSS提前3天+免费小时上限）"""
+    venue_id = data.get("venue_id")
+    coach_id = data.get("coach_id")
+    reservation_date = data.get("reservation_date")
+    start_time = data.get("start_time")
+    end_time = data.get("end_time")
+    duration = data.get("duration", 60)
+    coupon_id = data.get("coupon_id")
+    pay_type = data.get("pay_type", "coin")
+    if pay_type not in ("coin", "wechat"):
+        raise HTTPException(status_code=400, detail="无效的支付方式")
+
+    # 1-5. 权限、SSS免费抵扣、场馆/教练费用、优惠券抵扣（与 /reservations/quote 同一计算）
+    booking_date = datetime.strptime(reservation_date, "%Y-%m-%d").date() if isinstance(reservation_date, str) else reservation_date
+    ctx = BookingContext.load(db, current_member, booking_date, venue_id, coach_id, coupon_id)
+    try:
+        quote = BookingService(db).quote_booking(ctx, start_time, end_time, duration)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if not quote["can_book"]:
+        raise HTTPException(status_code=403, detail=quote["reason"])
+
+    # 6. 生成预约；SSS级写入后按台账（已持有行锁）确认免费额度，并发下单占用了额度则重新报价
+    import uuid
+    reservation_no = f"R{datetime.now().strftime('%Y%m%d%H%M%S')}{str(uuid.uuid4())[:4].upper()}"
+    reservation = Reservation(
+        reservation_no=reservation_no,
+        member_id=current_member.id,
+        venue_id=venue_id,
+        coach_id=coach_id,
+        reservation_date=booking_date,
+        start_time=start_time,
+        end_time=end_time,
+        duration=duration,
+        pay_type=pay_type
+    )
+    db.add(reservation)
+    if ctx.level_code == 'SSS' and ctx.daily_free_hours > 0:
+        used_before = daily_usage_service.claim_used_minutes(db, reservation, booking_date)
+        if used_before != ctx.used_minutes:
+            ctx.used_minutes = used_before
+            try:
+                quote = BookingService(db).quote_booking(ctx, start_time, end_time, duration)
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+
+    venue_price = quote["venue_price"]
+    sss_discount = quote["sss_discount"]
+    venue_price_after_free = quote["venue_price_after_free"]
+    coach_price = quote["coach_price"]
+    coupon_discount = quote["coupon_discount"]
+    actual_price = quote["actual_price"]
+    is_sss_free = quote["is_free"]
+    used_coupon = ctx.coupon if coupon_id else None
+
+    # 7. 支付检查（未通过时请求结束不提交，预约与台账一并回滚）
+    if actual_price > 0 and pay_type == "wechat":
+        if not current_member.openid:
+            raise HTTPException(status_code=400, detail="请先完成微信授权")
+
+    # 微信支付时生成微信订单号，状态为unpaid
+    out_trade_no = None
+    if actual_price > 0 and pay_type == "wechat":
+        out_trade_no = wechat_pay.generate_out_trade_no("RV")
+
+    reservation.venue_price = venue_price_after_free
+    reservation.coach_price = coach_price
+    reservation.total_price = actual_price
+    reservation.out_trade_no = out_trade_no
+    reservation.status = "unpaid" if (actual_price > 0 and pay_type == "wechat") else "pending"
+    reservation.remark = json.dumps({"coupon_id": coupon_id, "sss_discount": sss_discount}) if (pay_type == "wechat" and (coupon_id or sss_discount > 0)) else (json.dumps({"sss_discount": sss_discount}) if sss_discount > 0 else None)
+
+    # 8. 金币支付：立即条件扣费（余额不足时不提交，预约与台账一并回滚）
+    if actual_price > 0 and pay_type == "coin":
+        try:
+            wallet_service.debit(
+                db, current_member.id, wallet_service.COIN, actual_price,
+                source="预约消费", remark=f"预约编号: {reservation_no}"
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+
+    # 9. 核销优惠券
+    if used_coupon:
+        if pay_type == "wechat":
+            # 微信支付：锁定优惠券，回调成功后正式核销
+            used_coupon.status = 'locked'
+            used_coupon.order_type = 'reservation'
+        else:
+            # 金币支付：直接核销
+            used_coupon.status = 'used'
+            used_coupon.use_time = datetime.now()
+            used_coupon.order_type = 'reservation'
+            used_coupon.order_id = None
+
+    db.commit()
+
+    if used_coupon and pay_type != "wechat":
+        used_coupon.order_id = reservation.id
+        db.commit()
+
+    # 10. 微信支付：创建预支付订单
+    if actual_price > 0 and pay_type == "wechat":
+        total_amount_fen = round(actual_price * 100)
+        description = f"场馆预约-{ctx.venue.name if ctx.venue else '场馆'}"
+        attach = json.dumps({
+            "reservation_id": reservation.id,
+            "type": "reservation",
+            "coupon_id": coupon_id
+        })
+        result = wechat_pay.create_jsapi_order(
+            out_trade_no=out_trade_no,
+            total_amount=total_amount_fen,
+            description=description,
+            openid=current_member.openid,
+            attach=attach
+        )
+        if "error" in result:
+            # 与支付失败回调同一取消路径：回退免费额度台账、解锁优惠券
+            payment_notify_service.cancel_unpaid_reservation(db, out_trade_no, coupon_id)
+            db.commit()
+            raise HTTPException(status_code=500, detail=result["error"])
+        # 超时未支付由后台关单、释放时段并解锁优惠券
+        reservation_expiry.track(db, out_trade_no, reservation.created_at)
+
+        return ResponseModel(message="请完成微信支付", data={
+            "reservation_id": reservation.id,
+            "reservation_no": reservation_no,
+            "order_no": out_trade_no,
+            "venue_price": venue_price,
+            "sss_discount": sss_discount,
+            "venue_price_after_free": venue_price_after_free,
+            "coach_price": coach_price,
+            "coupon_discount": coupon_discount,
+            "actual_price": actual_price,
+            "pay_type": "wechat",
+            "pay_params": result,
+            "is_free": False
+        })
+
+    return ResponseModel(message="预约成功", data={
+        "reservation_no": reservation_no,
+        "venue_price": venue_price,
+        "sss_discount": sss_discount,
+        "venue_price_after_free": venue_price_after_free,
+        "coach_price": coach_price,
+        "coupon_discount": coupon_discount,
+        "actual_price": actual_price,
+        "pay_type": pay_type,
+        "is_free": is_sss_free
+    })
+
+
+@router.post("/reservations/quote", response_model=ResponseModel)
+def quote_reservation(
+    data: dict,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """预约报价（试算，不下单、不扣费、不锁券）：参数同创建预约"""
+    reservation_date = data.get("reservation_date")
+    try:
+        booking_date = datetime.strptime(reservation_date, "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        raise HTTPException(status_code=400, detail="日期格式错误")
+
+    ctx = BookingContext.load(
+        db, current_member, booking_date, data.get("venue_id"), data.get("coach_id"), data.get("coupon_id")
+    )
+    try:
+        quote = BookingService(db).quote_booking(
+            ctx, data.get("start_time"), data.get("end_time"), data.get("duration", 60)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ResponseModel(data=quote)
+
+
+@router.get("/reservations/{reservation_id}/pay-status", response_model=ResponseModel)
+def query_reservation_pay_status(
+    reservation_id: int,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """查询预约支付状态（用于微信支付后轮询确认）"""
+    reservation = db.query(Reservation).filter(
+        Reservation.id == reservation_id,
+        Reservation.member_id == current_member.id,
+        Reservation.is_deleted == False
+    ).first()
+
+    if not reservation:
+        raise HTTPException(status_code=404, detail="预约记录不存在")
+
+    # 如果是微信支付且尚未支付，主动查询微信订单状态补偿确认
+    if reservation.pay_type == "wechat" and reservation.status == "unpaid" and reservation.out_trade_no:
+        result = wechat_pay.query_order(reservation.out_trade_no)
+        if result.get("trade_state") == "SUCCESS":
+            # 与支付回调共用条件更新（核销优惠券的补偿路径），只生效一次
+            payment_notify_service.complete_reservation(
+                db, reservation.out_trade_no, result.get("transaction_id"),
+                payment_notify_service.coupon_id_from(reservation.remark)
+            )
+            db.commit()
+
+    return ResponseModel(data={
+        "id": reservation.id,
+        "status": reservation.status,
+        "pay_type": reservation.pay_type,
+        "total_price": float(reservation.total_price or 0)
+    })
+
+
+@router.get("/reservations", response_model=ResponseModel)
+def get_member_reservations(
+    status: Optional[str] = None,
+    page: int = 1,
+    limit: int = 10,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """获取会员预约列表"""
+    query = db.query(Reservation).options(
+        selectinload(Reservation.venue), selectinload(Reservation.coach)
+    ).filter(
+        Reservation.member_id == current_member.id,
+        Reservation.is_deleted == False
+    )
+
+    if status:
+        query = query.filter(Reservation.status == status)
+
+    reservations = query.order_by(Reservation.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
+
+    result = []
+    for r in reservations:
+        result.append({
+            "id": r.id,
+            "reservation_no": r.reservation_no,
+            "venue_name": r.venue.name if r.venue else None,
+            "coach_name": r.coach.name if r.coach else None,
+            "reservation_date": str(r.reservation_date),
+            "start_time": str(r.start_time),
+            "end_time": str(r.end_time),
+            "total_price": money(r.total_price),
+            "status": r.status
+        })
+
+    return json_response(result)
+
+
+# ==================== 会员自行取消预约 ====================
+
+class CancelReservationRequest(BaseModel):
+    reason: Optional[str] = None   # 预设原因文本，如 "时间冲突"
+    remark: Optional[str] = None   # 用户可选备注
+
+
+@router.post("/reservations/{reservation_id}/cancel", response_model=ResponseModel)
+def cancel_my_reservation(
+    reservation_id: int,
+    payload: CancelReservationRequest,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """会员自行取消预约
+
+    规则:
+      - 状态须为 unpaid / pending / confirmed
+      - 不能已核销
+      - 距离预约开始时间 >= 1 小时
+      - 金币支付: 全额退回金币余额 + 写 CoinRecord
+      - 微信支付: 调 wechat_pay.refund() 真退款
+      - SSS 免费预约 (total_price=0): 置 cancelled 即可 (booking_service 自动释放)
+      - 关联的优惠券若仍在有效期内恢复为 unused
+    """
+    # 1. 查询 + 所有权校验
+    res = db.query(Reservation).filter(
+        Reservation.id == reservation_id,
+        Reservation.is_deleted == False
+    ).first()
+    if not res:
+        raise HTTPException(status_code=404, detail="预约不存在")
+    if res.member_id != current_member.id:
+        raise HTTPException(status_code=403, detail="无权操作他人的预约")
+
+    # 2. 状态校验
+    if res.status not in ("unpaid", "pending", "confirmed"):
+        raise HTTPException(status_code=400, detail=f"当前状态（{res.status}）不可取消")
+    if res.is_verified:
+        raise HTTPException(status_code=400, detail="预约已核销，不可取消")
+
+    # 3. 时间校验: 距开始时间 >= 1 小时
+    try:
+        start_dt = datetime.combine(res.reservation_date, res.start_time)
+    except Exception:
+        raise HTTPException(status_code=500, detail="预约时间数据异常")
+    if start_dt - datetime.now() < timedelta(hours=1):
+        raise HTTPException(status_code=400, detail="距离预约开始不足1小时，无法取消")
+
+    # 4. 退款分支
+    refund_info = {"type": "none", "amount": 0, "desc": ""}
+    total_price = float(res.total_price or 0)
+
+    if res.status == "unpaid":
+        # 微信支付下单但未完成付款
+        refund_info = {"type": "none", "amount": 0, "desc": "订单未支付"}
+    elif total_price <= 0:
+        # SSS 免费预约
+        refund_info = {"type": "free", "amount": 0, "desc": "免费预约，已释放免费时长"}
+    elif res.pay_type == "coin":
+        # 金币支付 -> 全额退回
+        wallet_service.credit(
+            db, current_member.id, wallet_service.COIN, total_price,
+            source="预约退款", remark=f"取消预约: {res.reservation_no}"
+        )
+        refund_info = {
+            "type": "coin",
+            "amount": total_price,
+            "desc": f"已退还 {total_price:g} 金币"
+        }
+    elif res.pay_type == "wechat":
+        # 微信支付 -> 调 V3 退款
+        if not res.out_trade_no:
+            raise HTTPException(status_code=500, detail="微信订单号缺失，无法退款，请联系客服")
+        out_refund_no = f"REF{res.reservation_no}"[:64]
+        amount_fen = round(total_price * 100)
+        result = wechat_pay.refund(
+            out_trade_no=res.out_trade_no,
+            out_refund_no=out_refund_no,
+            total_amount=amount_fen,
+            refund_amount=amount_fen,
+            reason=(payload.reason or "会员自行取消")[:80]
+        )
+        if "error" in result:
+            raise HTTPException(status_code=500, detail=f"微信退款失败: {result.get('error')}")
+        # 微信返回的 status 可能是 SUCCESS / PROCESSING / ABNORMAL / CLOSED
+        # 非预期状态视为失败
+        status_resp = result.get("status")
+        if status_resp is not None and status_resp not in ("SUCCESS", "PROCESSING"):
+            raise HTTPException(
+                status_code=500,
+                detail=f"微信退款失败: {result.get('message') or status_resp}"
+            )
+        refund_info = {
+            "type": "wechat",
+            "amount": total_price,
+            "desc": f"微信退款 ¥{total_price:.2f} 申请已提交，1-3 工作日到账"
+        }
+
+    # 5. 优惠券恢复（若当初用了券）
+    #    注意: MemberCoupon 没有 is_deleted 字段（只继承 TimestampMixin）
+    #    主查询: 按 order_id 命中（金币支付立即写入；微信支付回调后写入）
+    used_coupon = db.query(MemberCoupon).filter(
+        MemberCoupon.order_type == 'reservation',
+        MemberCoupon.order_id == res.id,
+        MemberCoupon.status.in_(['used', 'locked'])
+    ).first()
+    #    Fallback: unpaid 状态微信下单时 coupon.order_id 可能尚未写入，
+    #    从 res.remark 的 JSON attach 里读 coupon_id 兜底。
+    if not used_coupon and res.remark:
+        try:
+            attach_data = json.loads(res.remark)
+            fallback_coupon_id = attach_data.get("coupon_id") if isinstance(attach_data, dict) else None
+            if fallback_coupon_id:
+                used_coupon = db.query(MemberCoupon).filter(
+                    MemberCoupon.id == fallback_coupon_id,
+                    MemberCoupon.member_id == current_member.id,
+                    MemberCoupon.status == 'locked',
+                    MemberCoupon.order_type == 'reservation'
+                ).first()
+        except (json.JSONDecodeError, TypeError, ValueError):
+            used_coupon = None
+    if used_coupon:
+        if used_coupon.end_time and used_coupon.end_time > datetime.now():
+            used_coupon.status = 'unused'
+            used_coupon.use_time = None
+            used_coupon.order_id = None
+            used_coupon.order_type = None
+            refund_info["coupon_restored"] = True
+        else:
+            refund_info["coupon_restored"] = False
+            refund_info["coupon_expired"] = True
+
+    # 6. 改状态
+    res.status = "cancelled"
+    reason_text = (payload.reason or "")
+    if payload.remark:
+        reason_text = f"{reason_text} | {payload.remark}" if reason_text else payload.remark
+    res.cancel_reason = reason_text[:255] if reason_text else None
+    res.cancel_time = datetime.utcnow()
+
+    try:
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.exception("cancel_my_reservation commit failed")
+        raise HTTPException(status_code=500, detail=f"取消失败: {str(e)}")
+
+    return ResponseModel(message="取消成功", data={
+        "reservation_id": res.id,
+        "status": res.status,
+        "refund": refund_info
+    })
+
+
+# ==================== 预约权限与核销 ====================
+
+@router.get("/booking-permission", response_model=ResponseModel)
+def check_booking_permission(
+    venue_type_id: int = Query(..., description="场馆类型ID"),
+    booking_date: str = Query(..., description="预约日期 YYYY-MM-DD"),
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """
+    检查预约权限
+
+    返回是否可以预约、原因、剩余次数等信息
+    """
+    try:
+        date_obj = datetime.strptime(booking_date, "%Y-%m-%d").date()
+    except ValueError:
+        return ResponseModel(code=400, message="日期格式错误")
+
+    booking_service = BookingService(db)
+    result = booking_service.check_booking_permission(
+        current_member,
+        venue_type_id,
+        date_obj
+    )
+
+    return ResponseModel(data=result)
+
+
+class VerifyReservationRequest(BaseModel):
+    verify_code: Optional[str] = None
+    device_id: Optional[str] = None
+
+
+@router.post("/reservations/{reservation_id}/verify", response_model=ResponseModel)
+def verify_reservation(
+    reservation_id: int,
+    data: VerifyReservationRequest,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """
+    核销预约
+
+    会员端用于自助核销或展示核销状态
+    """
+    # 查询预约
+    reservation = db.query(Reservation).filter(
+        Reservation.id == reservation_id,
+        Reservation.member_id == current_member.id,
+        Reservation.is_deleted == False
+    ).first()
+
+    if not reservation:
+        raise HTTPException(status_code=404, detail="预约不存在")
+
+    if reservation.is_verified:
+        return ResponseModel(message="该预约已核销", data={
+            "reservation_no": reservation.reservation_no,
+            "verified_at": str(reservation.verified_at),
+            "status": "already_verified"
+        })
+
+    # 检查预约时间
+    if reservation.reservation_date < date.today():
+        return ResponseModel(code=400, message="预约已过期")
+
+    # 执行核销
+    reservation.is_verified = True
+    reservation.verified_at = datetime.now()
+    reservation.verified_by = data.device_id or f"member_{current_member.id}"
+    reservation.status = 'in_progress'
+    db.commit()
+
+    # 获取剩余预约次数
+    booking_service = BookingService(db)
+    stats = booking_service.get_booking_stats(current_member)
+
+    return ResponseModel(message="核销成功", data={
+        "reservation_no": reservation.reservation_no,
+        "verified_at": str(reservation.verified_at),
+        "can_book_again": True,
+        "remaining_quota": stats["remaining_quota"]
+    })
@@ -0,0 +1,450 @@
+"""会员端API：会员卡、优惠券、会员卡购买、充值"""
+import json
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.database import get_db
+from app.models import Member
+from app.models.member import MemberCard, MemberLevel, MemberCardOrder
+from app.core.wechat_pay import wechat_pay
+from app.models.coupon import MemberCoupon, CouponTemplate
+from app.schemas.common import ResponseModel
+from app.services.catalog_cache import catalog_cache, cached_json_response, TAG_MEMBER_CARDS, TAG_RECHARGE_PACKAGES
+from app.services import payment_notify_service, wallet_service
+from app.api.deps import get_current_member
+from app.api.v1.member import serializers
+
+router = APIRouter()
+
+
+# ==================== 充值 ====================
+
+@router.post("/recharge", response_model=ResponseModel)
+def recharge(
+    data: dict,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """充值金币（从数据库配置读取套餐）"""
+    from app.models.finance import RechargePackage
+
+    package_id = data.get("package_id")
+    amount = data.get("amount", 0)
+
+    coins = 0
+    bonus = 0
+
+    if package_id:
+        # 从数据库读取套餐
+        package = db.query(RechargePackage).filter(
+            RechargePackage.id == package_id,
+            RechargePackage.is_active == True,
+            RechargePackage.is_deleted == False
+        ).first()
+        if not package:
+            raise HTTPException(status_code=400, detail="充值套餐不存在")
+        coins = package.coin_amount
+        bonus = package.bonus_coins
+    else:
+        # 自定义金额（1元=1金币）
+        coins = int(amount)
+
+    total_coins = coins + bonus
+
+    balance = wallet_service.credit(
+        db, current_member.id, wallet_service.COIN, total_coins,
+        source="充值",
+        remark=f"充值{coins}金币" + (f"，赠送{bonus}金币" if bonus else "")
+    )
+    db.commit()
+
+    return ResponseModel(message="充值成功", data={
+        "coins": total_coins,
+        "balance": float(balance)
+    })
+
+
+# ==================== 会员卡相关 ====================
+
+@router.get("/cards", response_model=ResponseModel)
+def get_member_cards(request: Request, db: Session = Depends(get_db)):
+    """获取会员卡套餐列表"""
+    entry = catalog_cache.get_or_build("member_cards", (TAG_MEMBER_CARDS,), lambda: _build_member_cards(db))
+    return cached_json_response(request, entry)
+
+
+def _build_member_cards(db: Session) -> list:
+    cards = db.query(MemberCard).options(selectinload(MemberCard.level)).filter(
+        MemberCard.is_active == True,
+        MemberCard.is_deleted == False
+    ).order_by(MemberCard.sort_order.asc()).all()
+
+    result = []
+    for card in cards:
+        # 获取会员等级信息（使用 level_code 映射，兼容旧数据库数据）
+        level_code = card.level.level_code if card.level else ""
+        level_name = serializers.level_name(level_code, level_code)
+
+        result.append({
+            "id": card.id,
+            "name": card.name,
+            "level_name": level_name,
+            "level_code": level_code,
+            "original_price": float(card.original_price or 0),
+            "price": float(card.price or 0),
+            "duration_days": card.duration_days,
+            "bonus_coins": float(card.bonus_coins or 0),
+            "bonus_points": card.bonus_points or 0,
+            "cover_image": card.cover_image,
+            "description": card.description,
+            "is_recommended": card.is_recommended,
+            "highlights": json.loads(card.highlights) if card.highlights else []
+        })
+
+    return result
+
+
+# ==================== 优惠券相关 ====================
+
+@router.get("/coupons", response_model=ResponseModel)
+def get_member_coupons(
+    status: Optional[str] = None,
+    applicable_type: Optional[str] = None,
+    page: int = 1,
+    limit: int = 20,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """获取用户优惠券列表"""
+    # 始终 JOIN CouponTemplate 以获取 applicable_type
+    query = db.query(MemberCoupon, CouponTemplate.applicable_type).outerjoin(
+        CouponTemplate, MemberCoupon.template_id == CouponTemplate.id
+    ).filter(
+        MemberCoupon.member_id == current_member.id
+    )
+
+    if status:
+        query = query.filter(MemberCoupon.status == status)
+
+    if applicable_type:
+        query = query.filter(
+            CouponTemplate.applicable_type.in_([applicable_type, 'all'])
+        )
+
+    rows = query.order_by(MemberCoupon.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
+
+    result = []
+    for coupon, tpl_applicable_type in rows:
+        # 获取体验券关联的会员等级名称
+        experience_level_name = None
+        if coupon.type == "experience" and coupon.experience_level_id:
+            level = db.query(MemberLevel).filter(MemberLevel.id == coupon.experience_level_id).first()
+            if level:
+                experience_level_name = level.name
+
+        result.append({
+            "id": coupon.id,
+            "name": coupon.name,
+            "type": coupon.type,
+            "applicable_type": tpl_applicable_type or "all",
+            "discount_value": float(coupon.discount_value or 0),
+            "min_amount": float(coupon.min_amount or 0),
+            "start_time": coupon.start_time.strftime("%Y-%m-%d %H:%M:%S") if coupon.start_time else None,
+            "end_time": coupon.end_time.strftime("%Y-%m-%d %H:%M:%S") if coupon.end_time else None,
+            "status": coupon.status,
+            "experience_days": coupon.experience_days,
+            "experience_level_id": coupon.experience_level_id,
+            "experience_level_name": experience_level_name
+        })
+
+    return ResponseModel(data=result)
+
+
+@router.post("/coupons/{coupon_id}/use", response_model=ResponseModel)
+def use_experience_coupon(
+    coupon_id: int,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """使用体验券（升级会员）"""
+    # 查找优惠券
+    coupon = db.query(MemberCoupon).filter(
+        MemberCoupon.id == coupon_id,
+        MemberCoupon.member_id == current_member.id
+    ).first()
+
+    if not coupon:
+        raise HTTPException(status_code=404, detail="优惠券不存在")
+
+    # 验证优惠券类型
+    if coupon.type != "experience":
+        raise HTTPException(status_code=400, detail="只有体验券可以直接使用")
+
+    # 验证优惠券状态
+    if coupon.status != "unused":
+        raise HTTPException(status_code=400, detail="该优惠券已使用或已过期")
+
+    # 验证有效期
+    now = datetime.now()
+    if coupon.start_time and now < coupon.start_time:
+        raise HTTPException(status_code=400, detail="优惠券尚未生效")
+    if coupon.end_time and now > coupon.end_time:
+        coupon.status = "expired"
+        db.commit()
+        raise HTTPException(status_code=400, detail="优惠券已过期")
+
+    # 验证体验券字段
+    if not coupon.experience_days or not coupon.experience_level_id:
+        raise HTTPException(status_code=400, detail="体验券配置错误")
+
+    # 获取目标会员等级
+    target_level = db.query(MemberLevel).filter(MemberLevel.id == coupon.experience_level_id).first()
+    if not target_level:
+        raise HTTPException(status_code=400, detail="会员等级不存在")
+
+    # 计算会员到期时间
+    if current_member.member_expire_time and current_member.member_expire_time > now:
+        # 如果已有会员且未过期，在原有基础上延长
+        new_expire_time = current_member.member_expire_time + timedelta(days=coupon.experience_days)
+    else:
+        # 如果没有会员或已过期，从今天开始计算
+        new_expire_time = now + timedelta(days=coupon.experience_days)
+
+    # 升级会员等级
+    current_member.level_id = coupon.experience_level_id
+    current_member.member_expire_time = new_expire_time
+
+    # 标记优惠券为已使用
+    coupon.status = "used"
+    coupon.use_time = now
+
+    db.commit()
+
+    return ResponseModel(
+        message=f"恭喜您！已成功激活{target_level.name}会员，有效期至{new_expire_time.strftime('%Y-%m-%d')}",
+        data={
+            "level_name": target_level.name,
+            "expire_time": new_expire_time.strftime("%Y-%m-%d %H:%M:%S")
+        }
+    )
+
+
+# ==================== 会员卡购买 ====================
+
+@router.get("/cards/{card_id}", response_model=ResponseModel)
+def get_member_card_detail(
+    card_id: int,
+    db: Session = Depends(get_db)
+):
+    """获取会员卡套餐详情"""
+    card = db.query(MemberCard).filter(
+        MemberCard.id == card_id,
+        MemberCard.is_active == True,
+        MemberCard.is_deleted == False
+    ).first()
+
+    if not card:
+        raise HTTPException(status_code=404, detail="会员卡套餐不存在")
+
+    # 解析亮点
+    highlights = []
+    if card.highlights:
+        try:
+            highlights = json.loads(card.highlights)
+        except:
+            pass
+
+    return ResponseModel(data={
+        "id": card.id,
+        "name": card.name,
+        "level_id": card.level_id,
+        "level_name": card.level.name if card.level else None,
+        "original_price": float(card.original_price),
+        "price": float(card.price),
+        "duration_days": card.duration_days,
+        "bonus_coins": float(card.bonus_coins or 0),
+        "bonus_points": card.bonus_points or 0,
+        "cover_image": card.cover_image,
+        "description": card.description,
+        "highlights": highlights,
+        "is_recommended": card.is_recommended
+    })
+
+
+@router.post("/cards/{card_id}/buy", response_model=ResponseModel)
+def buy_member_card(
+    card_id: int,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """购买会员卡（微信支付）"""
+    # 查找会员卡套餐
+    card = db.query(MemberCard).filter(
+        MemberCard.id == card_id,
+        MemberCard.is_active == True,
+        MemberCard.is_deleted == False
+    ).first()
+
+    if not card:
+        raise HTTPException(status_code=404, detail="会员卡套餐不存在或已下架")
+
+    # 检查用户是否有openid
+    if not current_member.openid:
+        raise HTTPException(status_code=400, detail="请先完成微信授权")
+
+    # 生成订单号
+    order_no = wechat_pay.generate_out_trade_no("MC")
+
+    # 创建会员卡订单
+    order = MemberCardOrder(
+        order_no=order_no,
+        member_id=current_member.id,
+        card_id=card.id,
+        original_price=card.original_price,
+        pay_amount=card.price,
+        bonus_coins=card.bonus_coins,
+        bonus_points=card.bonus_points,
+        level_id=card.level_id,
+        duration_days=card.duration_days,
+        pay_type="wechat",
+        status="pending"
+    )
+    db.add(order)
+    db.commit()
+    db.refresh(order)
+
+    # 调用微信支付创建预支付订单
+    total_amount = int(float(card.price) * 100)  # 转为分
+    result = wechat_pay.create_jsapi_order(
+        out_trade_no=order_no,
+        total_amount=total_amount,
+        description=f"会员卡-{card.name}",
+        openid=current_member.openid,
+        attach=json.dumps({"order_id": order.id, "type": "member_card"})
+    )
+
+    if "error" in result:
+        order.status = "failed"
+        db.commit()
+        raise HTTPException(status_code=500, detail=result["error"])
+
+    return ResponseModel(data={
+        "order_id": order.id,
+        "order_no": order_no,
+        "pay_amount": float(card.price),
+        "pay_params": result
+    })
+
+
+@router.get("/card-orders", response_model=ResponseModel)
+def get_my_card_orders(
+    page: int = 1,
+    limit: int = 10,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """获取我的会员卡订单列表"""
+    query = db.query(MemberCardOrder).filter(
+        MemberCardOrder.member_id == current_member.id
+    )
+
+    orders = query.order_by(MemberCardOrder.created_at.desc()).offset((page - 1) * limit).limit(limit).all()
+
+    result = []
+    for order in orders:
+        card = db.query(MemberCard).filter(MemberCard.id == order.card_id).first()
+        level = db.query(MemberLevel).filter(MemberLevel.id == order.level_id).first()
+
+        result.append({
+            "id": order.id,
+            "order_no": order.order_no,
+            "card_name": card.name if card else None,
+            "level_name": level.name if level else None,
+            "pay_amount": float(order.pay_amount),
+            "duration_days": order.duration_days,
+            "bonus_coins": float(order.bonus_coins or 0),
+            "bonus_points": order.bonus_points or 0,
+            "status": order.status,
+            "pay_time": order.pay_time.strftime("%Y-%m-%d %H:%M:%S") if order.pay_time else None,
+            "start_time": order.start_time.strftime("%Y-%m-%d") if order.start_time else None,
+            "expire_time": order.expire_time.strftime("%Y-%m-%d") if order.expire_time else None,
+            "created_at": order.created_at.strftime("%Y-%m-%d %H:%M:%S") if order.created_at else None
+        })
+
+    return ResponseModel(data=result)
+
+
+@router.get("/card-orders/{order_no}", response_model=ResponseModel)
+def get_card_order_detail(
+    order_no: str,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """查询会员卡订单状态"""
+    order = db.query(MemberCardOrder).filter(
+        MemberCardOrder.order_no == order_no,
+        MemberCardOrder.member_id == current_member.id
+    ).first()
+
+    if not order:
+        raise HTTPException(status_code=404, detail="订单不存在")
+
+    # 如果订单未支付，查询微信支付状态
+    if order.status == "pending":
+        result = wechat_pay.query_order(order_no)
+        if result.get("trade_state") == "SUCCESS":
+            # 与支付回调共用条件更新，只生效一次
+            payment_notify_service.complete_member_card(db, order_no, result.get("transaction_id"))
+            db.commit()
+
+    card = db.query(MemberCard).filter(MemberCard.id == order.card_id).first()
+    level = db.query(MemberLevel).filter(MemberLevel.id == order.level_id).first()
+
+    return ResponseModel(data={
+        "id": order.id,
+        "order_no": order.order_no,
+        "card_name": card.name if card else None,
+        "level_name": level.name if level else None,
+        "pay_amount": float(order.pay_amount),
+        "duration_days": order.duration_days,
+        "bonus_coins": float(order.bonus_coins or 0),
+        "bonus_points": order.bonus_points or 0,
+        "status": order.status,
+        "pay_time": order.pay_time.strftime("%Y-%m-%d %H:%M:%S") if order.pay_time else None,
+        "start_time": order.start_time.strftime("%Y-%m-%d") if order.start_time else None,
+        "expire_time": order.expire_time.strftime("%Y-%m-%d") if order.expire_time else None
+    })
+
+
+# ==================== 充值套餐列表 ====================
+
+@router.get("/recharge-packages", response_model=ResponseModel)
+def get_recharge_packages(request: Request, db: Session = Depends(get_db)):
+    """获取充值套餐列表"""
+    entry = catalog_cache.get_or_build(
+        "recharge_packages", (TAG_RECHARGE_PACKAGES,), lambda: _build_recharge_packages(db)
+    )
+    return cached_json_response(request, entry)
+
+
+def _build_recharge_packages(db: Session) -> list:
+    from app.models.finance import RechargePackage
+    packages = db.query(RechargePackage).filter(
+        RechargePackage.is_active == True,
+        RechargePackage.is_deleted == False
+    ).order_by(RechargePackage.sort_order).all()
+
+    result = []
+    for pkg in packages:
+        result.append({
+            "id": pkg.id,
+            "name": pkg.name,
+            "amount": float(pkg.amount),
+            "coin_amount": pkg.coin_amount,
+            "bonus_coins": pkg.bonus_coins,
+            "total_coins": pkg.coin_amount + pkg.bonus_coins
+        })
+    return result
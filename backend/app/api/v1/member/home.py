@@ -0,0 +1,432 @@
+"""会员端API：首页（轮播图、活动、公告、UI配置）"""
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from sqlalchemy import func, select
+
+from app.core.database import get_db, get_async_db
+from app.models import Member
+from app.models.activity import Activity, ActivityRegistration
+from app.models.message import Banner, Announcement
+from app.models.ui_editor import UIPageConfig, UIBlockConfig, UIMenuItem
+from app.schemas.common import ResponseModel
+from app.services.ui_config_cache import ui_config_cache
+from app.services.image_pipeline import image_variant_url
+from app.services.catalog_cache import catalog_cache, cached_json_response, TAG_BANNERS
+from app.services import activity_enrollment
+from app.api.deps import get_current_member, get_current_member_optional_async
+
+router = APIRouter()
+
+
+# ==================== 首页数据 ====================
+
+@router.get("/banners", response_model=ResponseModel)
+def get_banners(request: Request, db: Session = Depends(get_db)):
+    """获取轮播图"""
+    entry = catalog_cache.get_or_build("banners", (TAG_BANNERS,), lambda: _build_banners(db))
+    return cached_json_response(request, entry)
+
+
+def _build_banners(db: Session) -> list:
+    banners = db.query(Banner).filter(
+        Banner.is_active == True,
+        Banner.is_deleted == False
+    ).order_by(Banner.sort_order.asc()).all()
+
+    result = []
+    for b in banners:
+        result.append({
+            "id": b.id,
+            "image": image_variant_url(b.image, "full"),
+            "url": b.link_value or "",
+            "title": b.title
+        })
+
+    # 如果没有数据，返回默认轮播图
+    if not result:
+        result = [
+            {"id": 1, "image": "/assets/images/banner1.jpg", "url": "", "title": "欢迎来到运动社交"},
+            {"id": 2, "image": "/assets/images/banner2.jpg", "url": "", "title": "专业的体育场馆服务"}
+        ]
+
+    return result
+
+
+@router.get("/activities", response_model=ResponseModel)
+async def get_activities(
+    page: int = 1,
+    limit: int = 10,
+    status: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取活动列表
+
+    Tab 语义基于"时间"而非 Activity.status 字段，避免运营未手动标记时活动"永远招募中"：
+    - upcoming: start_time > now
+    - ongoing:  start_time <= now < end_time
+    - ended:    end_time <= now
+    - None(全部): 仅展示未过期的 published/ongoing 活动，过期活动默认隐藏
+    """
+    now = datetime.now()
+    stmt = select(Activity).where(
+        Activity.is_deleted == False,
+        Activity.status.in_(["published", "ongoing", "ended"]),
+    )
+
+    if status == "upcoming":
+        stmt = stmt.where(Activity.start_time > now)
+    elif status == "ongoing":
+        stmt = stmt.where(Activity.start_time <= now, Activity.end_time > now)
+    elif status == "ended":
+        stmt = stmt.where(Activity.end_time <= now)
+    else:
+        # 全部：只显示未过期
+        stmt = stmt.where(Activity.end_time > now)
+
+    stmt = stmt.order_by(Activity.start_time.asc()).offset((page - 1) * limit).limit(limit)
+    activities = (await db.execute(stmt)).scalars().all()
+
+    result = []
+    for a in activities:
+        if a.end_time and a.end_time <= now:
+            display_status = "ended"
+        elif a.start_time and a.start_time > now:
+            display_status = "upcoming"
+        else:
+            display_status = "ongoing"
+        result.append({
+            "id": a.id,
+            "title": a.title,
+            "image": a.cover_image,
+            "description": a.description,
+            "start_date": str(a.start_time.date()) if a.start_time else None,
+            "start_time": str(a.start_time.time()) if a.start_time else None,
+            "end_date": str(a.end_time.date()) if a.end_time else None,
+            "end_time": str(a.end_time.time()) if a.end_time else None,
+            "location": a.location,
+            "price": float(a.price or 0),
+            "max_participants": a.max_participants,
+            "enrolled": a.current_participants or 0,
+            "status": display_status,
+        })
+
+    return ResponseModel(data=result)
+
+
+@router.get("/activities/{activity_id}", response_model=ResponseModel)
+async def get_activity_detail(
+    activity_id: int,
+    db: AsyncSession = Depends(get_async_db),
+    current_member: Optional[Member] = Depends(get_current_member_optional_async),
+):
+    """获取活动详情（可选登录；登录后返回 is_enrolled / is_waitlisted）"""
+    activity = (await db.execute(
+        select(Activity).where(
+            Activity.id == activity_id,
+            Activity.is_deleted == False
+        )
+    )).scalars().first()
+
+    if not activity:
+        raise HTTPException(status_code=404, detail="活动不存在")
+
+    is_enrolled = is_waitlisted = False
+    if current_member:
+        statuses = set((await db.execute(
+            select(ActivityRegistration.status).where(
+                ActivityRegistration.activity_id == activity_id,
+                ActivityRegistration.member_id == current_member.id,
+                ActivityRegistration.status.in_(["registered", "waitlisted", "attended"]),
+            )
+        )).scalars())
+        is_enrolled = bool(statuses & {"registered", "attended"})
+        is_waitlisted = "waitlisted" in statuses
+
+    now = datetime.now()
+    if activity.end_time and activity.end_time <= now:
+        display_status = "ended"
+    elif activity.start_time and activity.start_time > now:
+        display_status = "upcoming"
+    else:
+        display_status = "ongoing"
+
+    return ResponseModel(data={
+        "id": activity.id,
+        "title": activity.title,
+        "image": activity.cover_image,
+        "description": activity.description,
+        "content": activity.content,
+        "start_date": str(activity.start_time.date()) if activity.start_time else None,
+        "start_time": str(activity.start_time.time()) if activity.start_time else None,
+        "end_date": str(activity.end_time.date()) if activity.end_time else None,
+        "end_time": str(activity.end_time.time()) if activity.end_time else None,
+        "location": activity.location,
+        "price": float(activity.price or 0),
+        "max_participants": activity.max_participants,
+        "enrolled": activity.current_participants or 0,
+        "waitlist_limit": activity.waitlist_limit or 0,
+        "waitlisted": activity.waitlist_count or 0,
+        "status": display_status,
+        "is_enrolled": is_enrolled,
+        "is_waitlisted": is_waitlisted,
+    })
+
+
+@router.post("/activities/{activity_id}/enroll", response_model=ResponseModel)
+def enroll_activity(
+    activity_id: int,
+    db: Session = Depends(get_db),
+    current_member: Member = Depends(get_current_member),
+):
+    """会员报名活动（报名费从金币余额扣；名额已满且开放候补时进入候补）"""
+    activity = db.query(Activity).filter(
+        Activity.id == activity_id,
+        Activity.is_deleted == False,
+    ).first()
+    if not activity:
+        raise HTTPException(status_code=404, detail="活动不存在")
+    if activity.status in ("draft", "cancelled"):
+        raise HTTPException(status_code=400, detail="活动不可报名")
+
+    now = datetime.now()
+    if activity.end_time and activity.end_time <= now:
+        raise HTTPException(status_code=400, detail="活动已结束")
+    if activity.registration_deadline and activity.registration_deadline < now:
+        raise HTTPException(status_code=400, detail="报名已截止")
+
+    try:
+        with activity_enrollment.admission_queue.admit(activity_id):
+            existing = db.query(ActivityRegistration).filter(
+                ActivityRegistration.activity_id == activity_id,
+                ActivityRegistration.member_id == current_member.id,
+                ActivityRegistration.status.in_(["registered", "waitlisted", "attended"]),
+            ).first()
+            if existing:
+                raise HTTPException(
+                    status_code=400,
+                    detail="您已在候补名单中" if existing.status == "waitlisted" else "您已报名该活动"
+                )
+
+            reg = activity_enrollment.enroll(db, activity, current_member)
+            db.commit()
+    except activity_enrollment.AdmissionBusy as e:
+        raise HTTPException(status_code=429, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if reg.status == "waitlisted":
+        return ResponseModel(message="名额已满，已加入候补", data={"registration_id": reg.id, "status": reg.status})
+    return ResponseModel(message="报名成功", data={"registration_id": reg.id, "status": reg.status})
+
+
+@router.post("/activities/{activity_id}/cancel", response_model=ResponseModel)
+def cancel_enrollment(
+    activity_id: int,
+    db: Session = Depends(get_db),
+    current_member: Member = Depends(get_current_member),
+):
+    """取消报名或候补；已支付金币原路退回，空出的名额自动递补候补"""
+    activity = db.query(Activity).filter(
+        Activity.id == activity_id,
+        Activity.is_deleted == False,
+    ).first()
+    if not activity:
+        raise HTTPException(status_code=404, detail="活动不存在")
+
+    reg = db.query(ActivityRegistration).filter(
+        ActivityRegistration.activity_id == activity_id,
+        ActivityRegistration.member_id == current_member.id,
+        ActivityRegistration.status.in_(["registered", "waitlisted"]),
+    ).first()
+    if not reg:
+        raise HTTPException(status_code=400, detail="您未报名该活动或报名已取消")
+
+    now = datetime.now()
+    if reg.status == "registered" and activity.start_time and activity.start_time <= now:
+        raise HTTPException(status_code=400, detail="活动已开始，无法取消")
+
+    refund = activity_enrollment.cancel(db, activity, reg)
+    db.commit()
+
+    return ResponseModel(message="已取消报名", data={"refund": refund})
+
+
+# ==================== UI配置（公开接口） ====================
+
+@router.get("/ui-config", response_model=ResponseModel)
+def get_ui_config(
+    request: Request,
+    page_code: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """获取UI配置（公开接口，小程序使用）
+
+    返回当前发布的UI配置，包括页面配置、区块配置、菜单项等。
+    已发布版本直接返回预编译的响应字节，支持 If-None-Match 协商缓存（304）。
+    """
+    compiled = ui_config_cache.get_current(db)
+    if compiled is not None:
+        payload = compiled.get(page_code)
+        headers = {
+            "ETag": payload.etag,
+            "Cache-Control": "no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if_none_match = request.headers.get("if-none-match", "")
+        if payload.etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=headers)
+        if "gzip" in request.headers.get("accept-encoding", ""):
+            headers["Content-Encoding"] = "gzip"
+            return Response(content=payload.gzip_body, media_type="application/json", headers=headers)
+        return Response(content=payload.body, media_type="application/json", headers=headers)
+
+    # 如果没有发布版本，从数据库实时读取已发布的配置
+    pages_query = db.query(UIPageConfig).filter(
+        UIPageConfig.is_deleted == False,
+        UIPageConfig.is_active == True,
+        UIPageConfig.status == "published"
+    )
+
+    if page_code:
+        pages_query = pages_query.filter(UIPageConfig.page_code == page_code)
+
+    pages = pages_query.all()
+
+    pages_data = []
+    for p in pages:
+        pages_data.append({
+            "id": p.id,
+            "page_code": p.page_code,
+            "page_name": p.page_name,
+            "page_type": p.page_type,
+            "blocks_config": p.blocks_config or [],
+            "style_config": p.style_config or {},
+            "version": p.version
+        })
+
+    # 获取区块配置
+    blocks_query = db.query(UIBlockConfig).filter(
+        UIBlockConfig.is_deleted == False,
+        UIBlockConfig.is_active == True
+    )
+
+    if page_code:
+        blocks_query = blocks_query.filter(UIBlockConfig.page_code == page_code)
+
+    blocks = blocks_query.order_by(UIBlockConfig.sort_order.asc()).all()
+
+    blocks_data = []
+    for b in blocks:
+        blocks_data.append({
+            "id": b.id,
+            "block_code": b.block_code,
+            "block_name": b.block_name,
+            "page_code": b.page_code,
+            "block_type": b.block_type,
+            "config": b.config or {},
+            "style_config": b.style_config or {},
+            "data_source": b.data_source,
+            "sort_order": b.sort_order
+        })
+
+    # 获取菜单项
+    menu_items_query = db.query(UIMenuItem).filter(
+        UIMenuItem.is_deleted == False,
+        UIMenuItem.is_active == True,
+        UIMenuItem.is_visible == True
+    )
+
+    menu_items = menu_items_query.order_by(UIMenuItem.sort_order.asc()).all()
+
+    menu_items_data = []
+    tabbar_data = []
+
+    for m in menu_items:
+        item_data = {
+            "id": m.id,
+            "menu_code": m.menu_code,
+            "menu_type": m.menu_type,
+            "block_id": m.block_id,
+            "title": m.title,
+            "subtitle": m.subtitle,
+            "icon": m.icon,
+            "icon_active": m.icon_active,
+            "link_type": m.link_type,
+            "link_value": m.link_value,
+            "link_params": m.link_params,
+            "show_condition": m.show_condition,
+            "badge_type": m.badge_type,
+            "badge_value": m.badge_value,
+            "sort_order": m.sort_order
+        }
+
+        if m.menu_type == "tabbar":
+            tabbar_data.append(item_data)
+        else:
+            menu_items_data.append(item_data)
+
+    return ResponseModel(data={
+        "pages": pages_data,
+        "blocks": blocks_data,
+        "menuItems": menu_items_data,
+        "tabBar": tabbar_data,
+        "version": 0,
+        "publishedAt": None
+    })
+
+
+# ==================== 公告相关 ====================
+
+@router.get("/announcements", response_model=ResponseModel)
+def get_member_announcements(
+    limit: int = Query(5, ge=1, le=20, description="获取数量，最多20条"),
+    db: Session = Depends(get_db)
+):
+    """
+    获取会员端公告列表（无需认证）
+
+    返回已发布、未过期、面向会员的公告
+    """
+    now = datetime.now()
+
+    # 查询条件：
+    # 1. 未删除
+    # 2. 已发布
+    # 3. 目标为all或member
+    # 4. 在有效期内
+    query = db.query(Announcement).filter(
+        Announcement.is_deleted == False,
+        Announcement.status == "published",
+        Announcement.target.in_(["all", "member"])
+    )
+
+    # 过滤有效期
+    query = query.filter(
+        func.coalesce(Announcement.start_time <= now, True),
+        func.coalesce(Announcement.end_time >= now, True)
+    )
+
+    # 排序：置顶优先，发布时间倒序
+    items = query.order_by(
+        Announcement.is_top.desc(),
+        Announcement.publish_time.desc()
+    ).limit(limit).all()
+
+    # 构造返回数据
+    result = []
+    for item in items:
+        result.append({
+            "id": item.id,
+            "title": item.title,
+            "content": item.content,
+            "type": item.type,
+            "is_top": item.is_top,
+            "publish_time": item.publish_time.strftime("%Y-%m-%d %H:%M:%S") if item.publish_time else None,
+            "created_at": item.created_at.strftime("%Y-%m-%d %H:%M:%S") if item.created_at else None
+        })
+
+    return ResponseModel(data=result)
@@ -0,0 +1,165 @@
+"""会员端API：积分商城"""
+import uuid
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from app.core.database import get_db
+from app.models import Member
+from app.models.mall import ProductCategory, Product, ProductOrder
+from app.schemas.common import ResponseModel
+from app.services.catalog_cache import catalog_cache, cached_json_response, TAG_MALL_CATEGORIES
+from app.services import wallet_service
+from app.services.mall_inventory import available_stock, claim_purchase_quota, take_stock
+from app.api.deps import get_current_member
+from app.api.v1.member.serializers import product_card
+from app.core.responses import json_response
+
+router = APIRouter()
+
+
+# ==================== 商城相关 ====================
+
+@router.get("/mall/categories", response_model=ResponseModel)
+def get_mall_categories(request: Request, db: Session = Depends(get_db)):
+    """获取商城分类"""
+    entry = catalog_cache.get_or_build(
+        "mall_categories", (TAG_MALL_CATEGORIES,), lambda: _build_mall_categories(db)
+    )
+    return cached_json_response(request, entry)
+
+
+def _build_mall_categories(db: Session) -> list:
+    categories = db.query(ProductCategory).filter(
+        ProductCategory.is_active == True,
+        ProductCategory.is_deleted == False
+    ).order_by(ProductCategory.sort_order.asc()).all()
+
+    return [{
+        "id": c.id,
+        "name": c.name,
+        "icon": c.icon
+    } for c in categories]
+
+
+@router.get("/mall/goods", response_model=ResponseModel)
+def get_mall_goods(
+    category_id: Optional[int] = None,
+    page: int = 1,
+    limit: int = 20,
+    db: Session = Depends(get_db)
+):
+    """获取商城商品列表"""
+    query = db.query(Product).filter(
+        Product.is_active == True,
+        Product.is_deleted == False
+    )
+
+    if category_id:
+        query = query.filter(Product.category_id == category_id)
+
+    products = query.order_by(Product.sort_order.asc()).offset((page - 1) * limit).limit(limit).all()
+
+    return json_response([product_card(p) for p in products])
+
+
+@router.get("/mall/goods/{product_id}", response_model=ResponseModel)
+def get_mall_goods_detail(product_id: int, db: Session = Depends(get_db)):
+    """获取商品详情"""
+    product = db.query(Product).filter(
+        Product.id == product_id,
+        Product.is_deleted == False
+    ).first()
+
+    if not product:
+        raise HTTPException(status_code=404, detail="商品不存在")
+
+    return ResponseModel(data={
+        "id": product.id,
+        "name": product.name,
+        "image": product.image,
+        "images": product.images.split(",") if product.images else [],
+        "points": product.points or 0,
+        "price": float(product.price or 0),
+        "original_price": float(product.market_price or 0) if product.market_price else 0,
+        "description": product.description,
+        "content": product.content,
+        "stock": available_stock(product),
+        "sales": product.sales or 0,
+        "purchase_limit": product.purchase_limit or 0,
+    })
+
+
+class MallExchangeRequest(BaseModel):
+    quantity: int = 1
+    receiver_name: Optional[str] = None
+    receiver_phone: Optional[str] = None
+    receiver_address: Optional[str] = None
+    remark: Optional[str] = None
+
+
+@router.post("/mall/goods/{product_id}/exchange", response_model=ResponseModel)
+def exchange_mall_goods(
+    product_id: int,
+    payload: Optional[MallExchangeRequest] = None,
+    db: Session = Depends(get_db),
+    current_member: Member = Depends(get_current_member),
+):
+    """积分商城兑换：条件扣库存、限购、扣积分(+金币附加)、建订单，同事务写记录"""
+    data = payload or MallExchangeRequest()
+    qty = max(1, int(data.quantity or 1))
+
+    product = db.query(Product).filter(
+        Product.id == product_id,
+        Product.is_deleted == False,
+    ).first()
+    if not product:
+        raise HTTPException(status_code=404, detail="商品不存在")
+    if not product.is_active:
+        raise HTTPException(status_code=400, detail="商品已下架")
+
+    total_points = int(product.points or 0) * qty
+    total_coins = float(product.price or 0) * qty
+
+    # 库存（秒杀商品取进程内令牌，须在本事务任何写入之前）、限购、积分/金币依次条件扣减；
+    # 任一不足时请求结束不提交，已扣部分一并回滚
+    remark = f"兑换：{product.name} x{qty}"
+    try:
+        take_stock(db, product, qty)
+        claim_purchase_quota(db, current_member.id, product.id, qty, product.purchase_limit)
+        wallet_service.debit(db, current_member.id, wallet_service.POINT, total_points,
+                             source="mall_exchange", remark=remark)
+        if total_coins > 0:
+            wallet_service.debit(db, current_member.id, wallet_service.COIN, total_coins,
+                                 source="mall_exchange", remark=remark)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    now = datetime.now()
+    order_no = now.strftime("%Y%m%d%H%M%S") + f"{current_member.id:06d}" + uuid.uuid4().hex[:4].upper()
+
+    order = ProductOrder(
+        order_no=order_no,
+        member_id=current_member.id,
+        product_id=product.id,
+        product_name=product.name,
+        product_image=product.image,
+        quantity=qty,
+        points_used=total_points,
+        coins_used=total_coins,
+        receiver_name=data.receiver_name,
+        receiver_phone=data.receiver_phone or current_member.phone,
+        receiver_address=data.receiver_address,
+        remark=data.remark,
+        status="pending",
+    )
+    db.add(order)
+    db.commit()
+
+    return ResponseModel(
+        message="兑换成功",
+        data={"order_no": order_no, "points_used": total_points, "coins_used": total_coins},
+    )
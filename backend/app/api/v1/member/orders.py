@@ -0,0 +1,247 @@
+"""会员端API：统一订单查询"""
+from datetime import datetime, timedelta
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import select
+
+from app.core.database import get_async_db
+from app.core.config import settings
+from app.models import Member, Reservation
+from app.schemas.common import ResponseModel
+from app.services.qrcode_cache import QRCODE_FORMATS, get_qrcode_async, verify_payload
+from app.api.deps import get_current_member_async
+from app.api.v1.member.serializers import (
+    first_image, fmt_date, fmt_datetime, fmt_time, money, resolve_image_url,
+)
+from app.core.responses import json_response
+
+router = APIRouter()
+
+
+# ==================== 统一订单查询 ====================
+
+@router.get("/orders", response_model=ResponseModel)
+async def get_member_orders(
+    status: Optional[str] = None,
+    type: Optional[str] = None,  # reservation, all, venue, coach
+    page: int = 1,
+    limit: int = 10,
+    current_member: Member = Depends(get_current_member_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取会员所有订单（统一接口）
+
+    返回预约订单，按时间倒序排列
+    """
+    all_orders = []
+
+    # 获取预约订单
+    if type in (None, "all", "reservation", "venue", "coach"):
+        res_stmt = select(Reservation).options(
+            selectinload(Reservation.venue),
+            selectinload(Reservation.coach),
+        ).where(
+            Reservation.member_id == current_member.id,
+            Reservation.is_deleted == False
+        )
+        # 注: 不在 SQL 层按 status 过滤,因为需要先把"过期未核销"的订单
+        # 重新归类到 effective_status='completed',再按 effective_status 过滤
+
+        # 按 coach_id 区分场馆预约和教练预约
+        if type == "venue":
+            res_stmt = res_stmt.where(Reservation.coach_id == None)
+        elif type == "coach":
+            res_stmt = res_stmt.where(Reservation.coach_id != None)
+
+        reservations = (await db.execute(res_stmt)).scalars().all()
+        for r in reservations:
+            # 计算 effective_status, 用它做 tab 过滤
+            effective_status, effective_status_text = _compute_effective_status(r)
+            if status and status != "all":
+                if status == "confirmed":
+                    # "已确认"tab: 只包含未过期的 pending+confirmed
+                    if effective_status not in ("pending", "confirmed"):
+                        continue
+                else:
+                    if effective_status != status:
+                        continue
+            # 场馆图片（JSON数组取第一张）与时间
+            venue_image = first_image(r.venue.images) if r.venue else None
+            start_str, end_str = fmt_time(r.start_time), fmt_time(r.end_time)
+            date_str = fmt_date(r.reservation_date)
+
+            can_cancel, cancel_deadline = _compute_can_cancel(r)
+            all_orders.append({
+                "id": r.id,
+                "order_no": r.reservation_no,
+                "type": "reservation",
+                "type_name": "场馆预约" if not r.coach_id else "教练预约",
+                "title": r.venue.name if r.venue else (r.coach.name if r.coach else "预约"),
+                "image": resolve_image_url(venue_image, "thumb"),
+                "amount": money(r.total_price),
+                "total_price": money(r.total_price),
+                "status": effective_status,
+                "raw_status": r.status,
+                "pay_type": r.pay_type or "coin",
+                "status_text": effective_status_text,
+                "created_at": fmt_datetime(r.created_at),
+                "detail": f"{date_str} {start_str}-{end_str}",
+                "description": f"{date_str} {start_str}-{end_str} {r.duration}分钟",
+                "is_verified": bool(r.is_verified),
+                "can_cancel": can_cancel,
+                "cancel_deadline": cancel_deadline,
+            })
+
+    # 按创建时间倒序排序
+    all_orders.sort(key=lambda x: x["created_at"] or "", reverse=True)
+
+    # 分页
+    start = (page - 1) * limit
+    end = start + limit
+    paged_orders = all_orders[start:end]
+
+    return json_response(paged_orders)
+
+
+async def _generate_verify_qrcode(reservation_no: str, fmt: str = "data_uri") -> str:
+    """生成预约核销二维码（按预约号缓存，格式见 qrcode_cache）"""
+    return await get_qrcode_async(verify_payload(reservation_no), fmt)
+
+
+def _compute_can_cancel(res: Reservation):
+    """计算一个预约当前是否允许会员自行取消。
+    规则:
+      - 状态必须属于 (unpaid, pending, confirmed)
+      - 不能已核销
+      - 距离开始时间必须 >= 1 小时
+    返回 (can_cancel: bool, cancel_deadline: Optional[str])
+    """
+    if res.status not in ("unpaid", "pending", "confirmed"):
+        return False, None
+    if res.is_verified:
+        return False, None
+    try:
+        start_dt = datetime.combine(res.reservation_date, res.start_time)
+    except Exception:
+        return False, None
+    deadline = start_dt - timedelta(hours=1)
+    return datetime.now() < deadline, fmt_datetime(deadline, seconds=True)
+
+
+def _compute_effective_status(res: Reservation):
+    """计算订单的"展示状态"和"展示文案"。
+
+    业务规则:
+        - unpaid/pending/confirmed 状态但开始时间已过且未核销 → 视为"已完成"
+          (实际是过期未到场, 但为了 UX 简化, 统一归入"已完成"标签
+           让其不再"挂着"在待支付/已确认 tab 里)
+        - 其他状态保持原样
+
+    返回 (effective_status: str, effective_status_text: str)
+    """
+    text_map = {
+        "unpaid": "待支付",
+        "pending": "待确认",
+        "confirmed": "已确认",
+        "in_progress": "进行中",
+        "completed": "已完成",
+        "cancelled": "已取消",
+        "no_show": "未到场",
+    }
+    raw = res.status or "unpaid"
+    if raw in ("unpaid", "pending", "confirmed") and not res.is_verified:
+        try:
+            start_dt = datetime.combine(res.reservation_date, res.start_time)
+            if start_dt < datetime.now():
+                return "completed", "已结束"
+        except Exception:
+            pass
+    return raw, text_map.get(raw, raw)
+
+
+@router.get("/orders/{order_id}", response_model=ResponseModel)
+async def get_member_order_detail(
+    order_id: int,
+    qr_format: Optional[str] = Query(None, description="核销二维码格式: data_uri/svg/url，默认取配置"),
+    current_member: Member = Depends(get_current_member_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取订单详情"""
+
+    # 1. 先查预约订单
+    reservation = (await db.execute(
+        select(Reservation).options(
+            selectinload(Reservation.venue),
+            selectinload(Reservation.coach),
+        ).where(
+            Reservation.id == order_id,
+            Reservation.member_id == current_member.id,
+            Reservation.is_deleted == False
+        )
+    )).scalars().first()
+
+    if reservation:
+        r = reservation
+
+        # 场馆图片与时间
+        venue_image = first_image(r.venue.images) if r.venue else None
+        start_str, end_str = fmt_time(r.start_time), fmt_time(r.end_time)
+        date_str = fmt_date(r.reservation_date)
+
+        # 计算 effective_status: 过期未核销的订单展示为"已结束"
+        effective_status, effective_status_text = _compute_effective_status(r)
+
+        # 核销二维码（仅 effective 仍是 pending/confirmed 且未核销时生成,
+        # 过期订单不再展示二维码,避免与"已结束"徽章自相矛盾）
+        qr_fmt = qr_format if qr_format in QRCODE_FORMATS else settings.VERIFY_QRCODE_FORMAT
+        qrcode_value = None
+        if effective_status in ("pending", "confirmed") and not r.is_verified:
+            qrcode_value = await _generate_verify_qrcode(r.reservation_no, qr_fmt)
+
+        can_cancel, cancel_deadline = _compute_can_cancel(r)
+        result = {
+            "id": r.id,
+            "order_no": r.reservation_no,
+            "type": "reservation",
+            "type_name": "场馆预约" if not r.coach_id else "教练预约",
+            "status": effective_status,
+            "raw_status": r.status,
+            "status_text": effective_status_text,
+            # 场馆信息
+            "venue_name": r.venue.name if r.venue else None,
+            "venue_location": r.venue.location if r.venue else None,
+            "venue_image": resolve_image_url(venue_image, "card"),
+            # 时间信息
+            "reservation_date": date_str,
+            "start_time": start_str,
+            "end_time": end_str,
+            "duration": r.duration,
+            # 费用
+            "venue_price": money(r.venue_price),
+            "coach_price": money(r.coach_price),
+            "total_price": money(r.total_price),
+            "pay_type": r.pay_type or "coin",
+            "pay_type_text": {"coin": "金币支付", "wechat": "微信支付"}.get(r.pay_type or "coin", r.pay_type),
+            # 教练信息
+            "coach_name": r.coach.name if r.coach else None,
+            "coach_avatar": r.coach.avatar if r.coach else None,
+            # 核销
+            "is_verified": r.is_verified or False,
+            "verified_at": fmt_datetime(r.verified_at),
+            "qrcode_base64": qrcode_value if qr_fmt == "data_uri" else None,
+            "qrcode_svg": qrcode_value if qr_fmt == "svg" else None,
+            "qrcode_url": resolve_image_url(qrcode_value) if qr_fmt == "url" else None,
+            # 取消相关
+            "can_cancel": can_cancel,
+            "cancel_deadline": cancel_deadline,
+            # 其他
+            "created_at": fmt_datetime(r.created_at),
+            "remark": r.remark,
+        }
+
+        return ResponseModel(data=result)
+
+    raise HTTPException(status_code=404, detail="订单不存在")
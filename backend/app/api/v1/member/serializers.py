@@ -0,0 +1,248 @@
+"""会员端接口共用序列化层
+
+各功能路由构造响应时共用的字段编码函数与常用实体的行编码函数（列表与详情共用同一份字段映射）：
+
+- JSON 文本列（图片、设施、技能等）的解析结果按原文缓存，同一场馆/教练的数据不再逐行逐请求 json.loads
+- 日期时间用 isoformat 格式化（与原 strftime 输出一致，开销更低）
+- 大列表接口配合 app.core.responses.json_response 直接返回预编码的统一响应，
+  跳过 response_model 对大列表的逐项校验与 jsonable 转换（输出与 ResponseModel 一致）
+"""
+import json
+from datetime import date, datetime, time
+from functools import lru_cache
+from typing import Optional
+
+from app.core.config import settings
+from app.services.image_pipeline import image_variant_url
+from app.services.mall_inventory import available_stock
+
+# 三级会员制等级名映射（兼容旧数据库数据）
+LEVEL_CODE_NAME_MAP = {"S": "S级会员", "SS": "SS级会员", "SSS": "SSS级会员"}
+
+# 运动类型常量
+SPORT_TYPES = {
+    "golf": "高尔夫",
+    "pickleball": "匹克球",
+    "tennis": "网球",
+    "squash": "壁球"
+}
+
+
+# ==================== 字段编码 ====================
+
+def resolve_image_url(path: str, variant: Optional[str] = None) -> str:
+    """将 /uploads/xxx 相对路径转为完整URL（如已配置 STATIC_BASE_URL）
+
+    variant 指定衍生图规格（thumb/card/full），按展示场景返回对应尺寸，无衍生图时返回原图
+    """
+    if not path:
+        return None
+    if path.startswith(('http://', 'https://')):
+        return path
+    path = image_variant_url(path, variant)
+    return settings.STATIC_BASE_URL + path if settings.STATIC_BASE_URL else path
+
+
+@lru_cache(maxsize=4096)
+def _parse_json(raw: str):
+    """解析 JSON 文本（按原文缓存；解析失败返回 None）。返回值为共享对象，调用方不得修改"""
+    try:
+        value = json.loads(raw)
+    except (ValueError, TypeError):
+        return None
+    return tuple(value) if isinstance(value, list) else value
+
+
+def json_list(raw, split_fallback: bool = False) -> list:
+    """JSON 数组文本列 -> 新的 list；空值或解析失败返回 []（split_fallback 时按逗号拆分原文）"""
+    if not raw:
+        return []
+    if isinstance(raw, list):
+        return list(raw)
+    value = _parse_json(raw)
+    if value is None:
+        return raw.split(",") if split_fallback else []
+    return list(value) if isinstance(value, tuple) else value
+
+
+def first_image(raw) -> Optional[str]:
+    """图片列取第一张：兼容 JSON 数组文本、list 及单个路径字符串"""
+    if not raw:
+        return None
+    if isinstance(raw, list):
+        return raw[0] if raw else None
+    value = _parse_json(raw)
+    if value is None:
+        return raw if not raw.startswith('[') else None
+    return value[0] if isinstance(value, tuple) and value else None
+
+
+def level_name(level_code: Optional[str], default: Optional[str] = "S级会员") -> Optional[str]:
+    """三级会员制等级名"""
+    return LEVEL_CODE_NAME_MAP.get(level_code, default)
+
+
+def money(value) -> float:
+    """金额/价格（Decimal、None）-> float"""
+    return float(value or 0)
+
+
+def fmt_date(value) -> Optional[str]:
+    """日期 -> YYYY-MM-DD（已是字符串时原样返回）"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        value = value.date()
+    return value.isoformat() if isinstance(value, date) else str(value)
+
+
+def fmt_time(value) -> Optional[str]:
+    """时间 -> HH:MM（字符串取前 5 位）"""
+    if value is None:
+        return None
+    if isinstance(value, (time, datetime)):
+        return f"{value.hour:02d}:{value.minute:02d}"
+    return str(value)[:5]
+
+
+def fmt_datetime(value: Optional[datetime], seconds: bool = False) -> Optional[str]:
+    """日期时间 -> YYYY-MM-DD HH:MM[:SS]"""
+    if value is None:
+        return None
+    if value.tzinfo is not None:
+        return value.strftime("%Y-%m-%d %H:%M:%S" if seconds else "%Y-%m-%d %H:%M")
+    return value.isoformat(" ", "seconds" if seconds else "minutes")
+
+
+# ==================== 实体行编码 ====================
+
+def venue_card(v) -> dict:
+    """场馆列表项（需预加载 venue_type）"""
+    images = json_list(v.images)
+    return {
+        "id": v.id,
+        "name": v.name,
+        "type_id": v.type_id,
+        "image": resolve_image_url(images[0] if images else None, "card"),
+        "type_name": v.venue_type.name if v.venue_type else None,
+        "location": v.location,
+        "price": money(v.price),
+        "status": v.status
+    }
+
+
+def venue_detail(v) -> dict:
+    """场馆详情（需预加载 venue_type）"""
+    images_full = [resolve_image_url(img, "full") for img in json_list(v.images)]
+    return {
+        "id": v.id,
+        "name": v.name,
+        "type_id": v.type_id,
+        "image": images_full[0] if images_full else None,
+        "images": images_full,
+        "type_name": v.venue_type.name if v.venue_type else None,
+        "location": v.location,
+        "price": money(v.price),
+        "description": v.description,
+        "facilities": json_list(v.facilities),
+        "capacity": v.capacity,
+        "status": v.status
+    }
+
+
+def coach_card(c) -> dict:
+    """教练列表项"""
+    return {
+        "id": c.id,
+        "name": c.name,
+        "avatar": c.avatar,
+        "type": c.type,
+        "type_name": c.type_name,
+        "level": c.level,
+        "rating": c.rating,
+        "price": money(c.price),
+        "introduction": c.introduction,
+        "skills": json_list(c.skills, split_fallback=True),
+        "total_courses": c.total_courses or 0
+    }
+
+
+def coach_detail(c) -> dict:
+    """教练详情（列表字段 + 证书、照片；total_courses 排在最后，与原接口一致）"""
+    card = coach_card(c)
+    total_courses = card.pop("total_courses")
+    return {
+        **card,
+        "skills": json_list(c.skills),
+        "certificates": json_list(c.certificates),
+        "photos": json_list(c.photos),
+        "total_courses": total_courses,
+    }
+
+
+def product_card(p) -> dict:
+    """商城商品列表项"""
+    return {
+        "id": p.id,
+        "name": p.name,
+        "image": p.image,
+        "points": p.points or 0,
+        "price": money(p.price),
+        "original_price": money(p.market_price) if p.market_price else 0,
+        "description": p.description,
+        "category_id": p.category_id,
+        "stock": available_stock(p),
+        "sales": p.sales or 0,
+    }
+
+
+def team_card(t, is_expired: bool) -> dict:
+    """组队列表项公共字段（组队广场与我的组队共用）"""
+    return {
+        "id": t.id,
+        "title": t.title,
+        "sport_type": t.sport_type,
+        "sport_type_name": SPORT_TYPES.get(t.sport_type, t.sport_type),
+        "activity_date": t.activity_date,
+        "activity_time": t.activity_time,
+        "location": t.location,
+        "max_members": t.max_members,
+        "current_members": t.current_members,
+        "status": t.status,
+        "is_expired": is_expired,
+        "created_at": str(t.created_at) if t.created_at else None
+    }
+
+
+def team_is_expired(t, now: datetime) -> bool:
+    """招募中但活动开始时间已过"""
+    return t.status == "recruiting" and t.starts_at is not None and t.starts_at < now
+
+
+def checkin_record(r) -> dict:
+    """打卡记录（需预加载 venue.venue_type）"""
+    venue = r.venue
+    return {
+        "id": r.id,
+        "venue_name": venue.name if venue else None,
+        "venue_type_name": venue.venue_type.name if venue and venue.venue_type else None,
+        "check_in_time": fmt_datetime(r.check_in_time),
+        "check_out_time": fmt_datetime(r.check_out_time),
+        "duration": r.duration,
+        "points_earned": r.points_earned,
+        "check_date": str(r.check_date)
+    }
+
+
+def leaderboard_entry(entry) -> dict:
+    """排行榜条目（需预加载 member.level）"""
+    member = entry.member
+    return {
+        "rank": entry.rank,
+        "member_id": entry.member_id,
+        "nickname": member.nickname if member else None,
+        "avatar": member.avatar if member else None,
+        "level_name": member.level.name if member and member.level else None,
+        "total_duration": entry.total_duration,
+        "check_count": entry.check_count
+    }
@@ -0,0 +1,396 @@
+"""会员端API：组队"""
+from datetime import datetime
+from typing import Optional
+from pydantic import BaseModel
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.orm import Session, joinedload
+
+from app.core.database import get_db
+from app.models import Member
+from app.schemas.common import ResponseModel
+from app.api.deps import get_current_member
+from app.services import counter_service
+from app.services.team_listing import (
+    TAG_TEAMS, invalidate_team_list, parse_starts_at, schedule_fields, team_list_cache,
+)
+from app.api.v1.member.serializers import SPORT_TYPES, team_card, team_is_expired
+from app.core.responses import json_response
+
+router = APIRouter()
+
+
+# ==================== 组队相关 ====================
+
+@router.get("/team-categories", response_model=ResponseModel)
+def get_team_categories():
+    """获取组队分类列表"""
+    categories = [
+        {"value": "all", "label": "全部"},
+        {"value": "golf", "label": "高尔夫"},
+        {"value": "pickleball", "label": "匹克球"},
+        {"value": "tennis", "label": "网球"},
+        {"value": "squash", "label": "壁球"}
+    ]
+    return ResponseModel(data=categories)
+
+
+@router.get("/teams", response_model=ResponseModel)
+def get_teams(
+    sport_type: Optional[str] = None,
+    status: Optional[str] = "recruiting",
+    page: int = 1,
+    limit: int = 20,
+    db: Session = Depends(get_db)
+):
+    """获取组队列表（短时缓存，创建/加入/退出组队后失效）"""
+    key = f"teams:{sport_type or 'all'}:{status or ''}:{page}:{limit}"
+    entry = team_list_cache.get_or_build(key, (TAG_TEAMS,), lambda: _build_teams(db, sport_type, status, page, limit))
+    return Response(content=entry.body, media_type="application/json")
+
+
+def _build_teams(db: Session, sport_type: Optional[str], status: Optional[str], page: int, limit: int) -> list:
+    from app.models.team import Team
+
+    query = db.query(Team).options(joinedload(Team.creator)).filter(Team.is_deleted == False)
+
+    # 按状态 + 运动类型 + 开始时间走 idx_team_status_sport_starts；
+    # 「全部」展开为全部运动类型，仍是索引上的若干段范围扫描
+    if status:
+        query = query.filter(Team.status == status)
+    if sport_type and sport_type != "all":
+        query = query.filter(Team.sport_type == sport_type)
+    else:
+        query = query.filter(Team.sport_type.in_(list(SPORT_TYPES)))
+
+    # 过滤已过期组队，按活动时间升序，最近要开始的排前面
+    now = datetime.now()
+    teams = query.filter(Team.starts_at >= now)\
+                 .order_by(Team.starts_at.asc(), Team.id.asc())\
+                 .offset((page - 1) * limit).limit(limit).all()
+
+    result = []
+    for t in teams:
+        # 获取发起人信息（已随列表一次加载）
+        creator_name = "匿名用户"
+        creator_avatar = None
+        if t.creator:
+            creator_name = t.creator.nickname or t.creator.phone or "匿名用户"
+            creator_avatar = t.creator.avatar
+
+        item = team_card(t, team_is_expired(t, now))
+        item.update({
+            "description": t.description,
+            "fee_type": t.fee_type,
+            "fee_amount": t.fee_amount,
+            "creator_id": t.creator_id,
+            "creator_name": creator_name,
+            "creator_avatar": creator_avatar,
+        })
+        result.append(item)
+    return result
+
+
+class TeamCreate(BaseModel):
+    """创建组队请求"""
+    title: str
+    sport_type: str
+    description: Optional[str] = None
+    activity_date: str
+    activity_time: str
+    location: Optional[str] = None
+    max_members: int = 4
+    fee_type: str = "AA"
+    fee_amount: int = 0
+
+
+@router.post("/teams", response_model=ResponseModel)
+def create_team(
+    data: TeamCreate,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """创建组队"""
+    from app.models.team import Team, TeamMember
+
+    # 验证运动类型
+    if data.sport_type not in SPORT_TYPES:
+        raise HTTPException(status_code=400, detail="无效的运动类型")
+
+    starts_at = parse_starts_at(data.activity_date, data.activity_time)
+    if starts_at is None:
+        raise HTTPException(status_code=400, detail="活动日期或时间格式错误")
+
+    # 创建组队
+    team = Team(
+        creator_id=current_member.id,
+        title=data.title,
+        sport_type=data.sport_type,
+        description=data.description,
+        **schedule_fields(starts_at),
+        location=data.location,
+        max_members=data.max_members,
+        current_members=1,
+        fee_type=data.fee_type,
+        fee_amount=data.fee_amount,
+        status="recruiting"
+    )
+    db.add(team)
+    db.flush()
+
+    # 创建者自动加入
+    team_member = TeamMember(
+        team_id=team.id,
+        member_id=current_member.id,
+        status="joined"
+    )
+    db.add(team_member)
+    db.commit()
+    invalidate_team_list()
+
+    return ResponseModel(
+        message="创建成功",
+        data={"id": team.id}
+    )
+
+
+@router.get("/teams/{team_id}", response_model=ResponseModel)
+def get_team_detail(
+    team_id: int,
+    db: Session = Depends(get_db)
+):
+    """获取组队详情"""
+    from app.models.team import Team, TeamMember
+
+    team = db.query(Team).filter(
+        Team.id == team_id,
+        Team.is_deleted == False
+    ).first()
+
+    if not team:
+        raise HTTPException(status_code=404, detail="组队不存在")
+
+    # 获取发起人信息（前端期望嵌套对象: team.creator.nickname / team.creator.avatar）
+    creator_info = {
+        "id": team.creator_id,
+        "nickname": "匿名用户",
+        "avatar": None
+    }
+    if team.creator:
+        creator_info = {
+            "id": team.creator.id,
+            "nickname": team.creator.nickname or "匿名用户",
+            "avatar": team.creator.avatar
+        }
+
+    # 获取成员列表（前端期望: item.member_id, item.status, item.member.avatar）
+    members = db.query(TeamMember).filter(
+        TeamMember.team_id == team_id,
+        TeamMember.status == "joined"
+    ).all()
+
+    member_list = []
+    for m in members:
+        member_info = {
+            "id": m.id,
+            "member_id": m.member_id,
+            "status": m.status,
+            "is_creator": m.member_id == team.creator_id,
+            "member": {
+                "id": m.member.id,
+                "nickname": m.member.nickname or m.member.phone or "匿名用户",
+                "avatar": m.member.avatar
+            }
+        } if m.member else {
+            "id": m.id,
+            "member_id": m.member_id,
+            "status": m.status,
+            "is_creator": False,
+            "member": {"id": m.member_id, "nickname": "匿名用户", "avatar": None}
+        }
+        member_list.append(member_info)
+
+    # 计算过期态（与 /teams、/my-teams 保持一致）
+    is_expired = team_is_expired(team, datetime.now())
+
+    return ResponseModel(data={
+        "id": team.id,
+        "title": team.title,
+        "sport_type": team.sport_type,
+        "sport_type_name": SPORT_TYPES.get(team.sport_type, team.sport_type),
+        "description": team.description,
+        "activity_date": team.activity_date,
+        "activity_time": team.activity_time,
+        "location": team.location,
+        "max_members": team.max_members,
+        "current_members": team.current_members,
+        "fee_type": team.fee_type,
+        "fee_amount": team.fee_amount,
+        "status": team.status,
+        "is_expired": is_expired,
+        "creator_id": team.creator_id,
+        "creator": creator_info,
+        "members": member_list,
+        "created_at": str(team.created_at) if team.created_at else None
+    })
+
+
+@router.post("/teams/{team_id}/join", response_model=ResponseModel)
+def join_team(
+    team_id: int,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """加入组队"""
+    from app.models.team import Team, TeamMember
+
+    team = db.query(Team).filter(
+        Team.id == team_id,
+        Team.is_deleted == False
+    ).first()
+
+    if not team:
+        raise HTTPException(status_code=404, detail="组队不存在")
+
+    if team.status != "recruiting":
+        raise HTTPException(status_code=400, detail="该组队已停止招募")
+
+    # 过期兜底：活动时间已过，即便 status 仍是 recruiting 也不允许加入
+    if team.starts_at is None or team.starts_at < datetime.now():
+        raise HTTPException(status_code=400, detail="该组队活动已过期")
+
+    # 检查是否已加入
+    existing = db.query(TeamMember).filter(
+        TeamMember.team_id == team_id,
+        TeamMember.member_id == current_member.id,
+        TeamMember.status == "joined"
+    ).first()
+
+    if existing:
+        raise HTTPException(status_code=400, detail="您已加入该组队")
+
+    # 条件占位：人数 < 上限才 +1，并发加入不会超员
+    if not counter_service.claim(db, counter_service.TEAM_MEMBERS, team_id):
+        raise HTTPException(status_code=400, detail="该组队已满员")
+
+    # 加入组队
+    team_member = TeamMember(
+        team_id=team_id,
+        member_id=current_member.id,
+        status="joined"
+    )
+    db.add(team_member)
+
+    if team.current_members >= team.max_members:
+        team.status = "full"
+
+    db.commit()
+    invalidate_team_list()
+
+    return ResponseModel(message="加入成功")
+
+
+@router.post("/teams/{team_id}/quit", response_model=ResponseModel)
+def quit_team(
+    team_id: int,
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """退出组队"""
+    from app.models.team import Team, TeamMember
+
+    team = db.query(Team).filter(
+        Team.id == team_id,
+        Team.is_deleted == False
+    ).first()
+
+    if not team:
+        raise HTTPException(status_code=404, detail="组队不存在")
+
+    if team.creator_id == current_member.id:
+        raise HTTPException(status_code=400, detail="发起人不能退出，请解散组队")
+
+    # 查找成员记录
+    team_member = db.query(TeamMember).filter(
+        TeamMember.team_id == team_id,
+        TeamMember.member_id == current_member.id,
+        TeamMember.status == "joined"
+    ).first()
+
+    if not team_member:
+        raise HTTPException(status_code=400, detail="您未加入该组队")
+
+    # 退出
+    team_member.status = "quit"
+    counter_service.release(db, counter_service.TEAM_MEMBERS, team_id)
+    if team.status == "full":
+        team.status = "recruiting"
+
+    db.commit()
+    invalidate_team_list()
+
+    return ResponseModel(message="退出成功")
+
+
+# ==================== 我的组队 ====================
+
+@router.get("/my-teams", response_model=ResponseModel)
+def get_my_teams(
+    role: str = Query("all"),
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100),
+    current_member: Member = Depends(get_current_member),
+    db: Session = Depends(get_db)
+):
+    """获取我的组队列表"""
+    from app.models.team import Team, TeamMember
+
+    if role not in ("all", "created", "joined"):
+        role = "all"
+
+    member_id = current_member.id
+    created_ids = set()
+    joined_ids = set()
+
+    if role in ("all", "created"):
+        created_teams = db.query(Team.id).filter(
+            Team.creator_id == member_id,
+            Team.is_deleted == False
+        ).all()
+        created_ids = {t.id for t in created_teams}
+
+    if role in ("all", "joined"):
+        joined_teams = db.query(TeamMember.team_id).filter(
+            TeamMember.member_id == member_id,
+            TeamMember.status == "joined"
+        ).all()
+        joined_ids = {t.team_id for t in joined_teams} - created_ids  # 排除自己创建的
+
+    all_ids = created_ids | joined_ids
+    if not all_ids:
+        return ResponseModel(data={"list": [], "total": 0, "page": page, "page_size": page_size})
+
+    query = db.query(Team).filter(
+        Team.id.in_(all_ids),
+        Team.is_deleted == False
+    ).order_by(Team.created_at.desc())
+
+    total = query.count()
+    teams = query.offset((page - 1) * page_size).limit(page_size).all()
+
+    # 计算活动过期态：recruiting 且开始时间已早于当前时间 → 显示为"已过期"
+    # 仅覆盖 recruiting，保留 full/completed/cancelled 的语义（user 关心的是历史状态）
+    now = datetime.now()
+
+    result = []
+    for t in teams:
+        item = team_card(t, team_is_expired(t, now))
+        item["role"] = "creator" if t.id in created_ids else "member"
+        result.append(item)
+
+    return json_response({
+        "list": result,
+        "total": total,
+        "page": page,
+        "page_size": page_size
+    })
@@ -0,0 +1,234 @@
+"""会员端API：场馆列表/详情、时间段、场馆日历、价目表"""
+from datetime import datetime
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import func, select
+
+from app.core.database import get_db, get_async_db
+from app.models import Venue, VenueType, Reservation
+from app.schemas.common import ResponseModel
+from app.services.catalog_cache import catalog_cache, cached_json_response, TAG_VENUES, TAG_VENUE_TYPES
+from app.api.v1.member.serializers import venue_card, venue_detail
+from app.core.responses import json_response
+
+router = APIRouter()
+
+
+# ==================== 场馆相关 ====================
+
+@router.get("/venues", response_model=ResponseModel)
+async def get_venues(
+    request: Request,
+    type_id: Optional[int] = None,
+    page: int = 1,
+    limit: int = 10,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取场馆列表"""
+    entry = await catalog_cache.aget_or_build(
+        f"venues:{type_id or 0}:{page}:{limit}", (TAG_VENUES, TAG_VENUE_TYPES),
+        lambda: _build_venues(db, type_id, page, limit),
+    )
+    return cached_json_response(request, entry)
+
+
+async def _build_venues(db: AsyncSession, type_id: Optional[int], page: int, limit: int) -> list:
+    stmt = select(Venue).options(selectinload(Venue.venue_type)).where(
+        Venue.is_deleted == False, Venue.status == 1
+    )
+
+    if type_id:
+        stmt = stmt.where(Venue.type_id == type_id)
+
+    venues = (await db.execute(stmt.offset((page - 1) * limit).limit(limit))).scalars().all()
+
+    return [venue_card(v) for v in venues]
+
+
+@router.get("/venues/{venue_id}", response_model=ResponseModel)
+async def get_venue_detail(request: Request, venue_id: int, db: AsyncSession = Depends(get_async_db)):
+    """获取场馆详情"""
+    entry = await catalog_cache.aget_or_build(
+        f"venue:{venue_id}", (TAG_VENUES, TAG_VENUE_TYPES),
+        lambda: _build_venue_detail(db, venue_id),
+    )
+    return cached_json_response(request, entry)
+
+
+async def _build_venue_detail(db: AsyncSession, venue_id: int) -> dict:
+    venue = (await db.execute(
+        select(Venue).options(selectinload(Venue.venue_type)).where(
+            Venue.id == venue_id,
+            Venue.is_deleted == False
+        )
+    )).scalars().first()
+
+    if not venue:
+        raise HTTPException(status_code=404, detail="场馆不存在")
+
+    return venue_detail(venue)
+
+
+@router.get("/venues/{venue_id}/slots", response_model=ResponseModel)
+async def get_venue_slots(
+    venue_id: int,
+    date: str = Query(...),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取场馆时间段"""
+    # 获取已预约的时间段（只取起止时间列）
+    rows = (await db.execute(
+        select(Reservation.start_time, Reservation.end_time).where(
+            Reservation.venue_id == venue_id,
+            Reservation.reservation_date == date,
+            Reservation.status.in_(["pending", "confirmed", "in_progress"]),
+            Reservation.is_deleted == False
+        )
+    )).all()
+
+    reserved_hours = set()
+    for start_time, end_time in rows:
+        for h in range(start_time.hour, end_time.hour):
+            reserved_hours.add(h)
+
+    # 生成时间段列表（06:00-24:00）
+    slots = []
+    for hour in range(6, 24):
+        status = "reserved" if hour in reserved_hours else "available"
+        slots.append({
+            "time": f"{hour:02d}:00",
+            "label": f"{hour:02d}:00 - {hour+1:02d}:00",
+            "status": status
+        })
+
+    return ResponseModel(data=slots)
+
+
+@router.get("/venue-types", response_model=ResponseModel)
+def get_venue_types(request: Request, db: Session = Depends(get_db)):
+    """获取场馆类型列表（包含场馆数量）"""
+    entry = catalog_cache.get_or_build(
+        "venue_types", (TAG_VENUES, TAG_VENUE_TYPES), lambda: _build_venue_types(db)
+    )
+    return cached_json_response(request, entry)
+
+
+def _build_venue_types(db: Session) -> list:
+    types = db.query(VenueType).filter(VenueType.status == True).order_by(VenueType.sort).all()
+
+    # 一次分组统计各类型场馆数量
+    counts = dict(db.query(Venue.type_id, func.count(Venue.id)).filter(
+        Venue.is_deleted == False,
+        Venue.status == 1
+    ).group_by(Venue.type_id).all())
+
+    return [{
+        "id": t.id,
+        "name": t.name,
+        "icon": t.icon,
+        "venue_count": counts.get(t.id, 0)
+    } for t in types]
+
+
+@router.get("/venue-calendar", response_model=ResponseModel)
+async def get_venue_calendar(
+    type_id: int = Query(..., description="场馆类型ID"),
+    date: str = Query(..., description="日期 YYYY-MM-DD"),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """获取场馆日历视图（用于预约日历）
+    返回指定类型所有场馆的时间段状态
+    """
+    # 获取该类型下所有场馆
+    venues = (await db.execute(
+        select(Venue.id, Venue.name, Venue.price).where(
+            Venue.type_id == type_id,
+            Venue.is_deleted == False,
+            Venue.status == 1
+        ).order_by(Venue.sort, Venue.id)
+    )).all()
+
+    if not venues:
+        return ResponseModel(data={"venues": [], "time_slots": []})
+
+    venue_ids = [v.id for v in venues]
+
+    # 获取这些场馆在指定日期的所有预约（只取场馆和起止时间列）
+    reservations = (await db.execute(
+        select(Reservation.venue_id, Reservation.start_time, Reservation.end_time).where(
+            Reservation.venue_id.in_(venue_ids),
+            Reservation.reservation_date == date,
+            Reservation.status.in_(["pending", "confirmed", "in_progress"]),
+            Reservation.is_deleted == False
+        )
+    )).all()
+
+    # 构建预约映射 {venue_id: {已预约小时}}
+    reservation_map = {}
+    for venue_id, start_time, end_time in reservations:
+        reservation_map.setdefault(venue_id, set()).update(range(start_time.hour, end_time.hour))
+
+    # 生成时间段列表（06:00-24:00）
+    time_slots = []
+    for hour in range(6, 24):
+        time_slots.append({
+            "hour": hour,
+            "time": f"{hour:02d}:00",
+            "label": f"{hour:02d}:00"
+        })
+
+    # 判断当天已过去的时间段
+    now = datetime.now()
+    today_str = now.strftime("%Y-%m-%d")
+    current_hour = now.hour
+    is_today = (date == today_str)
+
+    # 构建场馆数据
+    venue_data = []
+    for v in venues:
+        slots = []
+        venue_reservations = reservation_map.get(v.id, set())
+        for hour in range(6, 24):
+            if is_today and hour <= current_hour:
+                status = "past"
+            elif hour in venue_reservations:
+                status = "reserved"
+            else:
+                status = "available"
+            slots.append({
+                "hour": hour,
+                "status": status
+            })
+
+        venue_data.append({
+            "id": v.id,
+            "name": v.name,
+            "price": float(v.price or 0),
+            "slots": slots
+        })
+
+    return json_response({
+        "venues": venue_data,
+        "time_slots": time_slots
+    })
+
+
+# ==================== 场馆价目表 ====================
+
+@router.get("/venues/{venue_id}/price-table", response_model=ResponseModel)
+def get_venue_price_table(
+    venue_id: int,
+    date: str = Query(..., description="日期 YYYY-MM-DD"),
+    db: Session = Depends(get_db)
+):
+    """获取场馆某天价目表"""
+    from app.services.venue_pricing_service import VenuePricingService
+    pricing = VenuePricingService(db)
+
+    target_date = datetime.strptime(date, "%Y-%m-%d").date()
+    table = pricing.get_price_table(venue_id, target_date)
+
+    return ResponseModel(data=table)
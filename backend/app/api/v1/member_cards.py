@@ -12,6 +12,7 @@ from app.core.database import get_db
 from app.api.deps import get_current_user
 from app.models.member import MemberLevel, MemberCard, MemberCardOrder, Member
 from app.schemas.response import ResponseModel, PageResponseModel
+from app.services.catalog_cache import catalog_cache, TAG_MEMBER_CARDS
 
 router = APIRouter()
 
@@ -77,6 +78,7 @@ def create_member_level(
     )
     db.add(level)
     db.commit()
+    catalog_cache.invalidate(TAG_MEMBER_CARDS)
     db.refresh(level)
 
     return ResponseModel(message="创建成功", data={"id": level.id})
@@ -101,6 +103,7 @@ def update_member_level(
             setattr(level, key, value)
 
     db.commit()
+    catalog_cache.invalidate(TAG_MEMBER_CARDS)
     return ResponseModel(message="更新成功")
 
 
@@ -130,6 +133,7 @@ def delete_member_level(
 
     db.delete(level)
     db.commit()
+    catalog_cache.invalidate(TAG_MEMBER_CARDS)
     return ResponseModel(message="删除成功")
 
 
@@ -265,6 +269,7 @@ def create_member_card(
     )
     db.add(card)
     db.commit()
+    catalog_cache.invalidate(TAG_MEMBER_CARDS)
     db.refresh(card)
 
     return ResponseModel(message="创建成功", data={"id": card.id})
@@ -299,6 +304,7 @@ def update_member_card(
             setattr(card, key, value)
 
     db.commit()
+    catalog_cache.invalidate(TAG_MEMBER_CARDS)
     return ResponseModel(message="更新成功")
 
 
@@ -319,6 +325,7 @@ def delete_member_card(
 
     card.is_deleted = True
     db.commit()
+    catalog_cache.invalidate(TAG_MEMBER_CARDS)
     return ResponseModel(message="删除成功")
 
 
@@ -339,6 +346,7 @@ def toggle_card_active(
 
     card.is_active = not card.is_active
     db.commit()
+    catalog_cache.invalidate(TAG_MEMBER_CARDS)
 
     return ResponseModel(message="上架成功" if card.is_active else "下架成功")
 
@@ -4,6 +4,7 @@ from datetime import datetime, timedelta
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
+from app.core.config import settings
 from app.core.database import get_db
 from app.models import SysUser, Member, MemberLevel, MemberTag, CoinRecord, PointRecord
 from app.schemas import (
@@ -11,10 +12,11 @@ from app.schemas import (
     MemberLevelCreate, MemberLevelUpdate, MemberLevelResponse,
     MemberTagCreate, MemberTagUpdate, MemberTagResponse,
     MemberCreate, MemberUpdate, MemberResponse,
-    CoinRechargeRequest, PointRechargeRequest,
+    CoinRechargeRequest, PointRechargeRequest, BatchRechargeRequest,
     CoinRecordResponse, PointRecordResponse,
 )
 from app.api.deps import get_current_user
+from app.services import wallet_service
 
 router = APIRouter()
 
@@ -295,22 +297,7 @@ def recharge_coin(
     if data.amount == 0:
         raise HTTPException(status_code=400, detail="调整金额不能为0")
 
-    new_balance = member.coin_balance + data.amount
-    if new_balance < 0:
-        raise HTTPException(status_code=400, detail=f"余额不足，当前余额: {member.coin_balance}")
-
-    member.coin_balance = new_balance
-
-    record = CoinRecord(
-        member_id=member.id,
-        type="income" if data.amount > 0 else "expense",
-        amount=abs(data.amount),
-        balance=member.coin_balance,
-        source="后台调整",
-        remark=data.remark,
-        operator_id=current_user.id
-    )
-    db.add(record)
+    _adjust_balance(db, member.id, wallet_service.COIN, data.amount, data.remark, current_user.id)
     db.commit()
 
     return ResponseModel(message="调整成功")
@@ -333,25 +320,57 @@ def recharge_point(
     if data.amount == 0:
         raise HTTPException(status_code=400, detail="调整数量不能为0")
 
-    new_balance = member.point_balance + data.amount
-    if new_balance < 0:
-        raise HTTPException(status_code=400, detail=f"余额不足，当前余额: {member.point_balance}")
+    _adjust_balance(db, member.id, wallet_service.POINT, data.amount, data.remark, current_user.id)
+    db.commit()
+
+    return ResponseModel(message="调整成功")
+
 
-    member.point_balance = new_balance
+@router.post("/recharge/batch", response_model=ResponseModel)
+def batch_recharge(
+    data: BatchRechargeRequest,
+    db: Session = Depends(get_db),
+    current_user: SysUser = Depends(get_current_user)
+):
+    """批量发放金币/积分（一条 UPDATE 完成全部会员入账）"""
+    if data.kind not in (wallet_service.COIN, wallet_service.POINT):
+        raise HTTPException(status_code=400, detail="发放类型无效")
+    # 按入账精度校验：积分须为整数、金币最多两位小数，不静默截断
+    amount = wallet_service.normalize(data.kind, data.amount)
+    if amount != data.amount:
+        detail = "积分数量必须为整数" if data.kind == wallet_service.POINT else "金币数量最多保留两位小数"
+        raise HTTPException(status_code=400, detail=detail)
+    if amount <= 0:
+        raise HTTPException(status_code=400, detail="发放数量必须大于0")
+    if len(data.member_ids) > settings.MEMBER_BATCH_RECHARGE_MAX:
+        raise HTTPException(status_code=400, detail=f"单次最多发放{settings.MEMBER_BATCH_RECHARGE_MAX}个会员")
+    member_ids = [
+        member_id for (member_id,) in db.query(Member.id).filter(
+            Member.id.in_(set(data.member_ids)),
+            Member.is_deleted == False
+        )
+    ]
+    if not member_ids:
+        raise HTTPException(status_code=404, detail="会员不存在")
 
-    record = PointRecord(
-        member_id=member.id,
-        type="income" if data.amount > 0 else "expense",
-        amount=abs(data.amount),
-        balance=member.point_balance,
-        source="后台调整",
-        remark=data.remark,
-        operator_id=current_user.id
+    balances = wallet_service.credit_many(
+        db, data.kind, [(member_id, amount) for member_id in member_ids],
+        source="后台发放", remark=data.remark, operator_id=current_user.id
     )
-    db.add(record)
     db.commit()
 
-    return ResponseModel(message="调整成功")
+    return ResponseModel(message="发放成功", data={"count": len(balances)})
+
+
+def _adjust_balance(db: Session, member_id: int, kind: str, amount, remark: Optional[str], operator_id: int):
+    """后台调整：正数入账，负数条件扣减（不足时报当前余额）"""
+    if amount > 0:
+        wallet_service.credit(db, member_id, kind, amount, source="后台调整", remark=remark, operator_id=operator_id)
+        return
+    try:
+        wallet_service.debit(db, member_id, kind, -amount, source="后台调整", remark=remark, operator_id=operator_id)
+    except wallet_service.InsufficientBalance as e:
+        raise HTTPException(status_code=400, detail=f"余额不足，当前余额: {e.balance}")
 
 
 @router.get("/{member_id}/coin-records", response_model=ResponseModel[PageResult[CoinRecordResponse]])
@@ -13,6 +13,7 @@ from app.models.message import MessageTemplate, Message, Announcement, Banner
 from app.models.member import Member
 from app.models.coach import Coach
 from app.schemas.response import ResponseModel, PageResponseModel
+from app.services.catalog_cache import catalog_cache, TAG_BANNERS
 
 router = APIRouter()
 
@@ -438,6 +439,7 @@ def create_banner(
     )
     db.add(banner)
     db.commit()
+    catalog_cache.invalidate(TAG_BANNERS)
     db.refresh(banner)
 
     return ResponseModel(message="创建成功", data={"id": banner.id})
@@ -466,6 +468,7 @@ def update_banner(
             setattr(banner, key, value)
 
     db.commit()
+    catalog_cache.invalidate(TAG_BANNERS)
     return ResponseModel(message="更新成功")
 
 
@@ -486,4 +489,5 @@ def delete_banner(
 
     banner.is_deleted = True
     db.commit()
+    catalog_cache.invalidate(TAG_BANNERS)
     return ResponseModel(message="删除成功")
@@ -2,7 +2,9 @@
 微信支付相关API（小程序端使用）
 """
 from fastapi import APIRouter, Depends, Request, Header
+from sqlalchemy import update
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from datetime import datetime, timedelta
 from decimal import Decimal
 import json
@@ -10,10 +12,9 @@ import json
 from app.core.database import get_db
 from app.core.wechat_pay import wechat_pay
 from app.models.finance import RechargeOrder
-from app.models.member import Member, CoinRecord, PointRecord, MemberCardOrder, MemberCard
-from app.models import Reservation
-from app.models.coupon import MemberCoupon
+from app.models.member import Member
 from app.schemas.response import ResponseModel
+from app.services import payment_notify_service
 
 import logging
 logger = logging.getLogger(__name__)
@@ -107,7 +108,7 @@ def create_recharge_order(
     })
 
 
-@router.post("/notify", response_model=ResponseModel)
+@router.post("/notify")
 async def payment_notify(
     request: Request,
     db: Session = Depends(get_db),
@@ -117,24 +118,41 @@ async def payment_notify(
     wechatpay_serial: str = Header(None, alias="Wechatpay-Serial")
 ):
     """
-    微信支付回调通知
+    微信支付回调通知（幂等，见 payment_notify_service）
+
+    按微信要求返回 {"code": "SUCCESS"/"FAIL", "message": ...}，不套用 ResponseModel
     """
     body = await request.body()
     body_str = body.decode('utf-8')
 
+    try:
+        notify_data = json.loads(body_str)
+    except ValueError:
+        return {"code": "FAIL", "message": "通知格式错误"}
+
+    # 重试的通知已处理过：跳过验签、解密与业务处理（仅返回成功，不产生任何变更）
+    notify_id = notify_data.get("id")
+    if payment_notify_service.is_notify_processed(notify_id):
+        return payment_notify_service.SUCCESS
+
+    # 验签、解密与数据库处理均为阻塞调用，放到线程池执行
+    result = await run_in_threadpool(
+        _process_notify, db, notify_data, body_str,
+        wechatpay_timestamp, wechatpay_nonce, wechatpay_signature, wechatpay_serial
+    )
+    if result["code"] == "SUCCESS":
+        payment_notify_service.mark_notify_processed(notify_id)
+    return result
+
+
+def _process_notify(db: Session, notify_data: dict, body_str: str,
+                    timestamp: str, nonce: str, signature: str, serial: str) -> dict:
+    """验签、解密并处理回调"""
     # 验证签名
-    if not wechat_pay.verify_signature(
-        wechatpay_timestamp,
-        wechatpay_nonce,
-        body_str,
-        wechatpay_signature,
-        wechatpay_serial
-    ):
+    if not wechat_pay.verify_signature(timestamp, nonce, body_str, signature, serial):
         return {"code": "FAIL", "message": "签名验证失败"}
 
-    # 解析通知数据
     try:
-        notify_data = json.loads(body_str)
         resource = notify_data.get("resource", {})
 
         # 解密resource
@@ -143,223 +161,13 @@ async def payment_notify(
             resource.get("nonce"),
             resource.get("associated_data")
         )
-
-        if not decrypted:
-            return {"code": "FAIL", "message": "解密失败"}
-
-        out_trade_no = decrypted.get("out_trade_no")
-        transaction_id = decrypted.get("transaction_id")
-        trade_state = decrypted.get("trade_state")
-        attach = decrypted.get("attach")
-
-        # 根据订单号前缀判断订单类型
-        if out_trade_no.startswith("MC"):
-            # 会员卡订单
-            return _handle_member_card_notify(out_trade_no, transaction_id, trade_state, db)
-        elif out_trade_no.startswith("RV"):
-            # 场馆预约订单
-            return _handle_reservation_notify(out_trade_no, transaction_id, trade_state, attach, db)
-        elif out_trade_no.startswith("FD"):
-            # 餐饮订单(已迁移至美团，兼容历史未支付订单回调)
-            logger.warning(f"收到已废弃的餐饮订单回调: {out_trade_no}")
-            return {"code": "SUCCESS", "message": "成功"}
-        else:
-            # 充值订单（默认）
-            return _handle_recharge_notify(out_trade_no, transaction_id, trade_state, db)
-
     except Exception as e:
         return {"code": "FAIL", "message": str(e)}
 
+    if not decrypted:
+        return {"code": "FAIL", "message": "解密失败"}
 
-def _handle_recharge_notify(out_trade_no: str, transaction_id: str, trade_state: str, db: Session):
-    """处理充值订单支付回调"""
-    try:
-        # 使用悲观锁查询订单，确保幂等性
-        order = db.query(RechargeOrder).filter(
-            RechargeOrder.order_no == out_trade_no
-        ).with_for_update().first()
-
-        if not order:
-            db.rollback()
-            return {"code": "FAIL", "message": "订单不存在"}
-
-        # 幂等性检查：如果订单已支付，直接返回成功
-        if order.status == "paid":
-            db.rollback()
-            return {"code": "SUCCESS", "message": "成功"}
-
-        if trade_state == "SUCCESS":
-            order.status = "paid"
-            order.transaction_id = transaction_id
-            order.pay_time = datetime.now()
-
-            # 使用悲观锁查询会员，防止并发问题
-            member = db.query(Member).filter(Member.id == order.member_id).with_for_update().first()
-            if member:
-                total_coins = order.coins + order.bonus_coins
-                member.coin_balance = (member.coin_balance or 0) + total_coins
-
-                coin_record = CoinRecord(
-                    member_id=member.id,
-                    type="recharge",
-                    amount=total_coins,
-                    balance=member.coin_balance,
-                    remark=f"充值{order.amount}元，获得{order.coins}金币，赠送{order.bonus_coins}金币"
-                )
-                db.add(coin_record)
-
-            db.commit()
-        else:
-            db.rollback()
-
-        return {"code": "SUCCESS", "message": "成功"}
-    except Exception as e:
-        db.rollback()
-        return {"code": "FAIL", "message": f"处理失败: {str(e)}"}
-
-
-def _handle_member_card_notify(out_trade_no: str, transaction_id: str, trade_state: str, db: Session):
-    """处理会员卡订单支付回调"""
-    try:
-        # 使用悲观锁查询订单，确保幂等性
-        order = db.query(MemberCardOrder).filter(
-            MemberCardOrder.order_no == out_trade_no
-        ).with_for_update().first()
-
-        if not order:
-            db.rollback()
-            return {"code": "FAIL", "message": "订单不存在"}
-
-        # 幂等性检查：如果订单已支付，直接返回成功
-        if order.status == "paid":
-            db.rollback()
-            return {"code": "SUCCESS", "message": "成功"}
-
-        if trade_state == "SUCCESS":
-            now = datetime.now()
-
-            # 更新订单状态
-            order.status = "paid"
-            order.transaction_id = transaction_id
-            order.pay_time = now
-
-            # 使用悲观锁获取会员，防止并发问题
-            member = db.query(Member).filter(Member.id == order.member_id).with_for_update().first()
-            if member:
-                # 计算会员有效期
-                if member.member_expire_time and member.member_expire_time > now:
-                    start_time = member.member_expire_time
-                    expire_time = start_time + timedelta(days=order.duration_days)
-                else:
-                    start_time = now
-                    expire_time = now + timedelta(days=order.duration_days)
-
-                order.start_time = start_time
-                order.expire_time = expire_time
-
-                # 升级会员等级 + 修复subscription_status
-                member.level_id = order.level_id
-                member.member_expire_time = expire_time
-                member.subscription_status = 'active'
-                member.subscription_start_date = start_time.date() if hasattr(start_time, 'date') else now.date()
-
-                # 发放赠送金币
-                if order.bonus_coins and float(order.bonus_coins) > 0:
-                    member.coin_balance = float(member.coin_balance or 0) + float(order.bonus_coins)
-                    coin_record = CoinRecord(
-                        member_id=member.id,
-                        type="income",
-                        amount=order.bonus_coins,
-                        balance=member.coin_balance,
-                        source="会员卡赠送",
-                        remark=f"购买会员卡赠送金币，订单号：{order.order_no}"
-                    )
-                    db.add(coin_record)
-
-                # 发放赠送积分
-                if order.bonus_points and order.bonus_points > 0:
-                    member.point_balance = (member.point_balance or 0) + order.bonus_points
-                    point_record = PointRecord(
-                        member_id=member.id,
-                        type="income",
-                        amount=order.bonus_points,
-                        balance=member.point_balance,
-                        source="会员卡赠送",
-                        remark=f"购买会员卡赠送积分，订单号：{order.order_no}"
-                    )
-                    db.add(point_record)
-
-                # 更新会员卡销量
-                card = db.query(MemberCard).filter(MemberCard.id == order.card_id).first()
-                if card:
-                    card.sales_count = (card.sales_count or 0) + 1
-
-            db.commit()
-        else:
-            db.rollback()
-
-        return {"code": "SUCCESS", "message": "成功"}
-    except Exception as e:
-        db.rollback()
-        return {"code": "FAIL", "message": f"处理失败: {str(e)}"}
-
-
-def _handle_reservation_notify(out_trade_no: str, transaction_id: str, trade_state: str, attach: str, db: Session):
-    """处理场馆预约订单支付回调"""
-    try:
-        reservation = db.query(Reservation).filter(
-            Reservation.out_trade_no == out_trade_no
-        ).with_for_update().first()
-
-        if not reservation:
-            db.rollback()
-            return {"code": "FAIL", "message": "预约订单不存在"}
-
-        # 幂等性检查
-        if reservation.status != "unpaid":
-            db.rollback()
-            return {"code": "SUCCESS", "message": "成功"}
-
-        # 解析attach数据
-        try:
-            attach_data = json.loads(attach) if attach else {}
-        except (json.JSONDecodeError, TypeError):
-            attach_data = {}
-        coupon_id = attach_data.get("coupon_id")
-
-        if trade_state == "SUCCESS":
-            reservation.status = "pending"
-            reservation.transaction_id = transaction_id
-            if coupon_id:
-                coupon = db.query(MemberCoupon).filter(
-                    MemberCoupon.id == coupon_id,
-                    MemberCoupon.member_id == reservation.member_id,
-                    MemberCoupon.status.in_(['locked', 'unused'])
-                ).with_for_update().first()
-                if coupon:
-                    coupon.status = 'used'
-                    coupon.use_time = datetime.now()
-                    coupon.order_type = 'reservation'
-                    coupon.order_id = reservation.id
-
-            db.commit()
-        else:
-            # 支付失败：取消预约，解锁优惠券
-            reservation.status = "cancelled"
-            if coupon_id:
-                coupon = db.query(MemberCoupon).filter(
-                    MemberCoupon.id == coupon_id,
-                    MemberCoupon.member_id == reservation.member_id,
-                    MemberCoupon.status == 'locked'
-                ).first()
-                if coupon:
-                    coupon.status = 'unused'
-            db.commit()
-
-        return {"code": "SUCCESS", "message": "成功"}
-    except Exception as e:
-        db.rollback()
-        return {"code": "FAIL", "message": f"处理失败: {str(e)}"}
+    return payment_notify_service.handle_notify(db, decrypted)
 
 
 @router.get("/order/{order_no}", response_model=ResponseModel)
@@ -375,31 +183,13 @@ def query_order(
     if not order:
         return ResponseModel(code=404, message="订单不存在")
 
-    # 如果订单未支付，查询微信支付状态
+    # 如果订单未支付，查询微信支付状态（与回调共用条件更新，只入账一次）
     if order.status == "pending":
         result = wechat_pay.query_order(order_no)
         if result.get("trade_state") == "SUCCESS":
-            # 更新订单状态
-            order.status = "paid"
-            order.transaction_id = result.get("transaction_id")
-            order.pay_time = datetime.now()
-
-            # 给会员加金币
-            member = db.query(Member).filter(Member.id == order.member_id).first()
-            if member:
-                total_coins = order.coins + order.bonus_coins
-                member.coin_balance = (member.coin_balance or 0) + total_coins
-
-                coin_record = CoinRecord(
-                    member_id=member.id,
-                    type="recharge",
-                    amount=total_coins,
-                    balance=member.coin_balance,
-                    remark=f"充值{order.amount}元"
-                )
-                db.add(coin_record)
-
+            payment_notify_service.complete_recharge(db, order_no, result.get("transaction_id"))
             db.commit()
+            db.refresh(order)
 
     return ResponseModel(data={
         "order_no": order.order_no,
@@ -428,7 +218,15 @@ def close_order(
     # 关闭微信订单
     wechat_pay.close_order(order_no)
 
-    order.status = "closed"
+    # 条件更新：关单期间回调已将订单置为已支付时不覆盖
+    result = db.execute(
+        update(RechargeOrder).where(
+            RechargeOrder.order_no == order_no,
+            RechargeOrder.status == "pending"
+        ).values(status="closed")
+    )
     db.commit()
+    if result.rowcount == 0:
+        return ResponseModel(code=400, message="订单已支付，无法关闭")
 
     return ResponseModel(message="订单已关闭")
@@ -11,8 +11,11 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_db, get_current_user
 from app.models.ui_asset import UIIcon, UITheme, UIImage
 from app.schemas.response import ResponseModel
+from app.core.blocking_guard import BlockingGuardRoute
+from app.services.blob_store import release_blob, retain_blob
 
-router = APIRouter()
+# 接口内为同步数据库访问，由 BlockingGuardRoute 卸载到线程池，避免阻塞事件循环
+router = APIRouter(route_class=BlockingGuardRoute)
 
 # ==================== 图标管理 ====================
 
@@ -88,6 +91,8 @@ async def create_icon(
     )
 
     db.add(icon)
+    retain_blob(db, icon_normal)
+    retain_blob(db, icon_active)
     db.commit()
     db.refresh(icon)
 
@@ -117,9 +122,13 @@ async def update_icon(
         icon.name = name
     if category is not None:
         icon.category = category
-    if icon_normal is not None:
+    if icon_normal is not None and icon_normal != icon.icon_normal:
+        release_blob(db, icon.icon_normal)
+        retain_blob(db, icon_normal)
         icon.icon_normal = icon_normal
-    if icon_active is not None:
+    if icon_active is not None and icon_active != icon.icon_active:
+        release_blob(db, icon.icon_active)
+        retain_blob(db, icon_active)
         icon.icon_active = icon_active
     if description is not None:
         icon.description = description
@@ -147,6 +156,8 @@ async def delete_icon(
 
     icon.is_deleted = True
     icon.deleted_at = datetime.now()
+    release_blob(db, icon.icon_normal)
+    release_blob(db, icon.icon_active)
     db.commit()
 
     return ResponseModel(message="删除成功")
@@ -375,6 +386,7 @@ async def create_image(
     )
 
     db.add(image)
+    retain_blob(db, image_url)
     db.commit()
     db.refresh(image)
 
@@ -405,7 +417,10 @@ async def update_image(
         image.name = name
     if category is not None:
         image.category = category
-    if image_url is not None:
+    if image_url is not None and image_url != image.image_url:
+        # 替换图片时释放旧文件引用、持有新文件引用
+        release_blob(db, image.image_url)
+        retain_blob(db, image_url)
         image.image_url = image_url
     if suggested_width is not None:
         image.suggested_width = suggested_width
@@ -437,6 +452,7 @@ async def delete_image(
 
     image.is_deleted = True
     image.deleted_at = datetime.now()
+    release_blob(db, image.image_url)
     db.commit()
 
     return ResponseModel(message="删除成功")
@@ -8,8 +8,11 @@ from sqlalchemy.orm import Session
 from app.api.deps import get_db, get_current_user
 from app.models.ui_editor import UIPageConfig, UIBlockConfig, UIMenuItem, UIConfigVersion
 from app.schemas.response import ResponseModel
+from app.core.blocking_guard import BlockingGuardRoute
+from app.services.ui_config_cache import ui_config_cache
 
-router = APIRouter()
+# 接口内为同步数据库访问，由 BlockingGuardRoute 卸载到线程池，避免阻塞事件循环
+router = APIRouter(route_class=BlockingGuardRoute)
 
 
 # ==================== 页面配置管理 ====================
@@ -555,6 +558,9 @@ async def publish_config(
 
     db.commit()
 
+    # 预编译新版本响应，立即对小程序生效
+    ui_config_cache.publish(version)
+
     return ResponseModel(data={"version": new_version}, message="发布成功")
 
 
@@ -595,6 +601,8 @@ async def rollback_version(
 
     db.commit()
 
+    ui_config_cache.publish(version)
+
     return ResponseModel(message="回滚成功")
 
 
@@ -780,4 +788,6 @@ async def init_default_data(
 
     db.commit()
 
+    ui_config_cache.publish(version)
+
     return ResponseModel(message="默认数据初始化成功，已自动发布")
@@ -1,14 +1,23 @@
 """文件上传API"""
+import hashlib
 import os
 import uuid
-from datetime import datetime
 from typing import List, Optional
 
 from fastapi import APIRouter, UploadFile, File, HTTPException, Depends
 from fastapi.responses import JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
 
+from app.core.database import get_async_db
 from app.api.deps import get_current_user, get_current_member
 from app.schemas.response import ResponseModel
+from app.services.image_pipeline import (
+    IMAGE_VARIANTS, existing_derivatives, generate_derivatives_async, variant_path,
+)
+from app.services.blob_store import (
+    acquire_blob, blob_storage_path, blob_url, parse_blob_url, place_blob, release_blob_async,
+)
 
 router = APIRouter()
 
@@ -35,6 +44,8 @@ def detect_image_type(content: bytes) -> Optional[str]:
 ALLOWED_FILE_TYPES = ALLOWED_IMAGE_TYPES + ["application/pdf", "application/msword",
                                              "application/vnd.openxmlformats-officedocument.wordprocessingml.document"]
 MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+UPLOAD_CHUNK_SIZE = 256 * 1024  # 流式读取分块大小
+IMAGE_EXT_MAP = {"image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif", "image/webp": ".webp"}
 
 
 def ensure_upload_dir(folder: str = ""):
@@ -45,90 +56,143 @@ def ensure_upload_dir(folder: str = ""):
     return path
 
 
-def generate_filename(original_filename: str) -> str:
-    """生成唯一文件名"""
-    ext = os.path.splitext(original_filename)[1].lower()
-    date_str = datetime.now().strftime("%Y%m%d")
-    unique_id = uuid.uuid4().hex[:8]
-    return f"{date_str}_{unique_id}{ext}"
+def _discard(fileobj, path: str):
+    fileobj.close()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+async def save_upload_stream(file: UploadFile, image_only: bool = False) -> dict:
+    """分块读取上传文件并写入临时文件
+
+    - 每次只读取 UPLOAD_CHUNK_SIZE 字节，单个上传的内存占用以分块大小为上限
+    - 累计大小超过 MAX_FILE_SIZE 立即中止并删除已写入部分
+    - 首块检测文件头，image_only 时非图片直接拒绝，图片按真实类型决定扩展名
+    - 边读边计算 SHA-256；磁盘写入在线程池中执行，不阻塞事件循环
+
+    返回 {temp_path, ext, size, sha256, content_type}
+    """
+    first = await file.read(UPLOAD_CHUNK_SIZE)
+    actual_type = detect_image_type(first)
+    if image_only and not actual_type:
+        raise HTTPException(status_code=400, detail="不支持的图片格式，请上传 JPG/PNG/GIF/WEBP 格式")
+
+    # 使用检测到的真实扩展名，而非原始文件名的扩展名
+    if actual_type:
+        ext = IMAGE_EXT_MAP[actual_type]
+    else:
+        ext = os.path.splitext(file.filename or "")[1].lower()
+    temp_path = os.path.join(ensure_upload_dir("tmp"), f"{uuid.uuid4().hex}.part")
+
+    digest = hashlib.sha256()
+    size = 0
+    fileobj = await run_in_threadpool(open, temp_path, "wb")
+    try:
+        chunk = first
+        while chunk:
+            size += len(chunk)
+            if size > MAX_FILE_SIZE:
+                raise HTTPException(status_code=400, detail=f"文件大小超过限制（最大 {MAX_FILE_SIZE // 1024 // 1024}MB）")
+            digest.update(chunk)
+            await run_in_threadpool(fileobj.write, chunk)
+            chunk = await file.read(UPLOAD_CHUNK_SIZE)
+        await run_in_threadpool(fileobj.close)
+    except BaseException:
+        await run_in_threadpool(_discard, fileobj, temp_path)
+        raise
+
+    return {
+        "temp_path": temp_path,
+        "ext": ext,
+        "size": size,
+        "sha256": digest.hexdigest(),
+        "content_type": actual_type or file.content_type,
+    }
+
+
+async def store_upload(
+    file: UploadFile, db: AsyncSession, image_only: bool = False, derivatives: bool = False
+) -> dict:
+    """流式接收上传文件并存入内容寻址存储（相同内容只保存一份），返回稳定 URL
+
+    返回 {url, path, filename, size, sha256, content_type, variants}
+    """
+    saved = await save_upload_stream(file, image_only=image_only)
+    storage_path = blob_storage_path(saved["sha256"], saved["ext"])
+    # 先登记引用再落盘，避免 GC 在两步之间回收同内容文件
+    await acquire_blob(db, saved["sha256"], storage_path, saved["size"], saved["content_type"])
+    url = blob_url(storage_path)
+    try:
+        file_path = await run_in_threadpool(place_blob, saved["temp_path"], storage_path)
+    except BaseException:
+        # 落盘失败：释放刚登记的引用，避免计数泄漏导致文件永不回收
+        await release_blob_async(db, url)
+        raise
+
+    variants = {}
+    if derivatives:
+        variants = existing_derivatives(file_path) or await generate_derivatives_async(file_path)
+
+    return {
+        "url": url,
+        "path": file_path,
+        "filename": os.path.basename(file_path),
+        "size": saved["size"],
+        "sha256": saved["sha256"],
+        "content_type": saved["content_type"],
+        "variants": variant_urls(url, variants),
+    }
+
+
+def variant_urls(relative_url: str, variants: dict) -> dict:
+    """衍生图文件路径 -> 对应访问URL"""
+    return {
+        name: variant_path(relative_url, name.replace("_webp", ""), webp=name.endswith("_webp"))
+        for name in variants
+    }
 
 
 @router.post("/image", response_model=ResponseModel)
 async def upload_image(
     file: UploadFile = File(...),
     folder: str = "images",
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
-    """上传单张图片"""
+    """上传单张图片（folder 参数保留兼容，文件统一按内容寻址存储）"""
     # 验证文件类型
     if file.content_type not in ALLOWED_IMAGE_TYPES:
         raise HTTPException(status_code=400, detail="不支持的图片格式，请上传 JPG/PNG/GIF/WEBP 格式")
 
-    # 读取文件内容
-    content = await file.read()
-
-    # 验证文件大小
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail=f"文件大小超过限制（最大 {MAX_FILE_SIZE // 1024 // 1024}MB）")
-
-    # 确保目录存在
-    upload_path = ensure_upload_dir(folder)
-
-    # 生成文件名并保存
-    filename = generate_filename(file.filename or "image.jpg")
-    file_path = os.path.join(upload_path, filename)
-
-    with open(file_path, "wb") as f:
-        f.write(content)
-
-    # 返回相对URL
-    relative_url = f"/{UPLOAD_DIR}/{folder}/{filename}"
+    stored = await store_upload(file, db, image_only=True, derivatives=True)
 
     return ResponseModel(data={
-        "url": relative_url,
-        "filename": filename,
-        "size": len(content),
-        "content_type": file.content_type
+        "url": stored["url"],
+        "filename": stored["filename"],
+        "size": stored["size"],
+        "sha256": stored["sha256"],
+        "content_type": stored["content_type"],
+        "variants": stored["variants"]
     })
 
 
 @router.post("/member-image", response_model=ResponseModel)
 async def upload_member_image(
     file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_async_db),
     current_member = Depends(get_current_member)
 ):
     """会员端上传图片（头像等）"""
-    content = await file.read()
-
     # 通过文件头判断实际图片类型（wx.uploadFile 的 content_type 不可靠）
-    actual_type = detect_image_type(content)
-    if not actual_type:
-        raise HTTPException(status_code=400, detail="不支持的图片格式，请上传 JPG/PNG/GIF/WEBP 格式")
-
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail=f"文件大小超过限制（最大 {MAX_FILE_SIZE // 1024 // 1024}MB）")
-
-    # 根据实际类型决定扩展名
-    ext_map = {"image/jpeg": ".jpg", "image/png": ".png", "image/gif": ".gif", "image/webp": ".webp"}
-    ext = ext_map.get(actual_type, ".jpg")
-
-    upload_path = ensure_upload_dir("avatars")
-    # 使用检测到的真实扩展名，而非原始文件名的扩展名
-    date_str = datetime.now().strftime("%Y%m%d")
-    unique_id = uuid.uuid4().hex[:8]
-    filename = f"{date_str}_{unique_id}{ext}"
-    file_path = os.path.join(upload_path, filename)
-
-    with open(file_path, "wb") as f:
-        f.write(content)
-
-    relative_url = f"/{UPLOAD_DIR}/avatars/{filename}"
+    stored = await store_upload(file, db, image_only=True, derivatives=True)
 
     return ResponseModel(data={
-        "url": relative_url,
-        "filename": filename,
-        "size": len(content),
-        "content_type": actual_type
+        "url": stored["url"],
+        "filename": stored["filename"],
+        "size": stored["size"],
+        "sha256": stored["sha256"],
+        "content_type": stored["content_type"],
+        "variants": stored["variants"]
     })
 
 
@@ -136,6 +200,7 @@ async def upload_member_image(
 async def upload_images(
     files: List[UploadFile] = File(...),
     folder: str = "images",
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
     """批量上传图片"""
@@ -149,28 +214,18 @@ async def upload_images(
         if file.content_type not in ALLOWED_IMAGE_TYPES:
             continue
 
-        # 读取文件内容
-        content = await file.read()
-
-        # 验证文件大小
-        if len(content) > MAX_FILE_SIZE:
+        # 格式或大小不符合要求的文件跳过
+        try:
+            stored = await store_upload(file, db, image_only=True, derivatives=True)
+        except HTTPException:
             continue
 
-        # 确保目录存在
-        upload_path = ensure_upload_dir(folder)
-
-        # 生成文件名并保存
-        filename = generate_filename(file.filename or "image.jpg")
-        file_path = os.path.join(upload_path, filename)
-
-        with open(file_path, "wb") as f:
-            f.write(content)
-
-        relative_url = f"/{UPLOAD_DIR}/{folder}/{filename}"
         results.append({
-            "url": relative_url,
-            "filename": filename,
-            "size": len(content)
+            "url": stored["url"],
+            "filename": stored["filename"],
+            "size": stored["size"],
+            "sha256": stored["sha256"],
+            "variants": stored["variants"]
         })
 
     return ResponseModel(data=results)
@@ -180,6 +235,7 @@ async def upload_images(
 async def upload_file(
     file: UploadFile = File(...),
     folder: str = "files",
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
     """上传文件"""
@@ -187,49 +243,49 @@ async def upload_file(
     if file.content_type not in ALLOWED_FILE_TYPES:
         raise HTTPException(status_code=400, detail="不支持的文件格式")
 
-    # 读取文件内容
-    content = await file.read()
-
-    # 验证文件大小
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(status_code=400, detail=f"文件大小超过限制（最大 {MAX_FILE_SIZE // 1024 // 1024}MB）")
-
-    # 确保目录存在
-    upload_path = ensure_upload_dir(folder)
-
-    # 生成文件名并保存
-    filename = generate_filename(file.filename or "file")
-    file_path = os.path.join(upload_path, filename)
-
-    with open(file_path, "wb") as f:
-        f.write(content)
-
-    relative_url = f"/{UPLOAD_DIR}/{folder}/{filename}"
+    # 声明为图片的文件同样校验文件头
+    stored = await store_upload(file, db, image_only=file.content_type in ALLOWED_IMAGE_TYPES)
 
     return ResponseModel(data={
-        "url": relative_url,
-        "filename": filename,
+        "url": stored["url"],
+        "filename": stored["filename"],
         "original_name": file.filename,
-        "size": len(content),
-        "content_type": file.content_type
+        "size": stored["size"],
+        "sha256": stored["sha256"],
+        "content_type": stored["content_type"]
     })
 
 
 @router.delete("/file", response_model=ResponseModel)
 async def delete_file(
     path: str,
+    db: AsyncSession = Depends(get_async_db),
     current_user = Depends(get_current_user)
 ):
-    """删除文件"""
+    """删除文件
+
+    内容寻址文件仅释放一次引用，引用归零后由 GC 任务回收；旧版按日期命名的文件直接删除。
+    """
     # 安全检查：确保路径在上传目录内
     if not path.startswith(f"/{UPLOAD_DIR}/"):
         raise HTTPException(status_code=400, detail="无效的文件路径")
 
+    if parse_blob_url(path):
+        if not await release_blob_async(db, path):
+            raise HTTPException(status_code=404, detail="文件不存在")
+        return ResponseModel(message="文件删除成功")
+
     # 去掉开头的斜杠
     file_path = path.lstrip("/")
 
     if os.path.exists(file_path):
         os.remove(file_path)
+        # 同时删除衍生图
+        for variant in IMAGE_VARIANTS:
+            for webp in (False, True):
+                derived = variant_path(file_path, variant, webp=webp)
+                if os.path.exists(derived):
+                    os.remove(derived)
         return ResponseModel(message="文件删除成功")
     else:
         raise HTTPException(status_code=404, detail="文件不存在")
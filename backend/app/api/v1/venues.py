@@ -14,6 +14,7 @@ from app.schemas import (
     VenueCreate, VenueUpdate, VenueResponse,
 )
 from app.api.deps import get_current_user
+from app.services.catalog_cache import catalog_cache, TAG_VENUES, TAG_VENUE_TYPES
 
 
 class BatchPriceUpdate(BaseModel):
@@ -45,6 +46,7 @@ def create_venue_type(
     venue_type = VenueType(**data.model_dump())
     db.add(venue_type)
     db.commit()
+    catalog_cache.invalidate(TAG_VENUE_TYPES)
     db.refresh(venue_type)
     return ResponseModel(data=VenueTypeResponse.model_validate(venue_type))
 
@@ -64,6 +66,7 @@ def update_venue_type(
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(venue_type, key, value)
     db.commit()
+    catalog_cache.invalidate(TAG_VENUE_TYPES)
     db.refresh(venue_type)
     return ResponseModel(data=VenueTypeResponse.model_validate(venue_type))
 
@@ -86,6 +89,7 @@ def delete_venue_type(
 
     db.delete(venue_type)
     db.commit()
+    catalog_cache.invalidate(TAG_VENUE_TYPES)
     return ResponseModel(message="删除成功")
 
 
@@ -160,6 +164,7 @@ def create_venue(
     venue = Venue(**data.model_dump())
     db.add(venue)
     db.commit()
+    catalog_cache.invalidate(TAG_VENUES)
     db.refresh(venue)
 
     result = VenueResponse.model_validate(venue)
@@ -185,6 +190,7 @@ def update_venue(
     for key, value in data.model_dump(exclude_unset=True).items():
         setattr(venue, key, value)
     db.commit()
+    catalog_cache.invalidate(TAG_VENUES)
     db.refresh(venue)
 
     result = VenueResponse.model_validate(venue)
@@ -208,6 +214,7 @@ def delete_venue(
 
     venue.is_deleted = True
     db.commit()
+    catalog_cache.invalidate(TAG_VENUES)
     return ResponseModel(message="删除成功")
 
 
@@ -228,6 +235,7 @@ def update_venue_status(
 
     venue.status = status
     db.commit()
+    catalog_cache.invalidate(TAG_VENUES)
     return ResponseModel(message="更新成功")
 
 
@@ -249,6 +257,7 @@ def update_venue_price(
     old_price = float(venue.price or 0)
     venue.price = price
     db.commit()
+    catalog_cache.invalidate(TAG_VENUES)
     return ResponseModel(
         message=f"价格更新成功: {old_price} → {price}",
         data={"id": venue_id, "old_price": old_price, "new_price": price}
@@ -274,6 +283,7 @@ def batch_update_venue_price(
     ).update({Venue.price: data.price}, synchronize_session=False)
 
     db.commit()
+    catalog_cache.invalidate(TAG_VENUES)
     return ResponseModel(
         message=f"成功更新 {updated_count} 个场馆的价格",
         data={"updated_count": updated_count, "new_price": data.price}
@@ -0,0 +1,162 @@
+"""
+协程接口阻塞防护
+
+部分 `async def` 接口（UI 编辑器、UI 素材）直接使用同步 Session 访问数据库，
+查询期间会阻塞事件循环，拖慢同 worker 上的所有请求。
+
+- detect（开发环境）：同步引擎执行 SQL 时若当前线程正运行事件循环，记录告警并指出接口
+- offload（生产环境）：将依赖同步 get_db 的协程接口整体放到有界线程池中执行
+- auto：DEBUG 时为 detect，否则为 offload
+- off：不做处理
+
+用法：
+    router = APIRouter(route_class=BlockingGuardRoute)
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, Set
+
+from fastapi.params import Depends as DependsParam
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.core.config import settings
+from app.core.database import get_db
+
+logger = logging.getLogger(__name__)
+
+# 当前正在执行的协程接口（用于告警定位）
+_current_endpoint: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    "blocking_guard_endpoint", default=None
+)
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+_thread_local = threading.local()
+_detected_engines: Set[int] = set()
+
+
+def get_guard_mode() -> str:
+    """解析防护模式"""
+    mode = (settings.ASYNC_BLOCKING_GUARD or "auto").lower()
+    if mode == "auto":
+        return "detect" if settings.DEBUG else "offload"
+    return mode
+
+
+def get_offload_executor() -> ThreadPoolExecutor:
+    """有界线程池（限制同时占用数据库连接的阻塞接口数量）"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.BLOCKING_OFFLOAD_WORKERS,
+                    thread_name_prefix="db-offload",
+                )
+    return _executor
+
+
+def shutdown_offload_executor():
+    """关闭线程池（应用停止时调用）"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+    _executor = None
+
+
+def depends_on(call: Callable, target: Callable, _seen: Optional[Set[int]] = None) -> bool:
+    """递归检查 call 的参数依赖中是否包含 target（如 get_db）"""
+    seen = _seen if _seen is not None else set()
+    if id(call) in seen:
+        return False
+    seen.add(id(call))
+    try:
+        params = inspect.signature(call).parameters.values()
+    except (TypeError, ValueError):
+        return False
+    for param in params:
+        default = param.default
+        if isinstance(default, DependsParam) and default.dependency is not None:
+            if default.dependency is target or depends_on(default.dependency, target, seen):
+                return True
+    return False
+
+
+def _run_coroutine_in_thread(coro) -> Any:
+    """在线程池线程内用独立事件循环驱动协程"""
+    loop = getattr(_thread_local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _thread_local.loop = loop
+    return loop.run_until_complete(coro)
+
+
+def offload_endpoint(endpoint: Callable) -> Callable:
+    """将协程接口包装为在有界线程池中执行"""
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        loop = asyncio.get_running_loop()
+        ctx = contextvars.copy_context()
+        return await loop.run_in_executor(
+            get_offload_executor(),
+            functools.partial(ctx.run, _run_coroutine_in_thread, endpoint(*args, **kwargs)),
+        )
+
+    return wrapper
+
+
+def track_endpoint(endpoint: Callable) -> Callable:
+    """记录当前协程接口名，供阻塞检测告警使用"""
+    name = f"{endpoint.__module__}.{endpoint.__qualname__}"
+
+    @functools.wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        token = _current_endpoint.set(name)
+        try:
+            return await endpoint(*args, **kwargs)
+        finally:
+            _current_endpoint.reset(token)
+
+    return wrapper
+
+
+def install_blocking_db_detector(target_engine: Engine):
+    """在同步引擎上注册检测：事件循环线程内执行同步 SQL 即视为阻塞"""
+    if id(target_engine) in _detected_engines:
+        return
+    _detected_engines.add(id(target_engine))
+
+    @event.listens_for(target_engine, "before_cursor_execute")
+    def _detect_blocking(conn, cursor, statement, parameters, context, executemany):
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return  # 不在事件循环线程中（线程池/脚本），不阻塞
+        endpoint = _current_endpoint.get() or "<unknown>"
+        logger.warning(
+            "同步数据库调用阻塞事件循环: endpoint=%s sql=%s",
+            endpoint, " ".join(statement.split())[:120],
+        )
+
+
+class BlockingGuardRoute(APIRoute):
+    """对依赖同步 get_db 的协程接口按模式进行检测或线程池卸载"""
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        mode = get_guard_mode()
+        if mode != "off" and inspect.iscoroutinefunction(endpoint) and depends_on(endpoint, get_db):
+            if mode == "offload":
+                endpoint = offload_endpoint(endpoint)
+            elif mode == "detect":
+                from app.core.database import engine
+                install_blocking_db_detector(engine)
+                endpoint = track_endpoint(endpoint)
+        super().__init__(path, endpoint, **kwargs)
@@ -1,4 +1,7 @@
+from typing import AsyncGenerator, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -23,3 +26,71 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# ==================== 异步数据库（会员端热点读接口） ====================
+
+# 同步驱动 -> 异步驱动 的 URL 前缀映射
+_ASYNC_DRIVER_MAP = {
+    "mysql+pymysql://": "mysql+aiomysql://",
+    "mysql://": "mysql+aiomysql://",
+    "sqlite://": "sqlite+aiosqlite://",
+}
+
+_async_engine: Optional[AsyncEngine] = None
+_async_session_factory: Optional[async_sessionmaker] = None
+
+
+def get_async_database_url() -> str:
+    """异步引擎连接串：优先 ASYNC_DATABASE_URL，否则由 DATABASE_URL 换驱动推导"""
+    if settings.ASYNC_DATABASE_URL:
+        return settings.ASYNC_DATABASE_URL
+    url = settings.DATABASE_URL
+    for sync_prefix, async_prefix in _ASYNC_DRIVER_MAP.items():
+        if url.startswith(sync_prefix):
+            return async_prefix + url[len(sync_prefix):]
+    return url
+
+
+def get_async_engine() -> AsyncEngine:
+    """获取异步引擎（首次调用时创建，未安装 aiomysql 时不影响同步路径导入）"""
+    global _async_engine
+    if _async_engine is None:
+        url = get_async_database_url()
+        kwargs = {"echo": settings.DEBUG, "pool_pre_ping": True}
+        if not url.startswith("sqlite"):
+            kwargs.update(
+                pool_size=settings.ASYNC_DB_POOL_SIZE,
+                max_overflow=settings.ASYNC_DB_MAX_OVERFLOW,
+                pool_recycle=3600,
+            )
+        _async_engine = create_async_engine(url, **kwargs)
+    return _async_engine
+
+
+def get_async_session_factory() -> async_sessionmaker:
+    """获取异步会话工厂"""
+    global _async_session_factory
+    if _async_session_factory is None:
+        _async_session_factory = async_sessionmaker(
+            bind=get_async_engine(),
+            class_=AsyncSession,
+            autoflush=False,
+            expire_on_commit=False,
+        )
+    return _async_session_factory
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """获取异步数据库会话（用于 async def 接口，不占用线程池）"""
+    async with get_async_session_factory()() as db:
+        yield db
+
+
+async def dispose_async_engine():
+    """关闭异步连接池（应用停止时调用）"""
+    global _async_engine, _async_session_factory
+    if _async_engine is not None:
+        await _async_engine.dispose()
+    _async_engine = None
+    _async_session_factory = None
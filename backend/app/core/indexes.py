@@ -0,0 +1,205 @@
+"""索引管理
+
+- 对比模型声明的索引与数据库实际索引，找出缺失项（scripts/check_indexes.py）
+- 幂等的建/删索引函数，供 Alembic 迁移复用（已有库由 create_all 建表时可能已带索引）
+- 热点查询登记表 + EXPLAIN 解析，校验每个热点查询确实命中预期索引
+"""
+from datetime import date, datetime
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import Index, MetaData, inspect, select
+from sqlalchemy.engine import Connection
+
+from app.core.database import Base
+
+
+def declared_indexes(metadata: MetaData = Base.metadata) -> List[Index]:
+    """模型中声明的全部具名索引"""
+    indexes = []
+    for table in metadata.sorted_tables:
+        indexes.extend(index for index in table.indexes if index.name)
+    return sorted(indexes, key=lambda index: (index.table.name, index.name))
+
+
+def existing_index_names(conn: Connection, table_name: str) -> Set[str]:
+    """数据库中某表已有的索引名"""
+    return {index["name"] for index in inspect(conn).get_indexes(table_name)}
+
+
+def missing_indexes(conn: Connection, metadata: MetaData = Base.metadata) -> List[Index]:
+    """模型已声明、数据库中（表存在但）尚未创建的索引"""
+    tables = set(inspect(conn).get_table_names())
+    cache: Dict[str, Set[str]] = {}
+    missing = []
+    for index in declared_indexes(metadata):
+        table_name = index.table.name
+        if table_name not in tables:
+            continue
+        if table_name not in cache:
+            cache[table_name] = existing_index_names(conn, table_name)
+        if index.name not in cache[table_name]:
+            missing.append(index)
+    return missing
+
+
+def create_index_if_missing(conn: Connection, name: str, table_name: str, columns: List[str]) -> bool:
+    """索引不存在时创建（迁移用，不依赖模型定义），返回是否新建"""
+    if name in existing_index_names(conn, table_name):
+        return False
+    quote = conn.dialect.identifier_preparer.quote
+    conn.exec_driver_sql(
+        f"CREATE INDEX {quote(name)} ON {quote(table_name)} ({', '.join(quote(c) for c in columns)})"
+    )
+    return True
+
+
+def drop_index_if_exists(conn: Connection, name: str, table_name: str) -> bool:
+    """索引存在时删除，返回是否删除"""
+    if name not in existing_index_names(conn, table_name):
+        return False
+    quote = conn.dialect.identifier_preparer.quote
+    if conn.dialect.name == "mysql":
+        conn.exec_driver_sql(f"DROP INDEX {quote(name)} ON {quote(table_name)}")
+    else:
+        conn.exec_driver_sql(f"DROP INDEX {quote(name)}")
+    return True
+
+
+# ==================== 热点查询 EXPLAIN 校验 ====================
+
+def hot_queries() -> Dict[str, Tuple[object, str]]:
+    """热点查询形状 -> (查询语句, 预期命中的索引名)
+
+    条件与排序与接口中的实际写法保持一致；参数取值不影响执行计划。
+    """
+    from app.models import Reservation, MemberCoupon, Message
+    from app.models.activity import ActivityRegistration
+    from app.models.team import Team
+    from app.models.checkin import GateCheckRecord, Leaderboard
+
+    today = date.today()
+    now = datetime.now()
+    return {
+        # 场馆日历 / 时段占用 / 冲突检测
+        "venue_calendar": (
+            select(Reservation.venue_id, Reservation.start_time, Reservation.end_time).where(
+                Reservation.venue_id.in_([1, 2, 3]),
+                Reservation.reservation_date == today,
+                Reservation.status.in_(["pending", "confirmed", "in_progress"]),
+                Reservation.is_deleted == False,
+            ),
+            "idx_reservation_venue_date_status",
+        ),
+        # 会员订单列表（按创建时间倒序）
+        "member_orders": (
+            select(Reservation).where(
+                Reservation.member_id == 1,
+                Reservation.is_deleted == False,
+            ).order_by(Reservation.created_at.desc()).limit(10),
+            "idx_reservation_member_created",
+        ),
+        # 教练某日日程
+        "coach_schedule": (
+            select(Reservation).where(
+                Reservation.coach_id == 1,
+                Reservation.reservation_date == today,
+            ),
+            "idx_reservation_coach_date",
+        ),
+        # 未支付预约超时兜底扫描
+        "unpaid_reservation_expiry": (
+            select(Reservation.out_trade_no).where(
+                Reservation.status == "unpaid",
+                Reservation.created_at < now,
+                Reservation.out_trade_no.isnot(None),
+            ).limit(1000),
+            "idx_reservation_status_created",
+        ),
+        # 闸机入场/出场：当日未出场记录
+        "gate_open_record": (
+            select(GateCheckRecord).where(
+                GateCheckRecord.member_id == 1,
+                GateCheckRecord.check_date == today,
+                GateCheckRecord.check_out_time == None,
+            ),
+            "idx_gate_check_member_date_out",
+        ),
+        # 排行榜分页
+        "leaderboard_page": (
+            select(Leaderboard).where(
+                Leaderboard.period_type == "daily",
+                Leaderboard.period_key == today.isoformat(),
+                Leaderboard.venue_type_id == None,
+            ).order_by(Leaderboard.rank).limit(50),
+            "idx_leaderboard_period_rank",
+        ),
+        # 会员可用优惠券
+        "member_available_coupons": (
+            select(MemberCoupon).where(
+                MemberCoupon.member_id == 1,
+                MemberCoupon.status == "unused",
+                MemberCoupon.end_time >= now,
+            ),
+            "idx_member_coupon_member_status_end",
+        ),
+        # 会员未读消息
+        "member_unread_messages": (
+            select(Message).where(
+                Message.receiver_type == "member",
+                Message.receiver_id == 1,
+                Message.is_read == False,
+            ),
+            "idx_message_receiver_read",
+        ),
+        # 活动候补递补（按登记顺序）
+        "activity_waitlist": (
+            select(ActivityRegistration).where(
+                ActivityRegistration.activity_id == 1,
+                ActivityRegistration.status == "waitlisted",
+            ).order_by(ActivityRegistration.id),
+            "idx_activity_registration_activity_status",
+        ),
+        # 组队广场：某运动类型招募中、尚未开始的组队
+        "team_listing": (
+            select(Team).where(
+                Team.is_deleted == False,
+                Team.status == "recruiting",
+                Team.sport_type == "tennis",
+                Team.starts_at >= now,
+            ).order_by(Team.starts_at, Team.id).limit(20),
+            "idx_team_status_sport_starts",
+        ),
+    }
+
+
+def explain_indexes(conn: Connection, statement) -> Set[str]:
+    """执行 EXPLAIN，返回执行计划中用到的索引名（支持 MySQL / SQLite）"""
+    compiled = statement.compile(dialect=conn.dialect, compile_kwargs={"render_postcompile": True})
+    if compiled.positional:
+        params = tuple(compiled.params[name] for name in compiled.positiontup)
+    else:
+        params = compiled.params
+
+    used: Set[str] = set()
+    if conn.dialect.name == "mysql":
+        for row in conn.exec_driver_sql(f"EXPLAIN {compiled}", params).mappings():
+            if row.get("key"):
+                used.update(row["key"].split(","))
+    elif conn.dialect.name == "sqlite":
+        for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {compiled}", params):
+            detail: str = row[-1]
+            marker = " INDEX "
+            if marker in detail:
+                used.add(detail.split(marker, 1)[1].split(" ", 1)[0])
+    else:
+        raise NotImplementedError(f"不支持的数据库方言: {conn.dialect.name}")
+    return used
+
+
+def check_hot_queries(conn: Connection) -> Dict[str, Tuple[str, Set[str], bool]]:
+    """逐个 EXPLAIN 热点查询：名称 -> (预期索引, 实际索引, 是否命中)"""
+    results = {}
+    for name, (statement, expected) in hot_queries().items():
+        used = explain_indexes(conn, statement)
+        results[name] = (expected, used, expected in used)
+    return results
@@ -0,0 +1,161 @@
+"""路由模块按需加载
+
+应用导入时只登记各路由模块的路径前缀，第一次有请求落到该前缀下时才导入模块
+并注册路由（include_router 复制路由、构建依赖树是启动耗时的大头）。
+
+- 路由匹配顺序与原先逐个 include_router 完全一致：前缀下没有匹配的路由时返回
+  NONE，继续交给后面的路由（例如 staff_scan 挂在根 API 前缀下）
+- 依赖覆盖（app.dependency_overrides）、默认响应类与急加载时相同
+- /docs 生成 OpenAPI 时展开全部懒加载路由
+- 多个模块可共用同一前缀（如会员端各功能模块），各自通过 paths 只认领前缀下的若干路径首段
+- 常用模块可通过预热钩子提前加载（settings.PRELOAD_ROUTERS）
+"""
+import importlib
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import APIRouter, FastAPI
+from fastapi.openapi.utils import get_openapi
+from starlette.routing import BaseRoute, Match, NoMatchFound
+from starlette.types import Receive, Scope, Send
+
+_SCOPE_KEY = "lazy_route"
+
+
+class LazyRouter(BaseRoute):
+    """前缀占位路由：首次匹配到前缀（及 paths 中的路径首段）时导入 module 并 include 其 router"""
+
+    def __init__(self, app: FastAPI, module: str, prefix: str, tags: Optional[List[str]] = None,
+                 paths: Optional[Tuple[str, ...]] = None):
+        self.app = app
+        self.module = module
+        self.prefix = prefix.rstrip("/")
+        self.tags = tags or []
+        self.paths = tuple(paths) if paths else None
+        self.load_ms: Optional[float] = None
+        self._routes: Optional[List[BaseRoute]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._routes is not None
+
+    @property
+    def routes(self) -> List[BaseRoute]:
+        """模块内的路由（首次访问时导入模块）"""
+        if self._routes is None:
+            with self._lock:
+                if self._routes is None:
+                    start = time.perf_counter()
+                    router = importlib.import_module(self.module).router
+                    container = APIRouter(
+                        dependency_overrides_provider=self.app,
+                        default_response_class=self.app.router.default_response_class,
+                        generate_unique_id_function=self.app.router.generate_unique_id_function,
+                    )
+                    container.include_router(router, prefix=self.prefix, tags=self.tags)
+                    self._routes = container.routes
+                    self.load_ms = round((time.perf_counter() - start) * 1000, 1)
+        return self._routes
+
+    @staticmethod
+    def _under(path: str, prefix: str) -> bool:
+        return path == prefix or path.startswith(prefix + "/")
+
+    def _in_prefix(self, path: str) -> bool:
+        if self.prefix and not self._under(path, self.prefix):
+            return False
+        if self.paths is None:
+            return True
+        rest = path[len(self.prefix):]
+        return any(self._under(rest, p) for p in self.paths)
+
+    def matches(self, scope: Scope) -> Tuple[Match, Scope]:
+        if scope["type"] not in ("http", "websocket") or not self._in_prefix(scope["path"]):
+            return Match.NONE, {}
+        partial: Optional[Tuple[BaseRoute, Scope]] = None
+        for route in self.routes:
+            match, child_scope = route.matches(scope)
+            if match == Match.FULL:
+                return Match.FULL, {**child_scope, _SCOPE_KEY: route}
+            if match == Match.PARTIAL and partial is None:
+                partial = (route, child_scope)
+        if partial is not None:
+            route, child_scope = partial
+            return Match.PARTIAL, {**child_scope, _SCOPE_KEY: route}
+        return Match.NONE, {}
+
+    async def handle(self, scope: Scope, receive: Receive, send: Send) -> None:
+        route = scope.pop(_SCOPE_KEY)
+        await route.handle(scope, receive, send)
+
+    def url_path_for(self, name: str, /, **path_params: Any):
+        for route in self.routes:
+            try:
+                return route.url_path_for(name, **path_params)
+            except NoMatchFound:
+                pass
+        raise NoMatchFound(name, path_params)
+
+    def __repr__(self) -> str:
+        return f"LazyRouter(module={self.module!r}, prefix={self.prefix!r}, loaded={self.loaded})"
+
+
+def mount_router(app: FastAPI, module: str, prefix: str, tags: List[str], lazy: bool = True,
+                 paths: Optional[Tuple[str, ...]] = None):
+    """挂载路由模块：lazy 时登记占位路由，否则立即 include_router（paths 仅用于懒加载匹配）"""
+    if lazy:
+        app.router.routes.append(LazyRouter(app, module, prefix, tags, paths))
+    else:
+        app.include_router(importlib.import_module(module).router, prefix=prefix, tags=tags)
+
+
+def lazy_routers(app: FastAPI) -> List[LazyRouter]:
+    return [route for route in app.router.routes if isinstance(route, LazyRouter)]
+
+
+def preload_routers(app: FastAPI, modules: Optional[List[str]] = None) -> Dict[str, float]:
+    """提前加载路由模块（modules 为完整模块名或包名，包名加载其下全部模块；为空时全部加载），返回各模块加载耗时"""
+    timings = {}
+    for route in lazy_routers(app):
+        if modules is None or any(route.module == m or route.module.startswith(m + ".") for m in modules):
+            route.routes
+            timings[route.module] = route.load_ms
+    return timings
+
+
+def expand_routes(routes: List[BaseRoute]) -> List[BaseRoute]:
+    """把懒加载占位路由展开为实际路由（保持顺序）"""
+    expanded = []
+    for route in routes:
+        if isinstance(route, LazyRouter):
+            expanded.extend(route.routes)
+        else:
+            expanded.append(route)
+    return expanded
+
+
+def install_openapi(app: FastAPI):
+    """OpenAPI 文档包含懒加载路由（首次访问 /docs、/openapi.json 时加载全部模块）"""
+
+    def openapi() -> Dict[str, Any]:
+        if not app.openapi_schema:
+            app.openapi_schema = get_openapi(
+                title=app.title,
+                version=app.version,
+                openapi_version=app.openapi_version,
+                summary=app.summary,
+                description=app.description,
+                terms_of_service=app.terms_of_service,
+                contact=app.contact,
+                license_info=app.license_info,
+                routes=expand_routes(app.routes),
+                webhooks=app.webhooks.routes,
+                tags=app.openapi_tags,
+                servers=app.servers,
+                separate_input_output_schemas=app.separate_input_output_schemas,
+            )
+        return app.openapi_schema
+
+    app.openapi = openapi
@@ -0,0 +1,173 @@
+"""应用启动生命周期与就绪探针
+
+- 表结构由部署时执行一次的 `alembic upgrade head` 负责，进程导入/启动不再 create_all
+- 数据库连接按需建立：导入应用不连库，数据库短暂不可用时 worker 照常启动，由就绪探针反映
+- 预热钩子：启动后在后台依次执行（预建连接池、预编译 UI 配置等），失败只记日志，下次探针时重试
+- /health 为存活探针（进程在即可），/ready 为就绪探针（数据库可连、迁移已到最新、预热完成）
+"""
+import asyncio
+import inspect
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+_warmup_hooks: List[Tuple[str, Callable]] = []
+
+
+def _describe(e: Exception) -> str:
+    """异常摘要（去掉 SQLAlchemy 附带的背景链接等多行信息）"""
+    message = str(e).splitlines()[0] if str(e) else ""
+    return f"{type(e).__name__}: {message}"
+
+
+def register_warmup(name: str, hook: Callable):
+    """登记预热钩子（同步函数在线程池执行，协程函数直接 await）"""
+    _warmup_hooks.append((name, hook))
+
+
+class WarmupState:
+    """预热进度：全部钩子成功后才算完成"""
+
+    def __init__(self):
+        self.done = False
+        self.running = False
+        self.errors: Dict[str, str] = {}
+        self.timings_ms: Dict[str, float] = {}
+        self._lock = asyncio.Lock()
+
+    async def run(self, hooks: Optional[List[Tuple[str, Callable]]] = None) -> bool:
+        """执行预热（已完成或正在执行时直接返回），返回是否全部成功"""
+        if self.done:
+            return True
+        async with self._lock:
+            if self.done:
+                return True
+            self.running = True
+            errors = {}
+            for name, hook in hooks if hooks is not None else _warmup_hooks:
+                if name in self.timings_ms:
+                    continue
+                start = time.perf_counter()
+                try:
+                    if inspect.iscoroutinefunction(hook):
+                        await hook()
+                    else:
+                        await run_in_threadpool(hook)
+                except Exception as e:
+                    errors[name] = _describe(e)
+                    logger.warning("预热失败 %s: %s", name, e)
+                    continue
+                self.timings_ms[name] = round((time.perf_counter() - start) * 1000, 1)
+            self.errors = errors
+            self.done = not errors
+            self.running = False
+            return self.done
+
+
+warmup_state = WarmupState()
+
+
+async def run_warmup() -> bool:
+    """执行已登记的预热钩子（启动事件中以后台任务调用）"""
+    return await warmup_state.run()
+
+
+def warm_database():
+    """预热：建立同步连接池首个连接"""
+    from app.core.database import engine
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+async def warm_async_database():
+    """预热：建立异步连接池首个连接"""
+    from app.core.database import get_async_engine
+
+    async with get_async_engine().connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+# ==================== 迁移版本 ====================
+
+_head_revision: Optional[Tuple[str, ...]] = None
+_schema_ok = False
+_schema_lock = threading.Lock()
+
+
+def alembic_config(url: Optional[str] = None):
+    """backend/alembic.ini 配置（与工作目录无关），url 为空时使用 settings.DATABASE_URL"""
+    from alembic.config import Config
+
+    config = Config(os.path.join(BACKEND_DIR, "alembic.ini"))
+    config.set_main_option("script_location", os.path.join(BACKEND_DIR, "alembic"))
+    if url:
+        config.set_main_option("sqlalchemy.url", url)
+    return config
+
+
+def head_revisions() -> Tuple[str, ...]:
+    """代码中 Alembic 迁移的最新版本（进程内只解析一次）"""
+    global _head_revision
+    if _head_revision is None:
+        from alembic.script import ScriptDirectory
+
+        _head_revision = tuple(sorted(ScriptDirectory.from_config(alembic_config()).get_heads()))
+    return _head_revision
+
+
+def current_revisions(conn) -> Tuple[str, ...]:
+    """数据库当前迁移版本（未执行过 alembic 时为空）"""
+    from alembic.runtime.migration import MigrationContext
+
+    return tuple(sorted(MigrationContext.configure(conn).get_current_heads()))
+
+
+def check_database(engine: Engine) -> Dict:
+    """检查数据库可连接且迁移已到最新版本（同步，供线程池调用）"""
+    global _schema_ok
+    result = {"database": "ok", "schema": "ok"}
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            if not _schema_ok:
+                current, head = current_revisions(conn), head_revisions()
+                if current == head:
+                    with _schema_lock:
+                        _schema_ok = True
+                else:
+                    result["schema"] = (
+                        f"迁移未到最新（当前 {','.join(current) or '无'}，最新 {','.join(head)}），"
+                        f"请执行 alembic upgrade head"
+                    )
+    except Exception as e:
+        result["database"] = _describe(e)
+        result["schema"] = "unknown"
+    return result
+
+
+async def readiness_report(engine: Engine) -> Tuple[bool, Dict]:
+    """就绪探针：数据库 + 迁移版本 + 预热；未完成预热时顺带重试一次"""
+    checks = await run_in_threadpool(check_database, engine)
+    if checks["database"] == "ok" and not warmup_state.done and not warmup_state.running:
+        await warmup_state.run()
+    checks["warmup"] = "ok" if warmup_state.done else (warmup_state.errors or "running")
+    ready = checks["database"] == "ok" and checks["schema"] == "ok" and warmup_state.done
+    return ready, checks
+
+
+def reset_state():
+    """重置预热与迁移检查状态（测试用）"""
+    global warmup_state, _schema_ok
+    warmup_state = WarmupState()
+    _schema_ok = False
@@ -0,0 +1,45 @@
+"""JSON 响应编码
+
+- FastJSONResponse：应用默认响应类，用 orjson 渲染（比标准库 json 快数倍，直接输出 UTF-8）
+- encode_response / json_response：热点接口直接返回统一响应结构 {code, message, data}，
+  跳过 response_model 的逐项校验与 jsonable_encoder 转换；data 可以是构建好的 dict/list，
+  也可以是已编码的 JSON bytes（原样拼入响应体，不再解析）
+
+orjson 不原生支持的类型（Decimal、pydantic 模型等）按 pydantic 的 JSON 规则转换，
+输出与 ResponseModel(data=...) 经默认路径返回的结果一致。
+"""
+from typing import Any, Mapping, Optional
+
+import orjson
+from fastapi import Response
+from fastapi.responses import JSONResponse
+from pydantic_core import to_jsonable_python
+
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps(content: Any) -> bytes:
+    """任意内容 -> JSON bytes（紧凑格式、不转义中文）"""
+    return orjson.dumps(content, default=to_jsonable_python, option=_OPTIONS)
+
+
+class FastJSONResponse(JSONResponse):
+    """orjson 渲染的 JSONResponse（作为应用的 default_response_class）"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def encode_response(data: Any = None, code: int = 200, message: str = "success") -> bytes:
+    """统一响应结构 -> JSON bytes；data 为 bytes 时视为已编码的 JSON 片段直接拼接"""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        head = dumps({"code": code, "message": message})
+        return b"".join((head[:-1], b',"data":', data, b"}"))
+    return dumps({"code": code, "message": message, "data": data})
+
+
+def json_response(data: Any = None, code: int = 200, message: str = "success",
+                  status_code: int = 200, headers: Optional[Mapping[str, str]] = None) -> Response:
+    """热点接口直接返回预编码的统一响应（内容与 ResponseModel(data=data) 相同）"""
+    return Response(content=encode_response(data, code, message), status_code=status_code,
+                    headers=headers, media_type="application/json")
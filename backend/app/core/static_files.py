@@ -0,0 +1,29 @@
+"""上传文件静态服务"""
+import os
+from typing import Any, MutableMapping, Union
+
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+
+# 内容寻址文件（URL 含内容哈希，内容永不变化）
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+# 旧版按日期+随机串命名的文件
+DEFAULT_CACHE_CONTROL = "public, max-age=2592000"
+
+
+class UploadStaticFiles(StaticFiles):
+    """为 /uploads 下的文件附加缓存头：blobs/ 下的内容寻址文件使用长期 immutable 缓存"""
+
+    def file_response(
+        self,
+        full_path: Union[str, "os.PathLike[str]"],
+        stat_result: os.stat_result,
+        scope: MutableMapping[str, Any],
+        status_code: int = 200,
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if self.get_path(scope).replace(os.sep, "/").startswith("blobs/"):
+            response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers["Cache-Control"] = DEFAULT_CACHE_CONTROL
+        return response
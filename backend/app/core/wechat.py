@@ -3,7 +3,6 @@
 基于微信官方服务端API
 """
 
-import httpx
 import hashlib
 import json
 import time
@@ -12,6 +11,20 @@ from datetime import datetime, timedelta
 from .config import settings
 
 
+def _async_client():
+    """创建 httpx 异步客户端（httpx 首次调用微信接口时才导入，不拖慢应用启动）"""
+    import httpx
+
+    return httpx.AsyncClient(proxy=None)
+
+
+def is_request_error(e: Exception) -> bool:
+    """是否为 httpx 网络请求异常（调用方无需在模块顶层导入 httpx）"""
+    import httpx
+
+    return isinstance(e, httpx.RequestError)
+
+
 class WeChatService:
     """微信小程序服务类"""
 
@@ -52,7 +65,7 @@ class WeChatService:
             "secret": self.app_secret
         }
 
-        async with httpx.AsyncClient(proxy=None) as client:
+        async with _async_client() as client:
             response = await client.get(url, params=params)
             data = response.json()
 
@@ -79,7 +92,7 @@ class WeChatService:
             "grant_type": "authorization_code"
         }
 
-        async with httpx.AsyncClient(proxy=None) as client:
+        async with _async_client() as client:
             response = await client.get(url, params=params)
             data = response.json()
 
@@ -99,7 +112,7 @@ class WeChatService:
         params = {"access_token": access_token}
         payload = {"code": code}
 
-        async with httpx.AsyncClient(proxy=None) as client:
+        async with _async_client() as client:
             response = await client.post(url, params=params, json=payload)
             data = response.json()
 
@@ -139,7 +152,7 @@ class WeChatService:
         if page:
             payload["page"] = page
 
-        async with httpx.AsyncClient(proxy=None) as client:
+        async with _async_client() as client:
             response = await client.post(url, params=params, json=payload)
             result = response.json()
 
@@ -189,7 +202,7 @@ class WeChatService:
         if line_color:
             payload["line_color"] = line_color
 
-        async with httpx.AsyncClient(proxy=None) as client:
+        async with _async_client() as client:
             response = await client.post(url, params=params, json=payload)
 
         # 判断是否返回图片
@@ -231,7 +244,7 @@ class WeChatService:
         if line_color:
             payload["line_color"] = line_color
 
-        async with httpx.AsyncClient(proxy=None) as client:
+        async with _async_client() as client:
             response = await client.post(url, params=params, json=payload)
 
         content_type = response.headers.get("content-type", "")
@@ -258,7 +271,7 @@ class WeChatService:
             "width": width
         }
 
-        async with httpx.AsyncClient(proxy=None) as client:
+        async with _async_client() as client:
             response = await client.post(url, params=params, json=payload)
 
         content_type = response.headers.get("content-type", "")
@@ -288,7 +301,7 @@ class WeChatService:
             "openid": openid
         }
 
-        async with httpx.AsyncClient(proxy=None) as client:
+        async with _async_client() as client:
             response = await client.post(url, params=params, json=payload)
             data = response.json()
 
@@ -317,7 +330,7 @@ class WeChatService:
             "openid": openid
         }
 
-        async with httpx.AsyncClient(proxy=None) as client:
+        async with _async_client() as client:
             response = await client.post(url, params=params, json=payload)
             data = response.json()
 
@@ -5,12 +5,8 @@ import hashlib
 import time
 import uuid
 import json
-import requests
 from typing import Optional
 from datetime import datetime
-from Crypto.PublicKey import RSA
-from Crypto.Signature import pkcs1_15
-from Crypto.Hash import SHA256
 import base64
 
 from app.core.config import settings
@@ -37,6 +33,8 @@ class WechatPay:
     def private_key(self):
         """加载商户私钥"""
         if self._private_key is None:
+            from Crypto.PublicKey import RSA
+
             try:
                 with open(self.private_key_path, 'r') as f:
                     self._private_key = RSA.import_key(f.read())
@@ -49,6 +47,8 @@ class WechatPay:
     def wechat_public_key(self):
         """加载微信支付公钥（用于验证回调签名）"""
         if self._wechat_public_key is None:
+            from Crypto.PublicKey import RSA
+
             try:
                 with open(self.wechat_public_key_path, 'r') as f:
                     self._wechat_public_key = RSA.import_key(f.read())
@@ -76,6 +76,9 @@ class WechatPay:
         if not self.private_key:
             raise Exception("私钥未配置")
 
+        from Crypto.Hash import SHA256
+        from Crypto.Signature import pkcs1_15
+
         h = SHA256.new(message.encode('utf-8'))
         signature = pkcs1_15.new(self.private_key).sign(h)
         return base64.b64encode(signature).decode('utf-8')
@@ -142,6 +145,8 @@ class WechatPay:
             "Accept": "application/json"
         }
 
+        import requests
+
         try:
             response = requests.post(full_url, headers=headers, data=body_str)
             result = response.json()
@@ -200,6 +205,9 @@ class WechatPay:
             message = f"{timestamp}\n{nonce}\n{body}\n"
 
             # 使用微信支付公钥验证签名
+            from Crypto.Hash import SHA256
+            from Crypto.Signature import pkcs1_15
+
             h = SHA256.new(message.encode('utf-8'))
             signature_bytes = base64.b64decode(signature)
             pkcs1_15.new(self.wechat_public_key).verify(h, signature_bytes)
@@ -246,6 +254,8 @@ class WechatPay:
             "Accept": "application/json"
         }
 
+        import requests
+
         try:
             response = requests.get(full_url, headers=headers)
             return response.json()
@@ -268,6 +278,8 @@ class WechatPay:
             "Accept": "application/json"
         }
 
+        import requests
+
         try:
             response = requests.post(full_url, headers=headers, data=body_str)
             return response.status_code == 204
@@ -308,6 +320,8 @@ class WechatPay:
             "Accept": "application/json"
         }
 
+        import requests
+
         try:
             response = requests.post(full_url, headers=headers, data=body_str)
             return response.json()
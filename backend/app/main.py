@@ -1,27 +1,33 @@
+import asyncio
+import os
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-import os
+from fastapi.responses import JSONResponse
 
 from app.core.config import settings
-from app.core.database import engine, Base
-from app.api.v1 import auth, staff, members, venues, reservations, coaches, coach_api, member_api
-from app.api.v1 import activities, coupons, mall, payment, finance, dashboard, messages, member_cards, wechat, upload, ui_assets, ui_editor
-from app.api.v1 import gate_api, checkin
-from app.api.v1 import coupon_packs, reviews
-from app.api.v1 import feedback as feedback_router
-from app.api.v1 import staff_scan
-from app.api.v1 import internal_api
-
-# 创建数据库表
-Base.metadata.create_all(bind=engine)
+from app.core.database import engine, dispose_async_engine
+from app.core import lifecycle
+from app.core.blocking_guard import shutdown_offload_executor
+from app.core.static_files import UploadStaticFiles
+from app.services.image_pipeline import shutdown_image_executor
+from app.services.mall_inventory import flash_sale_pool, start_flash_sale_reclaim
+from app.services.counter_service import counter_rollup
+from app.services.reservation_expiry import reservation_expiry, start_reservation_expiry
+from app.services.ui_config_cache import warm_up_ui_config
+from app.core.lazy_router import install_openapi, mount_router, preload_routers
+from app.core.responses import FastJSONResponse
+from app.api.v1.member import FEATURES as MEMBER_FEATURES
+
+# 表结构由部署时的 alembic upgrade head 维护，导入应用不连接数据库
 
 app = FastAPI(
     title=settings.APP_NAME,
     description="场馆体育社交管理系统 API",
     version="1.0.0",
     docs_url="/docs",
-    redoc_url="/redoc"
+    redoc_url="/redoc",
+    default_response_class=FastJSONResponse,
 )
 
 # CORS 配置
@@ -48,42 +54,86 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# 注册路由
-app.include_router(auth.router, prefix=f"{settings.API_V1_PREFIX}/auth", tags=["认证"])
-app.include_router(staff.router, prefix=f"{settings.API_V1_PREFIX}/staff", tags=["员工管理"])
-app.include_router(members.router, prefix=f"{settings.API_V1_PREFIX}/members", tags=["会员管理"])
-app.include_router(venues.router, prefix=f"{settings.API_V1_PREFIX}/venues", tags=["场地管理"])
-app.include_router(reservations.router, prefix=f"{settings.API_V1_PREFIX}/reservations", tags=["预约管理"])
-app.include_router(coaches.router, prefix=f"{settings.API_V1_PREFIX}/coaches", tags=["教练管理"])
-app.include_router(coach_api.router, prefix=f"{settings.API_V1_PREFIX}/coach", tags=["教练端API"])
-app.include_router(member_api.router, prefix=f"{settings.API_V1_PREFIX}/member", tags=["会员端API"])
-app.include_router(activities.router, prefix=f"{settings.API_V1_PREFIX}/activities", tags=["活动管理"])
-app.include_router(coupons.router, prefix=f"{settings.API_V1_PREFIX}/coupons", tags=["票券管理"])
-app.include_router(mall.router, prefix=f"{settings.API_V1_PREFIX}/mall", tags=["商城管理"])
-app.include_router(payment.router, prefix=f"{settings.API_V1_PREFIX}/payment", tags=["支付"])
-app.include_router(finance.router, prefix=f"{settings.API_V1_PREFIX}/finance", tags=["财务管理"])
-app.include_router(dashboard.router, prefix=f"{settings.API_V1_PREFIX}/dashboard", tags=["数据看板"])
-app.include_router(messages.router, prefix=f"{settings.API_V1_PREFIX}/messages", tags=["消息通知"])
-app.include_router(member_cards.router, prefix=f"{settings.API_V1_PREFIX}/member-cards", tags=["会员卡套餐"])
-app.include_router(wechat.router, prefix=f"{settings.API_V1_PREFIX}/wechat", tags=["微信服务"])
-app.include_router(upload.router, prefix=f"{settings.API_V1_PREFIX}/upload", tags=["文件上传"])
-app.include_router(ui_assets.router, prefix=f"{settings.API_V1_PREFIX}/ui-assets", tags=["UI素材管理"])
-app.include_router(ui_editor.router, prefix=f"{settings.API_V1_PREFIX}/ui-editor", tags=["UI可视化编辑"])
-app.include_router(gate_api.router, prefix=f"{settings.API_V1_PREFIX}/gate", tags=["闸机接口"])
-app.include_router(checkin.router, prefix=f"{settings.API_V1_PREFIX}/checkin", tags=["打卡管理"])
-app.include_router(coupon_packs.router, prefix=f"{settings.API_V1_PREFIX}/coupon-packs", tags=["优惠券合集"])
-app.include_router(reviews.router, prefix=f"{settings.API_V1_PREFIX}/reviews", tags=["评论管理"])
-app.include_router(feedback_router.router, prefix=f"{settings.API_V1_PREFIX}/feedback", tags=["反馈管理"])
-# 前台扫码核销（路径同时挂在 /member 和 /staff 下，所以 prefix 用根 API 前缀）
-app.include_router(staff_scan.router, prefix=settings.API_V1_PREFIX, tags=["前台扫码核销"])
-# 服务间内部接口（供 wechat-bot 等受信任后端调用，X-Service-Token 鉴权）
-app.include_router(internal_api.router, prefix=f"{settings.API_V1_PREFIX}/internal", tags=["服务间内部接口"])
+# 注册路由（顺序即匹配顺序；默认按需加载，首次请求时才导入模块）
+API = settings.API_V1_PREFIX
+ROUTERS = [
+    ("auth", f"{API}/auth", "认证"),
+    ("staff", f"{API}/staff", "员工管理"),
+    ("members", f"{API}/members", "会员管理"),
+    ("venues", f"{API}/venues", "场地管理"),
+    ("reservations", f"{API}/reservations", "预约管理"),
+    ("coaches", f"{API}/coaches", "教练管理"),
+    ("coach_api", f"{API}/coach", "教练端API"),
+    # 会员端按功能拆分为多个模块（app/api/v1/member/），各自只认领 MEMBER_FEATURES 中登记的路径
+    *[(f"member.{name}", f"{API}/member", "会员端API") for name, _ in MEMBER_FEATURES],
+    ("activities", f"{API}/activities", "活动管理"),
+    ("coupons", f"{API}/coupons", "票券管理"),
+    ("mall", f"{API}/mall", "商城管理"),
+    ("payment", f"{API}/payment", "支付"),
+    ("finance", f"{API}/finance", "财务管理"),
+    ("dashboard", f"{API}/dashboard", "数据看板"),
+    ("messages", f"{API}/messages", "消息通知"),
+    ("member_cards", f"{API}/member-cards", "会员卡套餐"),
+    ("wechat", f"{API}/wechat", "微信服务"),
+    ("upload", f"{API}/upload", "文件上传"),
+    ("ui_assets", f"{API}/ui-assets", "UI素材管理"),
+    ("ui_editor", f"{API}/ui-editor", "UI可视化编辑"),
+    ("gate_api", f"{API}/gate", "闸机接口"),
+    ("checkin", f"{API}/checkin", "打卡管理"),
+    ("coupon_packs", f"{API}/coupon-packs", "优惠券合集"),
+    ("reviews", f"{API}/reviews", "评论管理"),
+    ("feedback", f"{API}/feedback", "反馈管理"),
+    # 前台扫码核销（路径同时挂在 /member 和 /staff 下，所以 prefix 用根 API 前缀）
+    ("staff_scan", API, "前台扫码核销"),
+    # 服务间内部接口（供 wechat-bot 等受信任后端调用，X-Service-Token 鉴权）
+    ("internal_api", f"{API}/internal", "服务间内部接口"),
+]
+ROUTER_PATHS = {f"member.{name}": paths for name, paths in MEMBER_FEATURES}
+for module, prefix, tag in ROUTERS:
+    mount_router(app, f"app.api.v1.{module}", prefix, [tag], lazy=settings.LAZY_ROUTERS,
+                 paths=ROUTER_PATHS.get(module))
+install_openapi(app)
 
 # 挂载静态文件目录（用于上传文件访问）
 upload_dir = settings.UPLOAD_DIR
 if not os.path.exists(upload_dir):
     os.makedirs(upload_dir)
-app.mount("/uploads", StaticFiles(directory=upload_dir), name="uploads")
+app.mount("/uploads", UploadStaticFiles(directory=upload_dir), name="uploads")
+
+
+# 启动预热钩子（后台执行，完成前 /ready 返回 503）
+lifecycle.register_warmup("database", lifecycle.warm_database)
+lifecycle.register_warmup("async_database", lifecycle.warm_async_database)
+lifecycle.register_warmup("ui_config", warm_up_ui_config)
+lifecycle.register_warmup("reservation_expiry", start_reservation_expiry)
+lifecycle.register_warmup("flash_sale_leases", start_flash_sale_reclaim)
+
+
+def warm_up_routers():
+    """预热：提前加载常用路由模块，避免首个请求承担导入耗时"""
+    names = [n.strip() for n in settings.PRELOAD_ROUTERS.split(",") if n.strip()]
+    if names:
+        preload_routers(app, None if "*" in names else [f"app.api.v1.{n}" for n in names])
+
+
+lifecycle.register_warmup("routers", warm_up_routers)
+
+
+@app.on_event("startup")
+async def start_warmup():
+    """后台预热，不阻塞 worker 开始接收请求"""
+    app.state.warmup_task = asyncio.create_task(lifecycle.run_warmup())
+
+
+@app.on_event("shutdown")
+async def shutdown_resources():
+    """关闭异步数据库连接池、阻塞接口线程池和图片处理线程池，归还秒杀库存令牌、回写热点计数并停止预约超时关单线程"""
+    await dispose_async_engine()
+    shutdown_offload_executor()
+    shutdown_image_executor()
+    flash_sale_pool.shutdown()
+    counter_rollup.shutdown()
+    reservation_expiry.shutdown()
 
 
 @app.get("/")
@@ -93,4 +143,15 @@ def root():
 
 @app.get("/health")
 def health():
+    """存活探针：进程可响应即返回 ok，不检查数据库"""
     return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """就绪探针：数据库可连、迁移已到最新且预热完成时返回 200，否则 503"""
+    is_ready, checks = await lifecycle.readiness_report(engine)
+    return JSONResponse(
+        status_code=200 if is_ready else 503,
+        content={"status": "ready" if is_ready else "not_ready", "checks": checks},
+    )
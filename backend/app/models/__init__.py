@@ -3,12 +3,13 @@ from app.models.member import Member, MemberLevel, MemberTag, CoinRecord, PointR
 from app.models.venue import Venue, VenueType, VenueTypeConfig
 from app.models.venue_price import VenuePriceRule
 from app.models.reservation import Reservation
-from app.models.coach import Coach, CoachSchedule, CoachApplication
+from app.models.daily_usage import MemberDailyUsage
+from app.models.coach import Coach, CoachSchedule, CoachWeeklySchedule, CoachScheduleException, CoachApplication
 from app.models.activity import Activity, ActivityRegistration
 from app.models.food import FoodCategory, FoodItem, FoodOrder, FoodOrderItem  # 保留: 数据库表映射(点餐已迁移至美团)
 from app.models.coupon import CouponTemplate, MemberCoupon, CouponPack, CouponPackItem
-from app.models.mall import ProductCategory, Product, ProductOrder
-from app.models.finance import RechargeOrder, ConsumeRecord, CoachSettlement, FinanceStat, RechargePackage
+from app.models.mall import ProductCategory, Product, ProductOrder, MemberProductPurchase, FlashSaleLease
+from app.models.finance import RechargeOrder, PaymentNotifyLog, ConsumeRecord, CoachSettlement, FinanceStat, RechargePackage
 from app.models.message import MessageTemplate, Message, Announcement, Banner
 from app.models.ui_asset import UIIcon, UITheme, UIImage
 from app.models.ui_editor import UIPageConfig, UIBlockConfig, UIMenuItem, UIConfigVersion
@@ -19,18 +20,20 @@ from app.models.member_coupon_issuance import MemberCouponIssuance
 from app.models.review import ServiceReview, ReviewPointConfig
 from app.models.member_invitation import MemberInvitation
 from app.models.feedback import Feedback
+from app.models.upload_blob import UploadBlob
+from app.models.counter_shard import CounterShard
 
 __all__ = [
     "SysUser", "SysRole", "SysDepartment", "SysPermission",
     "Member", "MemberLevel", "MemberTag", "CoinRecord", "PointRecord", "MemberCard", "MemberCardOrder",
     "Venue", "VenueType", "VenueTypeConfig", "VenuePriceRule",
-    "Reservation",
-    "Coach", "CoachSchedule", "CoachApplication",
+    "Reservation", "MemberDailyUsage",
+    "Coach", "CoachSchedule", "CoachWeeklySchedule", "CoachScheduleException", "CoachApplication",
     "Activity", "ActivityRegistration",
     "FoodCategory", "FoodItem", "FoodOrder", "FoodOrderItem",  # 保留: 数据库表映射(点餐已迁移至美团)
     "CouponTemplate", "MemberCoupon", "CouponPack", "CouponPackItem",
-    "ProductCategory", "Product", "ProductOrder",
-    "RechargeOrder", "ConsumeRecord", "CoachSettlement", "FinanceStat", "RechargePackage",
+    "ProductCategory", "Product", "ProductOrder", "MemberProductPurchase", "FlashSaleLease",
+    "RechargeOrder", "PaymentNotifyLog", "ConsumeRecord", "CoachSettlement", "FinanceStat", "RechargePackage",
     "MessageTemplate", "Message", "Announcement", "Banner",
     "UIIcon", "UITheme", "UIImage",
     "UIPageConfig", "UIBlockConfig", "UIMenuItem", "UIConfigVersion",
@@ -40,4 +43,6 @@ __all__ = [
     "ServiceReview", "ReviewPointConfig",
     "MemberInvitation",
     "Feedback",
+    "UploadBlob",
+    "CounterShard",
 ]
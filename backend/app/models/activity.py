@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, Enum
+from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, Enum, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 from app.models.base import TimestampMixin, SoftDeleteMixin
@@ -35,6 +35,8 @@ class Activity(Base, TimestampMixin, SoftDeleteMixin):
     # 报名设置
     max_participants = Column(Integer, default=0, comment="最大参与人数，0表示不限")
     current_participants = Column(Integer, default=0, comment="当前报名人数")
+    waitlist_limit = Column(Integer, default=0, comment="候补名额，0表示不开放候补")
+    waitlist_count = Column(Integer, default=0, comment="当前候补人数")
     price = Column(Numeric(10, 2), default=0, comment="报名费用（金币）")
 
     # 状态
@@ -63,7 +65,14 @@ class ActivityRegistration(Base, TimestampMixin):
     pay_time = Column(DateTime, comment="支付时间")
 
     # 状态
-    status = Column(String(20), default="registered", comment="状态：registered/cancelled/attended")
+    status = Column(String(20), default="registered", comment="状态：registered/waitlisted/cancelled/attended")
+    # 有效报名标记：报名/候补/签到为 1，取消后为 NULL；与唯一索引一起保证同一会员在同一活动只有一条有效报名
+    active_key = Column(Integer, nullable=True, default=1, comment="有效报名标记：有效为1，取消为NULL")
 
     # 签到
     check_in_time = Column(DateTime, comment="签到时间")
+
+    __table_args__ = (
+        Index('idx_activity_registration_activity_status', 'activity_id', 'status'),
+        Index('uq_activity_registration_active', 'activity_id', 'member_id', 'active_key', unique=True),
+    )
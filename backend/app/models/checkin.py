@@ -1,6 +1,6 @@
 """打卡相关模型"""
 from datetime import datetime, date
-from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Boolean, Text, Numeric
+from sqlalchemy import Column, Integer, String, DateTime, Date, ForeignKey, Boolean, Text, Numeric, Index
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
@@ -34,6 +34,11 @@ class GateCheckRecord(Base, TimestampMixin):
     member = relationship("Member", backref="check_records")
     venue = relationship("Venue", backref="check_records")
 
+    # 闸机入场/出场查找当日未出场记录
+    __table_args__ = (
+        Index('idx_gate_check_member_date_out', 'member_id', 'check_date', 'check_out_time'),
+    )
+
 
 class PointRuleConfig(Base, TimestampMixin):
     """积分规则配置表"""
@@ -90,3 +95,8 @@ class Leaderboard(Base, TimestampMixin):
     # 关系
     member = relationship("Member", backref="leaderboard_entries")
     venue_type = relationship("VenueType", backref="leaderboard_entries")
+
+    # 排行榜按周期 + 场馆类型分页（按名次有序扫描，免排序）
+    __table_args__ = (
+        Index('idx_leaderboard_period_rank', 'period_type', 'period_key', 'venue_type_id', 'rank'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Numeric, DateTime, Text, Date
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Numeric, DateTime, Text, Date, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -62,7 +62,7 @@ class Coach(Base, TimestampMixin, SoftDeleteMixin):
 
 
 class CoachSchedule(Base, TimestampMixin):
-    """教练排期表"""
+    """教练排期表（按小时一行的旧结构，已由每周模板 + 日期例外替代，保留供迁移回退）"""
     __tablename__ = "coach_schedule"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
@@ -75,6 +75,37 @@ class CoachSchedule(Base, TimestampMixin):
     coach = relationship("Coach", back_populates="schedules")
 
 
+class CoachWeeklySchedule(Base, TimestampMixin):
+    """教练每周排期模板：每个星期几一行，掩码第 h 位表示 h 点整这一小时"""
+    __tablename__ = "coach_weekly_schedule"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    coach_id = Column(Integer, ForeignKey('coach.id'), nullable=False, comment="教练ID")
+    weekday = Column(Integer, nullable=False, comment="星期几：0周一 ... 6周日")
+    available_mask = Column(Integer, default=0, nullable=False, comment="可用小时掩码")
+    unavailable_mask = Column(Integer, default=0, nullable=False, comment="不可用小时掩码")
+
+    __table_args__ = (
+        UniqueConstraint('coach_id', 'weekday', name='uk_coach_weekly_schedule'),
+    )
+
+
+class CoachScheduleException(Base, TimestampMixin):
+    """教练排期例外：日期区间内覆盖模板中掩码涉及的小时，后写入的覆盖先写入的"""
+    __tablename__ = "coach_schedule_exception"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    coach_id = Column(Integer, ForeignKey('coach.id'), nullable=False, comment="教练ID")
+    start_date = Column(Date, nullable=False, comment="开始日期")
+    end_date = Column(Date, nullable=False, comment="结束日期（含）")
+    available_mask = Column(Integer, default=0, nullable=False, comment="可用小时掩码")
+    unavailable_mask = Column(Integer, default=0, nullable=False, comment="不可用小时掩码")
+
+    __table_args__ = (
+        Index('idx_coach_schedule_exception_range', 'coach_id', 'end_date', 'start_date'),
+    )
+
+
 class CoachApplication(Base, TimestampMixin):
     """教练申请表"""
     __tablename__ = "coach_application"
@@ -0,0 +1,24 @@
+"""热点计数分片模型"""
+from sqlalchemy import Column, Integer, String, UniqueConstraint
+
+from app.core.database import Base
+from app.models.base import TimestampMixin
+
+
+class CounterShard(Base, TimestampMixin):
+    """热点计数分片表：一个计数（如活动报名人数）拆成多行，并发增减分散到不同行
+
+    capacity 为本分片的容量份额（各分片份额之和为总容量），NULL 表示不限
+    """
+    __tablename__ = "counter_shard"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(50), nullable=False, comment="计数名称，如 activity_participants")
+    key = Column(Integer, nullable=False, comment="业务主键，如活动ID")
+    shard = Column(Integer, nullable=False, comment="分片序号")
+    value = Column(Integer, default=0, nullable=False, comment="分片计数")
+    capacity = Column(Integer, nullable=True, comment="分片容量份额，NULL为不限")
+
+    __table_args__ = (
+        UniqueConstraint('name', 'key', 'shard', name='uk_counter_shard'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, Boolean, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, Boolean, ForeignKey, UniqueConstraint, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from app.models.base import TimestampMixin, SoftDeleteMixin
@@ -71,6 +71,11 @@ class MemberCoupon(Base, TimestampMixin):
     order_type = Column(String(20), comment="订单类型")
     order_id = Column(Integer, comment="订单ID")
 
+    # 会员可用券查询（member_id + status='unused' + 未过期）
+    __table_args__ = (
+        Index('idx_member_coupon_member_status_end', 'member_id', 'status', 'end_time'),
+    )
+
 
 class CouponPack(Base, TimestampMixin, SoftDeleteMixin):
     """优惠券合集表（入会赠送券包）"""
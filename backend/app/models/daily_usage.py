@@ -0,0 +1,115 @@
+"""会员每日预约时长台账
+
+member_daily_usage 按 (会员, 日期) 记录未取消预约的总时长，SSS 免费额度检查从这里按唯一键读取，
+不再对 reservation 做 SUM。台账随预约写入在同一事务内增减：
+
+- 走 ORM 对象的写入（下单、取消、后台取消/删除、改期）由 before_flush 钩子按改前/改后状态计算增量
+- 不经过 ORM 对象的批量 UPDATE（如支付失败取消）需调用 apply_usage_delta
+
+增量用 SET used_minutes = used_minutes + n 原子累加，并发预约在同一行上串行。
+"""
+from datetime import date, datetime
+from typing import Dict, Tuple
+
+from sqlalchemy import Column, Integer, ForeignKey, Date, UniqueConstraint, event, inspect, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.database import Base
+from app.models.base import TimestampMixin
+from app.models.reservation import Reservation
+
+
+class MemberDailyUsage(Base, TimestampMixin):
+    """会员每日预约时长台账（未取消、未删除预约的时长合计）"""
+    __tablename__ = "member_daily_usage"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    member_id = Column(Integer, ForeignKey('member.id'), nullable=False, comment="会员ID")
+    usage_date = Column(Date, nullable=False, comment="预约日期")
+    used_minutes = Column(Integer, default=0, nullable=False, comment="已预约分钟数")
+
+    __table_args__ = (
+        UniqueConstraint('member_id', 'usage_date', name='uk_member_daily_usage'),
+    )
+
+
+def _as_date(value) -> date:
+    """Date 列取值（下单时可能直接赋字符串）-> date"""
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def counts_toward_usage(status, is_deleted) -> bool:
+    """计入台账的预约：未取消且未删除（status 为空时按默认 pending）"""
+    return status != "cancelled" and not is_deleted
+
+
+def apply_usage_delta(conn: Connection, member_id: int, day, minutes: int):
+    """台账原子增减；行不存在时插入（并发插入冲突则回到累加）"""
+    if not minutes:
+        return
+    day = _as_date(day)
+    table = MemberDailyUsage.__table__
+    statement = update(table).where(
+        table.c.member_id == member_id,
+        table.c.usage_date == day
+    ).values(used_minutes=table.c.used_minutes + minutes)
+    if conn.execute(statement).rowcount:
+        return
+    try:
+        with conn.begin_nested():
+            conn.execute(table.insert().values(member_id=member_id, usage_date=day, used_minutes=max(0, minutes)))
+    except IntegrityError:
+        conn.execute(statement)
+
+
+def _usage_key(obj: Reservation, old: bool) -> Tuple[int, object, int, bool]:
+    """预约改前/改后的 (会员, 日期, 时长, 是否计入)"""
+    state = inspect(obj)
+
+    def value(attr):
+        history = state.attrs[attr].history
+        if old and history.deleted:
+            return history.deleted[0]
+        return getattr(obj, attr)
+
+    return (value("member_id"), value("reservation_date"), value("duration") or 0,
+            counts_toward_usage(value("status"), value("is_deleted")))
+
+
+@event.listens_for(Session, "before_flush")
+def _track_reservation_usage(session: Session, flush_context, instances):
+    deltas: Dict[Tuple[int, date], int] = {}
+
+    def add(member_id, day, minutes):
+        if member_id and day is not None and minutes:
+            key = (member_id, _as_date(day))
+            deltas[key] = deltas.get(key, 0) + minutes
+
+    for obj in session.new:
+        if isinstance(obj, Reservation):
+            member_id, day, duration, counted = _usage_key(obj, old=False)
+            if counted:
+                add(member_id, day, duration)
+    for obj in session.dirty:
+        if isinstance(obj, Reservation) and session.is_modified(obj):
+            old, new = _usage_key(obj, old=True), _usage_key(obj, old=False)
+            if old[3]:
+                add(old[0], old[1], -old[2])
+            if new[3]:
+                add(new[0], new[1], new[2])
+    for obj in session.deleted:
+        if isinstance(obj, Reservation):
+            member_id, day, duration, counted = _usage_key(obj, old=True)
+            if counted:
+                add(member_id, day, -duration)
+
+    if any(deltas.values()):
+        conn = session.connection()
+        for (member_id, day), minutes in deltas.items():
+            apply_usage_delta(conn, member_id, day, minutes)
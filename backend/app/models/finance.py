@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, Date, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Numeric, Date, Boolean, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 from app.models.base import TimestampMixin, SoftDeleteMixin
@@ -29,6 +29,22 @@ class RechargeOrder(Base, TimestampMixin):
     expire_time = Column(DateTime, comment="过期时间")
 
 
+
+class PaymentNotifyLog(Base, TimestampMixin):
+    """支付回调去重账本（每笔微信支付交易只处理一次）"""
+    __tablename__ = "payment_notify_log"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    transaction_id = Column(String(64), unique=True, nullable=False, comment="微信支付交易号")
+    out_trade_no = Column(String(64), nullable=False, comment="商户订单号")
+    order_type = Column(String(20), nullable=False, comment="订单类型：recharge/member_card/reservation")
+    trade_state = Column(String(32), comment="交易状态")
+    result = Column(String(20), comment="处理结果：applied/ignored")
+
+    __table_args__ = (
+        Index('idx_payment_notify_out_trade_no', 'out_trade_no'),
+    )
+
 class ConsumeRecord(Base, TimestampMixin):
     """消费记录表"""
     __tablename__ = "consume_record"
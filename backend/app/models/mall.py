@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Numeric, Boolean
+from sqlalchemy import Column, Integer, String, Text, Numeric, Boolean, DateTime, UniqueConstraint
 from app.core.database import Base
 from app.models.base import TimestampMixin, SoftDeleteMixin
 
@@ -34,6 +34,8 @@ class Product(Base, TimestampMixin, SoftDeleteMixin):
     # 库存
     stock = Column(Integer, default=999, comment="库存")
     sales = Column(Integer, default=0, comment="兑换量")
+    is_flash_sale = Column(Boolean, default=False, comment="是否秒杀商品（进程内预分配库存令牌）")
+    purchase_limit = Column(Integer, default=0, comment="每人限兑数量，0为不限")
 
     # 状态
     is_active = Column(Boolean, default=True, comment="是否上架")
@@ -80,3 +82,36 @@ class ProductOrder(Base, TimestampMixin):
 
     # 备注
     remark = Column(String(500), comment="备注")
+
+
+class MemberProductPurchase(Base, TimestampMixin):
+    """会员商品兑换数量台账（限购检查按唯一键条件累加，不再统计订单）"""
+    __tablename__ = "member_product_purchase"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    member_id = Column(Integer, nullable=False, comment="会员ID")
+    product_id = Column(Integer, nullable=False, comment="商品ID")
+    quantity = Column(Integer, default=0, nullable=False, comment="已兑换数量")
+
+    __table_args__ = (
+        UniqueConstraint('member_id', 'product_id', name='uk_member_product_purchase'),
+    )
+
+
+class FlashSaleLease(Base, TimestampMixin):
+    """秒杀库存令牌租约：各进程从 stock 预分配、尚未售出或归还的令牌数
+
+    product.stock + 各租约 quantity 之和 = 剩余可售库存。进程定期刷新心跳，
+    心跳超时（进程崩溃）的租约由其他进程或启动预热归还 stock。
+    """
+    __tablename__ = "flash_sale_lease"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    owner = Column(String(64), nullable=False, comment="持有进程：主机名:进程号:启动标识")
+    product_id = Column(Integer, nullable=False, comment="商品ID")
+    quantity = Column(Integer, default=0, nullable=False, comment="已预分配未售出的令牌数")
+    heartbeat_at = Column(DateTime, nullable=False, comment="持有进程最近心跳时间（UTC）")
+
+    __table_args__ = (
+        UniqueConstraint('owner', 'product_id', name='uk_flash_sale_lease'),
+    )
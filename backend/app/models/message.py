@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, Index
 from sqlalchemy.sql import func
 from app.core.database import Base
 from app.models.base import TimestampMixin, SoftDeleteMixin
@@ -53,6 +53,11 @@ class Message(Base, TimestampMixin):
     push_time = Column(DateTime, comment="推送时间")
     push_result = Column(Text, comment="推送结果")
 
+    # 会员/教练消息列表与未读数
+    __table_args__ = (
+        Index('idx_message_receiver_read', 'receiver_type', 'receiver_id', 'is_read'),
+    )
+
 
 class Announcement(Base, TimestampMixin, SoftDeleteMixin):
     """公告表"""
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Numeric, DateTime, Text, Date, Time
+from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, Numeric, DateTime, Text, Date, Time, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -50,6 +50,7 @@ class Reservation(Base, TimestampMixin, SoftDeleteMixin):
     pay_type = Column(String(20), default="coin", comment="支付方式: coin/wechat")
     out_trade_no = Column(String(50), nullable=True, unique=True, comment="微信订单号")
     transaction_id = Column(String(100), nullable=True, comment="微信交易流水号")
+    close_claimed_at = Column(DateTime, nullable=True, comment="超时关单认领时间（同一订单只由一个 worker 关单）")
 
     # 其他
     remark = Column(String(255), nullable=True, comment="备注")
@@ -60,3 +61,11 @@ class Reservation(Base, TimestampMixin, SoftDeleteMixin):
     member = relationship("Member")
     venue = relationship("Venue", back_populates="reservations")
     coach = relationship("Coach", back_populates="reservations")
+
+    # 热点查询索引：场馆日历/冲突检测、会员订单列表、教练日程
+    __table_args__ = (
+        Index('idx_reservation_venue_date_status', 'venue_id', 'reservation_date', 'status'),
+        Index('idx_reservation_member_created', 'member_id', 'created_at'),
+        Index('idx_reservation_coach_date', 'coach_id', 'reservation_date'),
+        Index('idx_reservation_status_created', 'status', 'created_at'),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from app.core.database import Base
 from app.models.base import TimestampMixin, SoftDeleteMixin
@@ -18,7 +18,8 @@ class Team(Base, TimestampMixin, SoftDeleteMixin):
     sport_type = Column(String(20), nullable=False, comment="运动类型：golf/pickleball/tennis/squash")
     description = Column(Text, comment="组队描述")
 
-    # 时间地点
+    # 时间地点（starts_at 为准，activity_date/activity_time 由其派生用于输出）
+    starts_at = Column(DateTime, comment="活动开始时间")
     activity_date = Column(String(20), nullable=False, comment="活动日期 YYYY-MM-DD")
     activity_time = Column(String(20), nullable=False, comment="活动时间 HH:MM")
     location = Column(String(200), comment="活动地点")
@@ -39,6 +40,10 @@ class Team(Base, TimestampMixin, SoftDeleteMixin):
     creator = relationship("Member", foreign_keys=[creator_id])
     members = relationship("TeamMember", back_populates="team")
 
+    __table_args__ = (
+        Index('idx_team_status_sport_starts', 'status', 'sport_type', 'starts_at'),
+    )
+
 
 class TeamMember(Base, TimestampMixin):
     """组队成员表"""
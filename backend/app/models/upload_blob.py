@@ -0,0 +1,21 @@
+"""上传文件内容寻址存储模型"""
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from app.core.database import Base
+from app.models.base import TimestampMixin
+
+
+class UploadBlob(Base, TimestampMixin):
+    """上传文件表（按 SHA-256 去重，引用计数归零后由 GC 回收）"""
+    __tablename__ = "upload_blob"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    sha256 = Column(String(64), unique=True, nullable=False, comment="文件内容 SHA-256")
+    storage_path = Column(String(255), nullable=False, comment="存储路径（相对上传目录），如 blobs/ab/<sha256>.jpg")
+    size = Column(Integer, nullable=False, default=0, comment="文件大小（字节）")
+    content_type = Column(String(100), comment="文件类型")
+    ref_count = Column(Integer, nullable=False, default=0, comment="引用计数")
+    released_at = Column(DateTime, nullable=True, comment="引用计数归零时间（GC 宽限期起点）")
+
+    __table_args__ = (
+        Index('idx_upload_blob_gc', 'ref_count', 'released_at'),
+    )
@@ -10,7 +10,7 @@ from app.schemas.member import (
     MemberLevelCreate, MemberLevelUpdate, MemberLevelResponse,
     MemberTagCreate, MemberTagUpdate, MemberTagResponse,
     MemberCreate, MemberUpdate, MemberResponse,
-    CoinRechargeRequest, PointRechargeRequest,
+    CoinRechargeRequest, PointRechargeRequest, BatchRechargeRequest,
     CoinRecordResponse, PointRecordResponse,
 )
 from app.schemas.venue import (
@@ -122,6 +122,14 @@ class PointRechargeRequest(BaseModel):
     remark: Optional[str] = None
 
 
+class BatchRechargeRequest(BaseModel):
+    """批量发放（只增不减）：kind 为 coin / point"""
+    member_ids: List[int]
+    kind: str = "point"
+    amount: Decimal
+    remark: Optional[str] = None
+
+
 class CoinRecordResponse(BaseModel):
     id: int
     member_id: int
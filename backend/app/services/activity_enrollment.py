@@ -0,0 +1,208 @@
+"""活动报名：容量守卫的原子占位、报名开放瞬间的准入排队、候补与自动递补
+
+- 同一会员：报名记录先于占位写入，active_key + 唯一索引 (activity_id, member_id, active_key)
+  保证同一会员在同一活动只有一条有效报名；并发重复报名在写入时失败（AlreadyEnrolled），不会占位、扣费
+- 占位：报名名额走 counter_service 的分片计数（ACTIVITY_PARTICIPANTS），条件增减保证不超员，
+  并发报名分散到不同分片行，不再排队等活动行锁
+- 候补（waitlist_limit > 0）：名额已满时在候补名额内登记 waitlisted（不扣费），
+  有人取消或后台扩容后按登记顺序递补；递补时扣报名费，金币不足的候补取消并顺延下一位
+- 准入限流（ACTIVITY_ENROLL_CONCURRENCY > 0）：每个 worker 内同一活动同时进入报名流程的请求数受限，
+  没有空位的请求立即返回「报名人数过多」（HTTP 429），不阻塞线程池等待；
+  活动满员（含候补）后 ACTIVITY_FULL_CACHE_TTL 秒内本进程的新请求直接拒绝，不再访问数据库。
+  两者都只是进程内的削峰，跨 worker 的容量判断只有数据库条件增减
+
+所有函数不提交事务，由调用方提交；调用方回滚时占位、扣费一并撤销。
+抛出 AlreadyEnrolled 时会话中的写入已失败，调用方需回滚。
+"""
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List
+
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Member
+from app.models.activity import Activity, ActivityRegistration
+from app.services import counter_service, wallet_service
+from app.services.counter_service import ACTIVITY_PARTICIPANTS, ACTIVITY_WAITLIST
+
+REGISTERED = "registered"
+WAITLISTED = "waitlisted"
+CANCELLED = "cancelled"
+
+
+class ActivityFull(ValueError):
+    def __init__(self):
+        super().__init__("报名名额已满")
+
+
+class AlreadyEnrolled(ValueError):
+    def __init__(self):
+        super().__init__("您已报名该活动")
+
+
+class AdmissionBusy(ValueError):
+    def __init__(self):
+        super().__init__("报名人数过多，请稍后重试")
+
+
+class AdmissionQueue:
+    """按活动限制本进程同时进入报名流程的请求数，并记住已满员的活动"""
+
+    def __init__(self, concurrency: int, full_ttl: float):
+        self.concurrency = concurrency
+        self.full_ttl = full_ttl
+        self._lock = threading.Lock()
+        self._slots: Dict[int, threading.BoundedSemaphore] = {}
+        self._full_until: Dict[int, float] = {}
+
+    def _slot(self, activity_id: int) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(activity_id)
+            if slot is None:
+                slot = self._slots[activity_id] = threading.BoundedSemaphore(self.concurrency)
+            return slot
+
+    @contextmanager
+    def admit(self, activity_id: int):
+        """进入报名流程；没有空位立即抛 AdmissionBusy（concurrency <= 0 时不限流）"""
+        if self.concurrency <= 0:
+            yield
+            return
+        slot = self._slot(activity_id)
+        if not slot.acquire(blocking=False):
+            raise AdmissionBusy()
+        try:
+            yield
+        finally:
+            slot.release()
+
+    def is_full(self, activity_id: int) -> bool:
+        until = self._full_until.get(activity_id)
+        return until is not None and time.monotonic() < until
+
+    def mark_full(self, activity_id: int):
+        if self.full_ttl > 0:
+            self._full_until[activity_id] = time.monotonic() + self.full_ttl
+
+    def clear_full(self, activity_id: int):
+        self._full_until.pop(activity_id, None)
+
+
+admission_queue = AdmissionQueue(
+    settings.ACTIVITY_ENROLL_CONCURRENCY,
+    settings.ACTIVITY_FULL_CACHE_TTL,
+)
+
+
+def enroll(db: Session, activity: Activity, member: Member) -> ActivityRegistration:
+    """占报名名额并扣报名费；名额已满时进候补，候补也满抛 ActivityFull；
+    已有有效报名抛 AlreadyEnrolled；金币不足抛 ValueError"""
+    if admission_queue.is_full(activity.id):
+        raise ActivityFull()
+
+    # 先写报名记录：同一会员并发报名时由唯一索引拦下（后到的等待先到的提交后失败），再占位扣费
+    reg = ActivityRegistration(
+        activity_id=activity.id,
+        member_id=member.id,
+        name=member.nickname or member.phone,
+        phone=member.phone,
+        pay_amount=0,
+        status=REGISTERED,
+    )
+    db.add(reg)
+    try:
+        db.flush()
+    except IntegrityError:
+        raise AlreadyEnrolled()
+
+    price = float(activity.price or 0)
+    if counter_service.claim(db, ACTIVITY_PARTICIPANTS, activity.id):
+        if price > 0:
+            wallet_service.debit(
+                db, member.id, wallet_service.COIN, price,
+                source="活动报名", remark=f"报名活动: {activity.title}"
+            )
+            reg.pay_amount = price
+            reg.pay_time = datetime.now()
+    elif (activity.waitlist_limit or 0) > 0 and counter_service.claim(db, ACTIVITY_WAITLIST, activity.id):
+        reg.status = WAITLISTED
+    else:
+        admission_queue.mark_full(activity.id)
+        raise ActivityFull()
+    return reg
+
+
+def _cancelled(reg: ActivityRegistration):
+    reg.status = CANCELLED
+    reg.active_key = None
+
+
+def cancel(db: Session, activity: Activity, reg: ActivityRegistration) -> float:
+    """取消报名或候补：退回已付金币、释放名额并递补候补，返回退款金额"""
+    if reg.status == WAITLISTED:
+        _cancelled(reg)
+        counter_service.release(db, ACTIVITY_WAITLIST, activity.id)
+        admission_queue.clear_full(activity.id)
+        return 0.0
+
+    refund = float(reg.pay_amount or 0)
+    if refund > 0:
+        wallet_service.credit(
+            db, reg.member_id, wallet_service.COIN, refund,
+            source="活动退款", remark=f"取消报名: {activity.title}"
+        )
+    _cancelled(reg)
+    counter_service.release(db, ACTIVITY_PARTICIPANTS, activity.id)
+    promote_waitlist(db, activity)
+    return refund
+
+
+def promote_waitlist(db: Session, activity: Activity) -> List[ActivityRegistration]:
+    """按登记顺序把候补转为正式报名，直到名额占满或候补递补完，返回递补成功的报名
+
+    名额有变动（取消、扩容）时调用，同时清除本进程的满员标记。
+    """
+    promoted = []
+    candidates = db.query(ActivityRegistration).filter(
+        ActivityRegistration.activity_id == activity.id,
+        ActivityRegistration.status == WAITLISTED,
+    ).order_by(ActivityRegistration.id).all()
+    price = float(activity.price or 0)
+
+    for reg in candidates:
+        if not counter_service.claim(db, ACTIVITY_PARTICIPANTS, activity.id):
+            break
+        # 条件转正：并发取消/递补时同一候补只会被转正一次
+        taken = db.execute(
+            update(ActivityRegistration)
+            .where(ActivityRegistration.id == reg.id, ActivityRegistration.status == WAITLISTED)
+            .values(status=REGISTERED)
+            .execution_options(synchronize_session=False)
+        ).rowcount
+        if not taken:
+            counter_service.release(db, ACTIVITY_PARTICIPANTS, activity.id)
+            continue
+        counter_service.release(db, ACTIVITY_WAITLIST, activity.id)
+
+        if price > 0:
+            try:
+                wallet_service.debit(
+                    db, reg.member_id, wallet_service.COIN, price,
+                    source="活动报名", remark=f"候补递补: {activity.title}"
+                )
+            except ValueError:
+                _cancelled(reg)
+                reg.remark = "候补递补时金币余额不足，已取消"
+                counter_service.release(db, ACTIVITY_PARTICIPANTS, activity.id)
+                continue
+            reg.pay_amount = price
+            reg.pay_time = datetime.now()
+        reg.status = REGISTERED
+        promoted.append(reg)
+    admission_queue.clear_full(activity.id)
+    return promoted
@@ -0,0 +1,185 @@
+"""内容寻址上传存储
+
+上传文件按内容 SHA-256 存放在 uploads/blobs/<前两位>/<sha256>.<扩展名>，
+相同内容只存一份，URL 稳定且内容不可变，可设置长期 immutable 缓存。
+
+引用计数：每次上传获得一个引用（由 delete_file 释放）；UI素材每个列写入 blob URL 时各自再持有一个引用
+（创建、替换图片时 retain_blob），删除素材或替换图片时释放旧 URL 的引用。
+计数归零的文件保留 BLOB_GC_GRACE_HOURS 小时，由 scripts/gc_upload_blobs.py 定期回收；
+回收前再按 BLOB_REFERENCES 检查未删除的素材是否仍在使用（兼容引用计数上线前写入的素材）。
+"""
+import os
+import re
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from sqlalchemy import and_, case, delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.ui_asset import UIIcon, UIImage
+from app.models.upload_blob import UploadBlob
+from app.services.image_pipeline import IMAGE_VARIANTS, variant_path
+
+BLOB_DIR = "blobs"
+
+# 保存上传 URL 的素材列：(列, 软删除标记列)
+BLOB_REFERENCES = (
+    (UIIcon.icon_normal, UIIcon.is_deleted),
+    (UIIcon.icon_active, UIIcon.is_deleted),
+    (UIImage.image_url, UIImage.is_deleted),
+)
+
+_BLOB_URL_RE = re.compile(r"^/uploads/blobs/[0-9a-f]{2}/([0-9a-f]{64})\.[A-Za-z0-9]+$")
+
+
+def blob_storage_path(sha256: str, ext: str) -> str:
+    """存储路径（相对上传目录）"""
+    return f"{BLOB_DIR}/{sha256[:2]}/{sha256}{ext.lower()}"
+
+
+def blob_url(storage_path: str) -> str:
+    return f"/uploads/{storage_path}"
+
+
+def blob_file_path(storage_path: str) -> str:
+    return os.path.join(settings.UPLOAD_DIR, storage_path)
+
+
+def parse_blob_url(url: Optional[str]) -> Optional[str]:
+    """内容寻址 URL -> sha256，非 blob URL 返回 None"""
+    if not url:
+        return None
+    match = _BLOB_URL_RE.match(url)
+    return match.group(1) if match else None
+
+
+def place_blob(temp_path: str, storage_path: str) -> str:
+    """将临时文件放入内容寻址位置（同步，应在线程池中调用）
+
+    目标已存在时同样用新文件原子替换（内容相同）：不依赖「文件已存在」的判断，
+    GC 恰好在此时删除旧文件也不会留下指向缺失文件的引用。失败时删除临时文件。
+    """
+    file_path = blob_file_path(storage_path)
+    try:
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        os.replace(temp_path, file_path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return file_path
+
+
+def _acquire_stmt(sha256: str):
+    return update(UploadBlob).where(UploadBlob.sha256 == sha256).values(
+        ref_count=UploadBlob.ref_count + 1,
+        released_at=None,
+    )
+
+
+def _release_stmt(sha256: str):
+    return update(UploadBlob).where(
+        UploadBlob.sha256 == sha256,
+        UploadBlob.ref_count > 0,
+    ).values(
+        ref_count=UploadBlob.ref_count - 1,
+        released_at=case((UploadBlob.ref_count == 1, datetime.now()), else_=UploadBlob.released_at),
+    )
+
+
+async def acquire_blob(
+    db: AsyncSession, sha256: str, storage_path: str, size: int, content_type: Optional[str]
+):
+    """增加引用（首次上传时创建记录）"""
+    result = await db.execute(_acquire_stmt(sha256))
+    if result.rowcount == 0:
+        db.add(UploadBlob(
+            sha256=sha256, storage_path=storage_path, size=size,
+            content_type=content_type, ref_count=1,
+        ))
+        try:
+            await db.commit()
+            return
+        except IntegrityError:
+            # 并发上传了相同内容，改为增加引用
+            await db.rollback()
+            await db.execute(_acquire_stmt(sha256))
+    await db.commit()
+
+
+async def release_blob_async(db: AsyncSession, url: str) -> bool:
+    """释放引用并提交，返回是否为 blob URL 且成功释放"""
+    sha256 = parse_blob_url(url)
+    if not sha256:
+        return False
+    result = await db.execute(_release_stmt(sha256))
+    await db.commit()
+    return result.rowcount > 0
+
+
+def retain_blob(db: Session, url: Optional[str]) -> bool:
+    """素材列写入 blob URL 时增加引用（由调用方提交事务），非 blob URL 或无记录时忽略"""
+    sha256 = parse_blob_url(url)
+    if not sha256:
+        return False
+    return db.execute(_acquire_stmt(sha256)).rowcount > 0
+
+
+def _in_use(db: Session, url: str) -> bool:
+    return any(
+        db.execute(select(column).where(column == url, deleted == False).limit(1)).first() is not None
+        for column, deleted in BLOB_REFERENCES
+    )
+
+
+def release_blob(db: Session, url: Optional[str]) -> bool:
+    """释放引用（由调用方提交事务），非 blob URL 忽略"""
+    sha256 = parse_blob_url(url)
+    if not sha256:
+        return False
+    return db.execute(_release_stmt(sha256)).rowcount > 0
+
+
+def collect_garbage(db: Session, grace_hours: Optional[int] = None) -> List[str]:
+    """回收引用计数为 0 且超过宽限期的文件，返回已删除的存储路径"""
+    grace = settings.BLOB_GC_GRACE_HOURS if grace_hours is None else grace_hours
+    deadline = datetime.now() - timedelta(hours=grace)
+    candidates = db.execute(
+        select(UploadBlob.id, UploadBlob.storage_path).where(
+            UploadBlob.ref_count == 0,
+            UploadBlob.released_at <= deadline,
+        )
+    ).all()
+
+    removed = []
+    for blob_id, storage_path in candidates:
+        # 锁住引用仍为 0 的记录，先删文件再删记录：并发上传的 acquire_blob 等待行锁，
+        # 提交后看到记录已删除会重新建记录并放入文件，不会引用到已删除的文件
+        locked = db.execute(
+            select(UploadBlob.id).where(
+                and_(UploadBlob.id == blob_id, UploadBlob.ref_count == 0)
+            ).with_for_update()
+        ).first()
+        if locked is None or _in_use(db, blob_url(storage_path)):
+            db.commit()
+            continue
+        file_path = blob_file_path(storage_path)
+        paths = [file_path] + [
+            variant_path(file_path, variant, webp=webp)
+            for variant in IMAGE_VARIANTS for webp in (False, True)
+        ]
+        try:
+            for path in paths:
+                if os.path.exists(path):
+                    os.remove(path)
+        except OSError:
+            # 保留记录，下次回收重试
+            db.rollback()
+            continue
+        db.execute(delete(UploadBlob).where(UploadBlob.id == blob_id))
+        db.commit()
+        removed.append(storage_path)
+    return removed
@@ -0,0 +1,102 @@
+"""预约决策上下文
+
+一次下单/报价需要的数据（会员等级、当日已约时长（每日台账）、场馆与当天定价规则、教练、优惠券及模板）
+在这里按固定条数查询一次加载（至多 6 条，与预约时长无关），再依次传给
+BookingService（权限、SSS 免费额度、报价）与 VenuePricingService（逐小时定价）。
+原先下单时等级懒加载、已约时长查两遍、可用券列表查了不用、场馆查两遍、定价逐小时查询。
+"""
+from datetime import date
+from decimal import Decimal
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.models import Member, MemberLevel, Venue, Coach, MemberCoupon, CouponTemplate
+from app.services import daily_usage_service
+from app.services.venue_pricing_service import VenuePricingService
+
+
+class BookingContext:
+    """一次预约决策所需的全部数据（只读，不写库）"""
+
+    def __init__(
+        self,
+        member: Member,
+        booking_date: date,
+        level: Optional[MemberLevel] = None,
+        used_minutes: int = 0,
+        venue: Optional[Venue] = None,
+        day_prices: Optional[Dict[int, Decimal]] = None,
+        coach: Optional[Coach] = None,
+        coupon_id: Optional[int] = None,
+        coupon: Optional[MemberCoupon] = None,
+        coupon_template: Optional[CouponTemplate] = None
+    ):
+        self.member = member
+        self.booking_date = booking_date
+        self.level = level
+        self.used_minutes = used_minutes
+        self.venue = venue
+        self.day_prices = day_prices or {}
+        self.coach = coach
+        self.coupon_id = coupon_id
+        self.coupon = coupon
+        self.coupon_template = coupon_template
+
+    @property
+    def coupon_requested(self) -> bool:
+        """是否选择了优惠券（选了但未查到时 coupon 为 None）"""
+        return bool(self.coupon_id)
+
+    @property
+    def level_code(self) -> str:
+        return self.level.level_code if self.level else "S"
+
+    @property
+    def daily_free_hours(self) -> int:
+        return getattr(self.level, 'daily_free_hours', 0) or 0
+
+    @property
+    def venue_default_price(self) -> Decimal:
+        """场馆默认价格（已删除的场馆按 0 计，与 VenuePricingService 兜底一致）"""
+        if not self.venue or self.venue.is_deleted:
+            return Decimal('0')
+        return self.venue.price or Decimal('0')
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        member: Member,
+        booking_date: date,
+        venue_id: Optional[int] = None,
+        coach_id: Optional[int] = None,
+        coupon_id: Optional[int] = None
+    ) -> "BookingContext":
+        """按需加载：未选场馆/教练/优惠券时不查询对应数据"""
+        level = db.get(MemberLevel, member.level_id) if member.level_id else None
+        ctx = cls(member, booking_date, level=level, coupon_id=coupon_id)
+
+        if ctx.level_code == 'SSS' and ctx.daily_free_hours > 0:
+            ctx.used_minutes = daily_usage_service.get_used_minutes(db, member.id, booking_date)
+
+        if venue_id:
+            ctx.venue = db.query(Venue).filter(Venue.id == venue_id).first()
+            if ctx.venue:
+                ctx.day_prices = VenuePricingService(db).get_day_prices(venue_id, booking_date.weekday())
+
+        if coach_id:
+            ctx.coach = db.query(Coach).filter(Coach.id == coach_id).first()
+
+        if coupon_id:
+            row = db.query(MemberCoupon, CouponTemplate).outerjoin(
+                CouponTemplate, MemberCoupon.template_id == CouponTemplate.id
+            ).filter(
+                MemberCoupon.id == coupon_id,
+                MemberCoupon.member_id == member.id,
+                MemberCoupon.status == 'unused'
+            ).first()
+            if row:
+                ctx.coupon, ctx.coupon_template = row
+
+        return ctx
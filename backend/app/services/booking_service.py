@@ -1,10 +1,13 @@
 """预约权限检查服务（三级会员制版本: S/SS/SSS）"""
 from datetime import date, datetime, timedelta
-from typing import Dict, List
+from typing import Dict, List, Optional
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy import and_
 
-from app.models import Member, MemberLevel, Reservation, MemberCoupon, CouponTemplate
+from app.models import Member, MemberLevel, MemberCoupon, CouponTemplate
+from app.services import daily_usage_service
+from app.services.booking_context import BookingContext
+from app.services.venue_pricing_service import VenuePricingService
 
 
 class BookingService:
@@ -17,7 +20,9 @@ class BookingService:
         self,
         member: Member,
         venue_id: int,
-        booking_date: date
+        booking_date: date,
+        context: Optional[BookingContext] = None,
+        with_coupons: bool = True
     ) -> Dict:
         """
         检查会员预约权限（三级会员制）
@@ -26,8 +31,10 @@ class BookingService:
         - S级: 无预约权限
         - SS级: can_book_venue=True, 仅当天
         - SSS级: can_book_venue=True, 提前3天, 每日2h免费(超出部分付费)
+
+        传入 context 时使用其中已加载的等级与当日已约时长；with_coupons=False 不查询可用券列表
         """
-        level = member.level
+        level = context.level if context else member.level
 
         # 1. 检查会员等级是否可预约
         if not level or not getattr(level, 'can_book_venue', False):
@@ -107,7 +114,10 @@ class BookingService:
         daily_free_hours = getattr(level, 'daily_free_hours', 0) or 0
         free_info = None
         if level_code == 'SSS' and daily_free_hours > 0:
-            used_minutes = self._get_daily_used_minutes(member.id, booking_date)
+            if context:
+                used_minutes = context.used_minutes
+            else:
+                used_minutes = self._get_daily_used_minutes(member.id, booking_date)
             remaining_free_minutes = max(0, daily_free_hours * 60 - used_minutes)
             free_info = {
                 "daily_free_hours": daily_free_hours,
@@ -115,27 +125,36 @@ class BookingService:
                 "remaining_free_minutes": remaining_free_minutes
             }
 
-        # 5. 获取可用优惠券
-        available_coupons = self._get_available_coupons(member.id, 'venue')
-
         result = {
             "can_book": True,
             "booking_range": {
                 "min_date": today.isoformat(),
                 "max_date": max_date.isoformat()
             },
-            "available_coupons": available_coupons,
             "level_code": level_code,
         }
+
+        # 5. 获取可用优惠券
+        if with_coupons:
+            result["available_coupons"] = self._get_available_coupons(member.id, 'venue')
         if free_info:
             result["free_usage_info"] = free_info
 
         return result
 
-    def check_sss_free_limit(self, member_id: int, booking_date: date, duration_minutes: int, daily_free_hours: int) -> Dict:
+    def check_sss_free_limit(
+        self,
+        member_id: int,
+        booking_date: date,
+        duration_minutes: int,
+        daily_free_hours: int,
+        used_minutes: Optional[int] = None
+    ) -> Dict:
         """
         SSS级：计算免费部分和付费部分（不再拒绝，超出部分允许付费）
 
+        used_minutes 为当日已约分钟数，已加载时传入（见 BookingContext），否则查询
+
         Returns:
             {
                 "allowed": True,
@@ -145,7 +164,8 @@ class BookingService:
                 "remaining_after": int    # 本次预约后剩余免费分钟数
             }
         """
-        used_minutes = self._get_daily_used_minutes(member_id, booking_date)
+        if used_minutes is None:
+            used_minutes = self._get_daily_used_minutes(member_id, booking_date)
         total_free_minutes = daily_free_hours * 60
         remaining_free = max(0, total_free_minutes - used_minutes)
 
@@ -166,17 +186,124 @@ class BookingService:
                 "remaining_after": 0
             }
 
+    def quote_booking(
+        self,
+        ctx: BookingContext,
+        start_time=None,
+        end_time=None,
+        duration: int = 60
+    ) -> Dict:
+        """
+        预约报价（不写库）：权限 -> SSS免费抵扣 -> 场馆/教练费用 -> 优惠券抵扣
+
+        无预约权限时返回权限检查结果（can_book=False）；优惠券不可用抛 ValueError
+        """
+        perm = self.check_booking_permission(
+            ctx.member, ctx.venue.id if ctx.venue else None, ctx.booking_date, context=ctx, with_coupons=False
+        )
+        if not perm["can_book"]:
+            return perm
+
+        # SSS级计算免费/付费拆分（超出部分允许付费）
+        sss_free_check = None
+        if ctx.level_code == 'SSS' and ctx.daily_free_hours > 0:
+            sss_free_check = self.check_sss_free_limit(
+                ctx.member.id, ctx.booking_date, duration, ctx.daily_free_hours, used_minutes=ctx.used_minutes
+            )
+
+        # 场馆费用（SSS级由免费额度抵扣）
+        venue_price = 0
+        breakdown = []
+        if ctx.venue:
+            if start_time and end_time:
+                start_hour = int(start_time.split(":")[0]) if isinstance(start_time, str) else start_time
+                end_hour = int(end_time.split(":")[0]) if isinstance(end_time, str) else end_time
+                price_result = VenuePricingService(self.db).calculate_booking_price(
+                    ctx.venue.id, ctx.booking_date, start_hour, end_hour,
+                    day_prices=ctx.day_prices, default_price=ctx.venue_default_price
+                )
+                venue_price = price_result["total"]
+                breakdown = price_result["breakdown"]
+            else:
+                venue_price = float(ctx.venue.price or 0) * (duration / 60)
+
+        sss_discount = 0
+        is_sss_free = False
+        if sss_free_check:
+            if sss_free_check["fully_free"]:
+                sss_discount = venue_price
+                is_sss_free = True
+            elif sss_free_check["free_minutes"] > 0 and duration > 0:
+                sss_discount = round(venue_price * (sss_free_check["free_minutes"] / duration), 2)
+
+        venue_price_after_free = round(venue_price - sss_discount, 2)
+
+        # 教练费用
+        coach_price = 0
+        if ctx.coach:
+            coach_price = float(ctx.coach.price or 0) * (duration / 60)
+
+        total_price = venue_price_after_free + coach_price
+
+        # 优惠券抵扣（基于扣除SSS免费后的场馆价格）
+        coupon_discount = 0
+        if ctx.coupon_requested:
+            coupon_discount = self.calculate_coupon_discount(ctx, venue_price_after_free, duration)
+
+        return {
+            "can_book": True,
+            "level_code": ctx.level_code,
+            "venue_price": venue_price,
+            "price_breakdown": breakdown,
+            "sss_discount": sss_discount,
+            "venue_price_after_free": venue_price_after_free,
+            "coach_price": coach_price,
+            "coupon_discount": coupon_discount,
+            "actual_price": max(0, total_price - coupon_discount),
+            "is_free": is_sss_free,
+            "free_usage_info": sss_free_check,
+        }
+
+    def calculate_coupon_discount(self, ctx: BookingContext, venue_price_after_free: float, duration: int) -> float:
+        """校验所选优惠券并计算抵扣金额，不可用时抛 ValueError"""
+        coupon = ctx.coupon
+        if not coupon:
+            raise ValueError("优惠券不存在或已使用")
+        # 有效期校验
+        now = datetime.now()
+        if coupon.start_time and coupon.start_time > now:
+            raise ValueError("优惠券尚未生效")
+        if coupon.end_time and coupon.end_time < now:
+            raise ValueError("优惠券已过期")
+        # applicable_type 校验
+        template = ctx.coupon_template
+        if not template:
+            raise ValueError("优惠券模板不存在")
+        if template.applicable_type not in ('venue', 'all'):
+            raise ValueError("该优惠券不适用于场馆预约")
+        # 体验券不可用于支付抵扣
+        if coupon.type == 'experience':
+            raise ValueError("体验券不可用于支付抵扣")
+        # min_amount 校验（基于扣除SSS免费后的价格）
+        if coupon.min_amount and float(coupon.min_amount) > venue_price_after_free:
+            raise ValueError(f"未达到最低消费 {coupon.min_amount} 金币")
+
+        if coupon.type == 'cash':
+            return min(float(coupon.discount_value or 0), venue_price_after_free)
+        if coupon.type == 'gift':
+            return venue_price_after_free
+        if coupon.type == 'hour_free':
+            # 时长券：按预约时长比例抵扣
+            free_hours = float(coupon.discount_value or 0)
+            booked_hours = duration / 60
+            if booked_hours <= free_hours:
+                return venue_price_after_free
+            return round(venue_price_after_free * (free_hours / booked_hours), 2)
+        return 0
+
     def _get_daily_used_minutes(self, member_id: int, target_date: date) -> int:
-        """计算会员某天已预约的总分钟数（排除已取消的）"""
-        result = self.db.query(
-            func.coalesce(func.sum(Reservation.duration), 0)
-        ).filter(
-            Reservation.member_id == member_id,
-            Reservation.reservation_date == target_date,
-            Reservation.status.notin_(['cancelled']),
-            Reservation.is_deleted == False
-        ).scalar()
-        return int(result)
+        """会员某天已预约的总分钟数（排除已取消的，读每日台账）"""
+        return daily_usage_service.get_used_minutes(self.db, member_id, target_date)
 
     def _get_available_coupons(self, member_id: int, applicable_type: str) -> List[Dict]:
         """获取可用优惠券列表（按 applicable_type 过滤，排除体验券）"""
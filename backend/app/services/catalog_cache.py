@@ -0,0 +1,119 @@
+"""公开目录接口响应缓存
+
+场馆列表/详情、场馆类型、轮播图、会员卡、商城分类、充值套餐等公开接口变化极少，
+按「接口 + 查询参数」缓存序列化后的响应字节，并按标签失效：
+后台对应的增删改接口提交后调用 catalog_cache.invalidate(标签)。
+
+响应附带 ETag 与 Cache-Control（短 max-age），便于小程序协商缓存及 nginx 代理缓存。
+多 worker 部署时，其他进程的缓存最长在 CATALOG_CACHE_TTL 秒后过期。
+"""
+import hashlib
+import threading
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+from fastapi import Request, Response
+
+from app.core.config import settings
+from app.core.responses import encode_response
+
+# 缓存标签
+TAG_VENUES = "venues"
+TAG_VENUE_TYPES = "venue_types"
+TAG_BANNERS = "banners"
+TAG_MEMBER_CARDS = "member_cards"
+TAG_MALL_CATEGORIES = "mall_categories"
+TAG_RECHARGE_PACKAGES = "recharge_packages"
+
+
+class CachedResponse:
+    """预序列化的响应"""
+
+    __slots__ = ("body", "etag", "tags", "expires_at")
+
+    def __init__(self, data: Any, tags: Tuple[str, ...], ttl: int):
+        self.body = encode_response(data)
+        self.etag = f'W/"{hashlib.sha1(self.body).hexdigest()[:20]}"'
+        self.tags = tags
+        self.expires_at = time.monotonic() + ttl
+
+
+class CatalogCache:
+    """进程内目录缓存（按查询形态存储，按标签失效）"""
+
+    def __init__(self, ttl: int, max_entries: int = 2048):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: Dict[str, CachedResponse] = {}
+        self._tag_keys: Dict[str, Set[str]] = {}
+        self._generations: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at <= time.monotonic():
+            return None
+        return entry
+
+    def _generation(self, tags: Iterable[str]) -> Tuple[int, ...]:
+        return tuple(self._generations.get(tag, 0) for tag in tags)
+
+    def _store(self, key: str, tags: Tuple[str, ...], data: Any, generation: Tuple[int, ...]) -> CachedResponse:
+        entry = CachedResponse(data, tags, self.ttl)
+        with self._lock:
+            # 构建期间发生失效则不写入，避免缓存旧数据
+            if self._generation(tags) != generation:
+                return entry
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                self._entries.clear()
+                self._tag_keys.clear()
+            self._entries[key] = entry
+            for tag in tags:
+                self._tag_keys.setdefault(tag, set()).add(key)
+        return entry
+
+    def get_or_build(self, key: str, tags: Tuple[str, ...], builder: Callable[[], Any]) -> CachedResponse:
+        """命中直接返回，否则调用 builder 构建 data 并缓存"""
+        entry = self.get(key)
+        if entry is None:
+            generation = self._generation(tags)
+            entry = self._store(key, tags, builder(), generation)
+        return entry
+
+    async def aget_or_build(
+        self, key: str, tags: Tuple[str, ...], builder: Callable[[], Awaitable[Any]]
+    ) -> CachedResponse:
+        """get_or_build 的协程版本"""
+        entry = self.get(key)
+        if entry is None:
+            generation = self._generation(tags)
+            entry = self._store(key, tags, await builder(), generation)
+        return entry
+
+    def invalidate(self, *tags: str):
+        """按标签失效"""
+        with self._lock:
+            for tag in tags:
+                self._generations[tag] = self._generations.get(tag, 0) + 1
+                for key in self._tag_keys.pop(tag, set()):
+                    self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tag_keys.clear()
+
+
+def cached_json_response(request: Request, entry: CachedResponse) -> Response:
+    """输出缓存响应，If-None-Match 命中时返回 304"""
+    headers = {
+        "ETag": entry.etag,
+        "Cache-Control": f"public, max-age={settings.CATALOG_CACHE_MAX_AGE}",
+    }
+    if_none_match = request.headers.get("if-none-match", "")
+    if entry.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=entry.body, media_type="application/json", headers=headers)
+
+
+catalog_cache = CatalogCache(ttl=settings.CATALOG_CACHE_TTL)
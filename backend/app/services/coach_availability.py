@@ -0,0 +1,240 @@
+"""教练可用性索引
+
+会员端「教练某日排期」与教练端「日期区间排期」原先每次请求都查询排期行与重叠预约，
+再逐小时合并。这里按 (教练, 日期) 在进程内缓存合并后的状态向量：每天 24 字节，
+第 h 字节为 h 点整这一小时的状态（未设置/可用/不可用/已预约），多日区间查询只是字典查找，
+缺失的日期按区间一次性加载（每周模板、排期例外、预约各一条查询，见 coach_schedule_service）。
+
+失效：
+- 会话提交时，按本次 flush 涉及的排期例外 / 预约（新增、修改、删除，含改前的教练与日期）失效对应的
+  (教练, 日期)，每周模板变更失效该教练全部日期：覆盖排期编辑、下单、取消、确认/拒绝等走 ORM 对象的写入
+- 批量 UPDATE 语句（如支付回调的条件更新）不经过 ORM 对象，需调用 mark_dirty / invalidate_reservation
+- 多 worker 部署时，其他进程的缓存最长在 COACH_AVAILABILITY_TTL 秒后过期
+
+容量：缓存按 (教练, 日期) 做 LRU，最多 COACH_AVAILABILITY_MAX_DAYS 项，超出时淘汰最久未访问的日期。
+"""
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import CoachWeeklySchedule, CoachScheduleException, Reservation
+from app.services.coach_schedule_service import resolve_range
+
+# 状态编码（向量中每小时一个字节）
+UNSET, AVAILABLE, UNAVAILABLE, RESERVED = 0, 1, 2, 3
+STATUS_NAMES = {AVAILABLE: "available", UNAVAILABLE: "unavailable", RESERVED: "reserved"}
+
+# 占用教练时间的预约状态
+ACTIVE_RESERVATION_STATUSES = ("pending", "confirmed", "in_progress")
+
+# 会员端展示的营业时段
+BOOKABLE_HOURS = range(8, 22)
+
+_DIRTY_KEY = "coach_availability_dirty"
+
+
+def to_date(value) -> Optional[date]:
+    """Date 列取值（ORM 中可能是字符串）-> date"""
+    if value is None or isinstance(value, date) and not isinstance(value, datetime):
+        return value
+    if isinstance(value, datetime):
+        return value.date()
+    return date.fromisoformat(str(value)[:10])
+
+
+def _hour(value) -> int:
+    """Time 列取值（可能是字符串）-> 小时"""
+    return value.hour if hasattr(value, "hour") else int(str(value).split(":")[0])
+
+
+def build_vector(masks: Tuple[int, int], reservations: Iterable[Tuple[object, object]]) -> bytes:
+    """排期 (可用, 不可用) 掩码与预约 (start_time, end_time) -> 24 字节状态向量（预约优先）"""
+    available, unavailable = masks
+    vector = bytearray(24)
+    for hour in range(24):
+        if available >> hour & 1:
+            vector[hour] = AVAILABLE
+        elif unavailable >> hour & 1:
+            vector[hour] = UNAVAILABLE
+    for start_time, end_time in reservations:
+        for hour in range(_hour(start_time), min(_hour(end_time), 24)):
+            vector[hour] = RESERVED
+    return bytes(vector)
+
+
+class CoachAvailability:
+    """进程内教练可用性缓存：(coach_id, date) -> (状态向量, 过期时间)，有界 LRU"""
+
+    def __init__(self, ttl: int, max_days: int):
+        self.ttl = ttl
+        self.max_days = max_days
+        self._days: "OrderedDict[Tuple[int, date], Tuple[bytes, float]]" = OrderedDict()
+        self._generations: Dict[int, int] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session, coach_id: int, start: date, end: date) -> Dict[date, bytes]:
+        """一次查询区间内的排期与占用中的预约，生成每天的状态向量"""
+        schedules = resolve_range(db, coach_id, start, end)
+
+        reservations: Dict[date, List[Tuple[object, object]]] = {}
+        for day, start_time, end_time in db.execute(
+            select(Reservation.reservation_date, Reservation.start_time, Reservation.end_time).where(
+                Reservation.coach_id == coach_id,
+                Reservation.reservation_date >= start,
+                Reservation.reservation_date <= end,
+                Reservation.status.in_(ACTIVE_RESERVATION_STATUSES),
+                Reservation.is_deleted == False
+            )
+        ):
+            reservations.setdefault(to_date(day), []).append((start_time, end_time))
+
+        return {day: build_vector(masks, reservations.get(day, ())) for day, masks in schedules.items()}
+
+    def get_range(self, db: Session, coach_id: int, start: date, end: date) -> Dict[date, bytes]:
+        """区间内每天的状态向量（缓存缺失的日期一次加载）"""
+        now = time.monotonic()
+        result: Dict[date, bytes] = {}
+        missing: List[date] = []
+        with self._lock:
+            day = start
+            while day <= end:
+                key = (coach_id, day)
+                entry = self._days.get(key)
+                if entry is None or entry[1] <= now:
+                    missing.append(day)
+                else:
+                    self._days.move_to_end(key)
+                    result[day] = entry[0]
+                day += timedelta(days=1)
+
+        if missing:
+            generation = self._generations.get(coach_id, 0)
+            loaded = self._load(db, coach_id, missing[0], missing[-1])
+            result.update({d: loaded[d] for d in missing})
+            with self._lock:
+                # 加载期间发生失效则不写入，避免缓存旧数据
+                if self._generations.get(coach_id, 0) == generation:
+                    expires_at = time.monotonic() + self.ttl
+                    for d in missing:
+                        self._days[(coach_id, d)] = (loaded[d], expires_at)
+                        self._days.move_to_end((coach_id, d))
+                    while len(self._days) > self.max_days:
+                        self._days.popitem(last=False)
+        return result
+
+    def get_day(self, db: Session, coach_id: int, day: date) -> bytes:
+        return self.get_range(db, coach_id, day, day)[day]
+
+    def invalidate(self, keys: Iterable[Tuple[int, Optional[date]]]):
+        """失效若干 (教练, 日期)，日期为 None 时失效该教练全部日期"""
+        with self._lock:
+            for coach_id, day in keys:
+                self._generations[coach_id] = self._generations.get(coach_id, 0) + 1
+                if day is None:
+                    for key in [k for k in self._days if k[0] == coach_id]:
+                        del self._days[key]
+                    continue
+                self._days.pop((coach_id, day), None)
+
+    def __len__(self):
+        return len(self._days)
+
+    def clear(self):
+        with self._lock:
+            self._days.clear()
+            self._generations.clear()
+
+
+coach_availability = CoachAvailability(ttl=settings.COACH_AVAILABILITY_TTL, max_days=settings.COACH_AVAILABILITY_MAX_DAYS)
+
+
+# ==================== 视图 ====================
+
+def member_day_slots(vector: bytes) -> List[dict]:
+    """会员端某日时段列表（未设置的时段视为可用）"""
+    return [{
+        "time": f"{hour:02d}:00",
+        "label": f"{hour:02d}:00 - {hour + 1:02d}:00",
+        "status": STATUS_NAMES.get(vector[hour], "available")
+    } for hour in BOOKABLE_HOURS]
+
+
+def coach_range_view(vectors: Dict[date, bytes]) -> Dict[str, Dict[str, str]]:
+    """教练端区间排期：日期 -> {时段: 状态}，只包含已设置或已预约的时段"""
+    result = {}
+    for day, vector in vectors.items():
+        if not any(vector):
+            continue
+        result[day.isoformat()] = {
+            f"{hour:02d}:00": STATUS_NAMES[code] for hour, code in enumerate(vector) if code
+        }
+    return result
+
+
+# ==================== 写入后失效 ====================
+
+def _values(obj, attr: str) -> set:
+    """属性当前值及本次 flush 前的旧值"""
+    return set(inspect(obj).attrs[attr].history.sum()) | {getattr(obj, attr)}
+
+
+def _keys_of(obj) -> Set[Tuple[int, Optional[date]]]:
+    """对象影响的 (教练, 日期)：含改前的教练与日期；每周模板影响该教练全部日期"""
+    coaches = {c for c in _values(obj, "coach_id") if c}
+    if isinstance(obj, CoachWeeklySchedule):
+        return {(c, None) for c in coaches}
+    if isinstance(obj, Reservation):
+        days = {to_date(d) for d in _values(obj, "reservation_date") if d}
+    else:
+        starts = [to_date(d) for d in _values(obj, "start_date") if d]
+        ends = [to_date(d) for d in _values(obj, "end_date") if d]
+        if not starts or not ends:
+            return set()
+        first, last = min(starts), max(ends)
+        days = {first + timedelta(days=i) for i in range((last - first).days + 1)}
+    return {(c, d) for c in coaches for d in days}
+
+
+def mark_dirty(db: Session, coach_id: int, days: Iterable):
+    """批量语句修改排期/预约后调用：会话提交时失效这些日期"""
+    db.info.setdefault(_DIRTY_KEY, set()).update((coach_id, to_date(day)) for day in days)
+
+
+def invalidate_reservation(db: Session, out_trade_no: str):
+    """批量 UPDATE 修改预约状态后调用（按订单号查出教练与日期）"""
+    row = db.execute(
+        select(Reservation.coach_id, Reservation.reservation_date).where(Reservation.out_trade_no == out_trade_no)
+    ).first()
+    if row and row.coach_id:
+        mark_dirty(db, row.coach_id, [row.reservation_date])
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dirty(session: Session, flush_context):
+    keys = set()
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, (Reservation, CoachScheduleException, CoachWeeklySchedule)):
+            keys |= _keys_of(obj)
+    if keys:
+        session.info.setdefault(_DIRTY_KEY, set()).update(keys)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session: Session):
+    keys = session.info.pop(_DIRTY_KEY, None)
+    if keys:
+        coach_availability.invalidate(keys)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_dirty(session: Session, previous_transaction):
+    # 保存点回滚时外层事务仍可能提交，多失效无害，保留
+    if not previous_transaction.nested:
+        session.info.pop(_DIRTY_KEY, None)
@@ -0,0 +1,146 @@
+"""教练排期存储：每周模板 + 日期例外
+
+旧结构按「教练 × 日期 × 小时」一行（CoachSchedule），批量设置 90 天要插入 1260 行，读取也要扫描这些行。
+现在用两张小表表示：
+- coach_weekly_schedule：每个教练每个星期几一行，available_mask / unavailable_mask 的第 h 位
+  表示 h 点整这一小时可用/不可用（都为 0 即未设置）
+- coach_schedule_exception：日期区间例外，按写入顺序（id）依次覆盖掩码涉及的小时
+
+某天的排期 = 星期模板，再叠加覆盖这一天的例外。区间读取只查模板（至多 7 行）和与区间相交的例外，
+逐天叠加，代价与天数成正比；批量设置为一条 DELETE + 一条 INSERT，与天数无关。
+写入函数不提交事务，由调用方提交；可用性索引在提交时按 flush 涉及的对象失效（见 coach_availability）。
+"""
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.models import CoachWeeklySchedule, CoachScheduleException
+
+# 可写入的排期状态
+SCHEDULE_STATUSES = ("available", "unavailable")
+
+# 批量设置覆盖的营业时段（与会员端展示一致）
+BUSINESS_HOURS = range(8, 22)
+
+
+def hours_mask(hours: Iterable[int]) -> int:
+    mask = 0
+    for hour in hours:
+        if 0 <= hour < 24:
+            mask |= 1 << hour
+    return mask
+
+
+def status_masks(status: str, mask: int) -> Tuple[int, int]:
+    """状态 + 小时掩码 -> (available_mask, unavailable_mask)"""
+    return (mask, 0) if status == "available" else (0, mask)
+
+
+def apply_masks(masks: Tuple[int, int], available: int, unavailable: int) -> Tuple[int, int]:
+    """在已有 (可用, 不可用) 掩码上叠加一层：该层涉及的小时以该层为准"""
+    touched = available | unavailable
+    return (masks[0] & ~touched) | available, (masks[1] & ~touched) | unavailable
+
+
+def resolve_range(db: Session, coach_id: int, start: date, end: date) -> Dict[date, Tuple[int, int]]:
+    """区间内每天的 (可用, 不可用) 掩码"""
+    templates = {
+        weekday: (available, unavailable)
+        for weekday, available, unavailable in db.execute(
+            select(CoachWeeklySchedule.weekday, CoachWeeklySchedule.available_mask,
+                   CoachWeeklySchedule.unavailable_mask)
+            .where(CoachWeeklySchedule.coach_id == coach_id)
+        )
+    }
+    exceptions = db.execute(
+        select(CoachScheduleException.start_date, CoachScheduleException.end_date,
+               CoachScheduleException.available_mask, CoachScheduleException.unavailable_mask)
+        .where(
+            CoachScheduleException.coach_id == coach_id,
+            CoachScheduleException.end_date >= start,
+            CoachScheduleException.start_date <= end
+        )
+        .order_by(CoachScheduleException.id)
+    ).all()
+
+    days = {}
+    day = start
+    while day <= end:
+        days[day] = templates.get(day.weekday(), (0, 0))
+        day += timedelta(days=1)
+    for exception_start, exception_end, available, unavailable in exceptions:
+        day = max(exception_start, start)
+        last = min(exception_end, end)
+        while day <= last:
+            days[day] = apply_masks(days[day], available, unavailable)
+            day += timedelta(days=1)
+    return days
+
+
+def set_range(db: Session, coach_id: int, start: date, end: date, status: str,
+              hours: Iterable[int] = BUSINESS_HOURS) -> CoachScheduleException:
+    """把区间内每天的指定时段设为同一状态：删除被完全覆盖的旧例外，写入一条区间例外"""
+    db.query(CoachScheduleException).filter(
+        CoachScheduleException.coach_id == coach_id,
+        CoachScheduleException.start_date >= start,
+        CoachScheduleException.end_date <= end
+    ).delete(synchronize_session=False)
+
+    available, unavailable = status_masks(status, hours_mask(hours))
+    exception = CoachScheduleException(
+        coach_id=coach_id, start_date=start, end_date=end,
+        available_mask=available, unavailable_mask=unavailable
+    )
+    db.add(exception)
+    return exception
+
+
+def set_slot(db: Session, coach_id: int, day: date, hour: int, status: str) -> CoachScheduleException:
+    """设置某天某一小时：当天最后生效的例外若是单日例外则就地合并，否则追加一条单日例外"""
+    latest: Optional[CoachScheduleException] = db.execute(
+        select(CoachScheduleException).where(
+            CoachScheduleException.coach_id == coach_id,
+            CoachScheduleException.start_date <= day,
+            CoachScheduleException.end_date >= day
+        ).order_by(CoachScheduleException.id.desc()).limit(1)
+    ).scalar_one_or_none()
+
+    available, unavailable = status_masks(status, hours_mask([hour]))
+    if latest is not None and latest.start_date == day and latest.end_date == day:
+        latest.available_mask, latest.unavailable_mask = apply_masks(
+            (latest.available_mask, latest.unavailable_mask), available, unavailable
+        )
+        return latest
+
+    exception = CoachScheduleException(
+        coach_id=coach_id, start_date=day, end_date=day,
+        available_mask=available, unavailable_mask=unavailable
+    )
+    db.add(exception)
+    return exception
+
+
+def set_weekly(db: Session, coach_id: int, weekdays: Iterable[int], status: str,
+               hours: Iterable[int] = BUSINESS_HOURS):
+    """设置每周模板：所选星期几的指定时段设为同一状态（至多 7 行）"""
+    available, unavailable = status_masks(status, hours_mask(hours))
+    weekdays = sorted(set(weekdays))
+    existing = {
+        row.weekday: row for row in db.query(CoachWeeklySchedule).filter(
+            CoachWeeklySchedule.coach_id == coach_id,
+            CoachWeeklySchedule.weekday.in_(weekdays)
+        )
+    }
+    for weekday in weekdays:
+        row = existing.get(weekday)
+        if row is None:
+            db.add(CoachWeeklySchedule(
+                coach_id=coach_id, weekday=weekday,
+                available_mask=available, unavailable_mask=unavailable
+            ))
+        else:
+            row.available_mask, row.unavailable_mask = apply_masks(
+                (row.available_mask, row.unavailable_mask), available, unavailable
+            )
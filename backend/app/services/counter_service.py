@@ -0,0 +1,325 @@
+"""热点计数：分片计数行与带容量上限的条件增减
+
+活动报名人数、优惠券已发放量、组队人数、商品兑换量原来都是「读出 -> 判断上限 -> 写回」，
+并发时超额且每次操作都排队等同一行的行锁。这里统一成两种原语：
+
+- 分片计数（sharded=True）：一个计数拆成 COUNTER_SHARDS 行 counter_shard，容量按份额分到各分片。
+  增减随机挑一个分片做条件 UPDATE value = value + n WHERE value + n <= capacity，满了换下一个分片，
+  全部分片都满才算满员；并发请求落在不同的行上，不再排队。首次使用时按业务表当前值与容量建分片
+- 行内条件增减（sharded=False）：UPDATE 业务表 SET c = c + n WHERE c + n <= 上限，
+  用于上限很小（组队人数、活动候补）或本就跟随其他写入的计数（商品兑换量）
+
+分片计数的业务表列（current_participants 等）仍是列表、详情展示用的值，由后台线程按分片合计定期回写
+（COUNTER_ROLLUP_INTERVAL 秒内可见），容量判断只看分片。后台修改容量时调用 reset 把分片折回业务表，
+下次使用按新容量重建。普通商品的兑换量随库存条件扣减在同一条语句中累加，
+秒杀商品的已售由令牌池批量回写时走 PRODUCT_SALES（见 mall_inventory）。
+
+所有函数不提交事务，由调用方提交。
+"""
+import logging
+import random
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Set, Tuple
+
+from sqlalchemy import create_engine, event, func, insert, select, update, delete
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.models import Activity, CouponTemplate, Team, Product
+from app.models.counter_shard import CounterShard
+
+logger = logging.getLogger(__name__)
+
+_STAGED_KEY = "counter_rollup_keys"
+
+
+class CounterSpec:
+    """计数定义：业务表计数列、容量列（为空或 <= 0 表示不限）、是否分片"""
+
+    def __init__(self, name: str, column, capacity_column=None, sharded: bool = True):
+        self.name = name
+        self.column = column
+        self.capacity_column = capacity_column
+        self.sharded = sharded
+        self.model = column.class_
+
+
+ACTIVITY_PARTICIPANTS = CounterSpec("activity_participants", Activity.current_participants, Activity.max_participants)
+ACTIVITY_WAITLIST = CounterSpec("activity_waitlist", Activity.waitlist_count, Activity.waitlist_limit, sharded=False)
+COUPON_ISSUED = CounterSpec("coupon_issued", CouponTemplate.issued_count, CouponTemplate.total_count)
+TEAM_MEMBERS = CounterSpec("team_members", Team.current_members, Team.max_members, sharded=False)
+PRODUCT_SALES = CounterSpec("product_sales", Product.sales, sharded=False)
+
+SPECS: Dict[str, CounterSpec] = {
+    spec.name: spec for spec in (ACTIVITY_PARTICIPANTS, ACTIVITY_WAITLIST, COUPON_ISSUED, TEAM_MEMBERS, PRODUCT_SALES)
+}
+
+
+# ==================== 后台回写基类 ====================
+
+class BackgroundFlusher(ABC):
+    """后台定期回写：独立连接池 + 守护线程
+
+    回写走自己的连接池（与请求会话同一数据库、同样连接参数），请求线程占满主连接池时不会互相等待。
+    """
+
+    def __init__(self, interval: float, thread_name: str):
+        self.interval = interval
+        self.thread_name = thread_name
+        self._lock = threading.Lock()
+        self._engine: Optional[Engine] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _bind_from(self, db: Session):
+        """首次使用时按请求会话的连接建独立连接池（调用方需持有 self._lock）"""
+        if self._engine is None:
+            bind = db.get_bind()
+            self._engine = create_engine(bind.url, pool=bind.pool.recreate())
+
+    def _ensure_thread(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name=self.thread_name, daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.flush()
+
+    @abstractmethod
+    def flush(self):
+        """把积累的变更写回数据库（后台线程按 interval 调用）"""
+
+    def drain(self):
+        """停机前最后一次回写"""
+        self.flush()
+
+    def shutdown(self):
+        """停止后台线程、完成回写并关闭连接池（应用停止时调用）"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._engine is not None:
+            self.drain()
+            self._engine.dispose()
+            self._engine = None
+
+
+class CounterRollup(BackgroundFlusher):
+    """分片合计定期回写业务表计数列"""
+
+    def __init__(self, interval: float):
+        super().__init__(interval, "counter-rollup")
+        self._pending: Set[Tuple[str, int]] = set()
+
+    def schedule(self, db: Session, keys: Set[Tuple[str, int]]):
+        with self._lock:
+            self._bind_from(db)
+            self._pending |= keys
+        self._ensure_thread()
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, set()
+        if not pending:
+            return
+        by_spec: Dict[str, Set[int]] = {}
+        for name, key in pending:
+            by_spec.setdefault(name, set()).add(key)
+        try:
+            with self._engine.begin() as conn:
+                for name, keys in by_spec.items():
+                    spec = SPECS[name]
+                    total = select(func.sum(CounterShard.value)).where(
+                        CounterShard.name == name,
+                        CounterShard.key == spec.model.id
+                    ).scalar_subquery()
+                    conn.execute(
+                        update(spec.model).where(spec.model.id.in_(keys))
+                        .values({spec.column: func.coalesce(total, spec.column)})
+                    )
+        except Exception:
+            logger.exception("计数分片合计回写失败，下次重试")
+            with self._lock:
+                self._pending |= pending
+
+
+counter_rollup = CounterRollup(settings.COUNTER_ROLLUP_INTERVAL)
+
+
+# ==================== 计数原语 ====================
+
+def _shard_order(shards: int):
+    start = random.randrange(shards)
+    return [(start + i) % shards for i in range(shards)]
+
+
+def _split(value: int, capacity: Optional[int], shards: int) -> list:
+    """当前值与容量按份额分到各分片（已超额的部分记在 0 号分片）"""
+    if capacity is None:
+        return [(value if i == 0 else 0, None) for i in range(shards)]
+    slices = [capacity // shards + (1 if i < capacity % shards else 0) for i in range(shards)]
+    rows, remaining = [], value
+    for size in slices:
+        taken = min(size, remaining)
+        remaining -= taken
+        rows.append([taken, size])
+    rows[0][0] += remaining
+    return [tuple(row) for row in rows]
+
+
+def _ensure_shards(db: Session, spec: CounterSpec, key: int) -> bool:
+    """分片不存在时按业务表当前值与容量建分片，返回是否新建（并发建分片时以先到者为准）"""
+    exists = db.execute(select(func.count(CounterShard.id)).where(
+        CounterShard.name == spec.name,
+        CounterShard.key == key
+    )).scalar()
+    if exists:
+        return False
+    columns = [spec.column] + ([spec.capacity_column] if spec.capacity_column is not None else [])
+    row = db.execute(select(*columns).where(spec.model.id == key)).first()
+    if row is None:
+        return False
+    capacity = row[1] if len(row) > 1 and row[1] and row[1] > 0 else None
+    shards = _split(row[0] or 0, capacity, settings.COUNTER_SHARDS)
+    try:
+        with db.begin_nested():
+            db.execute(insert(CounterShard), [
+                {"name": spec.name, "key": key, "shard": i, "value": value, "capacity": cap}
+                for i, (value, cap) in enumerate(shards)
+            ])
+    except IntegrityError:
+        pass
+    return True
+
+
+def _update_shard(db: Session, spec: CounterSpec, key: int, shard: int, n: int) -> bool:
+    condition = (
+        (CounterShard.capacity.is_(None) | (CounterShard.value + n <= CounterShard.capacity))
+        if n > 0 else CounterShard.value >= -n
+    )
+    result = db.execute(
+        update(CounterShard).where(
+            CounterShard.name == spec.name,
+            CounterShard.key == key,
+            CounterShard.shard == shard,
+            condition
+        ).values(value=CounterShard.value + n)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount > 0
+
+
+def _update_sharded(db: Session, spec: CounterSpec, key: int, n: int) -> bool:
+    for _ in range(2):
+        for shard in _shard_order(settings.COUNTER_SHARDS):
+            if _update_shard(db, spec, key, shard, n):
+                db.info.setdefault(_STAGED_KEY, set()).add((spec.name, key))
+                return True
+        if not _ensure_shards(db, spec, key):
+            return False
+    return False
+
+
+def _sync(db: Session, spec: CounterSpec, key: int):
+    """会话中已加载的业务对象同步为行内计数新值"""
+    obj = db.identity_map.get(db.identity_key(spec.model, key))
+    if obj is not None:
+        value = db.execute(select(spec.column).where(spec.model.id == key)).scalar()
+        set_committed_value(obj, spec.column.key, value)
+
+
+def _update_row(db: Session, spec: CounterSpec, key: int, n: int) -> bool:
+    current = func.coalesce(spec.column, 0)
+    conditions = [spec.model.id == key]
+    if n < 0:
+        conditions.append(current >= -n)
+    elif spec.capacity_column is not None:
+        capacity = spec.capacity_column
+        conditions.append(capacity.is_(None) | (capacity <= 0) | (current + n <= capacity))
+    result = db.execute(
+        update(spec.model).where(*conditions)
+        .values({spec.column: current + n})
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        return False
+    _sync(db, spec, key)
+    return True
+
+
+def _update_sharded_many(db: Session, spec: CounterSpec, key: int, n: int) -> bool:
+    """分片计数一次增减多个：逐个单位分散到各分片，中途失败则把已增减的单位补回（单个分片的份额可能小于 n）"""
+    step = 1 if n > 0 else -1
+    for done in range(abs(n)):
+        if not _update_sharded(db, spec, key, step):
+            for _ in range(done):
+                _update_sharded(db, spec, key, -step)
+            return False
+    return True
+
+
+def claim(db: Session, spec: CounterSpec, key: int, n: int = 1) -> bool:
+    """计数 +n；超出容量返回 False（不做任何修改）"""
+    if spec.sharded:
+        return _update_sharded_many(db, spec, key, n)
+    return _update_row(db, spec, key, n)
+
+
+def release(db: Session, spec: CounterSpec, key: int, n: int = 1) -> bool:
+    """计数 -n；不足 n 时返回 False（计数不会减成负数）"""
+    if spec.sharded:
+        return _update_sharded_many(db, spec, key, -n)
+    return _update_row(db, spec, key, -n)
+
+
+def total(db: Session, spec: CounterSpec, key: int) -> int:
+    """当前精确计数（分片计数按分片合计，未建分片时读业务表）"""
+    if spec.sharded:
+        value = db.execute(select(func.sum(CounterShard.value)).where(
+            CounterShard.name == spec.name,
+            CounterShard.key == key
+        )).scalar()
+        if value is not None:
+            return int(value)
+    return int(db.execute(select(spec.column).where(spec.model.id == key)).scalar() or 0)
+
+
+def reset(db: Session, spec: CounterSpec, key: int):
+    """分片合计折回业务表并删除分片（修改容量后调用，下次使用按新容量重建）"""
+    if not spec.sharded:
+        return
+    values = db.execute(
+        select(CounterShard.value).where(CounterShard.name == spec.name, CounterShard.key == key)
+        .with_for_update()
+    ).scalars().all()
+    if not values:
+        return
+    db.execute(
+        update(spec.model).where(spec.model.id == key).values({spec.column: sum(values)})
+        .execution_options(synchronize_session=False)
+    )
+    db.execute(delete(CounterShard).where(CounterShard.name == spec.name, CounterShard.key == key))
+    _sync(db, spec, key)
+
+
+@event.listens_for(Session, "after_commit")
+def _schedule_rollup(session: Session):
+    keys = session.info.pop(_STAGED_KEY, None)
+    if keys:
+        counter_rollup.schedule(session, keys)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _discard_uncommitted(session: Session, transaction):
+    if transaction.parent is None and not transaction.nested:
+        session.info.pop(_STAGED_KEY, None)
@@ -4,6 +4,7 @@ from typing import Dict, List
 from sqlalchemy.orm import Session
 
 from app.models.coupon import CouponPack, CouponPackItem, CouponTemplate, MemberCoupon
+from app.services import counter_service
 
 
 class CouponPackService:
@@ -48,15 +49,15 @@ class CouponPackService:
                 continue
 
             for _ in range(item.quantity):
+                # 占用模板发放名额，已发完的券跳过
+                if not counter_service.claim(self.db, counter_service.COUPON_ISSUED, template.id):
+                    break
                 coupon = self._create_member_coupon(member_id, template)
                 issued_coupons.append({
                     "name": coupon.name,
                     "type": coupon.type
                 })
 
-                # 更新模板已发放数量
-                template.issued_count = (template.issued_count or 0) + 1
-
         self.db.commit()
 
         return {
@@ -0,0 +1,52 @@
+"""SSS 每日免费额度：读取与下单占用
+
+台账本身随预约写入自动维护（见 app.models.daily_usage），这里提供：
+- get_used_minutes：按 (会员, 日期) 唯一键读取当日已约分钟数
+- claim_used_minutes：下单时在写入预约后读取「本单之前」的已约分钟数。预约 flush 时台账行
+  已被本事务原子累加并持有行锁，并发下单在这一行上串行，后到者读到的值已包含先到者，
+  两笔并发预约不会同时用掉最后一小时免费额度
+- rebuild：按 reservation 重新汇总某天（数据修复）
+"""
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models import Reservation
+from app.models.daily_usage import MemberDailyUsage, apply_usage_delta
+
+
+def get_used_minutes(db: Session, member_id: int, day: date) -> int:
+    used: Optional[int] = db.execute(
+        select(MemberDailyUsage.used_minutes).where(
+            MemberDailyUsage.member_id == member_id,
+            MemberDailyUsage.usage_date == day
+        )
+    ).scalar()
+    return max(0, used or 0)
+
+
+def claim_used_minutes(db: Session, reservation: Reservation, day: date) -> int:
+    """新预约已 add 到会话：flush 累加台账后，返回本单之前当日已约分钟数"""
+    db.flush()
+    return max(0, get_used_minutes(db, reservation.member_id, day) - (reservation.duration or 0))
+
+
+def adjust(db: Session, member_id: int, day: date, minutes: int):
+    """批量 UPDATE 改变预约是否计入台账后调用（如 unpaid -> cancelled）"""
+    apply_usage_delta(db.connection(), member_id, day, minutes)
+
+
+def rebuild(db: Session, member_id: int, day: date) -> int:
+    """按 reservation 重新汇总某天的已约分钟数并写回台账"""
+    total = int(db.execute(
+        select(func.coalesce(func.sum(Reservation.duration), 0)).where(
+            Reservation.member_id == member_id,
+            Reservation.reservation_date == day,
+            Reservation.status.notin_(['cancelled']),
+            Reservation.is_deleted == False
+        )
+    ).scalar())
+    apply_usage_delta(db.connection(), member_id, day, total - get_used_minutes(db, member_id, day))
+    return total
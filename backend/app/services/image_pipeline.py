@@ -0,0 +1,142 @@
+"""上传图片衍生图处理
+
+上传原图后在线程池中生成固定尺寸的衍生图（thumb/card/full）及对应 WebP 版本，
+与原图放在同一目录，命名为 <原文件名>.<规格>.<扩展名>，例如：
+    /uploads/blobs/3f/3f9a...e1.jpg
+    /uploads/blobs/3f/3f9a...e1.thumb.jpg
+    /uploads/blobs/3f/3f9a...e1.thumb.webp
+
+接口按使用场景通过 image_variant_url() 取对应规格，衍生图不存在（历史图片、GIF）时回退原图。
+历史图片可用 scripts/generate_image_derivatives.py 补生成。
+"""
+import asyncio
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, Optional
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# 规格名 -> 最长边像素
+IMAGE_VARIANTS = {
+    "thumb": 240,   # 列表缩略图、头像
+    "card": 750,    # 卡片/列表大图
+    "full": 1600,   # 详情页、轮播图
+}
+
+# 生成衍生图的格式（GIF 保留原图，避免丢失动画）
+_SOURCE_FORMATS = {".jpg": "JPEG", ".jpeg": "JPEG", ".png": "PNG", ".webp": "WEBP"}
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+# 已确认存在的衍生图 URL 缓存（仅缓存命中，未生成的历史图片会在补生成后生效）
+_existing_variants: Dict[str, bool] = {}
+
+
+def get_image_executor() -> ThreadPoolExecutor:
+    """图片处理线程池（Pillow 缩放/编码期间释放 GIL）"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=settings.IMAGE_PIPELINE_WORKERS,
+                    thread_name_prefix="image-pipeline",
+                )
+    return _executor
+
+
+def shutdown_image_executor():
+    """关闭线程池（应用停止时调用）"""
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False)
+    _executor = None
+
+
+def variant_path(path: str, variant: str, webp: bool = False) -> str:
+    """原图路径/URL -> 衍生图路径/URL"""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.{variant}{'.webp' if webp else ext.lower()}"
+
+
+def _save(img: "Image.Image", dest: str, fmt: str):
+    if fmt == "JPEG":
+        img.convert("RGB").save(dest, "JPEG", quality=82, optimize=True, progressive=True)
+    elif fmt == "PNG":
+        img.save(dest, "PNG", optimize=True)
+    else:
+        img.save(dest, "WEBP", quality=80, method=4)
+
+
+def generate_derivatives(file_path: str) -> Dict[str, str]:
+    """为磁盘上的原图生成全部衍生图（同步，应在线程池中调用）
+
+    返回 {规格名: 文件路径}，不支持的格式返回空字典。
+    """
+    fmt = _SOURCE_FORMATS.get(os.path.splitext(file_path)[1].lower())
+    if not fmt:
+        return {}
+
+    from PIL import Image, ImageOps  # 仅在生成衍生图时导入，不拖慢应用启动
+
+    results = {}
+    with Image.open(file_path) as src:
+        src = ImageOps.exif_transpose(src)
+        if src.mode not in ("RGB", "RGBA"):
+            src = src.convert("RGBA" if src.mode in ("LA", "PA") or "transparency" in src.info else "RGB")
+        for variant, size in IMAGE_VARIANTS.items():
+            img = src.copy()
+            img.thumbnail((size, size), Image.LANCZOS)
+            dest = variant_path(file_path, variant)
+            _save(img, dest, fmt)
+            results[variant] = dest
+            if fmt != "WEBP":
+                webp_dest = variant_path(file_path, variant, webp=True)
+                _save(img, webp_dest, "WEBP")
+                results[f"{variant}_webp"] = webp_dest
+    return results
+
+
+def existing_derivatives(file_path: str) -> Dict[str, str]:
+    """已生成的衍生图（内容去重后重复上传的图片无需重新生成）"""
+    results = {}
+    source_is_webp = file_path.lower().endswith(".webp")
+    for variant in IMAGE_VARIANTS:
+        for webp in (False, True):
+            if webp and source_is_webp:
+                continue
+            path = variant_path(file_path, variant, webp=webp)
+            if os.path.exists(path):
+                results[f"{variant}_webp" if webp else variant] = path
+    return results
+
+
+async def generate_derivatives_async(file_path: str) -> Dict[str, str]:
+    """在图片线程池中生成衍生图，失败时记录日志并返回空字典（不影响上传本身）"""
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(get_image_executor(), generate_derivatives, file_path)
+    except Exception as e:
+        logger.warning("生成衍生图失败: %s %s", file_path, e)
+        return {}
+
+
+def image_variant_url(path: Optional[str], variant: Optional[str]) -> Optional[str]:
+    """按场景返回衍生图 URL（仅处理本地 /uploads/ 图片，衍生图不存在时返回原路径）"""
+    if not path or not variant or not path.startswith("/uploads/"):
+        return path
+    url = variant_path(path, variant, webp=settings.IMAGE_SERVE_WEBP)
+    if url in _existing_variants:
+        return url
+    file_path = os.path.join(settings.UPLOAD_DIR, url[len("/uploads/"):])
+    if os.path.exists(file_path):
+        _existing_variants[url] = True
+        return url
+    return path
@@ -0,0 +1,358 @@
+"""积分商城库存：原子扣减、秒杀令牌池、每人限购
+
+- 普通商品：UPDATE product SET stock = stock - n, sales = sales + n WHERE id = :id AND stock >= n，
+  影响 0 行即库存不足，不会超卖
+- 秒杀商品（is_flash_sale）：热门商品所有兑换都扣同一行，行锁把请求串成一队。进程内令牌池
+  每次用独立连接从数据库预分配一批库存（条件扣减 stock，立即提交），兑换只在内存里取令牌；
+  预分配、回写走令牌池自己的连接池（BackgroundFlusher），请求线程占满主连接池时也不会互相等待；
+  各 worker 预分配的令牌互不重叠，总数不超过数据库库存。令牌随兑换事务提交计入已售，
+  由后台线程定期把已售数量回写 sales；事务回滚的令牌退回池内。停机、商品下架或取消秒杀时未用完的令牌退回 stock
+- 令牌租约（flash_sale_lease）：预分配与 stock 扣减同一事务记入本进程租约，售出回写、归还时扣减，
+  stock + 租约合计 = 剩余可售库存。后台改库存按此折算（set_stock），不覆盖其他进程手里的令牌；
+  进程定期刷新心跳，崩溃进程的租约超时后由其他进程或启动预热归还（reclaim_orphaned_leases）
+- 限购（purchase_limit）：member_product_purchase 按 (会员, 商品) 唯一键条件累加
+  SET quantity = quantity + n WHERE quantity + n <= limit，不再统计订单
+
+秒杀商品的数据库 stock 为尚未预分配的库存，会员端展示的剩余库存加上本进程池内令牌（available_stock），
+后台展示加上全部租约（leased_stock）。
+"""
+import logging
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, event, func, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.mall import FlashSaleLease, Product, ProductOrder, MemberProductPurchase
+from app.services import counter_service
+from app.services.counter_service import BackgroundFlusher
+
+logger = logging.getLogger(__name__)
+
+_STAGED_KEY = "mall_flash_tokens"
+
+
+class OutOfStock(ValueError):
+    def __init__(self):
+        super().__init__("库存不足")
+
+
+class PurchaseLimitExceeded(ValueError):
+    def __init__(self, limit: int):
+        self.limit = limit
+        super().__init__(f"该商品每人限兑{limit}件")
+
+
+def reserve_stock(db: Session, product_id: int, qty: int):
+    """普通商品条件扣减库存并累加兑换量，库存不足抛 OutOfStock"""
+    result = db.execute(
+        update(Product).where(Product.id == product_id, func.coalesce(Product.stock, 0) >= qty)
+        .values(stock=func.coalesce(Product.stock, 0) - qty, sales=func.coalesce(Product.sales, 0) + qty)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        raise OutOfStock()
+
+
+def claim_purchase_quota(db: Session, member_id: int, product_id: int, qty: int, limit: Optional[int]):
+    """限购台账条件累加；超出限购抛 PurchaseLimitExceeded（limit 为空或 0 不限购）"""
+    if not limit:
+        return
+    table = MemberProductPurchase.__table__
+    conn = db.connection()
+    statement = update(table).where(
+        table.c.member_id == member_id,
+        table.c.product_id == product_id,
+        table.c.quantity + qty <= limit
+    ).values(quantity=table.c.quantity + qty)
+    if conn.execute(statement).rowcount:
+        return
+    if qty <= limit:
+        try:
+            with conn.begin_nested():
+                conn.execute(insert(table).values(member_id=member_id, product_id=product_id, quantity=qty))
+            return
+        except IntegrityError:
+            # 行已存在（本会员已兑换过或并发首单）：回到条件累加
+            if conn.execute(statement).rowcount:
+                return
+    raise PurchaseLimitExceeded(limit)
+
+
+class FlashSalePool(BackgroundFlusher):
+    """秒杀商品的进程内库存令牌池"""
+
+    def __init__(self, batch: int, flush_interval: float, lease_ttl: float = 30.0):
+        super().__init__(flush_interval, "mall-flash-sale-flush")
+        self.batch = batch
+        self.lease_ttl = lease_ttl
+        self._boot = uuid.uuid4().hex[:8]
+        self._tokens: Dict[int, int] = {}
+        self._sold: Dict[int, int] = {}
+
+    @property
+    def owner(self) -> str:
+        """租约持有者标识（fork 出的 worker 进程号不同）"""
+        return f"{socket.gethostname()[:40]}:{os.getpid()}:{self._boot}"
+
+    def available(self, product_id: int) -> int:
+        return self._tokens.get(product_id, 0)
+
+    def take(self, db: Session, product_id: int, qty: int) -> bool:
+        """取 qty 个令牌（不足时先从数据库预分配），登记到会话随事务结算；库存耗尽返回 False"""
+        db.connection()  # 确保会话事务已开始，令牌才能随其提交/回滚结算
+        with self._lock:
+            self._bind_from(db)
+            have = self._tokens.get(product_id, 0)
+            if have < qty:
+                have += self._claim(product_id, max(self.batch, qty - have))
+            if have < qty:
+                self._tokens[product_id] = have
+                return False
+            self._tokens[product_id] = have - qty
+        db.info.setdefault(_STAGED_KEY, []).append((self, product_id, qty))
+        self._ensure_thread()
+        return True
+
+    def _claim(self, product_id: int, want: int) -> int:
+        """独立连接从数据库库存中预分配至多 want 个令牌（按读到的库存值比较并交换），同一事务记入本进程租约"""
+        with self._engine.begin() as conn:
+            while True:
+                stock = conn.execute(select(Product.stock).where(
+                    Product.id == product_id,
+                    Product.is_active == True,
+                    Product.is_flash_sale == True,
+                    Product.is_deleted == False
+                )).scalar()
+                if not stock or stock <= 0:
+                    return 0
+                n = min(want, stock)
+                result = conn.execute(
+                    update(Product).where(Product.id == product_id, Product.stock == stock)
+                    .values(stock=Product.stock - n)
+                )
+                if result.rowcount:
+                    _add_lease(conn, self.owner, product_id, n)
+                    return n
+
+    def settle(self, staged: List[Tuple[int, int]], committed: bool):
+        """兑换事务结束：提交的计入待回写的已售数量，回滚的退回池内"""
+        with self._lock:
+            target = self._sold if committed else self._tokens
+            for product_id, qty in staged:
+                target[product_id] = target.get(product_id, 0) + qty
+
+    def flush(self):
+        """已售数量回写 product.sales 并从租约扣除；刷新持有令牌的租约心跳；
+        归还已下架/取消秒杀商品的令牌；回收心跳超时的孤儿租约"""
+        with self._lock:
+            sold, self._sold = self._sold, {}
+            held = [pid for pid, n in self._tokens.items() if n]
+        owner = self.owner
+        try:
+            with Session(self._engine) as db:
+                conn = db.connection()
+                for product_id, qty in sold.items():
+                    counter_service.claim(db, counter_service.PRODUCT_SALES, product_id, qty)
+                    _add_lease(conn, owner, product_id, -qty, create=False)
+                leased = _heartbeat(conn, owner)
+                # 租约已被当作孤儿回收（本进程长时间未心跳）：这部分库存已归还，池内令牌作废
+                lost = [pid for pid in held if pid not in leased]
+                unsellable = _unsellable(conn, [pid for pid in held if pid in leased])
+                db.commit()
+        except Exception:
+            logger.exception("秒杀已售数量回写失败，下次重试")
+            self.settle(list(sold.items()), committed=True)
+            return
+
+        if lost:
+            logger.warning("秒杀令牌租约已被回收，丢弃池内令牌: %s", lost)
+            with self._lock:
+                for pid in lost:
+                    self._tokens.pop(pid, None)
+        if unsellable:
+            with self._lock:
+                tokens = {pid: self._tokens.pop(pid, 0) for pid in unsellable}
+            self._return_tokens(tokens)
+        try:
+            with Session(self._engine) as db:
+                reclaim_orphaned_leases(db, self.lease_ttl)
+                db.commit()
+        except Exception:
+            logger.exception("回收孤儿秒杀租约失败")
+
+    def _return_tokens(self, tokens: Dict[int, int]):
+        """未售令牌退回 stock 并从本进程租约扣除"""
+        tokens = {pid: n for pid, n in tokens.items() if n}
+        if not tokens:
+            return
+        with self._engine.begin() as conn:
+            for pid, n in tokens.items():
+                if _add_lease(conn, self.owner, pid, -n, create=False):
+                    conn.execute(update(Product).where(Product.id == pid).values(stock=Product.stock + n))
+
+    def release(self, product_id: Optional[int] = None):
+        """回写已售并把未用完的令牌退回 stock（product_id 为空时全部商品）"""
+        with self._lock:
+            if product_id is None:
+                tokens, self._tokens = self._tokens, {}
+            else:
+                tokens = {product_id: self._tokens.pop(product_id, 0)}
+        if self._engine is None:
+            return
+        self.flush()
+        self._return_tokens(tokens)
+
+    def drain(self):
+        """停机：回写已售并归还全部令牌"""
+        self.release()
+
+
+def _add_lease(conn, owner: str, product_id: int, delta: int, create: bool = True) -> bool:
+    """本进程租约 quantity += delta 并刷新心跳；租约不存在时按 create 新建，返回租约是否存在"""
+    table = FlashSaleLease.__table__
+    now = datetime.utcnow()
+    result = conn.execute(
+        update(table).where(table.c.owner == owner, table.c.product_id == product_id)
+        .values(quantity=table.c.quantity + delta, heartbeat_at=now, updated_at=now)
+    )
+    if result.rowcount:
+        return True
+    if create:
+        conn.execute(insert(table).values(owner=owner, product_id=product_id, quantity=delta,
+                                          heartbeat_at=now, created_at=now, updated_at=now))
+        return True
+    return False
+
+
+def _heartbeat(conn, owner: str) -> set:
+    """刷新本进程全部租约心跳（含池内已取空、令牌仍在未提交事务中的租约），清理已归零的租约，
+    返回仍持有租约的商品ID"""
+    table = FlashSaleLease.__table__
+    conn.execute(update(table).where(table.c.owner == owner).values(heartbeat_at=datetime.utcnow()))
+    conn.execute(delete(table).where(table.c.owner == owner, table.c.quantity <= 0))
+    return set(conn.execute(select(table.c.product_id).where(table.c.owner == owner)).scalars())
+
+
+def _unsellable(conn, product_ids: List[int]) -> List[int]:
+    """池内持有令牌、但商品已下架/删除/取消秒杀的商品ID"""
+    if not product_ids:
+        return []
+    sellable = set(conn.execute(select(Product.id).where(
+        Product.id.in_(product_ids),
+        Product.is_active == True,
+        Product.is_flash_sale == True,
+        Product.is_deleted == False
+    )).scalars())
+    return [pid for pid in product_ids if pid not in sellable]
+
+
+def reclaim_orphaned_leases(db: Session, ttl: float) -> int:
+    """心跳超时（持有进程已崩溃）的租约归还 stock，返回回收的租约数（不提交）
+
+    崩溃进程最后一次回写之后卖出的令牌已不可知，归还时扣除该商品自心跳前 ttl 秒以来的全部订单数量
+    （含其他进程的订单）：宁可少还，不会超卖。
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=ttl)
+    leases = db.execute(
+        select(FlashSaleLease.id, FlashSaleLease.product_id, FlashSaleLease.quantity, FlashSaleLease.heartbeat_at)
+        .where(FlashSaleLease.heartbeat_at < cutoff)
+        .with_for_update(skip_locked=True)
+    ).all()
+    for lease in leases:
+        recent = db.execute(
+            select(func.coalesce(func.sum(func.coalesce(ProductOrder.quantity, 1)), 0)).where(
+                ProductOrder.product_id == lease.product_id,
+                ProductOrder.status != "cancelled",
+                ProductOrder.created_at >= lease.heartbeat_at - timedelta(seconds=ttl),
+            )
+        ).scalar()
+        back = max(0, (lease.quantity or 0) - recent)
+        if back:
+            db.execute(update(Product).where(Product.id == lease.product_id)
+                       .values(stock=Product.stock + back).execution_options(synchronize_session=False))
+        db.execute(delete(FlashSaleLease).where(FlashSaleLease.id == lease.id)
+                   .execution_options(synchronize_session=False))
+        logger.warning("回收孤儿秒杀租约: 商品 %s 令牌 %s 件，归还 %s 件", lease.product_id, lease.quantity, back)
+    return len(leases)
+
+
+def leased_stock(db: Session, product_ids: List[int]) -> Dict[int, int]:
+    """各进程已预分配、尚未售出的秒杀令牌数（按商品汇总）"""
+    if not product_ids:
+        return {}
+    return dict(db.execute(
+        select(FlashSaleLease.product_id, func.sum(FlashSaleLease.quantity))
+        .where(FlashSaleLease.product_id.in_(product_ids))
+        .group_by(FlashSaleLease.product_id)
+    ).all())
+
+
+def set_stock(db: Session, product_id: int, remaining: int):
+    """后台设置剩余可售库存（含各进程已预分配未售出的令牌），不提交
+
+    锁住商品行后按租约合计折算 stock：预分配进行中的请求持有同一行锁，读到的租约合计不会漏算。
+    剩余库存低于已预分配量时拒绝（ValueError），下架商品后各进程在下个回写周期归还令牌。
+    """
+    db.execute(select(Product.id).where(Product.id == product_id).with_for_update()).first()
+    leased = leased_stock(db, [product_id]).get(product_id, 0)
+    if remaining < leased:
+        raise ValueError(f"已有{leased}件库存预分配给秒杀令牌池，剩余库存不能低于该值（可先下架商品，令牌归还后再调整）")
+    db.execute(update(Product).where(Product.id == product_id).values(stock=remaining - leased)
+               .execution_options(synchronize_session=False))
+
+
+def start_flash_sale_reclaim():
+    """启动预热：回收崩溃进程遗留的秒杀租约"""
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        reclaim_orphaned_leases(db, settings.MALL_FLASH_SALE_LEASE_TTL)
+        db.commit()
+    finally:
+        db.close()
+
+
+flash_sale_pool = FlashSalePool(
+    settings.MALL_FLASH_SALE_BATCH, settings.MALL_FLASH_SALE_FLUSH_INTERVAL, settings.MALL_FLASH_SALE_LEASE_TTL
+)
+
+
+def take_stock(db: Session, product: Product, qty: int):
+    """按商品类型扣库存：秒杀商品取令牌，普通商品条件扣减；不足抛 OutOfStock"""
+    if product.is_flash_sale:
+        if not flash_sale_pool.take(db, product.id, qty):
+            raise OutOfStock()
+    else:
+        reserve_stock(db, product.id, qty)
+
+
+def available_stock(product: Product) -> int:
+    """对外展示的剩余库存（秒杀商品含本进程池内令牌）"""
+    stock = product.stock or 0
+    if product.is_flash_sale:
+        stock += flash_sale_pool.available(product.id)
+    return stock
+
+
+def _settle(session: Session, committed: bool):
+    for pool, product_id, qty in session.info.pop(_STAGED_KEY, ()):
+        pool.settle([(product_id, qty)], committed)
+
+
+@event.listens_for(Session, "after_commit")
+def _settle_committed(session: Session):
+    _settle(session, committed=True)
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _return_uncommitted(session: Session, transaction):
+    # 回滚或未提交即关闭会话：令牌退回池内（提交时已在 after_commit 取走）
+    if transaction.parent is None and not transaction.nested:
+        _settle(session, committed=False)
@@ -0,0 +1,308 @@
+"""微信支付回调幂等处理
+
+微信支付对同一笔交易会多次重试回调，多 worker 部署时重复通知还可能被并发处理。
+
+- 快速路径：已处理的通知 ID / 交易号记在进程内 LRU，重试的通知在验签、解密之前直接返回成功
+- 去重账本：payment_notify_log.transaction_id 唯一。账本行是事务中的第一条写入，与订单状态变更
+  一起提交；并发的重复投递插入时被唯一约束挡下（先到者提交后报重复，先到者回滚则放行）
+- 状态变更：条件更新 UPDATE ... WHERE status='pending'，按影响行数判断是否由本次完成支付，
+  不再先加锁查询再写；金币、积分经 wallet_service 原子累加，销量用 SET x = x + n
+
+主动查单的补偿路径（充值订单、会员卡订单、预约支付状态查询）复用同一组 complete_* 函数，
+与回调之间只有一方生效。complete_* / cancel_* 不提交事务，由调用方提交。
+"""
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import func, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models import Member, MemberCard, MemberCardOrder, Reservation, MemberCoupon
+from app.models.finance import RechargeOrder, PaymentNotifyLog
+from app.services import daily_usage_service, wallet_service
+from app.services.coach_availability import invalidate_reservation
+from app.services.qrcode_cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+SUCCESS = {"code": "SUCCESS", "message": "成功"}
+
+# 已处理的回调：notify:<通知ID>、txn:<交易号>
+_processed = LRUCache(settings.PAYMENT_NOTIFY_CACHE_SIZE)
+
+
+def fail(message: str) -> dict:
+    return {"code": "FAIL", "message": message}
+
+
+def is_notify_processed(notify_id: Optional[str]) -> bool:
+    return bool(notify_id) and _processed.get(f"notify:{notify_id}") is not None
+
+
+def mark_notify_processed(notify_id: Optional[str]):
+    if notify_id:
+        _processed.set(f"notify:{notify_id}", "1")
+
+
+def clear_processed_cache():
+    _processed.clear()
+
+
+def order_type_of(out_trade_no: str) -> str:
+    """按商户订单号前缀判断订单类型"""
+    if out_trade_no.startswith("MC"):
+        return "member_card"
+    if out_trade_no.startswith("RV"):
+        return "reservation"
+    if out_trade_no.startswith("FD"):
+        return "food"
+    return "recharge"
+
+
+def coupon_id_from(attach: Optional[str]) -> Optional[int]:
+    """从下单附加数据（attach / 预约 remark）中取优惠券ID"""
+    try:
+        data = json.loads(attach) if attach else {}
+    except (json.JSONDecodeError, TypeError):
+        return None
+    return data.get("coupon_id") if isinstance(data, dict) else None
+
+
+# ==================== 状态变更（回调与主动查单共用） ====================
+
+def complete_recharge(db: Session, order_no: str, transaction_id: str) -> bool:
+    """充值订单 pending -> paid 并入账金币，返回是否由本次调用完成"""
+    result = db.execute(
+        update(RechargeOrder).where(
+            RechargeOrder.order_no == order_no,
+            RechargeOrder.status == "pending"
+        ).values(status="paid", transaction_id=transaction_id, pay_time=datetime.now())
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        return False
+
+    order = db.execute(select(
+        RechargeOrder.member_id, RechargeOrder.amount, RechargeOrder.coins, RechargeOrder.bonus_coins
+    ).where(RechargeOrder.order_no == order_no)).one()
+    bonus_coins = order.bonus_coins or 0
+    total_coins = order.coins + bonus_coins
+    wallet_service.credit(
+        db, order.member_id, wallet_service.COIN, total_coins,
+        source="充值", remark=f"充值{order.amount}元，获得{order.coins}金币，赠送{bonus_coins}金币",
+        record_type="recharge"
+    )
+    return True
+
+
+def complete_member_card(db: Session, order_no: str, transaction_id: str) -> bool:
+    """会员卡订单 pending -> paid，开通/续期会员并发放赠送，返回是否由本次调用完成"""
+    now = datetime.now()
+    result = db.execute(
+        update(MemberCardOrder).where(
+            MemberCardOrder.order_no == order_no,
+            MemberCardOrder.status == "pending"
+        ).values(status="paid", transaction_id=transaction_id, pay_time=now)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        return False
+
+    order = db.execute(
+        select(MemberCardOrder).where(MemberCardOrder.order_no == order_no)
+        .execution_options(populate_existing=True)
+    ).scalar_one()
+
+    # 有效期在原到期时间上顺延，需读取当前值：仅对已赢得订单状态变更的这一次调用锁会员行
+    member = db.execute(
+        select(Member).where(Member.id == order.member_id).with_for_update()
+        .execution_options(populate_existing=True)
+    ).scalar_one_or_none()
+    if member:
+        if member.member_expire_time and member.member_expire_time > now:
+            start_time = member.member_expire_time
+        else:
+            start_time = now
+        expire_time = start_time + timedelta(days=order.duration_days)
+
+        order.start_time = start_time
+        order.expire_time = expire_time
+
+        member.level_id = order.level_id
+        member.member_expire_time = expire_time
+        member.subscription_status = 'active'
+        member.subscription_start_date = start_time.date()
+
+        if order.bonus_coins and float(order.bonus_coins) > 0:
+            wallet_service.credit(
+                db, member.id, wallet_service.COIN, order.bonus_coins,
+                source="会员卡赠送", remark=f"购买会员卡赠送金币，订单号：{order.order_no}"
+            )
+
+        if order.bonus_points and order.bonus_points > 0:
+            wallet_service.credit(
+                db, member.id, wallet_service.POINT, order.bonus_points,
+                source="会员卡赠送", remark=f"购买会员卡赠送积分，订单号：{order.order_no}"
+            )
+
+    db.execute(
+        update(MemberCard).where(MemberCard.id == order.card_id)
+        .values(sales_count=func.coalesce(MemberCard.sales_count, 0) + 1)
+        .execution_options(synchronize_session=False)
+    )
+    return True
+
+
+def complete_reservation(db: Session, out_trade_no: str, transaction_id: str, coupon_id: Optional[int]) -> bool:
+    """预约 unpaid -> pending 并核销锁定的优惠券，返回是否由本次调用完成"""
+    result = db.execute(
+        update(Reservation).where(
+            Reservation.out_trade_no == out_trade_no,
+            Reservation.status == "unpaid"
+        ).values(status="pending", transaction_id=transaction_id)
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        return False
+    invalidate_reservation(db, out_trade_no)
+
+    if coupon_id:
+        reservation_id, member_id = db.execute(
+            select(Reservation.id, Reservation.member_id).where(Reservation.out_trade_no == out_trade_no)
+        ).one()
+        db.execute(
+            update(MemberCoupon).where(
+                MemberCoupon.id == coupon_id,
+                MemberCoupon.member_id == member_id,
+                MemberCoupon.status.in_(['locked', 'unused'])
+            ).values(status='used', use_time=datetime.now(), order_type='reservation', order_id=reservation_id)
+            .execution_options(synchronize_session=False)
+        )
+    return True
+
+
+def cancel_unpaid_reservation(db: Session, out_trade_no: str, coupon_id: Optional[int]) -> bool:
+    """支付失败：预约 unpaid -> cancelled 并解锁优惠券，返回是否由本次调用完成"""
+    result = db.execute(
+        update(Reservation).where(
+            Reservation.out_trade_no == out_trade_no,
+            Reservation.status == "unpaid"
+        ).values(status="cancelled")
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount == 0:
+        return False
+    invalidate_reservation(db, out_trade_no)
+    reservation = db.execute(
+        select(Reservation.member_id, Reservation.reservation_date, Reservation.duration, Reservation.is_deleted)
+        .where(Reservation.out_trade_no == out_trade_no)
+    ).one()
+    if not reservation.is_deleted:
+        daily_usage_service.adjust(db, reservation.member_id, reservation.reservation_date, -reservation.duration)
+
+    if coupon_id:
+        db.execute(
+            update(MemberCoupon).where(
+                MemberCoupon.id == coupon_id,
+                MemberCoupon.member_id == reservation.member_id,
+                MemberCoupon.status == 'locked'
+            ).values(status='unused')
+            .execution_options(synchronize_session=False)
+        )
+    return True
+
+
+# ==================== 回调分发 ====================
+
+def _unchanged(db: Session, model, condition, missing_message: str) -> Tuple[dict, bool]:
+    """状态未变更：订单存在说明已处理过（幂等成功），否则返回失败让微信重试"""
+    if db.execute(select(model.id).where(condition)).first():
+        return SUCCESS, False
+    return fail(missing_message), False
+
+
+def _handle_recharge(db: Session, out_trade_no: str, transaction_id: str, trade_state: str, attach: str):
+    if trade_state == "SUCCESS" and complete_recharge(db, out_trade_no, transaction_id):
+        return SUCCESS, True
+    return _unchanged(db, RechargeOrder, RechargeOrder.order_no == out_trade_no, "订单不存在")
+
+
+def _handle_member_card(db: Session, out_trade_no: str, transaction_id: str, trade_state: str, attach: str):
+    if trade_state == "SUCCESS" and complete_member_card(db, out_trade_no, transaction_id):
+        return SUCCESS, True
+    return _unchanged(db, MemberCardOrder, MemberCardOrder.order_no == out_trade_no, "订单不存在")
+
+
+def _handle_reservation(db: Session, out_trade_no: str, transaction_id: str, trade_state: str, attach: str):
+    coupon_id = coupon_id_from(attach)
+    if trade_state == "SUCCESS":
+        changed = complete_reservation(db, out_trade_no, transaction_id, coupon_id)
+    else:
+        changed = cancel_unpaid_reservation(db, out_trade_no, coupon_id)
+    if changed:
+        return SUCCESS, True
+    return _unchanged(db, Reservation, Reservation.out_trade_no == out_trade_no, "预约订单不存在")
+
+
+_HANDLERS = {
+    "recharge": _handle_recharge,
+    "member_card": _handle_member_card,
+    "reservation": _handle_reservation,
+}
+
+
+def handle_notify(db: Session, decrypted: dict) -> dict:
+    """处理解密后的支付回调（幂等，可被多 worker 并发重复调用）"""
+    out_trade_no = decrypted.get("out_trade_no") or ""
+    transaction_id = decrypted.get("transaction_id")
+    trade_state = decrypted.get("trade_state")
+    order_type = order_type_of(out_trade_no)
+
+    if order_type == "food":
+        # 餐饮订单(已迁移至美团，兼容历史未支付订单回调)
+        logger.warning(f"收到已废弃的餐饮订单回调: {out_trade_no}")
+        return SUCCESS
+
+    txn_key = f"txn:{transaction_id}"
+    if transaction_id and _processed.get(txn_key) is not None:
+        return SUCCESS
+
+    try:
+        log = None
+        if transaction_id:
+            log = PaymentNotifyLog(
+                transaction_id=transaction_id,
+                out_trade_no=out_trade_no,
+                order_type=order_type,
+                trade_state=trade_state,
+            )
+            db.add(log)
+            try:
+                db.flush()
+            except IntegrityError:
+                # 同一交易已由其他请求/worker 处理
+                db.rollback()
+                _processed.set(txn_key, "1")
+                return SUCCESS
+
+        response, applied = _HANDLERS[order_type](
+            db, out_trade_no, transaction_id, trade_state, decrypted.get("attach")
+        )
+        if response is not SUCCESS:
+            db.rollback()
+            return response
+        if log is not None:
+            log.result = "applied" if applied else "ignored"
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        logger.exception(f"支付回调处理失败: {out_trade_no}")
+        return fail(f"处理失败: {str(e)}")
+
+    if transaction_id:
+        _processed.set(txn_key, "1")
+    return SUCCESS
@@ -0,0 +1,139 @@
+"""核销二维码缓存
+
+qrcode 纯 Python 编码 + PNG 压缩开销较大，订单详情每次打开都会重新生成。
+同一预约号的二维码内容不变，按 (内容, 格式) 记忆到有界 LRU 中；
+url 格式额外落盘到 uploads/qrcodes/，返回可被 CDN/nginx 缓存的图片地址。
+
+输出格式（VERIFY_QRCODE_FORMAT 或接口 qr_format 参数）：
+- data_uri：data:image/png;base64,...（默认，兼容现有小程序）
+- svg：紧凑 SVG 字符串（按行合并模块，体积远小于 qrcode 自带 SVG 工厂）
+- url：/uploads/qrcodes/<签名>.png
+"""
+import base64
+import hashlib
+import hmac
+import io
+import os
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+QRCODE_FORMATS = ("data_uri", "svg", "url")
+QRCODE_DIR = "qrcodes"
+
+
+class LRUCache:
+    """线程安全的有界 LRU"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[tuple, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key) -> Optional[str]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value: str):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        return len(self._data)
+
+
+_cache = LRUCache(settings.QRCODE_CACHE_SIZE)
+
+
+def render_png(payload: str) -> bytes:
+    """生成二维码 PNG（与原 qrcode.make 默认参数一致）"""
+    import qrcode
+
+    buf = io.BytesIO()
+    qrcode.make(payload).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def render_svg(payload: str) -> str:
+    """生成紧凑 SVG：每行连续的深色模块合并为一个矩形路径"""
+    import qrcode
+
+    qr = qrcode.QRCode(border=4)
+    qr.add_data(payload)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+    size = len(matrix)
+
+    parts = []
+    for y, row in enumerate(matrix):
+        x = 0
+        while x < size:
+            if row[x]:
+                start = x
+                while x < size and row[x]:
+                    x += 1
+                parts.append(f"M{start} {y}h{x - start}v1h-{x - start}z")
+            else:
+                x += 1
+    return (
+        f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {size} {size}" shape-rendering="crispEdges">'
+        f'<rect width="100%" height="100%" fill="#fff"/><path d="{"".join(parts)}"/></svg>'
+    )
+
+
+def _signed_name(payload: str) -> str:
+    """落盘文件名（HMAC 签名，防止通过预约号枚举二维码地址）"""
+    return hmac.new(settings.SECRET_KEY.encode(), payload.encode(), hashlib.sha256).hexdigest()[:32]
+
+
+def _render(payload: str, fmt: str) -> str:
+    if fmt == "svg":
+        return render_svg(payload)
+    if fmt == "url":
+        relative = f"{QRCODE_DIR}/{_signed_name(payload)}.png"
+        file_path = os.path.join(settings.UPLOAD_DIR, relative)
+        if not os.path.exists(file_path):
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            temp_path = f"{file_path}.{threading.get_ident()}.part"
+            with open(temp_path, "wb") as f:
+                f.write(render_png(payload))
+            os.replace(temp_path, file_path)
+        return f"/uploads/{relative}"
+    return "data:image/png;base64," + base64.b64encode(render_png(payload)).decode()
+
+
+def get_qrcode(payload: str, fmt: str = "data_uri") -> str:
+    """获取二维码（命中缓存直接返回）"""
+    key = (payload, fmt)
+    value = _cache.get(key)
+    if value is None:
+        value = _render(payload, fmt)
+        _cache.set(key, value)
+    return value
+
+
+async def get_qrcode_async(payload: str, fmt: str = "data_uri") -> str:
+    """协程版本：未命中时在线程池中生成，不阻塞事件循环"""
+    value = _cache.get((payload, fmt))
+    if value is None:
+        value = await run_in_threadpool(get_qrcode, payload, fmt)
+    return value
+
+
+def verify_payload(reservation_no: str) -> str:
+    """预约核销二维码内容"""
+    return f"VERIFY:{reservation_no}"
@@ -0,0 +1,340 @@
+"""未支付预约超时关闭：进程内时间轮 + 数据库兜底扫描
+
+微信支付下单的预约以 unpaid 创建，用户放弃支付时会一直占着时段、锁着优惠券。
+这里在下单提交后把订单号挂到时间轮上（截止时间 = 创建时间 + RESERVATION_PAY_TIMEOUT），
+后台线程每 RESERVATION_EXPIRY_TICK 秒推进一格，到期的订单按批关闭：
+
+1. 逐单条件认领：UPDATE close_claimed_at WHERE status = 'unpaid' AND 无未过期认领，
+   只有认领成功的订单由本进程关单（已支付、已取消、其他 worker 正在关的直接丢弃）
+2. 线程池并发调用 wechat_pay.close_order；关单失败时查单：已支付的走 complete_reservation 补偿，
+   查不到结果的释放认领、稍后重试（RESERVATION_CLOSE_RETRY_DELAY 秒）
+3. 关单成功的一批订单在一个事务内：条件更新 unpaid -> cancelled、按会员日期回退 SSS 免费额度台账、
+   批量解锁优惠券 locked -> unused、失效教练排期缓存
+
+时间轮只在本进程内，重启或其他 worker 下的单由兜底扫描处理：启动预热时把未到期的 unpaid 订单装入时间轮，
+之后每 RESERVATION_EXPIRY_RECOVERY_INTERVAL 秒按 (status, created_at) 索引扫一次已超时的 unpaid 订单。
+每个 worker 都会装载、扫描到同一批订单，靠第 1 步的认领保证每单只调用一次微信关单；
+认领的 worker 崩溃时认领在 RESERVATION_CLOSE_CLAIM_TTL 秒后过期，由下一轮兜底扫描接手。
+"""
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import or_, select, tuple_, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.wechat_pay import wechat_pay
+from app.models import MemberCoupon, Reservation
+from app.services import daily_usage_service, payment_notify_service
+from app.services.coach_availability import mark_dirty
+from app.services.counter_service import BackgroundFlusher
+
+logger = logging.getLogger(__name__)
+
+CLOSED, PAID, RETRY = "closed", "paid", "retry"
+
+
+class TimingWheel:
+    """哈希时间轮：slots 个格子，每格 tick 秒；超过一圈的截止时间按目标刻度留在格子里等下一圈"""
+
+    def __init__(self, tick: float, slots: int, start: Optional[float] = None):
+        self.tick = tick
+        self.slots = slots
+        self._buckets: List[Dict[str, int]] = [{} for _ in range(slots)]
+        self._slot_of: Dict[str, int] = {}
+        self._cursor = self._tick_of(time.time() if start is None else start) - 1
+
+    def __len__(self):
+        return len(self._slot_of)
+
+    def _tick_of(self, at: float) -> int:
+        return int(at // self.tick)
+
+    def schedule(self, key: str, deadline: float):
+        """登记（或改期）key，deadline 为 epoch 秒；已过期的放到下一格，随下次推进取出"""
+        self.cancel(key)
+        target = max(self._tick_of(deadline), self._cursor + 1)
+        slot = target % self.slots
+        self._buckets[slot][key] = target
+        self._slot_of[key] = slot
+
+    def cancel(self, key: str):
+        slot = self._slot_of.pop(key, None)
+        if slot is not None:
+            self._buckets[slot].pop(key, None)
+
+    def advance(self, now: float) -> List[str]:
+        """推进到 now，返回到期的 key（落后超过一圈时每个格子只需看一次）"""
+        current = self._tick_of(now)
+        due = []
+        for tick in range(max(self._cursor + 1, current - self.slots + 1), current + 1):
+            bucket = self._buckets[tick % self.slots]
+            for key in [k for k, target in bucket.items() if target <= current]:
+                del bucket[key]
+                del self._slot_of[key]
+                due.append(key)
+        self._cursor = max(self._cursor, current)
+        return due
+
+
+def _epoch(created_at: datetime) -> float:
+    """created_at 为 UTC naive 时间（TimestampMixin 使用 utcnow）"""
+    return created_at.replace(tzinfo=timezone.utc).timestamp()
+
+
+class ReservationExpiry(BackgroundFlusher):
+    """未支付预约到期关闭"""
+
+    def __init__(self, timeout: int, tick: float, slots: int, batch: int, workers: int,
+                 retry_delay: float, recovery_interval: float, claim_ttl: float):
+        super().__init__(tick, "reservation-expiry")
+        self.timeout = timeout
+        self.batch = batch
+        self.workers = workers
+        self.retry_delay = retry_delay
+        self.recovery_interval = recovery_interval
+        self.claim_ttl = claim_ttl
+        self._wheel = TimingWheel(tick, slots)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._next_recovery = 0.0
+
+    def pending(self) -> int:
+        return len(self._wheel)
+
+    def track(self, db: Session, out_trade_no: str, created_at: datetime):
+        """下单提交后登记到期时间"""
+        with self._lock:
+            self._bind_from(db)
+            self._wheel.schedule(out_trade_no, _epoch(created_at) + self.timeout)
+        self._ensure_thread()
+
+    def recover(self, db: Session):
+        """启动时装载尚未到期的 unpaid 订单（已到期的由下一轮兜底扫描关闭）"""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.timeout)
+        rows = db.execute(
+            select(Reservation.out_trade_no, Reservation.created_at).where(
+                Reservation.status == "unpaid",
+                Reservation.created_at >= cutoff,
+                Reservation.out_trade_no.isnot(None),
+            )
+        ).all()
+        with self._lock:
+            self._bind_from(db)
+            for out_trade_no, created_at in rows:
+                self._wheel.schedule(out_trade_no, _epoch(created_at) + self.timeout)
+        self._ensure_thread()
+
+    def flush(self):
+        """推进时间轮，关闭到期订单；到兜底扫描时间时顺带扫描数据库中已超时的订单"""
+        now = time.time()
+        with self._lock:
+            due = set(self._wheel.advance(now))
+        if now >= self._next_recovery:
+            self._next_recovery = now + self.recovery_interval
+            try:
+                due |= self._overdue()
+            except Exception:
+                logger.exception("未支付预约兜底扫描失败")
+        due = sorted(due)
+        for i in range(0, len(due), self.batch):
+            try:
+                self.close_batch(due[i:i + self.batch])
+            except Exception:
+                logger.exception("未支付预约关闭失败，稍后重试")
+                self._reschedule(due[i:i + self.batch])
+
+    def drain(self):
+        """停机不补关：重启后由兜底扫描处理"""
+
+    def shutdown(self):
+        super().shutdown()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def _reschedule(self, keys: Iterable[str]):
+        deadline = time.time() + self.retry_delay
+        with self._lock:
+            for key in keys:
+                self._wheel.schedule(key, deadline)
+
+    def _overdue(self) -> Set[str]:
+        cutoff = datetime.utcnow() - timedelta(seconds=self.timeout)
+        with self._engine.connect() as conn:
+            return set(conn.execute(
+                select(Reservation.out_trade_no).where(
+                    Reservation.status == "unpaid",
+                    Reservation.created_at < cutoff,
+                    Reservation.out_trade_no.isnot(None),
+                    self._unclaimed(datetime.utcnow()),
+                ).limit(self.batch * 10)
+            ).scalars())
+
+    # ==================== 认领 ====================
+
+    def _unclaimed(self, now: datetime):
+        return or_(
+            Reservation.close_claimed_at.is_(None),
+            Reservation.close_claimed_at < now - timedelta(seconds=self.claim_ttl),
+        )
+
+    def _claim(self, out_trade_nos: List[str], now: datetime) -> List[str]:
+        """逐单条件认领仍为 unpaid 且无人认领（或认领已过期）的订单，返回认领成功的订单号"""
+        claimed = []
+        with self._engine.begin() as conn:
+            for out_trade_no in out_trade_nos:
+                if conn.execute(
+                    update(Reservation).where(
+                        Reservation.out_trade_no == out_trade_no,
+                        Reservation.status == "unpaid",
+                        self._unclaimed(now),
+                    ).values(close_claimed_at=now)
+                ).rowcount:
+                    claimed.append(out_trade_no)
+        return claimed
+
+    def _release(self, out_trade_nos: List[str], now: datetime):
+        """释放本进程的认领，重试时任一 worker 都可重新认领"""
+        with self._engine.begin() as conn:
+            conn.execute(
+                update(Reservation).where(
+                    Reservation.out_trade_no.in_(out_trade_nos),
+                    Reservation.close_claimed_at == now,
+                ).values(close_claimed_at=None)
+            )
+
+    # ==================== 关单 ====================
+
+    def _close_remote(self, out_trade_no: str) -> Tuple[str, Optional[str]]:
+        """关闭微信订单，返回 (结果, 已支付时的交易号)"""
+        if not settings.WECHAT_MCH_ID:
+            return CLOSED, None  # 未接入微信支付：没有需要关闭的远端订单
+        try:
+            if wechat_pay.close_order(out_trade_no):
+                return CLOSED, None
+            result = wechat_pay.query_order(out_trade_no)
+        except Exception:
+            logger.exception("关闭微信订单失败: %s", out_trade_no)
+            return RETRY, None
+        state = result.get("trade_state")
+        if state == "SUCCESS":
+            return PAID, result.get("transaction_id")
+        if state in ("CLOSED", "REVOKED", "PAYERROR"):
+            return CLOSED, None
+        return RETRY, None
+
+    def _close_all_remote(self, out_trade_nos: List[str]) -> List[Tuple[str, str, Optional[str]]]:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="reservation-close")
+        results = self._executor.map(self._close_remote, out_trade_nos)
+        return [(no, outcome, txn) for no, (outcome, txn) in zip(out_trade_nos, results)]
+
+    def close_batch(self, out_trade_nos: List[str]):
+        """关闭一批到期订单（见模块说明）；调用微信接口期间不占数据库事务"""
+        now = datetime.utcnow().replace(microsecond=0)  # DATETIME 列不存微秒，释放时按相等匹配
+        claimed = self._claim(out_trade_nos, now)
+        if not claimed:
+            return
+        with self._engine.connect() as conn:
+            remarks = dict(conn.execute(
+                select(Reservation.out_trade_no, Reservation.remark).where(
+                    Reservation.out_trade_no.in_(claimed),
+                    Reservation.status == "unpaid",
+                )
+            ).all())
+        if not remarks:
+            return
+
+        closed, paid, retry = [], [], []
+        for out_trade_no, outcome, transaction_id in self._close_all_remote(list(remarks)):
+            if outcome == CLOSED:
+                closed.append(out_trade_no)
+            elif outcome == PAID:
+                paid.append((out_trade_no, transaction_id))
+            else:
+                retry.append(out_trade_no)
+
+        if closed or paid:
+            with Session(self._engine) as db:
+                for out_trade_no, transaction_id in paid:
+                    payment_notify_service.complete_reservation(
+                        db, out_trade_no, transaction_id, payment_notify_service.coupon_id_from(remarks[out_trade_no])
+                    )
+                if closed:
+                    cancel_expired(db, closed)
+                db.commit()
+        if retry:
+            self._release(retry, now)
+            self._reschedule(retry)
+
+
+def cancel_expired(db: Session, out_trade_nos: List[str]) -> int:
+    """一批已关单的预约 unpaid -> cancelled，回退免费额度台账并解锁优惠券，返回取消数（不提交）"""
+    rows = db.execute(
+        select(
+            Reservation.id, Reservation.member_id, Reservation.coach_id, Reservation.reservation_date,
+            Reservation.duration, Reservation.is_deleted, Reservation.remark,
+        ).where(
+            Reservation.out_trade_no.in_(out_trade_nos),
+            Reservation.status == "unpaid",
+        ).with_for_update()
+    ).all()
+    if not rows:
+        return 0
+    # 行已加锁，条件更新只为与支付回调的 unpaid -> pending 互斥
+    db.execute(
+        update(Reservation).where(
+            Reservation.id.in_([r.id for r in rows]),
+            Reservation.status == "unpaid",
+        ).values(status="cancelled")
+        .execution_options(synchronize_session=False)
+    )
+
+    usage: Dict[Tuple[int, object], int] = {}
+    coupons = set()
+    for r in rows:
+        if not r.is_deleted:
+            usage[(r.member_id, r.reservation_date)] = usage.get((r.member_id, r.reservation_date), 0) + (r.duration or 0)
+        if r.coach_id:
+            mark_dirty(db, r.coach_id, [r.reservation_date])
+        coupon_id = payment_notify_service.coupon_id_from(r.remark)
+        if coupon_id:
+            coupons.add((coupon_id, r.member_id))
+    for (member_id, day), minutes in usage.items():
+        if minutes:
+            daily_usage_service.adjust(db, member_id, day, -minutes)
+    if coupons:
+        db.execute(
+            update(MemberCoupon).where(
+                tuple_(MemberCoupon.id, MemberCoupon.member_id).in_(list(coupons)),
+                MemberCoupon.status == 'locked'
+            ).values(status='unused')
+            .execution_options(synchronize_session=False)
+        )
+    return len(rows)
+
+
+reservation_expiry = ReservationExpiry(
+    timeout=settings.RESERVATION_PAY_TIMEOUT,
+    tick=settings.RESERVATION_EXPIRY_TICK,
+    slots=settings.RESERVATION_EXPIRY_WHEEL_SLOTS,
+    batch=settings.RESERVATION_EXPIRY_BATCH,
+    workers=settings.RESERVATION_CLOSE_WORKERS,
+    retry_delay=settings.RESERVATION_CLOSE_RETRY_DELAY,
+    recovery_interval=settings.RESERVATION_EXPIRY_RECOVERY_INTERVAL,
+    claim_ttl=settings.RESERVATION_CLOSE_CLAIM_TTL,
+)
+
+
+def start_reservation_expiry():
+    """启动预热：装载未到期的 unpaid 订单并启动后台线程"""
+    from app.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        reservation_expiry.recover(db)
+    finally:
+        db.close()
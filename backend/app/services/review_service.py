@@ -6,7 +6,7 @@ from sqlalchemy import func
 
 from app.models import Member
 from app.models.review import ServiceReview, ReviewPointConfig
-from app.models.member import PointRecord
+from app.services import wallet_service
 
 
 class ReviewService:
@@ -72,16 +72,10 @@ class ReviewService:
 
         # 发放积分
         if can_earn_points and points > 0:
-            member.point_balance = (member.point_balance or 0) + points
-            point_record = PointRecord(
-                member_id=member.id,
-                type='income',
-                amount=points,
-                balance=member.point_balance,
-                source='review',
-                remark=f'评论{order_type}订单#{order_id}获得积分'
+            wallet_service.credit(
+                self.db, member.id, wallet_service.POINT, points,
+                source='review', remark=f'评论{order_type}订单#{order_id}获得积分'
             )
-            self.db.add(point_record)
 
         self.db.commit()
         self.db.refresh(review)
@@ -15,12 +15,11 @@ from sqlalchemy.orm import Session, joinedload
 from app.core.config import settings
 from app.models import (
     GateCheckRecord,
-    Member,
-    PointRecord,
     Reservation,
     Venue,
 )
 from app.models.venue import VenueType
+from app.services import wallet_service
 
 # JWT 短期 token 设计
 QR_TOKEN_EXPIRE_SECONDS = 30
@@ -120,22 +119,14 @@ def record_checkin_for_reservation(db: Session, res: Reservation) -> GateCheckRe
     )
     db.add(record)
 
-    # 同步更新 member 积分余额 + 写 PointRecord 流水（与 gate_api 出场逻辑一致）
+    # 积分原子入账 + 写 PointRecord 流水（与 gate_api 出场逻辑一致）
     if points > 0:
-        member = db.query(Member).filter(Member.id == member_id).first()
-        if member:
-            member.point_balance = (member.point_balance or 0) + points
-            venue = db.query(Venue).filter(Venue.id == venue_id).first()
-            venue_name = venue.name if venue else f"场馆#{venue_id}"
-            point_record = PointRecord(
-                member_id=member_id,
-                type="income",
-                amount=points,
-                balance=member.point_balance,
-                source="预约核销打卡",
-                remark=f"在{venue_name}运动{duration}分钟",
-            )
-            db.add(point_record)
+        venue = db.query(Venue).filter(Venue.id == venue_id).first()
+        venue_name = venue.name if venue else f"场馆#{venue_id}"
+        wallet_service.credit(
+            db, member_id, wallet_service.POINT, points,
+            source="预约核销打卡", remark=f"在{venue_name}运动{duration}分钟",
+        )
 
     return record
 
@@ -0,0 +1,47 @@
+"""组队广场：活动开始时间解析与短 TTL 列表缓存
+
+组队的活动时间以 team.starts_at（DATETIME）为准，activity_date / activity_time 字符串由它派生，
+只用于输出。列表按 (status, sport_type, starts_at) 索引做范围查询。
+
+列表响应按「运动类型 + 状态 + 分页」缓存 TEAM_LIST_CACHE_TTL 秒，创建、加入、退出组队提交后失效；
+多 worker 部署时其他进程最长 TTL 秒后看到变化（过期判断也随 TTL 推进）。
+"""
+import re
+from datetime import datetime
+from typing import Optional
+
+from app.core.config import settings
+from app.services.catalog_cache import CatalogCache
+
+TAG_TEAMS = "teams"
+
+_DATE_RE = re.compile(r"^\s*(\d{4})[-/.](\d{1,2})[-/.](\d{1,2})\s*$")
+_TIME_RE = re.compile(r"^\s*(\d{1,2})[:：](\d{1,2})(?:[:：]\d{1,2})?\s*$")
+
+team_list_cache = CatalogCache(ttl=settings.TEAM_LIST_CACHE_TTL, max_entries=256)
+
+
+def parse_starts_at(activity_date: Optional[str], activity_time: Optional[str]) -> Optional[datetime]:
+    """日期 + 时间字符串 -> 开始时间（兼容 2026-3-27、9:5 等未补零写法），无法解析返回 None"""
+    date_match = _DATE_RE.match(activity_date or "")
+    time_match = _TIME_RE.match(activity_time or "")
+    if not date_match or not time_match:
+        return None
+    try:
+        return datetime(*(int(v) for v in date_match.groups()), *(int(v) for v in time_match.groups()))
+    except ValueError:
+        return None
+
+
+def schedule_fields(starts_at: datetime) -> dict:
+    """开始时间派生的输出字段"""
+    return {
+        "starts_at": starts_at,
+        "activity_date": starts_at.strftime("%Y-%m-%d"),
+        "activity_time": starts_at.strftime("%H:%M"),
+    }
+
+
+def invalidate_team_list():
+    """组队增删改提交后调用"""
+    team_list_cache.invalidate(TAG_TEAMS)
@@ -0,0 +1,139 @@
+"""UI配置快照缓存服务
+
+/member/ui-config 每次小程序启动都会请求。发布/回滚时将当前版本快照预编译为
+按页面拆分、已序列化（并已 gzip 压缩）的响应字节，进程内按版本缓存；
+配合 ETag/If-None-Match，重复启动直接返回 304，不查库、不序列化。
+
+多 worker 部署时，各进程在 UI_CONFIG_CACHE_TTL 秒内信任本地版本指针，
+过期后仅查询当前版本号（不加载快照 JSON），版本未变则继续复用已编译结果。
+"""
+import gzip
+import hashlib
+import threading
+import time
+from typing import Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.responses import encode_response
+from app.core.database import SessionLocal
+from app.models.ui_editor import UIConfigVersion
+
+
+class CompiledPayload:
+    """单个页面（或全量）的预编译响应"""
+
+    __slots__ = ("body", "gzip_body", "etag")
+
+    def __init__(self, body: bytes, version: int):
+        self.body = body
+        self.gzip_body = gzip.compress(body, compresslevel=6)
+        digest = hashlib.sha1(body).hexdigest()[:16]
+        # 同一内容存在原始/gzip 两种编码，使用弱 ETag
+        self.etag = f'W/"ui-{version}-{digest}"'
+
+
+class CompiledUIConfig:
+    """某一发布版本的预编译结果"""
+
+    def __init__(self, version_id: int, version: int, snapshot: dict):
+        self.version_id = version_id
+        self.version = version
+        self.snapshot = snapshot or {}
+        self._pages: Dict[Optional[str], CompiledPayload] = {}
+        self._lock = threading.Lock()
+
+        # 全量 + 快照中出现的所有页面预先编译
+        self.get(None)
+        for page in self.snapshot.get("pages", []):
+            if page.get("page_code"):
+                self.get(page["page_code"])
+
+    def _build_data(self, page_code: Optional[str]) -> dict:
+        config = self.snapshot
+        if not page_code:
+            return config
+        return {
+            "pages": [p for p in config.get("pages", []) if p.get("page_code") == page_code],
+            "blocks": [b for b in config.get("blocks", []) if b.get("page_code") == page_code],
+            "menuItems": [
+                m for m in config.get("menuItems", [])
+                if m.get("page_code") == page_code or m.get("menu_type") == "tabbar"
+            ],
+            "tabBar": config.get("tabBar", []),
+            "version": self.version,
+            "publishedAt": config.get("publishedAt"),
+        }
+
+    def get(self, page_code: Optional[str]) -> CompiledPayload:
+        """获取页面预编译结果（快照外的页面按需编译并记忆）"""
+        payload = self._pages.get(page_code)
+        if payload is None:
+            body = encode_response(self._build_data(page_code))
+            payload = CompiledPayload(body, self.version)
+            with self._lock:
+                # 限制按需编译的页面数量，防止任意 page_code 撑爆内存
+                if len(self._pages) < 256:
+                    self._pages[page_code] = payload
+        return payload
+
+
+class UIConfigCache:
+    """进程内 UI 配置缓存（按版本）"""
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+        self._compiled: Optional[CompiledUIConfig] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def publish(self, version: UIConfigVersion) -> CompiledUIConfig:
+        """发布/回滚后调用：编译新版本并立即切换"""
+        compiled = CompiledUIConfig(version.id, version.version, version.config_snapshot)
+        with self._lock:
+            self._compiled = compiled
+            self._checked_at = time.monotonic()
+        return compiled
+
+    def invalidate(self):
+        with self._lock:
+            self._compiled = None
+            self._checked_at = 0.0
+
+    def get_current(self, db: Session) -> Optional[CompiledUIConfig]:
+        """获取当前版本编译结果；无已发布版本时返回 None"""
+        compiled = self._compiled
+        if compiled is not None and time.monotonic() - self._checked_at < self.ttl:
+            return compiled
+
+        # 只查版本号，不加载快照
+        row = db.query(UIConfigVersion.id, UIConfigVersion.version).filter(
+            UIConfigVersion.is_current == True
+        ).first()
+        if not row:
+            self.invalidate()
+            return None
+
+        if compiled is not None and compiled.version_id == row.id:
+            with self._lock:
+                self._checked_at = time.monotonic()
+            return compiled
+
+        version = db.query(UIConfigVersion).filter(UIConfigVersion.id == row.id).first()
+        if not version or not version.config_snapshot:
+            self.invalidate()
+            return None
+        return self.publish(version)
+
+
+ui_config_cache = UIConfigCache(ttl=settings.UI_CONFIG_CACHE_TTL)
+
+
+def warm_up_ui_config():
+    """启动预热：加载并预编译当前发布版本"""
+    db = SessionLocal()
+    try:
+        ui_config_cache.get_current(db)
+    finally:
+        db.close()
@@ -36,20 +36,34 @@ class VenuePricingService:
 
         if rule:
             return rule.price
+        return self.get_default_price(venue_id)
 
-        # 兜底：使用场馆默认价格
+    def get_default_price(self, venue_id: int) -> Decimal:
+        """场馆默认价格（无定价规则时兜底）"""
         venue = self.db.query(Venue).filter(
             Venue.id == venue_id,
             Venue.is_deleted == False
         ).first()
         return venue.price if venue else Decimal('0')
 
+    def get_day_prices(self, venue_id: int, day_of_week: int) -> Dict[int, Decimal]:
+        """某星期几全部启用的定价规则 {小时: 价格}（一次查询）"""
+        rows = self.db.query(VenuePriceRule.hour, VenuePriceRule.price).filter(
+            VenuePriceRule.venue_id == venue_id,
+            VenuePriceRule.day_of_week == day_of_week,
+            VenuePriceRule.is_active == True,
+            VenuePriceRule.is_deleted == False
+        ).all()
+        return {hour: price for hour, price in rows}
+
     def calculate_booking_price(
         self,
         venue_id: int,
         booking_date: date,
         start_hour: int,
-        end_hour: int
+        end_hour: int,
+        day_prices: Optional[Dict[int, Decimal]] = None,
+        default_price: Optional[Decimal] = None
     ) -> Dict:
         """
         计算预约总价
@@ -59,16 +73,24 @@ class VenuePricingService:
             booking_date: 预约日期
             start_hour: 开始小时 (如 8)
             end_hour: 结束小时 (如 10，表示到10:00结束)
+            day_prices: 当天定价规则 {小时: 价格}，已加载时传入（见 BookingContext）
+            default_price: 场馆默认价格，已加载时传入
 
         Returns:
             {total: 总价, breakdown: [{hour, price}]}
         """
         day_of_week = booking_date.weekday()  # 0=周一
+        if day_prices is None:
+            day_prices = self.get_day_prices(venue_id, day_of_week)
         breakdown = []
         total = Decimal('0')
 
         for hour in range(start_hour, end_hour):
-            price = self.get_hourly_price(venue_id, day_of_week, hour)
+            price = day_prices.get(hour)
+            if price is None:
+                if default_price is None:
+                    default_price = self.get_default_price(venue_id)
+                price = default_price
             breakdown.append({
                 "hour": hour,
                 "time_range": f"{hour:02d}:00-{hour+1:02d}:00",
@@ -94,10 +116,16 @@ class VenuePricingService:
             [{hour, time_range, price}]
         """
         day_of_week = target_date.weekday()
+        day_prices = self.get_day_prices(venue_id, day_of_week)
+        default_price = None
         table = []
 
         for hour in range(6, 24):
-            price = self.get_hourly_price(venue_id, day_of_week, hour)
+            price = day_prices.get(hour)
+            if price is None:
+                if default_price is None:
+                    default_price = self.get_default_price(venue_id)
+                price = default_price
             table.append({
                 "hour": hour,
                 "time_range": f"{hour:02d}:00-{hour+1:02d}:00",
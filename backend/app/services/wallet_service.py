@@ -0,0 +1,171 @@
+"""会员钱包：金币 / 积分余额变动与流水
+
+所有余额变动都走这里，不再「读余额 -> 应用层加减 -> 写回」（并发时后写覆盖先写，丢失更新）：
+
+- debit：UPDATE member SET 余额 = 余额 - x WHERE id = :id AND 余额 >= x，影响 0 行即余额不足，
+  不会扣成负数；并发扣款在会员行上串行
+- credit：UPDATE member SET 余额 = 余额 + x
+- credit_many：多会员入账合并为一条 UPDATE ... CASE id，流水一次 executemany 写入
+
+变动后余额在同一事务内按主键读回（本事务已持有行锁，读到的就是本次变动后的值），
+流水与余额变动一起提交。本会话中已加载的 Member 对象同步为新余额，不会被后续 flush 写回旧值。
+函数不提交事务，由调用方提交。
+"""
+from decimal import Decimal
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import case, func, insert, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.models import Member, CoinRecord, PointRecord
+
+COIN = "coin"
+POINT = "point"
+
+_BALANCE_COLUMNS = {COIN: Member.coin_balance, POINT: Member.point_balance}
+_RECORD_MODELS = {COIN: CoinRecord, POINT: PointRecord}
+
+
+class InsufficientBalance(ValueError):
+    """余额不足；balance 为当前余额"""
+
+    def __init__(self, kind: str, balance):
+        self.kind = kind
+        self.balance = balance
+        super().__init__("金币余额不足" if kind == COIN else "积分不足")
+
+
+def normalize(kind: str, amount):
+    """金币按 Decimal 保留两位，积分取整"""
+    if kind == COIN:
+        return Decimal(str(amount or 0)).quantize(Decimal("0.01"))
+    return int(amount or 0)
+
+
+def _column(kind: str):
+    if kind not in _BALANCE_COLUMNS:
+        raise ValueError(f"未知的余额类型: {kind}")
+    return _BALANCE_COLUMNS[kind]
+
+
+def _read_balance(db: Session, kind: str, member_id: int):
+    return db.execute(select(_column(kind)).where(Member.id == member_id)).first()
+
+
+def _sync_member(db: Session, kind: str, member_id: int, balance):
+    """会话中已加载的会员对象同步为新余额（作为已提交值，不产生脏数据）"""
+    member = db.identity_map.get(db.identity_key(Member, member_id))
+    if member is not None:
+        set_committed_value(member, _column(kind).key, balance)
+
+
+def _write_records(db: Session, kind: str, rows: list):
+    if rows:
+        db.execute(insert(_RECORD_MODELS[kind]), rows)
+
+
+def _record(member_id, record_type, amount, balance, source, remark, operator_id) -> dict:
+    return {
+        "member_id": member_id,
+        "type": record_type,
+        "amount": amount,
+        "balance": balance,
+        "source": source,
+        "remark": remark,
+        "operator_id": operator_id,
+    }
+
+
+def debit(
+    db: Session,
+    member_id: int,
+    kind: str,
+    amount,
+    source: str,
+    remark: Optional[str] = None,
+    operator_id: Optional[int] = None,
+    record_type: str = "expense",
+):
+    """扣减余额并写流水，返回扣减后余额；余额不足抛 InsufficientBalance，会员不存在抛 ValueError"""
+    column = _column(kind)
+    amount = normalize(kind, amount)
+    if amount < 0:
+        raise ValueError("扣减数量不能为负")
+    if amount:
+        result = db.execute(
+            update(Member).where(Member.id == member_id, func.coalesce(column, 0) >= amount)
+            .values({column: func.coalesce(column, 0) - amount})
+            .execution_options(synchronize_session=False)
+        )
+        updated = result.rowcount > 0
+    else:
+        updated = True
+    row = _read_balance(db, kind, member_id)
+    if row is None:
+        raise ValueError("会员不存在")
+    balance = normalize(kind, row[0])
+    if not updated:
+        raise InsufficientBalance(kind, balance)
+
+    _sync_member(db, kind, member_id, balance)
+    _write_records(db, kind, [_record(member_id, record_type, amount, balance, source, remark, operator_id)])
+    return balance
+
+
+def credit(
+    db: Session,
+    member_id: int,
+    kind: str,
+    amount,
+    source: str,
+    remark: Optional[str] = None,
+    operator_id: Optional[int] = None,
+    record_type: str = "income",
+):
+    """增加余额并写流水，返回增加后余额；会员不存在返回 None（不写流水）"""
+    balances = credit_many(db, kind, [(member_id, amount)], source, remark, operator_id, record_type)
+    return balances.get(member_id)
+
+
+def credit_many(
+    db: Session,
+    kind: str,
+    credits: Iterable[Tuple[int, object]],
+    source: str,
+    remark: Optional[str] = None,
+    operator_id: Optional[int] = None,
+    record_type: str = "income",
+) -> Dict[int, object]:
+    """批量入账：[(会员ID, 数量)]，同一会员多条合并。返回 {会员ID: 入账后余额}，不存在的会员不在结果中
+
+    一条 UPDATE ... CASE id 完成全部会员的原子累加，一次读回余额，流水一次批量写入。
+    """
+    column = _column(kind)
+    totals: Dict[int, object] = {}
+    for member_id, amount in credits:
+        amount = normalize(kind, amount)
+        if amount < 0:
+            raise ValueError("入账数量不能为负")
+        totals[member_id] = totals.get(member_id, 0) + amount
+    if not totals:
+        return {}
+
+    changed = {member_id: amount for member_id, amount in totals.items() if amount}
+    if changed:
+        db.execute(
+            update(Member).where(Member.id.in_(changed))
+            .values({column: func.coalesce(column, 0) + case(changed, value=Member.id, else_=0)})
+            .execution_options(synchronize_session=False)
+        )
+    rows = db.execute(select(Member.id, column).where(Member.id.in_(totals))).all()
+
+    balances = {}
+    records = []
+    for member_id, balance in rows:
+        balance = normalize(kind, balance)
+        balances[member_id] = balance
+        _sync_member(db, kind, member_id, balance)
+        records.append(_record(member_id, record_type, totals[member_id], balance, source, remark, operator_id))
+    _write_records(db, kind, records)
+    return balances
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""冷启动基准：每轮起一个全新解释器，测量导入应用、执行启动事件（含预热）、首次就绪的耗时
+
+用法：
+  python benchmarks/cold_start.py                         # 使用 .env / DATABASE_URL，默认 5 轮
+  python benchmarks/cold_start.py -n 10 --output cold.json
+  python benchmarks/cold_start.py --compare cold.json     # 与基线对比中位数
+  DATABASE_URL=mysql+pymysql://u:p@127.0.0.1:1/x python benchmarks/cold_start.py -n 1
+      # 数据库不可用：导入与启动应照常完成，仅 ready=false
+
+指标（毫秒）：
+  import_ms   import app.main（路由、模型、依赖库加载；不再连接数据库建表）
+  startup_ms  启动事件 + 等待后台预热结束
+  ready_ms    从进程开始到 /ready 检查通过（未就绪时为 null）
+内存（MB，进程峰值 RSS）：
+  rss_import_mb  导入应用后
+  rss_ready_mb   启动事件与预热结束后（含 PRELOAD_ROUTERS 预加载的路由模块）
+另输出 routers_loaded：预热后已加载的路由模块数 / 总数（LAZY_ROUTERS=false 时为全部急加载）
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+CHILD = r"""
+import asyncio, json, resource, sys, time
+t0 = time.perf_counter()
+import app.main as main
+from app.core import lifecycle
+from app.core.lazy_router import lazy_routers
+t1 = time.perf_counter()
+
+def rss_mb():
+    # Linux 下 ru_maxrss 单位为 KB，macOS 为字节
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(rss / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+rss_import = rss_mb()
+
+async def boot():
+    await main.app.router.startup()
+    await main.app.state.warmup_task
+    t2 = time.perf_counter()
+    ready, checks = await lifecycle.readiness_report(main.engine)
+    t3 = time.perf_counter()
+    await main.app.router.shutdown()
+    return t2, t3, ready, checks
+
+t2, t3, ready, checks = asyncio.run(boot())
+print(json.dumps({
+    "import_ms": round((t1 - t0) * 1000, 1),
+    "startup_ms": round((t2 - t1) * 1000, 1),
+    "ready_ms": round((t3 - t0) * 1000, 1) if ready else None,
+    "ready": ready,
+    "checks": checks,
+    "rss_import_mb": rss_import,
+    "rss_ready_mb": rss_mb(),
+    "routers_loaded": f"{sum(r.loaded for r in lazy_routers(main.app))}/{len(lazy_routers(main.app))}",
+    "warmup_ms": lifecycle.warmup_state.timings_ms,
+}, ensure_ascii=False))
+"""
+
+
+def run_once() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", CHILD], cwd=BACKEND_DIR, capture_output=True, text=True, timeout=300
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"子进程启动失败:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def summarize(runs: list) -> dict:
+    summary = {}
+    for key in ("import_ms", "startup_ms", "ready_ms", "rss_import_mb", "rss_ready_mb"):
+        values = [r[key] for r in runs if r[key] is not None]
+        summary[key] = {
+            "median": round(statistics.median(values), 1) if values else None,
+            "min": min(values) if values else None,
+            "max": max(values) if values else None,
+        }
+    return summary
+
+
+def compare(summary: dict, baseline_path: str):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["summary"]
+    print(f"\n对比基线 {baseline_path}（中位数）:")
+    for key, stats in summary.items():
+        base = baseline.get(key, {}).get("median")
+        if base is None or stats["median"] is None:
+            continue
+        unit = "MB" if key.endswith("_mb") else "ms"
+        print(f"  {key:<13} {base}{unit} -> {stats['median']}{unit}  x{base / stats['median']:.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="应用冷启动基准")
+    parser.add_argument("-n", type=int, default=5, help="轮数（每轮一个新进程）")
+    parser.add_argument("--output", help="结果输出 JSON 路径")
+    parser.add_argument("--compare", help="基线 JSON 路径")
+    args = parser.parse_args()
+
+    runs = []
+    for i in range(args.n):
+        run = run_once()
+        runs.append(run)
+        print(f"  #{i + 1}  import={run['import_ms']}ms  startup={run['startup_ms']}ms  "
+              f"ready={run['ready_ms'] if run['ready'] else '-'}ms  "
+              f"rss={run['rss_import_mb']}/{run['rss_ready_mb']}MB  routers={run['routers_loaded']}  "
+              f"{'' if run['ready'] else run['checks']}")
+
+    summary = summarize(runs)
+    print("\n中位数: " + "  ".join(f"{k}={v['median'] if v['median'] is not None else '-'}"
+                                   for k, v in summary.items()))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"runs": runs, "summary": summary}, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        compare(summary, args.compare)
+
+
+if __name__ == "__main__":
+    main()
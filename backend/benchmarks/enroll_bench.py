@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""活动报名开放瞬间压测：大量会员同时报名少量名额，校验不超员并统计延迟
+
+用法：
+  python benchmarks/enroll_bench.py                         # 临时 SQLite 文件库，1000 人抢 100 个名额 + 50 个候补
+  python benchmarks/enroll_bench.py -n 2000 --seats 200 --waitlist 100 -c 200 --queue 16
+  python benchmarks/enroll_bench.py --url mysql+pymysql://u:p@127.0.0.1/bench   # 需已建表（会清空活动报名相关表）
+  python benchmarks/enroll_bench.py --output enroll.json
+
+所有会员在同一时刻（Barrier）报名同一活动，每次报名一个独立会话。三种模式各跑一遍：
+  read_check_write  原写法：Python 里比较 current_participants 与名额 -> 扣费 -> 插报名 -> 人数 += 1
+  pipeline          报名接口：分片计数占位 + 候补（不排队）
+  pipeline_queue    报名接口 + 准入排队（每个活动同时 --queue 个请求进入报名流程）
+报名结束后 pipeline 两种模式再让 --cancels 名正式报名者取消，校验候补按顺序递补。
+
+校验：正式报名数 <= 名额、候补数 <= 候补名额；扣费会员数 == 正式报名数；
+回写后的 current_participants == 正式报名数。任一 pipeline 模式不满足时以非零状态退出
+（read_check_write 仅作对照，超员属预期）。
+延迟（毫秒）：p50 / p95 / p99 / max。
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, delete, func, select
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.models import Activity, ActivityRegistration, CoinRecord, CounterShard, Member
+from app.services import activity_enrollment, wallet_service
+from app.services.counter_service import counter_rollup
+from app.api.v1.member.home import cancel_enrollment, enroll_activity
+
+ACTIVITY_ID = 1
+PRICE = 10
+BALANCE = 100
+
+
+def percentile(values, pct: float) -> float:
+    """计算百分位（values 已排序）"""
+    if not values:
+        return 0.0
+    k = max(0, min(len(values) - 1, int(round(pct / 100 * (len(values) - 1)))))
+    return values[k]
+
+
+def reset(factory, members: int, seats: int, waitlist: int):
+    with factory() as db:
+        for model in (ActivityRegistration, CoinRecord, CounterShard):
+            db.execute(delete(model))
+        db.execute(delete(Activity).where(Activity.id == ACTIVITY_ID))
+        db.execute(delete(Member).where(Member.id <= members))
+        start = datetime.now() + timedelta(days=7)
+        db.add(Activity(id=ACTIVITY_ID, title="压测活动", start_time=start, end_time=start + timedelta(hours=2),
+                        max_participants=seats, waitlist_limit=waitlist, price=PRICE, status="published"))
+        db.add_all([
+            Member(id=i, nickname=f"bench{i}", phone=f"138{i:08d}", coin_balance=BALANCE, point_balance=0)
+            for i in range(1, members + 1)
+        ])
+        db.commit()
+    activity_enrollment.admission_queue.clear_full(ACTIVITY_ID)
+
+
+def read_check_write(db, member: Member):
+    """原写法（对照）：读出人数在 Python 里判断名额，再扣费、插报名、人数 += 1"""
+    activity = db.get(Activity, ACTIVITY_ID)
+    if activity.max_participants and (activity.current_participants or 0) >= activity.max_participants:
+        raise HTTPException(status_code=400, detail="报名名额已满")
+    try:
+        wallet_service.debit(db, member.id, wallet_service.COIN, PRICE, source="活动报名")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    db.add(ActivityRegistration(activity_id=ACTIVITY_ID, member_id=member.id, pay_amount=PRICE,
+                                status="registered"))
+    activity.current_participants = (activity.current_participants or 0) + 1
+    db.commit()
+
+
+def pipeline(db, member: Member):
+    enroll_activity(ACTIVITY_ID, db, member)
+
+
+def counts(factory) -> dict:
+    counter_rollup.flush()
+    with factory() as db:
+        statuses = dict(db.execute(
+            select(ActivityRegistration.status, func.count(ActivityRegistration.id))
+            .group_by(ActivityRegistration.status)
+        ).all())
+        paid = db.scalar(select(func.count(Member.id)).where(Member.coin_balance < BALANCE))
+        column = db.scalar(select(Activity.current_participants).where(Activity.id == ACTIVITY_ID))
+    return {
+        "registered": statuses.get("registered", 0),
+        "waitlisted": statuses.get("waitlisted", 0),
+        "cancelled": statuses.get("cancelled", 0),
+        "paid": paid,
+        "current_participants": column or 0,
+    }
+
+
+def cancel_some(factory, cancels: int) -> dict:
+    """前 cancels 名正式报名者取消，返回取消前后的计数"""
+    with factory() as db:
+        member_ids = db.scalars(
+            select(ActivityRegistration.member_id).where(ActivityRegistration.status == "registered")
+            .order_by(ActivityRegistration.id).limit(cancels)
+        ).all()
+    for member_id in member_ids:
+        with factory() as db:
+            cancel_enrollment(ACTIVITY_ID, db, db.get(Member, member_id))
+    return counts(factory)
+
+
+def run(name: str, factory, handler, args, queue: int = 0) -> dict:
+    reset(factory, args.members, args.seats, args.waitlist)
+    activity_enrollment.admission_queue.concurrency = queue
+    barrier = threading.Barrier(min(args.concurrency, args.members))
+    outcomes, latencies = {}, []
+    lock = threading.Lock()
+
+    def enroll(member_id: int):
+        if member_id <= barrier.parties:
+            barrier.wait()
+        start = time.perf_counter()
+        with factory() as db:
+            member = db.get(Member, member_id)
+            try:
+                handler(db, member)
+                outcome = "ok"
+            except HTTPException as e:
+                outcome = e.detail
+            except Exception as e:  # 原写法在 SQLite 上可能撞锁
+                outcome = type(e).__name__
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        list(pool.map(enroll, range(1, args.members + 1)))
+    wall = time.perf_counter() - start
+    activity_enrollment.admission_queue.concurrency = 0
+
+    after = counts(factory)
+    latencies.sort()
+    stats = {
+        "outcomes": outcomes,
+        **after,
+        "overfilled": max(0, after["registered"] - args.seats),
+        "consistent": (
+            after["registered"] <= args.seats
+            and after["waitlisted"] <= args.waitlist
+            and after["paid"] == after["registered"] == after["current_participants"]
+        ),
+        "wall_s": round(wall, 2),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "max_ms": round(latencies[-1], 1) if latencies else 0.0,
+        "mean_ms": round(statistics.mean(latencies), 1) if latencies else 0.0,
+    }
+    print(f"  {name:<17} registered={after['registered']:<4} waitlisted={after['waitlisted']:<4} "
+          f"overfilled={stats['overfilled']:<4} consistent={stats['consistent']}  "
+          f"p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms "
+          f"max={stats['max_ms']}ms  wall={stats['wall_s']}s")
+
+    if handler is pipeline and args.cancels:
+        promoted = min(args.cancels, after["waitlisted"])
+        final = cancel_some(factory, args.cancels)
+        stats["after_cancel"] = final
+        stats["promotion_ok"] = (
+            final["registered"] == after["registered"] - args.cancels + promoted
+            and final["waitlisted"] == after["waitlisted"] - promoted
+            and final["paid"] == final["registered"] == final["current_participants"]
+        )
+        print(f"  {'':<17} cancel {args.cancels} -> registered={final['registered']} "
+              f"waitlisted={final['waitlisted']} promotion_ok={stats['promotion_ok']}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="活动报名开放瞬间压测")
+    parser.add_argument("-n", "--members", type=int, default=1000, help="同时报名的会员数")
+    parser.add_argument("--seats", type=int, default=100, help="活动名额")
+    parser.add_argument("--waitlist", type=int, default=50, help="候补名额")
+    parser.add_argument("-c", "--concurrency", type=int, default=200, help="并发线程数")
+    parser.add_argument("--queue", type=int, default=8, help="pipeline_queue 模式每个活动同时进入报名流程的请求数")
+    parser.add_argument("--cancels", type=int, default=20, help="报名结束后取消的正式报名数（校验候补递补）")
+    parser.add_argument("--url", help="数据库 URL（默认临时 SQLite 文件库）")
+    parser.add_argument("--output", help="结果输出 JSON 路径")
+    args = parser.parse_args()
+
+    if args.url:
+        engine = create_engine(args.url, pool_size=min(args.concurrency, 100), max_overflow=0, pool_timeout=120)
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "enroll_bench.db")
+        engine = create_engine(f"sqlite:///{path}", pool_size=args.concurrency, max_overflow=0,
+                               connect_args={"check_same_thread": False, "timeout": 120})
+        Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+
+    print(f"活动报名压测  members={args.members} seats={args.seats} waitlist={args.waitlist} "
+          f"concurrency={args.concurrency} queue={args.queue} db={engine.dialect.name}")
+    results = {
+        "read_check_write": run("read_check_write", factory, read_check_write, args),
+        "pipeline": run("pipeline", factory, pipeline, args),
+        "pipeline_queue": run("pipeline_queue", factory, pipeline, args, queue=args.queue),
+    }
+    counter_rollup.shutdown()
+    engine.dispose()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"members": args.members, "seats": args.seats, "waitlist": args.waitlist,
+                       "concurrency": args.concurrency, "queue": args.queue, "results": results},
+                      f, ensure_ascii=False, indent=2)
+
+    pipelines = [results["pipeline"], results["pipeline_queue"]]
+    if any(not r["consistent"] or not r.get("promotion_ok", True) for r in pipelines):
+        sys.exit("出现超员或计数不一致")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""热点业务链路基准：在 seed_data.py 生成的数据上并发驱动预约、日历、闸机、订单、排行榜、看板/财务接口
+
+用法：
+  1. 生成数据：DATABASE_URL=... python benchmarks/seed_data.py
+  2. 进程内压测（httpx ASGITransport 直连 app，可统计每请求 SQL 条数）：
+       DATABASE_URL=... python benchmarks/hot_paths.py --output baseline.json
+     优化后再跑一次并对比：
+       DATABASE_URL=... python benchmarks/hot_paths.py --output after.json --compare baseline.json
+  3. 也可压测已启动的服务（多 worker 真实部署形态，此时不统计 SQL 条数）：
+       DATABASE_URL=... python benchmarks/hot_paths.py --base-url http://127.0.0.1:8000
+
+说明：
+  - 会员/管理员 Token 按 SECRET_KEY 直接签发，远程压测时需与服务端配置一致
+  - create_reservation / gate_checkin 会写入数据，建议每轮对比前重新生成数据库
+  - create_reservation 按字符串写入 Date/Time 列，仅 MySQL 可用；SQLite 冒烟时该项会记为 5xx
+  - 每个场景单独统计 p50/p95/p99、吞吐、状态码分布（业务错误码记为 200/<code>）和每请求 SQL 条数
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import date, timedelta
+from typing import Callable, Dict, List, Optional
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from load_test import percentile
+
+API = "/api/v1"
+# 写接口放在最后，避免影响读接口的数据分布
+DEFAULT_SCENARIOS = [
+    "venue_calendar", "member_orders", "leaderboard",
+    "dashboard_stats", "dashboard_trend", "finance_overview", "finance_trend",
+    "gate_checkin", "create_reservation",
+]
+SIZE_TABLES = ["member", "reservation", "gate_check_record", "leaderboard", "recharge_order", "consume_record"]
+
+
+class QueryCounter:
+    """统计同步/异步引擎发出的 SQL 条数（进程内压测时挂到 before_cursor_execute）"""
+
+    def __init__(self):
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, *args, **kwargs):
+        with self._lock:
+            self.count += 1
+
+    def attach(self, *engines):
+        from sqlalchemy import event
+        for eng in engines:
+            event.listen(eng, "before_cursor_execute", self)
+
+
+class BenchContext:
+    """压测账号与场馆：从库中按 seed_data.py 的固定前缀查出，并签发 Token"""
+
+    def __init__(self, max_members: int):
+        from sqlalchemy import func, select, text
+        from app.core.database import engine
+        from app.core.security import create_access_token
+        from app.models import Member, MemberLevel, Venue, SysUser
+        from seed_data import BENCH_ADMIN_USERNAME, BENCH_GATE_PREFIX, BENCH_PHONE_PREFIX
+
+        with engine.connect() as conn:
+            admin_id = conn.execute(
+                select(SysUser.id).where(SysUser.username == BENCH_ADMIN_USERNAME)
+            ).scalar()
+            if admin_id is None:
+                raise SystemExit("未找到压测数据，请先运行 benchmarks/seed_data.py")
+
+            self.bookers = list(conn.execute(
+                select(Member.id).join(MemberLevel, Member.level_id == MemberLevel.id).where(
+                    Member.phone.like(f"{BENCH_PHONE_PREFIX}%"), MemberLevel.level_code == "SSS"
+                ).order_by(Member.id).limit(max_members)
+            ).scalars())
+            self.members = list(conn.execute(
+                select(Member.id).where(Member.phone.like(f"{BENCH_PHONE_PREFIX}%"))
+                .order_by(Member.id).limit(max_members)
+            ).scalars())
+            venues = conn.execute(
+                select(Venue.id, Venue.type_id, Venue.gate_id).where(Venue.gate_id.like(f"{BENCH_GATE_PREFIX}%"))
+            ).all()
+            self.venue_ids = [v.id for v in venues]
+            self.type_ids = sorted({v.type_id for v in venues})
+            self.gate_ids = [v.gate_id for v in venues]
+
+            self.sizes = {}
+            for table in SIZE_TABLES:
+                self.sizes[table] = conn.execute(text(f"SELECT COUNT(*) FROM {table}")).scalar()
+            self.dialect = engine.dialect.name
+
+        self.admin_headers = {"Authorization": f"Bearer {create_access_token({'sub': str(admin_id)})}"}
+        self.member_headers = {
+            member_id: {"Authorization": f"Bearer {create_access_token({'member_id': member_id})}"}
+            for member_id in set(self.bookers) | set(self.members)
+        }
+
+
+# ==================== 场景：每次调用返回一个请求 (method, path, kwargs) ====================
+# worker 为并发协程编号，i 为该协程内的请求序号，seq 为全局序号
+
+def scenario_venue_calendar(ctx: BenchContext, worker: int, i: int, seq: int):
+    day = date.today() + timedelta(days=seq % 4)
+    return "GET", f"{API}/member/venue-calendar", {
+        "params": {"type_id": ctx.type_ids[seq % len(ctx.type_ids)], "date": day.isoformat()}
+    }
+
+
+def scenario_member_orders(ctx: BenchContext, worker: int, i: int, seq: int):
+    member_id = ctx.members[seq % len(ctx.members)]
+    return "GET", f"{API}/member/orders", {
+        "params": {"page": 1 + (seq // len(ctx.members)) % 3, "limit": 10},
+        "headers": ctx.member_headers[member_id],
+    }
+
+
+def scenario_leaderboard(ctx: BenchContext, worker: int, i: int, seq: int):
+    member_id = ctx.members[seq % len(ctx.members)]
+    params = {"period": ("daily", "weekly", "monthly")[seq % 3]}
+    if seq % 2:
+        params["venue_type_id"] = ctx.type_ids[seq % len(ctx.type_ids)]
+    return "GET", f"{API}/member/leaderboard", {"params": params, "headers": ctx.member_headers[member_id]}
+
+
+def scenario_dashboard_stats(ctx: BenchContext, worker: int, i: int, seq: int):
+    return "GET", f"{API}/dashboard/stats", {"headers": ctx.admin_headers}
+
+
+def scenario_dashboard_trend(ctx: BenchContext, worker: int, i: int, seq: int):
+    return "GET", f"{API}/dashboard/trend", {"headers": ctx.admin_headers}
+
+
+def scenario_finance_overview(ctx: BenchContext, worker: int, i: int, seq: int):
+    return "GET", f"{API}/finance/overview", {"headers": ctx.admin_headers}
+
+
+def scenario_finance_trend(ctx: BenchContext, worker: int, i: int, seq: int):
+    return "GET", f"{API}/finance/trend", {"params": {"days": 30}, "headers": ctx.admin_headers}
+
+
+def scenario_gate_checkin(ctx: BenchContext, worker: int, i: int, seq: int):
+    """每个协程轮流让自己负责的会员入场、出场，保证同一会员的 in 先于 out"""
+    slot = worker + (i // 2) * 1000
+    member_id = ctx.members[slot % len(ctx.members)]
+    return "POST", f"{API}/gate/checkin", {"json": {
+        "gate_id": ctx.gate_ids[slot % len(ctx.gate_ids)],
+        "member_card_no": str(member_id),
+        "check_type": "in" if i % 2 == 0 else "out",
+    }}
+
+
+def scenario_create_reservation(ctx: BenchContext, worker: int, i: int, seq: int):
+    """SSS 会员在未来 1-3 天内按序占用不同场馆/时段，金币支付"""
+    member_id = ctx.bookers[seq % len(ctx.bookers)]
+    rnd = seq // len(ctx.bookers)
+    hour = 8 + rnd % 13
+    day = date.today() + timedelta(days=1 + (rnd // 13) % 3)
+    return "POST", f"{API}/member/reservations", {
+        "json": {
+            "venue_id": ctx.venue_ids[seq % len(ctx.venue_ids)],
+            "reservation_date": day.isoformat(),
+            "start_time": f"{hour:02d}:00",
+            "end_time": f"{hour + 1:02d}:00",
+            "duration": 60,
+            "pay_type": "coin",
+        },
+        "headers": ctx.member_headers[member_id],
+    }
+
+
+SCENARIOS: Dict[str, Callable] = {
+    name: globals()[f"scenario_{name}"] for name in DEFAULT_SCENARIOS
+}
+
+
+def status_key(resp: httpx.Response) -> str:
+    """HTTP 状态码；200 但业务 code 非 200 时记为 200/<code>"""
+    if resp.status_code == 200 and resp.headers.get("content-type", "").startswith("application/json"):
+        try:
+            code = resp.json().get("code", 200)
+        except ValueError:
+            code = 200
+        if code != 200:
+            return f"200/{code}"
+    return str(resp.status_code)
+
+
+async def run_scenario(client: httpx.AsyncClient, ctx: BenchContext, name: str, concurrency: int,
+                       duration: float, warmup: int, counter: Optional[QueryCounter]) -> Dict:
+    """以固定并发驱动单个场景 duration 秒"""
+    build = SCENARIOS[name]
+    seq = 0
+
+    async def send(worker: int, i: int) -> httpx.Response:
+        nonlocal seq
+        seq += 1
+        method, path, kwargs = build(ctx, worker, i, seq)
+        return await client.request(method, path, **kwargs)
+
+    # 预热（建连接池、填充进程内缓存），不计入统计
+    for i in range(warmup):
+        await send(concurrency + i, 0)
+
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    queries_before = counter.count if counter else 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(worker_id: int):
+        i = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                resp = await send(worker_id, i)
+                statuses[status_key(resp)] += 1
+            except httpx.HTTPError as exc:
+                statuses[type(exc).__name__] += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+            i += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(w) for w in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    requests = len(latencies)
+    return {
+        "requests": requests,
+        "rps": round(requests / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0,
+        "status": dict(statuses),
+        "queries_per_request": (
+            round((counter.count - queries_before) / requests, 2) if counter and requests else None
+        ),
+    }
+
+
+async def main_async(args) -> Dict:
+    ctx = BenchContext(args.max_members)
+    counter = None
+
+    if args.base_url:
+        transport = None
+        base_url = args.base_url
+    else:
+        from app.core.database import engine, get_async_engine
+        from app.main import app
+        counter = QueryCounter()
+        counter.attach(engine, get_async_engine().sync_engine)
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        base_url = "http://bench"
+
+    print(f"数据规模: {ctx.sizes}")
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, transport=transport, timeout=60, limits=limits) as client:
+        for name in args.only or DEFAULT_SCENARIOS:
+            stats = await run_scenario(client, ctx, name, args.concurrency, args.duration, args.warmup, counter)
+            results[name] = stats
+            qpr = stats["queries_per_request"]
+            print(f"  {name:<20} {stats['rps']:>8} req/s  p50={stats['p50_ms']}ms "
+                  f"p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms  "
+                  f"sql/req={qpr if qpr is not None else '-'}  {stats['status']}")
+
+    return {
+        "target": args.base_url or "in-process",
+        "dialect": ctx.dialect,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "sizes": ctx.sizes,
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline_path: str):
+    """与基线 JSON 对比吞吐、p95/p99 与每请求 SQL 条数"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    if baseline.get("sizes") != current.get("sizes"):
+        print("\n注意：两次压测的数据规模不同，对比结果仅供参考")
+    print(f"\n对比基线 {baseline_path}:")
+    for name, stats in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base.get("rps"):
+            continue
+        line = (f"  {name:<20} 吞吐 x{stats['rps'] / base['rps']:.2f}  "
+                f"p95 {base['p95_ms']}ms -> {stats['p95_ms']}ms  "
+                f"p99 {base['p99_ms']}ms -> {stats['p99_ms']}ms")
+        if base.get("queries_per_request") is not None and stats.get("queries_per_request") is not None:
+            line += f"  sql/req {base['queries_per_request']} -> {stats['queries_per_request']}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="热点业务链路基准")
+    parser.add_argument("--base-url", help="压测已启动的服务；不传则进程内压测并统计 SQL 条数")
+    parser.add_argument("--concurrency", type=int, default=50, help="并发数")
+    parser.add_argument("--duration", type=float, default=15, help="每个场景压测秒数")
+    parser.add_argument("--warmup", type=int, default=20, help="每个场景预热请求数")
+    parser.add_argument("--max-members", type=int, default=2000, help="参与压测的会员数（签发 Token）")
+    parser.add_argument("--only", nargs="*", choices=DEFAULT_SCENARIOS, help="只运行指定场景")
+    parser.add_argument("--output", help="结果输出 JSON 路径")
+    parser.add_argument("--compare", help="基线 JSON 路径")
+    args = parser.parse_args()
+
+    print(f"热点链路压测  并发={args.concurrency}  时长={args.duration}s/场景")
+    report = asyncio.run(main_async(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""导入耗时剖析：在全新解释器中以 -X importtime 导入应用，汇总各模块/顶层包耗时
+
+用法：
+  python benchmarks/import_profile.py                        # 导入 app.main，打印耗时最多的模块
+  python benchmarks/import_profile.py -n 5 --top 30          # 5 轮取中位数
+  python benchmarks/import_profile.py --output benchmarks/importtime_baseline.json
+  python benchmarks/import_profile.py --compare benchmarks/importtime_baseline.json
+      # 与基线对比；总耗时超过基线 --tolerance 倍，或导入了 HEAVY_MODULES 中的库时退出码为 1
+
+指标（毫秒）：
+  total_ms    导入目标模块的累计耗时
+  packages    按顶层包汇总的自身耗时（app.* 按二级模块拆开，便于定位具体路由/服务）
+  modules     自身耗时最多的模块
+"""
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+
+# 只在具体业务调用时才需要的重量级依赖，不应出现在应用启动的导入链中
+HEAVY_MODULES = ("httpx", "requests", "Crypto", "PIL", "qrcode", "alembic")
+
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+
+
+def run_once(target: str) -> list:
+    """返回 [(模块名, 自身微秒, 累计微秒, 层级)]"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {target}"],
+        cwd=BACKEND_DIR, capture_output=True, text=True, timeout=300,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"导入 {target} 失败:\n{result.stderr[-2000:]}")
+    rows = []
+    for line in result.stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            self_us, cumulative_us, indent, name = m.groups()
+            rows.append((name, int(self_us), int(cumulative_us), len(indent) // 2))
+    return rows
+
+
+def package_of(name: str) -> str:
+    parts = name.split(".")
+    return ".".join(parts[:3]) if parts[0] == "app" else parts[0]
+
+
+def profile(rows: list, target: str) -> dict:
+    total = next((cum for name, _, cum, _ in reversed(rows) if name == target), 0)
+    packages = defaultdict(int)
+    for name, self_us, _, _ in rows:
+        packages[package_of(name)] += self_us
+    imported = {name.split(".")[0] for name, _, _, _ in rows}
+    return {
+        "total_ms": round(total / 1000, 1),
+        "packages": {k: round(v / 1000, 1) for k, v in packages.items()},
+        "modules": {name: round(self_us / 1000, 1) for name, self_us, _, _ in rows},
+        "heavy": sorted(m for m in HEAVY_MODULES if m in imported),
+    }
+
+
+def merge(runs: list, top: int) -> dict:
+    """多轮取中位数，模块/包只保留耗时最多的 top 项"""
+    def median_map(key):
+        names = set().union(*(r[key] for r in runs))
+        values = {n: round(statistics.median(r[key].get(n, 0) for r in runs), 1) for n in names}
+        return dict(sorted(values.items(), key=lambda kv: -kv[1])[:top])
+
+    return {
+        "total_ms": round(statistics.median(r["total_ms"] for r in runs), 1),
+        "packages": median_map("packages"),
+        "modules": median_map("modules"),
+        "heavy": sorted(set().union(*(r["heavy"] for r in runs))),
+    }
+
+
+def report(summary: dict, target: str):
+    print(f"import {target}: {summary['total_ms']}ms")
+    print("\n按包（自身耗时）:")
+    for name, ms in summary["packages"].items():
+        print(f"  {ms:>8.1f}ms  {name}")
+    print("\n按模块（自身耗时）:")
+    for name, ms in summary["modules"].items():
+        print(f"  {ms:>8.1f}ms  {name}")
+    if summary["heavy"]:
+        print(f"\n启动时导入了重量级依赖: {', '.join(summary['heavy'])}")
+
+
+def compare(summary: dict, baseline_path: str, tolerance: float) -> bool:
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)["summary"]
+    ok = True
+    base = baseline["total_ms"]
+    print(f"\n对比基线 {baseline_path}:")
+    print(f"  total_ms  {base}ms -> {summary['total_ms']}ms  x{base / summary['total_ms']:.2f}")
+    if summary["total_ms"] > base * tolerance:
+        print(f"  总耗时超过基线 {tolerance} 倍")
+        ok = False
+    new_heavy = set(summary["heavy"]) - set(baseline.get("heavy", []))
+    if new_heavy:
+        print(f"  新增重量级依赖: {', '.join(sorted(new_heavy))}")
+        ok = False
+    for name, ms in summary["packages"].items():
+        before = baseline["packages"].get(name, 0)
+        if ms > before * tolerance and ms - before > 20:
+            print(f"  {name}: {before}ms -> {ms}ms")
+    return ok
+
+
+def main():
+    parser = argparse.ArgumentParser(description="应用导入耗时剖析")
+    parser.add_argument("--target", default="app.main", help="导入的模块")
+    parser.add_argument("-n", type=int, default=3, help="轮数（每轮一个新进程）")
+    parser.add_argument("--top", type=int, default=25, help="输出耗时最多的前 N 项")
+    parser.add_argument("--output", help="结果输出 JSON 路径")
+    parser.add_argument("--compare", help="基线 JSON 路径")
+    parser.add_argument("--tolerance", type=float, default=1.5, help="相对基线允许的倍数")
+    args = parser.parse_args()
+
+    runs = [profile(run_once(args.target), args.target) for _ in range(args.n)]
+    summary = merge(runs, args.top)
+    report(summary, args.target)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"target": args.target, "python": sys.version.split()[0], "summary": summary},
+                      f, ensure_ascii=False, indent=2)
+    if args.compare and not compare(summary, args.compare, args.tolerance):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
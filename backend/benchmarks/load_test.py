@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""会员端热点接口压测脚本（对比线程池同步路径与异步会话路径的吞吐）
+
+用法：
+  1. 在同一台机器、相同 worker 数下分别启动两个版本的服务，例如
+       uvicorn app.main:app --workers 2 --port 8000   # 同步线程池版本（旧提交）
+       uvicorn app.main:app --workers 2 --port 8001   # 异步会话版本
+  2. 分别压测并输出 JSON：
+       python benchmarks/load_test.py --base-url http://127.0.0.1:8000 --output sync.json
+       python benchmarks/load_test.py --base-url http://127.0.0.1:8001 --output async.json \\
+           --compare sync.json
+  需要登录的接口（orders/profile）通过 --token 传入会员 Token，未传时自动跳过。
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+from typing import Dict, List, Optional
+
+import httpx
+
+
+def default_endpoints(venue_id: int, type_id: int, target_date: str) -> List[Dict]:
+    """默认压测的会员端热点读接口"""
+    return [
+        {"name": "venues", "path": "/api/v1/member/venues", "params": {"type_id": type_id}},
+        {"name": "venue_detail", "path": f"/api/v1/member/venues/{venue_id}"},
+        {"name": "venue_slots", "path": f"/api/v1/member/venues/{venue_id}/slots", "params": {"date": target_date}},
+        {"name": "venue_calendar", "path": "/api/v1/member/venue-calendar",
+         "params": {"type_id": type_id, "date": target_date}},
+        {"name": "activities", "path": "/api/v1/member/activities"},
+        {"name": "orders", "path": "/api/v1/member/orders", "auth": True},
+        {"name": "profile", "path": "/api/v1/member/profile", "auth": True},
+    ]
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """计算百分位（values 已排序）"""
+    if not values:
+        return 0.0
+    k = max(0, min(len(values) - 1, int(round(pct / 100 * (len(values) - 1)))))
+    return values[k]
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient,
+    endpoint: Dict,
+    concurrency: int,
+    duration: float,
+    headers: Dict,
+) -> Dict:
+    """以固定并发对单个接口施压 duration 秒，返回延迟分布与吞吐"""
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker():
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                resp = await client.get(endpoint["path"], params=endpoint.get("params"), headers=headers)
+                if resp.status_code >= 400:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": round(len(latencies) / elapsed, 1) if elapsed else 0,
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "mean_ms": round(statistics.fmean(latencies), 2) if latencies else 0,
+    }
+
+
+async def main_async(args) -> Dict:
+    target_date = args.date or (date.today() + timedelta(days=1)).isoformat()
+    headers = {"Authorization": f"Bearer {args.token}"} if args.token else {}
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+    results = {}
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=30, limits=limits) as client:
+        for endpoint in default_endpoints(args.venue_id, args.type_id, target_date):
+            if args.only and endpoint["name"] not in args.only:
+                continue
+            if endpoint.get("auth") and not args.token:
+                print(f"  跳过 {endpoint['name']}（未提供 --token）")
+                continue
+            stats = await run_endpoint(client, endpoint, args.concurrency, args.duration, headers)
+            results[endpoint["name"]] = stats
+            print(f"  {endpoint['name']:<16} {stats['rps']:>8} req/s  "
+                  f"p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms "
+                  f"errors={stats['errors']}")
+
+    return {
+        "base_url": args.base_url,
+        "concurrency": args.concurrency,
+        "duration": args.duration,
+        "results": results,
+    }
+
+
+def compare(current: Dict, baseline_path: str):
+    """与基线 JSON 对比吞吐和 p95"""
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\n对比基线 {baseline_path}:")
+    for name, stats in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base or not base.get("rps"):
+            continue
+        ratio = stats["rps"] / base["rps"]
+        print(f"  {name:<16} 吞吐 x{ratio:.2f}  p95 {base['p95_ms']}ms -> {stats['p95_ms']}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="会员端热点接口压测")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, default=100, help="并发连接数")
+    parser.add_argument("--duration", type=float, default=15, help="每个接口压测秒数")
+    parser.add_argument("--venue-id", type=int, default=1)
+    parser.add_argument("--type-id", type=int, default=1)
+    parser.add_argument("--date", help="slots/calendar 查询日期，默认明天")
+    parser.add_argument("--token", default=os.environ.get("MEMBER_TOKEN"), help="会员 Token")
+    parser.add_argument("--only", nargs="*", help="只压测指定接口名")
+    parser.add_argument("--output", help="结果输出 JSON 路径")
+    parser.add_argument("--compare", help="基线 JSON 路径")
+    args = parser.parse_args()
+
+    print(f"压测 {args.base_url}  并发={args.concurrency}  时长={args.duration}s/接口")
+    report = asyncio.run(main_async(args))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
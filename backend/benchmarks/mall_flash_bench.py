@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""积分商城秒杀压测：大量并发兑换抢少量库存，校验不超卖并统计延迟
+
+用法：
+  python benchmarks/mall_flash_bench.py                        # 临时 SQLite 文件库，1000 次兑换抢 100 件
+  python benchmarks/mall_flash_bench.py -n 1000 --stock 100 -c 200
+  python benchmarks/mall_flash_bench.py --url mysql+pymysql://u:p@127.0.0.1/bench   # 需已建表（会清空商城相关表）
+  python benchmarks/mall_flash_bench.py --output flash.json
+
+直接调用兑换接口函数（不经 HTTP），每次兑换一个独立会话、一个独立会员。两种模式各跑一遍：
+  conditional  普通商品：UPDATE product SET stock = stock - 1 WHERE stock >= 1
+  flash_sale   秒杀商品：进程内令牌池（MALL_FLASH_SALE_BATCH 批量预分配，已售异步回写）
+
+校验：成功兑换数 == 订单数 <= 库存；结束归还令牌后 stock + sales == 初始库存；会员积分扣减数 == 成功数。
+延迟（毫秒）：p50 / p95 / p99 / max。任一模式超卖或库存不守恒时以非零状态退出。
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, delete, func, select
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.models import Member, PointRecord, Product, ProductOrder, MemberProductPurchase
+from app.services.mall_inventory import flash_sale_pool
+from app.api.v1.member.mall import MallExchangeRequest, exchange_mall_goods
+
+PRODUCT_ID = 1
+POINTS = 10
+
+
+def percentile(values, pct: float) -> float:
+    """计算百分位（values 已排序）"""
+    if not values:
+        return 0.0
+    k = max(0, min(len(values) - 1, int(round(pct / 100 * (len(values) - 1)))))
+    return values[k]
+
+
+def reset(factory, members: int, stock: int, flash: bool):
+    with factory() as db:
+        for model in (ProductOrder, PointRecord, MemberProductPurchase):
+            db.execute(delete(model))
+        db.execute(delete(Product).where(Product.id == PRODUCT_ID))
+        db.execute(delete(Member).where(Member.id <= members))
+        db.add(Product(id=PRODUCT_ID, category_id=1, name="秒杀商品", points=POINTS, price=0,
+                       stock=stock, sales=0, is_flash_sale=flash, purchase_limit=1))
+        db.add_all([
+            Member(id=i, nickname=f"bench{i}", phone=f"139{i:08d}", point_balance=POINTS, coin_balance=0)
+            for i in range(1, members + 1)
+        ])
+        db.commit()
+
+
+def run(name: str, factory, requests: int, stock: int, concurrency: int, flash: bool) -> dict:
+    reset(factory, requests, stock, flash)
+    barrier = threading.Barrier(min(concurrency, requests))
+    outcomes, latencies = {}, []
+    lock = threading.Lock()
+
+    def exchange(member_id: int):
+        if member_id <= barrier.parties:
+            barrier.wait()
+        start = time.perf_counter()
+        with factory() as db:
+            member = db.get(Member, member_id)
+            try:
+                exchange_mall_goods(PRODUCT_ID, MallExchangeRequest(), db, member)
+                outcome = "ok"
+            except HTTPException as e:
+                outcome = e.detail
+        elapsed = (time.perf_counter() - start) * 1000
+        with lock:
+            outcomes[outcome] = outcomes.get(outcome, 0) + 1
+            latencies.append(elapsed)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(exchange, range(1, requests + 1)))
+    wall = time.perf_counter() - start
+    flash_sale_pool.shutdown()
+
+    with factory() as db:
+        product_stock, sales = db.execute(
+            select(Product.stock, Product.sales).where(Product.id == PRODUCT_ID)
+        ).one()
+        orders = db.scalar(select(func.count(ProductOrder.id)))
+        spent = db.scalar(select(func.count(Member.id)).where(Member.id <= requests, Member.point_balance < POINTS))
+
+    ok = outcomes.get("ok", 0)
+    latencies.sort()
+    stats = {
+        "outcomes": outcomes,
+        "orders": orders,
+        "oversold": max(0, orders - stock),
+        "stock_conserved": product_stock + sales == stock and sales == orders == ok == spent,
+        "wall_s": round(wall, 2),
+        "p50_ms": round(percentile(latencies, 50), 1),
+        "p95_ms": round(percentile(latencies, 95), 1),
+        "p99_ms": round(percentile(latencies, 99), 1),
+        "max_ms": round(latencies[-1], 1) if latencies else 0.0,
+        "mean_ms": round(statistics.mean(latencies), 1) if latencies else 0.0,
+    }
+    print(f"  {name:<12} ok={ok:<4} orders={orders:<4} oversold={stats['oversold']} "
+          f"conserved={stats['stock_conserved']}  p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms "
+          f"p99={stats['p99_ms']}ms max={stats['max_ms']}ms  wall={stats['wall_s']}s")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="积分商城秒杀压测")
+    parser.add_argument("-n", "--requests", type=int, default=1000, help="兑换请求数（每个请求一个会员）")
+    parser.add_argument("--stock", type=int, default=100, help="商品库存")
+    parser.add_argument("-c", "--concurrency", type=int, default=1000, help="并发线程数")
+    parser.add_argument("--url", help="数据库 URL（默认临时 SQLite 文件库）")
+    parser.add_argument("--output", help="结果输出 JSON 路径")
+    args = parser.parse_args()
+
+    if args.url:
+        engine = create_engine(args.url, pool_size=min(args.concurrency, 100), max_overflow=0, pool_timeout=120)
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "mall_flash_bench.db")
+        engine = create_engine(f"sqlite:///{path}", pool_size=args.concurrency, max_overflow=0,
+                               connect_args={"check_same_thread": False, "timeout": 120})
+        Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+
+    print(f"积分商城秒杀压测  requests={args.requests} stock={args.stock} "
+          f"concurrency={args.concurrency} db={engine.dialect.name}")
+    results = {
+        "conditional": run("conditional", factory, args.requests, args.stock, args.concurrency, flash=False),
+        "flash_sale": run("flash_sale", factory, args.requests, args.stock, args.concurrency, flash=True),
+    }
+    engine.dispose()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"requests": args.requests, "stock": args.stock, "concurrency": args.concurrency,
+                       "results": results}, f, ensure_ascii=False, indent=2)
+
+    if any(r["oversold"] or not r["stock_conserved"] for r in results.values()):
+        sys.exit("出现超卖或库存不守恒")
+
+
+if __name__ == "__main__":
+    main()
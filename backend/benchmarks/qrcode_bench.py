@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""核销二维码生成吞吐基准（缓存前后对比）
+
+用法：
+  python benchmarks/qrcode_bench.py                 # 默认 2000 个预约号
+  python benchmarks/qrcode_bench.py -n 500 --output qrcode.json
+
+对比项：
+  baseline        原实现：每次 qrcode.make + PNG + base64
+  data_uri_cold   缓存未命中（首次生成）
+  data_uri_warm   缓存命中（订单详情重复打开）
+  svg_cold        紧凑 SVG 首次生成
+  svg_warm        紧凑 SVG 缓存命中
+"""
+import argparse
+import base64
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import qrcode
+
+from app.services import qrcode_cache
+from app.services.qrcode_cache import LRUCache, get_qrcode, verify_payload
+
+
+def baseline(payload: str) -> str:
+    qr = qrcode.make(payload)
+    buf = io.BytesIO()
+    qr.save(buf, format='PNG')
+    return "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode()
+
+
+def measure(name: str, func, payloads) -> dict:
+    start = time.perf_counter()
+    total_bytes = 0
+    for payload in payloads:
+        total_bytes += len(func(payload))
+    elapsed = time.perf_counter() - start
+    stats = {
+        "ops": len(payloads),
+        "ops_per_sec": round(len(payloads) / elapsed, 1),
+        "mean_us": round(elapsed / len(payloads) * 1e6, 1),
+        "avg_bytes": round(total_bytes / len(payloads)),
+    }
+    print(f"  {name:<15} {stats['ops_per_sec']:>12} ops/s  {stats['mean_us']:>10} us/op  "
+          f"{stats['avg_bytes']:>6} B")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="核销二维码生成吞吐基准")
+    parser.add_argument("-n", type=int, default=2000, help="预约号数量")
+    parser.add_argument("--output", help="结果输出 JSON 路径")
+    args = parser.parse_args()
+
+    payloads = [verify_payload(f"R2026{i:010d}") for i in range(args.n)]
+    qrcode_cache._cache = LRUCache(args.n * 2)
+
+    print(f"二维码生成基准  n={args.n}")
+    results = {
+        "baseline": measure("baseline", baseline, payloads),
+        "data_uri_cold": measure("data_uri_cold", lambda p: get_qrcode(p, "data_uri"), payloads),
+        "data_uri_warm": measure("data_uri_warm", lambda p: get_qrcode(p, "data_uri"), payloads),
+        "svg_cold": measure("svg_cold", lambda p: get_qrcode(p, "svg"), payloads),
+        "svg_warm": measure("svg_warm", lambda p: get_qrcode(p, "svg"), payloads),
+    }
+    speedup = results["data_uri_warm"]["ops_per_sec"] / results["baseline"]["ops_per_sec"]
+    print(f"\n缓存命中吞吐为原实现的 {speedup:.0f} 倍")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"n": args.n, "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+"""大响应体端到端延迟基准：默认 JSONResponse vs orjson 默认响应类 vs 预编码统一响应
+
+用法：
+  python benchmarks/response_bench.py                       # 每个场景 200 次请求
+  python benchmarks/response_bench.py -n 500 --output response.json
+
+场景（数据形态与线上最大的几类响应一致，不依赖数据库）：
+  venue_calendar  20 个场馆 x 18 个时段
+  member_orders   2000 条订单
+  leaderboard     5000 条排行
+  ui_config       40 页 / 800 区块的 UI 快照
+
+响应路径：
+  model     response_model=ResponseModel + 标准库 JSONResponse（改造前）
+  orjson    response_model=ResponseModel + FastJSONResponse（默认响应类，无需改接口）
+  envelope  json_response(data)：跳过 response_model 校验与 jsonable_encoder
+  bytes     json_response(已编码的 data)：缓存型接口直接拼接预编码片段
+经 httpx ASGITransport 走完整 ASGI 链路，统计 p50/p95（毫秒），并校验各路径响应内容一致。
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import httpx
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+
+from app.core.responses import FastJSONResponse, dumps, json_response
+from app.schemas.common import ResponseModel
+from load_test import percentile
+
+MODES = ["model", "orjson", "envelope", "bytes"]
+
+
+# ==================== 样本数据 ====================
+
+def venue_calendar():
+    return {
+        "venues": [{
+            "id": i, "name": f"网球{i}号场", "price": 120.0,
+            "slots": [{"hour": h, "status": ("reserved", "available", "past")[(i + h) % 3]} for h in range(6, 24)],
+        } for i in range(1, 21)],
+        "time_slots": [{"hour": h, "time": f"{h:02d}:00", "label": f"{h:02d}:00"} for h in range(6, 24)],
+    }
+
+
+def member_orders():
+    now = datetime(2026, 6, 1, 12, 0)
+    return [{
+        "id": i, "order_no": f"R{i:012d}", "type": "reservation", "title": f"网球{i % 20}号场",
+        "image": f"/uploads/blobs/{i % 256:02x}/{i:032x}_thumb.jpg",
+        "amount": Decimal("120.00"), "total_price": Decimal("120.00"), "status": "confirmed",
+        "pay_type": "coin", "created_at": now - timedelta(minutes=i), "detail": "2026-06-01 09:00-10:00",
+    } for i in range(1, 2001)]
+
+
+def leaderboard():
+    return {"period": "weekly", "my_rank": 18, "items": [{
+        "rank": i, "member_id": i, "nickname": f"会员{i}", "avatar": f"/uploads/avatar/{i}.png",
+        "level_name": "SS级会员", "total_duration": 100000 - i, "check_count": 40,
+    } for i in range(1, 5001)]}
+
+
+def ui_config():
+    pages = [{"page_code": f"page_{p}", "page_name": f"页面{p}", "config": {"background": "#ffffff"}}
+             for p in range(40)]
+    blocks = [{
+        "id": b, "page_code": f"page_{b % 40}", "block_type": "banner", "sort": b,
+        "config": {"title": f"区块{b}", "images": [f"/uploads/ui/{b}_{k}.png" for k in range(3)],
+                   "style": {"margin": [8, 12, 8, 12], "radius": 8}},
+    } for b in range(800)]
+    return {"pages": pages, "blocks": blocks, "menuItems": [], "tabBar": [], "version": 12,
+            "publishedAt": "2026-06-01 12:00:00"}
+
+
+SCENARIOS = {
+    "venue_calendar": venue_calendar,
+    "member_orders": member_orders,
+    "leaderboard": leaderboard,
+    "ui_config": ui_config,
+}
+
+
+# ==================== 应用 ====================
+
+def add_routes(app: FastAPI, name: str, data):
+    encoded = dumps(data)
+
+    @app.get(f"/model/{name}", response_model=ResponseModel)
+    def model_endpoint():
+        return ResponseModel(data=data)
+
+    @app.get(f"/envelope/{name}", response_model=ResponseModel)
+    def envelope_endpoint():
+        return json_response(data)
+
+    @app.get(f"/bytes/{name}", response_model=ResponseModel)
+    def bytes_endpoint():
+        return json_response(encoded)
+
+
+def build_app(response_class) -> FastAPI:
+    app = FastAPI(default_response_class=response_class)
+    for name, factory in SCENARIOS.items():
+        add_routes(app, name, factory())
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, n: int):
+    latencies = []
+    body = b""
+    for _ in range(n):
+        start = time.perf_counter()
+        response = await client.get(path)
+        latencies.append((time.perf_counter() - start) * 1000)
+        body = response.content
+    latencies.sort()
+    return {"p50": round(percentile(latencies, 50), 2), "p95": round(percentile(latencies, 95), 2),
+            "bytes": len(body)}, body
+
+
+async def run(n: int) -> dict:
+    apps = {"stdlib": build_app(JSONResponse), "orjson": build_app(FastJSONResponse)}
+    routes = {"model": ("stdlib", "model"), "orjson": ("orjson", "model"),
+              "envelope": ("orjson", "envelope"), "bytes": ("orjson", "bytes")}
+    clients = {key: httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench")
+               for key, app in apps.items()}
+    results = {}
+    try:
+        for name in SCENARIOS:
+            results[name], bodies = {}, {}
+            for mode in MODES:
+                app_key, prefix = routes[mode]
+                path = f"/{prefix}/{name}"
+                await clients[app_key].get(path)  # 预热
+                results[name][mode], bodies[mode] = await measure(clients[app_key], path, n)
+            expected = json.loads(bodies["model"])
+            for mode in MODES[1:]:
+                if json.loads(bodies[mode]) != expected:
+                    raise SystemExit(f"{name}: {mode} 响应内容与 ResponseModel 默认路径不一致")
+    finally:
+        for client in clients.values():
+            await client.aclose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="大响应体端到端延迟基准")
+    parser.add_argument("-n", type=int, default=200, help="每个场景每种路径的请求次数")
+    parser.add_argument("--output", help="结果输出 JSON 路径")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args.n))
+    print(f"{'场景':<16}{'大小KB':>8}" + "".join(f"{mode + ' p50/p95':>20}" for mode in MODES) + f"{'加速':>8}")
+    for name, r in results.items():
+        cells = "".join(f"{r[m]['p50']:>12.2f}/{r[m]['p95']:<7.2f}" for m in MODES)
+        speedup = r["model"]["p50"] / r["envelope"]["p50"]
+        print(f"{name:<16}{r['model']['bytes'] / 1024:>8.1f}{cells}{speedup:>7.2f}x")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"requests": args.n, "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
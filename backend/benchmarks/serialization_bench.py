@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""会员端大列表响应序列化基准（拆分前内联写法 vs 共享序列化层）
+
+用法：
+  python benchmarks/serialization_bench.py                  # 默认每个列表 2000 行
+  python benchmarks/serialization_bench.py -n 10000 --output serialization.json
+
+对比项（每项分别统计构造行数据 build 与编码响应 encode 的耗时）：
+  legacy   原 member_api.py 内联写法 + ResponseModel 默认响应路径（校验、转换、json.dumps）
+  shared   app/api/v1/member/serializers 的行编码函数 + app.core.responses 预编码统一响应
+两种路径的输出按 JSON 解析后逐项比对，不一致时报错退出。
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, time as dtime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.api.v1.member import serializers
+from app.api.v1.member.serializers import resolve_image_url
+from app.core.responses import encode_response
+from app.models import Coach, Member, Reservation, Venue, VenueType
+from app.models.checkin import GateCheckRecord, Leaderboard
+from app.models.member import MemberLevel
+from app.schemas.common import ResponseModel
+
+RESPONSE_FIELD = create_response_field(name="Response_bench", type_=ResponseModel, mode="serialization")
+
+
+# ==================== 样本数据（不入库的 ORM 实例） ====================
+
+def make_rows(n: int, seed: int = 42) -> dict:
+    rnd = random.Random(seed)
+    types = [VenueType(id=i, name=name) for i, name in enumerate(["高尔夫", "网球", "匹克球", "壁球"], 1)]
+    venues = []
+    for i in range(1, max(n // 10, 20) + 1):
+        venue_type = rnd.choice(types)
+        images = json.dumps([f"/uploads/blobs/{i:02x}/{i:032x}.jpg", f"/uploads/blobs/{i:02x}/{i + 1:032x}.jpg"])
+        venues.append(Venue(id=i, name=f"{venue_type.name}{i}号场", type_id=venue_type.id, venue_type=venue_type,
+                            images=images, location=f"{i % 5 + 1}楼", price=rnd.choice([80, 120, 200]), status=1))
+    levels = [MemberLevel(id=i, name=name, level_code=code) for i, (code, name) in
+              enumerate([("S", "S级会员"), ("SS", "SS级会员"), ("SSS", "SSS级会员")], 1)]
+    members = [Member(id=i, nickname=f"会员{i}", avatar=f"/uploads/avatar/{i}.png", level=rnd.choice(levels))
+               for i in range(1, n + 1)]
+    coaches = [Coach(id=i, name=f"教练{i}", avatar=None, type=rnd.choice(["junior", "senior"]), level="4.8",
+                     price=rnd.choice([200, 300]), introduction="专业教练" * 5,
+                     skills=json.dumps(["正手", "反手", "发球"], ensure_ascii=False), total_courses=i)
+               for i in range(1, n + 1)]
+    now = datetime(2026, 6, 1, 12, 0)
+    reservations = []
+    for i in range(1, n + 1):
+        venue = rnd.choice(venues)
+        start = rnd.randint(8, 20)
+        reservations.append(Reservation(
+            id=i, reservation_no=f"R{i:012d}", member_id=1, venue_id=venue.id, venue=venue, coach=None,
+            reservation_date=date(2026, 6, rnd.randint(1, 28)), start_time=dtime(start), end_time=dtime(start + 1),
+            duration=60, total_price=venue.price, status=rnd.choice(["confirmed", "completed", "cancelled"]),
+            pay_type="coin", is_verified=False, created_at=now - timedelta(minutes=i),
+        ))
+    checkins = [GateCheckRecord(id=i, member_id=1, venue_id=(v := rnd.choice(venues)).id, venue=v,
+                                check_in_time=now - timedelta(hours=i), check_out_time=now - timedelta(hours=i - 1),
+                                duration=60, points_earned=10, check_date=(now - timedelta(hours=i)).date())
+                for i in range(1, n + 1)]
+    leaderboard = [Leaderboard(id=i, rank=i, member_id=m.id, member=m, total_duration=10000 - i, check_count=50)
+                   for i, m in enumerate(members, 1)]
+    return {"venues": venues, "coaches": coaches, "orders": reservations,
+            "checkin_records": checkins, "leaderboard": leaderboard}
+
+
+# ==================== 拆分前的内联写法（冻结副本，仅供对比） ====================
+
+def legacy_venues(venues):
+    result = []
+    for v in venues:
+        images_list = []
+        if v.images:
+            try:
+                images_list = json.loads(v.images)
+            except Exception:
+                pass
+        first_image = images_list[0] if images_list else None
+        result.append({
+            "id": v.id, "name": v.name, "type_id": v.type_id,
+            "image": resolve_image_url(first_image, "card"),
+            "type_name": v.venue_type.name if v.venue_type else None,
+            "location": v.location, "price": float(v.price or 0), "status": v.status
+        })
+    return result
+
+
+def legacy_coaches(coaches):
+    result = []
+    for c in coaches:
+        skills = []
+        if c.skills:
+            try:
+                skills = json.loads(c.skills)
+            except Exception:
+                skills = c.skills.split(",") if c.skills else []
+        result.append({
+            "id": c.id, "name": c.name, "avatar": c.avatar, "type": c.type, "type_name": c.type_name,
+            "level": c.level, "rating": c.rating, "price": float(c.price or 0),
+            "introduction": c.introduction, "skills": skills, "total_courses": c.total_courses or 0
+        })
+    return result
+
+
+def legacy_orders(reservations):
+    result = []
+    for r in reservations:
+        venue_image = None
+        if r.venue and r.venue.images:
+            try:
+                imgs = json.loads(r.venue.images) if isinstance(r.venue.images, str) else r.venue.images
+                venue_image = imgs[0] if isinstance(imgs, list) and imgs else None
+            except (json.JSONDecodeError, TypeError):
+                venue_image = r.venue.images if not r.venue.images.startswith('[') else None
+        start_str = r.start_time.strftime("%H:%M") if hasattr(r.start_time, 'strftime') else str(r.start_time)[:5]
+        end_str = r.end_time.strftime("%H:%M") if hasattr(r.end_time, 'strftime') else str(r.end_time)[:5]
+        date_str = r.reservation_date.strftime("%Y-%m-%d")
+        result.append({
+            "id": r.id, "order_no": r.reservation_no, "type": "reservation",
+            "title": r.venue.name if r.venue else "预约",
+            "image": resolve_image_url(venue_image, "thumb"),
+            "amount": float(r.total_price or 0), "total_price": float(r.total_price or 0),
+            "status": r.status, "pay_type": r.pay_type or "coin",
+            "created_at": r.created_at.strftime("%Y-%m-%d %H:%M") if r.created_at else None,
+            "detail": f"{date_str} {start_str}-{end_str}",
+        })
+    return result
+
+
+def shared_orders(reservations):
+    result = []
+    for r in reservations:
+        venue_image = serializers.first_image(r.venue.images) if r.venue else None
+        start_str, end_str = serializers.fmt_time(r.start_time), serializers.fmt_time(r.end_time)
+        date_str = serializers.fmt_date(r.reservation_date)
+        result.append({
+            "id": r.id, "order_no": r.reservation_no, "type": "reservation",
+            "title": r.venue.name if r.venue else "预约",
+            "image": resolve_image_url(venue_image, "thumb"),
+            "amount": serializers.money(r.total_price), "total_price": serializers.money(r.total_price),
+            "status": r.status, "pay_type": r.pay_type or "coin",
+            "created_at": serializers.fmt_datetime(r.created_at),
+            "detail": f"{date_str} {start_str}-{end_str}",
+        })
+    return result
+
+
+def legacy_checkin_records(records):
+    return [{
+        "id": r.id,
+        "venue_name": r.venue.name if r.venue else None,
+        "venue_type_name": r.venue.venue_type.name if r.venue and r.venue.venue_type else None,
+        "check_in_time": r.check_in_time.strftime("%Y-%m-%d %H:%M") if r.check_in_time else None,
+        "check_out_time": r.check_out_time.strftime("%Y-%m-%d %H:%M") if r.check_out_time else None,
+        "duration": r.duration, "points_earned": r.points_earned, "check_date": str(r.check_date)
+    } for r in records]
+
+
+def legacy_leaderboard(entries):
+    items = []
+    for entry in entries:
+        member = entry.member
+        items.append({
+            "rank": entry.rank, "member_id": entry.member_id,
+            "nickname": member.nickname if member else None,
+            "avatar": member.avatar if member else None,
+            "level_name": member.level.name if member and member.level else None,
+            "total_duration": entry.total_duration, "check_count": entry.check_count
+        })
+    return items
+
+
+SCENARIOS = {
+    "venues": (legacy_venues, lambda rows: [serializers.venue_card(v) for v in rows]),
+    "coaches": (legacy_coaches, lambda rows: [serializers.coach_card(c) for c in rows]),
+    "orders": (legacy_orders, shared_orders),
+    "checkin_records": (legacy_checkin_records, lambda rows: [serializers.checkin_record(r) for r in rows]),
+    "leaderboard": (legacy_leaderboard, lambda rows: [serializers.leaderboard_entry(e) for e in rows]),
+}
+
+
+# ==================== 测量 ====================
+
+async def legacy_encode(data) -> bytes:
+    """FastAPI 默认路径：response_model 校验 + 转换，JSONResponse 渲染"""
+    content = await serialize_response(field=RESPONSE_FIELD, response_content=ResponseModel(data=data))
+    return JSONResponse(content).body
+
+
+def timed(func, repeat: int):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return round(best * 1000, 2), result
+
+
+def run(n: int, repeat: int) -> dict:
+    data = make_rows(n)
+    results = {}
+    loop = asyncio.new_event_loop()
+    for name, (legacy_build, shared_build) in SCENARIOS.items():
+        rows = data[name]
+        legacy_build_ms, legacy_rows = timed(lambda: legacy_build(rows), repeat)
+        legacy_encode_ms, legacy_body = timed(lambda: loop.run_until_complete(legacy_encode(legacy_rows)), repeat)
+        shared_build_ms, shared_rows = timed(lambda: shared_build(rows), repeat)
+        shared_encode_ms, shared_body = timed(lambda: encode_response(shared_rows), repeat)
+
+        if json.loads(legacy_body) != json.loads(shared_body):
+            raise SystemExit(f"{name}: 共享序列化层输出与原写法不一致")
+
+        legacy_ms = legacy_build_ms + legacy_encode_ms
+        shared_ms = shared_build_ms + shared_encode_ms
+        results[name] = {
+            "rows": len(rows),
+            "bytes": len(shared_body),
+            "legacy": {"build_ms": legacy_build_ms, "encode_ms": legacy_encode_ms, "total_ms": round(legacy_ms, 2)},
+            "shared": {"build_ms": shared_build_ms, "encode_ms": shared_encode_ms, "total_ms": round(shared_ms, 2)},
+            "speedup": round(legacy_ms / shared_ms, 2),
+        }
+    loop.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="会员端大列表序列化基准")
+    parser.add_argument("-n", type=int, default=2000, help="每个列表的行数")
+    parser.add_argument("--repeat", type=int, default=5, help="每项重复次数（取最快一次）")
+    parser.add_argument("--output", help="结果输出 JSON 路径")
+    args = parser.parse_args()
+
+    results = run(args.n, args.repeat)
+    print(f"{'列表':<16}{'行数':>7}{'legacy build/encode':>24}{'shared build/encode':>24}{'加速':>8}")
+    for name, r in results.items():
+        legacy, shared = r["legacy"], r["shared"]
+        print(f"{name:<16}{r['rows']:>7}"
+              f"{legacy['build_ms']:>12.2f}/{legacy['encode_ms']:<10.2f}"
+              f"{shared['build_ms']:>12.2f}/{shared['encode_ms']:<10.2f}"
+              f"{r['speedup']:>7.2f}x")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"rows": args.n, "results": results}, f, ensure_ascii=False, indent=2)
+
+
+if __name__ == "__main__":
+    main()
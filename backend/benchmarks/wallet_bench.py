@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""钱包并发基准：高并发扣减/入账下校验无丢失更新
+
+用法：
+  python benchmarks/wallet_bench.py                          # 临时 SQLite 文件库，16 线程 x 200 次
+  python benchmarks/wallet_bench.py -t 64 -n 500 --members 4
+  python benchmarks/wallet_bench.py --url mysql+pymysql://u:p@127.0.0.1/bench   # 需已建表（会清空钱包相关表）
+  python benchmarks/wallet_bench.py --output wallet.json
+
+每个线程随机挑会员，按 2:1 做扣减 / 入账（扣减可能因余额不足被拒）。两种实现各跑一遍：
+  read_modify_write  原写法：ORM 读出余额 -> 应用层加减 -> 写回，再 add 流水
+  wallet_service     条件 UPDATE（余额 >= x）+ 同事务写流水
+
+校验（每个会员）：
+  最终余额 == 初始余额 + 入账流水合计 - 扣减流水合计，否则计为 lost_update
+  余额 >= 0
+输出吞吐（ops/s）、拒绝数（余额不足）、数据库错误数（如 SQLite 锁冲突）与校验结果。
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from sqlalchemy import create_engine, delete, func, select
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.models import Member, CoinRecord
+from app.services import wallet_service
+from app.services.wallet_service import COIN, InsufficientBalance
+
+INITIAL_BALANCE = Decimal("1000.00")
+DEBIT, CREDIT = Decimal("3.00"), Decimal("2.00")
+
+
+def reset(factory, members: int):
+    with factory() as db:
+        db.execute(delete(CoinRecord))
+        db.execute(delete(Member).where(Member.id <= members))
+        db.add_all([
+            Member(id=i, nickname=f"bench{i}", phone=f"1390000{i:04d}", coin_balance=INITIAL_BALANCE, point_balance=0)
+            for i in range(1, members + 1)
+        ])
+        db.commit()
+
+
+def read_modify_write(db, member_id: int, debit: bool):
+    member = db.get(Member, member_id)
+    balance = Decimal(str(member.coin_balance or 0))
+    amount = DEBIT if debit else CREDIT
+    if debit and balance < amount:
+        raise InsufficientBalance(COIN, balance)
+    member.coin_balance = balance - amount if debit else balance + amount
+    db.add(CoinRecord(member_id=member_id, type="expense" if debit else "income", amount=amount,
+                      balance=member.coin_balance, source="bench"))
+
+
+def with_wallet(db, member_id: int, debit: bool):
+    if debit:
+        wallet_service.debit(db, member_id, COIN, DEBIT, source="bench")
+    else:
+        wallet_service.credit(db, member_id, COIN, CREDIT, source="bench")
+
+
+def verify(factory, members: int) -> dict:
+    with factory() as db:
+        totals = {
+            (member_id, kind): Decimal(str(amount))
+            for member_id, kind, amount in db.execute(
+                select(CoinRecord.member_id, CoinRecord.type, func.sum(CoinRecord.amount))
+                .group_by(CoinRecord.member_id, CoinRecord.type)
+            )
+        }
+        lost, negative = 0, 0
+        for member_id, balance in db.execute(select(Member.id, Member.coin_balance).where(Member.id <= members)):
+            balance = Decimal(str(balance))
+            expected = INITIAL_BALANCE + totals.get((member_id, "income"), 0) - totals.get((member_id, "expense"), 0)
+            lost += balance != expected
+            negative += balance < 0
+    return {"lost_update_members": lost, "negative_members": negative}
+
+
+def run(name: str, factory, operation, threads: int, ops: int, members: int) -> dict:
+    reset(factory, members)
+    barrier = threading.Barrier(threads)
+    counters = {"ok": 0, "rejected": 0, "errors": 0}
+    lock = threading.Lock()
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        barrier.wait()
+        for _ in range(ops):
+            outcome = "ok"
+            with factory() as db:
+                try:
+                    operation(db, rng.randint(1, members), rng.random() < 2 / 3)
+                    db.commit()
+                except InsufficientBalance:
+                    db.rollback()
+                    outcome = "rejected"
+                except DBAPIError:
+                    db.rollback()
+                    outcome = "errors"
+            with lock:
+                counters[outcome] += 1
+
+    workers = [threading.Thread(target=worker, args=(i,)) for i in range(threads)]
+    start = time.perf_counter()
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    stats = {**counters, "ops_per_sec": round(threads * ops / elapsed, 1), **verify(factory, members)}
+    print(f"  {name:<18} {stats['ops_per_sec']:>10} ops/s  ok={stats['ok']:<6} rejected={stats['rejected']:<5} "
+          f"errors={stats['errors']:<5} lost_update_members={stats['lost_update_members']} "
+          f"negative_members={stats['negative_members']}")
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="钱包并发基准")
+    parser.add_argument("-t", "--threads", type=int, default=16, help="并发线程数")
+    parser.add_argument("-n", "--ops", type=int, default=200, help="每线程操作数")
+    parser.add_argument("--members", type=int, default=2, help="参与会员数（越少冲突越多）")
+    parser.add_argument("--url", help="数据库 URL（默认临时 SQLite 文件库）")
+    parser.add_argument("--output", help="结果输出 JSON 路径")
+    args = parser.parse_args()
+
+    if args.url:
+        engine = create_engine(args.url, pool_size=args.threads, max_overflow=0)
+    else:
+        path = os.path.join(tempfile.mkdtemp(), "wallet_bench.db")
+        engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False, "timeout": 30})
+        Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+
+    print(f"钱包并发基准  threads={args.threads} ops={args.ops} members={args.members} db={engine.dialect.name}")
+    results = {
+        "read_modify_write": run("read_modify_write", factory, read_modify_write, args.threads, args.ops, args.members),
+        "wallet_service": run("wallet_service", factory, with_wallet, args.threads, args.ops, args.members),
+    }
+    engine.dispose()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({"threads": args.threads, "ops": args.ops, "members": args.members, "results": results},
+                      f, ensure_ascii=False, indent=2)
+
+    wallet = results["wallet_service"]
+    if wallet["lost_update_members"] or wallet["negative_members"]:
+        sys.exit("wallet_service 出现丢失更新或负余额")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,11 @@
 """
 初始化数据脚本（三级会员制版本: S/SS/SSS）
-运行: python init_data.py
+运行: python init_data.py（会先执行 alembic upgrade head 建表/升级结构）
 """
 import json
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
-from app.core.database import SessionLocal, engine, Base
+from app.core.database import SessionLocal
 from app.core.security import get_password_hash
 from app.models import SysUser, SysRole, SysDepartment, SysPermission, MemberLevel
 from app.models.venue import VenueType, Venue
@@ -15,8 +15,13 @@ from app.models.review import ReviewPointConfig
 from app.models.checkin import PointRuleConfig
 from app.models.coupon import CouponTemplate, CouponPack, CouponPackItem
 
-# 创建所有表
-Base.metadata.create_all(bind=engine)
+
+def upgrade_schema():
+    """执行 Alembic 迁移到最新版本（表结构不再由 create_all 维护）"""
+    from alembic import command
+    from app.core.lifecycle import alembic_config
+
+    command.upgrade(alembic_config(), "head")
 
 
 def init_permissions(db: Session):
@@ -495,6 +500,7 @@ def init_venues(db: Session):
 
 
 def main():
+    upgrade_schema()
     db = SessionLocal()
     try:
         print("开始初始化数据...")
@@ -0,0 +1,17 @@
+-- 上传文件内容寻址存储迁移脚本
+-- 版本: 1.0
+-- 说明: 上传文件按 SHA-256 去重存储，记录引用计数，供 GC 回收无引用文件
+
+CREATE TABLE IF NOT EXISTS upload_blob (
+    id INT AUTO_INCREMENT PRIMARY KEY,
+    sha256 CHAR(64) NOT NULL COMMENT '文件内容 SHA-256',
+    storage_path VARCHAR(255) NOT NULL COMMENT '存储路径（相对上传目录），如 blobs/ab/<sha256>.jpg',
+    size INT NOT NULL DEFAULT 0 COMMENT '文件大小（字节）',
+    content_type VARCHAR(100) COMMENT '文件类型',
+    ref_count INT NOT NULL DEFAULT 0 COMMENT '引用计数',
+    released_at DATETIME NULL COMMENT '引用计数归零时间（GC 宽限期起点）',
+    created_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP COMMENT '创建时间',
+    updated_at DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP COMMENT '更新时间',
+    UNIQUE KEY uk_upload_blob_sha256 (sha256),
+    KEY idx_upload_blob_gc (ref_count, released_at)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='上传文件（内容寻址）';
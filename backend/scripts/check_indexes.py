@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+"""索引检查脚本 — 列出模型已声明但数据库缺失的索引，并 EXPLAIN 热点查询确认命中预期索引
+
+用法:
+  python scripts/check_indexes.py            # 检查，有缺失或未命中时退出码为 1
+  alembic upgrade head                       # 补齐缺失索引（正式途径）
+"""
+import sys
+import os
+
+# 将 backend 目录加入 Python 路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+import app.models  # noqa: F401
+from app.core.database import engine
+from app.core.indexes import check_hot_queries, missing_indexes
+
+
+def main():
+    ok = True
+    with engine.connect() as conn:
+        missing = missing_indexes(conn)
+        if missing:
+            ok = False
+            print("缺失索引（请执行 alembic upgrade head）：")
+            for index in missing:
+                columns = ", ".join(col.name for col in index.columns)
+                print(f"  {index.table.name}.{index.name} ({columns})")
+        else:
+            print("模型声明的索引均已创建")
+
+        print("\n热点查询执行计划：")
+        for name, (expected, used, hit) in check_hot_queries(conn).items():
+            ok = ok and hit
+            mark = "OK  " if hit else "MISS"
+            print(f"  [{mark}] {name:<26} 预期 {expected}，实际 {', '.join(sorted(used)) or '全表扫描'}")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""上传文件回收脚本 — 删除引用计数为 0 且超过宽限期的内容寻址文件（含衍生图）
+
+crontab 示例:
+30 3 * * * /var/www/sports-bar-project/backend/venv/bin/python /var/www/sports-bar-project/backend/scripts/gc_upload_blobs.py >> /var/log/upload_gc.log 2>&1
+"""
+import argparse
+import sys
+import os
+from datetime import datetime
+
+# 将 backend 目录加入 Python 路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.blob_store import collect_garbage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="回收无引用的上传文件")
+    parser.add_argument("--grace-hours", type=int, default=settings.BLOB_GC_GRACE_HOURS,
+                        help="引用归零后保留的小时数")
+    args = parser.parse_args()
+
+    print(f"[{datetime.now().strftime('%Y-%m-%d %H:%M:%S')}] 开始回收上传文件（宽限期 {args.grace_hours} 小时）")
+    db = SessionLocal()
+    try:
+        removed = collect_garbage(db, grace_hours=args.grace_hours)
+        for path in removed:
+            print(f"  已删除 {path}")
+        print(f"完成，共回收 {len(removed)} 个文件")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""为历史上传图片补生成衍生图（thumb/card/full 及 WebP）
+
+用法:
+python scripts/generate_image_derivatives.py            # 处理 uploads 下全部图片
+python scripts/generate_image_derivatives.py --force    # 已有衍生图也重新生成
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# 将 backend 目录加入 Python 路径
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from app.core.config import settings
+from app.services.image_pipeline import IMAGE_VARIANTS, generate_derivatives, variant_path
+
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".webp")
+
+
+def iter_originals(root: str):
+    """遍历原图（跳过衍生图本身）"""
+    for dirpath, _, filenames in os.walk(root):
+        for name in filenames:
+            stem, ext = os.path.splitext(name)
+            if ext.lower() not in IMAGE_EXTS:
+                continue
+            if os.path.splitext(stem)[1].lstrip(".") in IMAGE_VARIANTS:
+                continue
+            yield os.path.join(dirpath, name)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="补生成上传图片衍生图")
+    parser.add_argument("--force", action="store_true", help="已有衍生图也重新生成")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    args = parser.parse_args()
+
+    pending = [
+        path for path in iter_originals(settings.UPLOAD_DIR)
+        if args.force or not os.path.exists(variant_path(path, "thumb"))
+    ]
+    print(f"待处理图片: {len(pending)}")
+
+    def process(path):
+        try:
+            generate_derivatives(path)
+            return True
+        except Exception as e:
+            print(f"  失败 {path}: {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        done = sum(pool.map(process, pending))
+    print(f"完成: {done}/{len(pending)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,6 +3,7 @@ pytest 测试配置文件
 
 提供测试夹具（fixtures）：
 - 数据库会话模拟
+- 文件 SQLite 会话工厂（db_factory，预置数据由各测试文件写入）
 - 会员模型模拟
 - 预约模型模拟
 """
@@ -12,6 +13,16 @@ from decimal import Decimal
 from typing import Optional
 from unittest.mock import MagicMock, patch
 
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.core.database import Base
+
 
 # ==================== 模拟模型类 ====================
 
@@ -220,6 +231,15 @@ def mock_db():
     return db
 
 
+@pytest.fixture
+def db_factory(tmp_path):
+    """文件 SQLite 会话工厂：按全部模型建表，多线程各自连接（写锁最多等待 30 秒），测试结束释放连接池"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}", connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
 @pytest.fixture
 def trial_member():
     """体验会员夹具"""
@@ -0,0 +1,203 @@
+"""
+活动报名测试
+
+- 并发报名：名额内正式报名、候补名额内候补，其余拒绝，不超员不超候补
+- 同一会员并发重复报名：只有一条有效报名、只占一个名额、只扣一次费；取消后可再次报名
+- 取消递补：正式报名取消后按登记顺序递补并扣费，金币不足的候补取消并顺延
+- 扩容递补：后台调大名额后候补自动转正
+- 准入限流：同一活动同时进入报名流程的请求数受限，没有空位立即返回 429；满员后直接拒绝
+"""
+import threading
+import time as clock
+from datetime import datetime, timedelta
+from decimal import Decimal
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+
+import app.models  # noqa: F401
+from app.models import Activity, ActivityRegistration, Member
+from app.services import activity_enrollment
+from app.services.activity_enrollment import AdmissionBusy, AdmissionQueue
+from app.services.counter_service import counter_rollup
+from app.api.v1.member.home import cancel_enrollment, enroll_activity
+from app.api.v1.activities import update_activity
+
+MEMBERS = 30
+
+
+@pytest.fixture
+def Session(db_factory):
+    start = datetime.now() + timedelta(days=3)
+    with db_factory() as db:
+        db.add_all([
+            Member(id=i, nickname=f"会员{i}", phone=f"1360000{i:04d}", coin_balance=100)
+            for i in range(1, MEMBERS + 1)
+        ])
+        db.add(Activity(id=1, title="周末球赛", start_time=start, end_time=start + timedelta(hours=2),
+                        max_participants=5, waitlist_limit=3, price=20, status="published"))
+        db.commit()
+    activity_enrollment.admission_queue.clear_full(1)
+    yield db_factory
+    activity_enrollment.admission_queue.clear_full(1)
+    counter_rollup.shutdown()
+
+
+def call(Session, handler, member_id):
+    with Session() as db:
+        member = db.get(Member, member_id)
+        try:
+            return handler(1, db, member).message
+        except HTTPException as e:
+            return e.detail
+
+
+def registrations(Session):
+    with Session() as db:
+        rows = db.query(ActivityRegistration).order_by(ActivityRegistration.id).all()
+        return {status: [r.member_id for r in rows if r.status == status]
+                for status in ("registered", "waitlisted", "cancelled")}
+
+
+def coins(Session, member_id):
+    with Session() as db:
+        return db.get(Member, member_id).coin_balance
+
+
+class TestEnroll:
+    """并发报名测试类"""
+
+    def test_spike_fills_seats_then_waitlist(self, Session):
+        barrier = threading.Barrier(MEMBERS)
+        results = []
+
+        def worker(member_id):
+            barrier.wait()
+            results.append(call(Session, enroll_activity, member_id))
+
+        threads = [threading.Thread(target=worker, args=(m,)) for m in range(1, MEMBERS + 1)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results.count("报名成功") == 5
+        assert results.count("名额已满，已加入候补") == 3
+        assert results.count("报名名额已满") == MEMBERS - 8
+        regs = registrations(Session)
+        assert len(regs["registered"]) == 5 and len(regs["waitlisted"]) == 3
+        paid = [m for m in range(1, MEMBERS + 1) if coins(Session, m) == Decimal("80.00")]
+        assert sorted(paid) == sorted(regs["registered"])
+
+    def test_duplicate_enroll_rejected(self, Session):
+        assert call(Session, enroll_activity, 1) == "报名成功"
+        assert call(Session, enroll_activity, 1) == "您已报名该活动"
+
+    def test_same_member_concurrent_taps(self, Session):
+        taps = 8
+        barrier = threading.Barrier(taps)
+        results = []
+
+        def worker():
+            barrier.wait()
+            results.append(call(Session, enroll_activity, 1))
+
+        threads = [threading.Thread(target=worker) for _ in range(taps)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results.count("报名成功") == 1
+        assert results.count("您已报名该活动") == taps - 1
+        assert registrations(Session)["registered"] == [1]
+        assert coins(Session, 1) == Decimal("80.00")
+        counter_rollup.flush()
+        with Session() as db:
+            assert db.get(Activity, 1).current_participants == 1
+
+        assert call(Session, cancel_enrollment, 1) == "已取消报名"
+        assert call(Session, enroll_activity, 1) == "报名成功"
+
+
+class TestWaitlistPromotion:
+    """候补递补测试类"""
+
+    def fill(self, Session, members):
+        for m in members:
+            call(Session, enroll_activity, m)
+
+    def test_cancel_promotes_in_order_and_skips_broke(self, Session):
+        self.fill(Session, range(1, 9))
+        with Session() as db:
+            db.get(Member, 6).coin_balance = 5
+            db.commit()
+
+        assert call(Session, cancel_enrollment, 2) == "已取消报名"
+        regs = registrations(Session)
+        assert regs["registered"] == [1, 3, 4, 5, 7]
+        assert regs["waitlisted"] == [8]
+        assert regs["cancelled"] == [2, 6]
+        assert coins(Session, 2) == Decimal("100.00")
+        assert coins(Session, 6) == Decimal("5.00")
+        assert coins(Session, 7) == Decimal("80.00")
+
+        counter_rollup.flush()
+        with Session() as db:
+            activity = db.get(Activity, 1)
+            assert (activity.current_participants, activity.waitlist_count) == (5, 1)
+
+    def test_cancel_waitlisted_frees_waitlist_slot(self, Session):
+        self.fill(Session, range(1, 10))
+        assert call(Session, enroll_activity, 10) == "报名名额已满"
+        assert call(Session, cancel_enrollment, 8) == "已取消报名"
+        assert call(Session, enroll_activity, 10) == "名额已满，已加入候补"
+        assert coins(Session, 8) == Decimal("100.00")
+
+    def test_capacity_raise_promotes(self, Session):
+        self.fill(Session, range(1, 9))
+        with Session() as db:
+            assert update_activity(1, {"max_participants": 7}, db, None).code == 200
+        regs = registrations(Session)
+        assert regs["registered"] == [1, 2, 3, 4, 5, 6, 7]
+        assert regs["waitlisted"] == [8]
+        assert call(Session, enroll_activity, 9) == "名额已满，已加入候补"
+
+
+class TestAdmissionQueue:
+    """准入限流测试类"""
+
+    def test_concurrency_limit_rejects_without_waiting(self):
+        queue = AdmissionQueue(concurrency=1, full_ttl=1)
+        with queue.admit(1):
+            started = clock.monotonic()
+            with pytest.raises(AdmissionBusy):
+                with queue.admit(1):
+                    pass
+            assert clock.monotonic() - started < 0.05
+            with queue.admit(2):
+                pass
+        with queue.admit(1):
+            pass
+
+    def test_busy_maps_to_429(self, Session, monkeypatch):
+        queue = AdmissionQueue(concurrency=1, full_ttl=0)
+        monkeypatch.setattr(activity_enrollment, "admission_queue", queue)
+        with queue.admit(1):
+            with Session() as db:
+                with pytest.raises(HTTPException) as exc:
+                    enroll_activity(1, db, db.get(Member, 1))
+            assert exc.value.status_code == 429
+        assert call(Session, enroll_activity, 1) == "报名成功"
+
+    def test_full_marker(self):
+        queue = AdmissionQueue(concurrency=0, full_ttl=60)
+        queue.mark_full(1)
+        assert queue.is_full(1) and not queue.is_full(2)
+        queue.clear_full(1)
+        assert not queue.is_full(1)
@@ -0,0 +1,115 @@
+"""
+会员端异步读接口测试
+
+使用 aiosqlite 内存库覆盖 get_async_db，验证场馆列表/时间段/日历/活动
+在 AsyncSession 下可正常工作（无懒加载 MissingGreenlet 异常）
+"""
+import asyncio
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("aiosqlite")
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base, get_async_db
+from app.models import Venue, VenueType, Reservation, Member, Activity
+from app.api.v1 import member_api
+from app.services.catalog_cache import catalog_cache
+
+
+@pytest.fixture
+def client():
+    """挂载会员路由的测试客户端（内存 SQLite + 预置数据）"""
+    engine = create_async_engine(
+        "sqlite+aiosqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    today = date.today()
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with factory() as db:
+            db.add(VenueType(id=1, name="网球", sort=1, status=True))
+            db.add_all([
+                Venue(id=1, name="1号场", type_id=1, price=100, images='["/uploads/a.jpg"]', status=1, sort=1),
+                Venue(id=2, name="2号场", type_id=1, price=80, status=1, sort=2),
+            ])
+            db.add(Member(id=1, nickname="测试会员", phone="13800000000"))
+            db.add(Reservation(
+                reservation_no="R1", member_id=1, venue_id=1,
+                reservation_date=today + timedelta(days=1),
+                start_time=time(10, 0), end_time=time(12, 0), duration=120,
+                status="confirmed",
+            ))
+            db.add(Activity(
+                id=1, title="周末赛", status="published",
+                start_time=datetime.now() + timedelta(days=2),
+                end_time=datetime.now() + timedelta(days=2, hours=3),
+            ))
+            await db.commit()
+
+    asyncio.run(setup())
+    catalog_cache.clear()
+
+    async def override_get_async_db():
+        async with factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(member_api.router, prefix="/api/v1/member")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    with TestClient(app) as c:
+        yield c
+    asyncio.run(engine.dispose())
+
+
+class TestAsyncMemberReadPaths:
+    """异步读接口测试类"""
+
+    def test_get_venues_with_type_name(self, client):
+        resp = client.get("/api/v1/member/venues", params={"type_id": 1})
+        assert resp.status_code == 200
+        data = resp.json()["data"]
+        assert [v["name"] for v in data] == ["1号场", "2号场"]
+        assert data[0]["type_name"] == "网球"
+        assert data[0]["image"] == "/uploads/a.jpg"
+
+    def test_get_venue_detail_not_found(self, client):
+        resp = client.get("/api/v1/member/venues/99")
+        assert resp.status_code == 404
+
+    def test_get_venue_slots_marks_reserved_hours(self, client):
+        target = (date.today() + timedelta(days=1)).isoformat()
+        resp = client.get("/api/v1/member/venues/1/slots", params={"date": target})
+        slots = {s["time"]: s["status"] for s in resp.json()["data"]}
+        assert slots["10:00"] == "reserved"
+        assert slots["11:00"] == "reserved"
+        assert slots["12:00"] == "available"
+
+    def test_get_venue_calendar(self, client):
+        target = (date.today() + timedelta(days=1)).isoformat()
+        resp = client.get("/api/v1/member/venue-calendar", params={"type_id": 1, "date": target})
+        venues = resp.json()["data"]["venues"]
+        assert len(venues) == 2
+        first = {s["hour"]: s["status"] for s in venues[0]["slots"]}
+        assert first[10] == "reserved"
+        assert first[9] == "available"
+        assert all(s["status"] == "available" for s in venues[1]["slots"])
+
+    def test_get_activities(self, client):
+        resp = client.get("/api/v1/member/activities", params={"status": "upcoming"})
+        data = resp.json()["data"]
+        assert len(data) == 1
+        assert data[0]["status"] == "upcoming"
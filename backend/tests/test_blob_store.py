@@ -0,0 +1,215 @@
+"""
+内容寻址上传存储测试
+
+- 相同内容重复上传只存一份，URL 相同，引用计数累加
+- delete_file 只释放引用，引用归零后由 GC 在宽限期后回收（含衍生图）
+- 同内容文件被 GC 删除后再次上传会重新放入文件；落盘失败时释放已登记的引用
+- UI素材每个列写入 blob URL 时各持有一个引用，多个素材共用同一 URL 时删除其中一个不会回收文件；
+  引用计数上线前写入（未持有引用）的素材仍在使用时 GC 跳过
+- blobs/ 下文件返回长期 immutable 缓存头
+"""
+import asyncio
+import io
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.core.database import Base, get_async_db, get_db
+from app.core.static_files import IMMUTABLE_CACHE_CONTROL, UploadStaticFiles
+from app.api.deps import get_current_user
+from app.api.v1 import ui_assets, upload
+from app.models.ui_asset import UIImage
+from app.models.upload_blob import UploadBlob
+from app.services.blob_store import collect_garbage, parse_blob_url, release_blob
+
+
+def make_png() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (400, 300), (200, 40, 40)).save(buf, "PNG")
+    return buf.getvalue()
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    """上传接口 + /uploads 静态服务，数据库为临时 SQLite 文件（同步会话供 GC 使用）"""
+    monkeypatch.chdir(tmp_path)
+    db_path = f"{tmp_path}/test.db"
+    engine = create_async_engine(f"sqlite+aiosqlite:///{db_path}")
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(setup())
+
+    async def override_get_async_db():
+        async with factory() as db:
+            yield db
+
+    sync_engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    SyncSession = sessionmaker(bind=sync_engine)
+
+    def override_get_db():
+        with SyncSession() as db:
+            yield db
+
+    os.makedirs("uploads")
+    app = FastAPI()
+    app.include_router(upload.router, prefix="/upload")
+    app.include_router(ui_assets.router, prefix="/ui-assets")
+    app.mount("/uploads", UploadStaticFiles(directory="uploads"), name="uploads")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+
+    with TestClient(app) as c:
+        yield c, SyncSession
+    sync_engine.dispose()
+    asyncio.run(engine.dispose())
+
+
+def upload_png(client, content: bytes) -> dict:
+    resp = client.post("/upload/image", files={"file": ("a.png", content, "image/png")})
+    assert resp.status_code == 200
+    return resp.json()["data"]
+
+
+class TestBlobStore:
+    """内容寻址存储测试类"""
+
+    def test_duplicate_uploads_share_one_blob(self, env):
+        client, Session = env
+        content = make_png()
+        first = upload_png(client, content)
+        second = upload_png(client, content)
+
+        assert first["url"] == second["url"]
+        assert parse_blob_url(first["url"]) == first["sha256"]
+        assert len(os.listdir(os.path.dirname(first["url"].lstrip("/")))) == 1 + 6  # 原图 + 衍生图
+        assert os.listdir("uploads/tmp") == []
+        with Session() as db:
+            assert db.query(UploadBlob).one().ref_count == 2
+
+    def test_delete_releases_reference_and_gc_reclaims(self, env):
+        client, Session = env
+        data = upload_png(client, make_png())
+        file_path = data["url"].lstrip("/")
+
+        assert client.delete("/upload/file", params={"path": data["url"]}).status_code == 200
+        assert os.path.exists(file_path)
+        with Session() as db:
+            blob = db.query(UploadBlob).one()
+            assert blob.ref_count == 0
+            assert blob.released_at is not None
+
+            # 宽限期内不回收
+            assert collect_garbage(db, grace_hours=1) == []
+            assert collect_garbage(db, grace_hours=0) == [blob.storage_path]
+            assert db.query(UploadBlob).count() == 0
+        assert os.listdir(os.path.dirname(file_path)) == []
+
+        # 引用已归零后再次删除视为不存在
+        assert client.delete("/upload/file", params={"path": data["url"]}).status_code == 404
+
+    def test_gc_skips_referenced_blob(self, env):
+        client, Session = env
+        data = upload_png(client, make_png())
+        upload_png(client, make_png())
+        with Session() as db:
+            assert release_blob(db, data["url"])
+            db.commit()
+            assert collect_garbage(db, grace_hours=0) == []
+            assert db.query(UploadBlob).one().ref_count == 1
+
+    def test_reupload_restores_missing_file(self, env):
+        client, _ = env
+        data = upload_png(client, make_png())
+        file_path = data["url"].lstrip("/")
+        os.remove(file_path)  # GC 在上传登记引用与落盘之间删除了同内容文件
+        assert upload_png(client, make_png())["url"] == data["url"]
+        assert os.path.exists(file_path)
+
+    def test_place_failure_releases_reference(self, env, monkeypatch):
+        client, Session = env
+        upload_png(client, make_png())
+
+        def broken(temp_path, storage_path):
+            os.remove(temp_path)
+            raise OSError("disk full")
+
+        monkeypatch.setattr(upload, "place_blob", broken)
+        with pytest.raises(OSError):
+            client.post("/upload/image", files={"file": ("a.png", make_png(), "image/png")})
+        with Session() as db:
+            assert db.query(UploadBlob).one().ref_count == 1
+        assert os.listdir("uploads/tmp") == []
+
+    def test_blob_served_with_immutable_cache(self, env):
+        client, _ = env
+        data = upload_png(client, make_png())
+        resp = client.get(data["url"])
+        assert resp.status_code == 200
+        assert resp.headers["cache-control"] == IMMUTABLE_CACHE_CONTROL
+
+
+class TestAssetReferences:
+    """UI素材引用测试类"""
+
+    def ref_count(self, Session):
+        with Session() as db:
+            return db.query(UploadBlob).one().ref_count
+
+    def test_shared_url_survives_deleting_one_asset(self, env):
+        client, Session = env
+        url = upload_png(client, make_png())["url"]
+        image_id = client.post("/ui-assets/images", params={
+            "code": "bg", "name": "背景", "app_type": "member", "image_url": url}).json()["data"]["id"]
+        icon_id = client.post("/ui-assets/icons", params={
+            "code": "home", "name": "首页", "app_type": "member", "icon_normal": url}).json()["data"]["id"]
+        assert self.ref_count(Session) == 3  # 上传 + 图片素材 + 图标
+
+        assert client.delete(f"/ui-assets/images/{image_id}").status_code == 200
+        assert client.delete("/upload/file", params={"path": url}).status_code == 200
+        assert self.ref_count(Session) == 1
+        with Session() as db:
+            assert collect_garbage(db, grace_hours=0) == []
+        assert os.path.exists(url.lstrip("/"))
+
+        # 图标改用其他地址后引用归零，文件可回收
+        assert client.put(f"/ui-assets/icons/{icon_id}", params={"icon_normal": "/static/home.png"}).status_code == 200
+        assert self.ref_count(Session) == 0
+        with Session() as db:
+            assert len(collect_garbage(db, grace_hours=0)) == 1
+        assert not os.path.exists(url.lstrip("/"))
+
+    def test_update_to_existing_url_retains(self, env):
+        client, Session = env
+        url = upload_png(client, make_png())["url"]
+        image_id = client.post("/ui-assets/images", params={
+            "code": "bg", "name": "背景", "app_type": "member", "image_url": "/static/bg.png"}).json()["data"]["id"]
+        client.post("/ui-assets/images", params={"code": "bg2", "name": "背景2", "app_type": "member", "image_url": url})
+        assert client.put(f"/ui-assets/images/{image_id}", params={"image_url": url}).status_code == 200
+        assert self.ref_count(Session) == 3
+
+    def test_gc_skips_asset_without_reference(self, env):
+        client, Session = env
+        url = upload_png(client, make_png())["url"]
+        assert client.delete("/upload/file", params={"path": url}).status_code == 200
+        with Session() as db:
+            # 引用计数上线前创建的素材：未持有引用
+            db.add(UIImage(code="legacy", name="旧素材", app_type="member", image_url=url))
+            db.commit()
+            assert collect_garbage(db, grace_hours=0) == []
+        assert os.path.exists(url.lstrip("/"))
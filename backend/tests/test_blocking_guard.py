@@ -0,0 +1,148 @@
+"""
+协程接口阻塞防护测试
+
+以 UI 编辑器发布接口为例，发布进行期间测量事件循环延迟：
+- 未防护时同步 SQL 在事件循环上执行，延迟约等于整个发布耗时
+- offload 模式下发布在线程池中执行，事件循环保持响应
+- detect 模式下记录阻塞告警并指出接口
+"""
+import asyncio
+import logging
+import time
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import APIRouter, FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core import blocking_guard
+from app.core.blocking_guard import BlockingGuardRoute, depends_on, install_blocking_db_detector
+from app.core.config import settings
+from app.core.database import Base, get_db
+from app.api.deps import get_current_user
+from app.api.v1 import ui_editor
+from app.models.ui_editor import UIPageConfig, UIBlockConfig, UIMenuItem
+
+SQL_LATENCY = 0.03  # 模拟每条 SQL 的网络往返耗时
+
+
+@pytest.fixture
+def slow_engine():
+    """每条 SQL 额外耗时 SQL_LATENCY 秒的内存 SQLite"""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db = Session()
+    for i in range(10):
+        db.add(UIPageConfig(page_code=f"page{i}", page_name=f"页面{i}", status="draft"))
+        db.add(UIBlockConfig(block_code=f"block{i}", block_name=f"区块{i}", page_code=f"page{i}", block_type="list"))
+        db.add(UIMenuItem(menu_code=f"menu{i}", menu_type="quick_entry", title=f"菜单{i}"))
+    db.commit()
+    db.close()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _slow(*args):
+        time.sleep(SQL_LATENCY)
+
+    yield engine, Session
+    engine.dispose()
+
+
+def build_app(Session, route_class=None) -> FastAPI:
+    """仅挂载发布接口的测试应用"""
+    router = APIRouter(route_class=route_class) if route_class else APIRouter()
+    router.add_api_route("/publish", ui_editor.publish_config, methods=["POST"])
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(router, prefix="/ui-editor")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    return app
+
+
+async def measure_loop_lag_during_publish(app: FastAPI):
+    """发布期间每 5ms 打点，返回 (最大事件循环延迟, 响应)"""
+    max_lag = 0.0
+    done = asyncio.Event()
+
+    async def ticker():
+        nonlocal max_lag
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            max_lag = max(max_lag, time.perf_counter() - start - 0.005)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        tick = asyncio.create_task(ticker())
+        await asyncio.sleep(0.02)
+        resp = await client.post("/ui-editor/publish", json=None)
+        done.set()
+        await tick
+    return max_lag, resp
+
+
+class TestBlockingGuard:
+    """阻塞防护测试类"""
+
+    def test_depends_on_detects_nested_get_db(self):
+        assert depends_on(ui_editor.publish_config, get_db)
+        assert depends_on(get_current_user, get_db)
+
+        def no_db_endpoint(page: int = 1):
+            return page
+
+        assert not depends_on(no_db_endpoint, get_db)
+
+    @pytest.mark.asyncio
+    async def test_unguarded_publish_blocks_event_loop(self, slow_engine):
+        _, Session = slow_engine
+        lag, resp = await measure_loop_lag_during_publish(build_app(Session))
+        assert resp.status_code == 200
+        # 整个发布在事件循环上同步执行
+        assert lag > SQL_LATENCY * 5
+
+    @pytest.mark.asyncio
+    async def test_offloaded_publish_keeps_event_loop_responsive(self, slow_engine, monkeypatch):
+        _, Session = slow_engine
+        monkeypatch.setattr(settings, "ASYNC_BLOCKING_GUARD", "offload")
+        lag, resp = await measure_loop_lag_during_publish(build_app(Session, BlockingGuardRoute))
+        assert resp.status_code == 200
+        assert resp.json()["data"]["version"] == 1
+        assert lag < SQL_LATENCY * 2
+
+    def test_detect_mode_logs_blocking_endpoint(self, slow_engine, monkeypatch, caplog):
+        engine, Session = slow_engine
+        monkeypatch.setattr(settings, "ASYNC_BLOCKING_GUARD", "detect")
+        monkeypatch.setattr(blocking_guard, "install_blocking_db_detector", lambda _: None)
+        install_blocking_db_detector(engine)
+        app = build_app(Session, BlockingGuardRoute)
+
+        async def call():
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.post("/ui-editor/publish", json=None)
+
+        with caplog.at_level(logging.WARNING, logger="app.core.blocking_guard"):
+            resp = asyncio.run(call())
+        assert resp.status_code == 200
+        assert any("publish_config" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,176 @@
+"""
+预约决策上下文与报价测试
+
+- BookingContext 按固定条数查询加载，与预约时长无关
+- SSS 免费额度、逐小时定价（规则 + 默认价兜底）、优惠券抵扣
+- 报价接口不写库；创建预约复用同一报价，券不可用时在写库前拒绝
+- 微信预下单失败：预约取消，回退免费额度台账并解锁优惠券
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, func
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401
+from app.api.deps import get_current_member
+from app.core.database import Base, get_db
+from app.models import Member, MemberLevel, Venue, Coach, Reservation, MemberCoupon, CouponTemplate, CoinRecord
+from app.models.venue_price import VenuePriceRule
+from app.core.wechat_pay import wechat_pay
+from app.services import daily_usage_service
+from app.services.booking_context import BookingContext
+from app.services.booking_service import BookingService
+
+TODAY = date.today()
+
+
+@pytest.fixture
+def Session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add(MemberLevel(id=3, name="SSS", level=3, level_code="SSS", can_book_venue=True,
+                           booking_range_days=3, daily_free_hours=2))
+        db.add(Member(id=1, nickname="会员", phone="13800000000", level_id=3, coin_balance=500,
+                      subscription_status="active", member_expire_time=datetime.now() + timedelta(days=30)))
+        db.add(Venue(id=1, name="1号场", type_id=1, price=Decimal("50")))
+        db.add_all([VenuePriceRule(venue_id=1, day_of_week=TODAY.weekday(), hour=h, price=Decimal("80"))
+                    for h in (18, 19)])
+        db.add(Coach(id=1, coach_no="C001", name="教练", phone="13900000000", price=Decimal("100")))
+        db.add(CouponTemplate(id=1, name="满减券", type="cash", applicable_type="venue"))
+        db.add(MemberCoupon(id=1, template_id=1, member_id=1, name="满减券", type="cash",
+                            discount_value=Decimal("30"), min_amount=Decimal("0"), status="unused",
+                            start_time=datetime.now() - timedelta(days=1), end_time=datetime.now() + timedelta(days=1)))
+        db.add(Reservation(reservation_no="R0", member_id=1, venue_id=1, reservation_date=TODAY,
+                           start_time=time(9), end_time=time(10), duration=60, status="pending"))
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+def load(db, **kwargs):
+    member = db.get(Member, 1)
+    return BookingContext.load(db, member, TODAY, **kwargs)
+
+
+class TestBookingContext:
+    """上下文加载测试类"""
+
+    def test_fixed_query_count(self, Session):
+        with Session() as db:
+            member = db.get(Member, 1)
+            statements = []
+            event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+            ctx = BookingContext.load(db, member, TODAY, venue_id=1, coach_id=1, coupon_id=1)
+            loaded = len(statements)
+            BookingService(db).quote_booking(ctx, "08:00", "20:00", 720)
+            assert loaded <= 6
+            assert len(statements) == loaded
+
+    def test_quote_prices(self, Session):
+        with Session() as db:
+            quote = BookingService(db).quote_booking(load(db, venue_id=1, coach_id=1, coupon_id=1),
+                                                     "17:00", "20:00", 180)
+        # 17点默认价 50 + 18/19点规则价 80；当日已用 60 分钟，剩余免费 60 分钟抵扣 1/3
+        assert quote["venue_price"] == 210
+        assert [item["price"] for item in quote["price_breakdown"]] == [50, 80, 80]
+        assert quote["sss_discount"] == 70
+        assert quote["coach_price"] == 300
+        assert quote["coupon_discount"] == 30
+        assert quote["actual_price"] == 140 + 300 - 30
+        assert quote["free_usage_info"]["free_minutes"] == 60
+
+    def test_invalid_coupon(self, Session):
+        with Session() as db:
+            with pytest.raises(ValueError, match="优惠券不存在或已使用"):
+                BookingService(db).quote_booking(load(db, venue_id=1, coupon_id=99), "18:00", "19:00", 60)
+
+    def test_permission_denied_returned(self, Session):
+        with Session() as db:
+            member = db.get(Member, 1)
+            ctx = BookingContext.load(db, member, TODAY + timedelta(days=10), venue_id=1)
+            quote = BookingService(db).quote_booking(ctx, "18:00", "19:00", 60)
+        assert quote["can_book"] is False
+        assert "提前3天" in quote["reason"]
+
+
+@pytest.fixture
+def client(Session):
+    from app.api.v1.member import booking
+
+    db = Session()
+    app = FastAPI()
+    app.include_router(booking.router, prefix="/member")
+    app.dependency_overrides[get_db] = lambda: db
+    app.dependency_overrides[get_current_member] = lambda: db.get(Member, 1)
+    yield TestClient(app)
+    db.close()
+
+
+class TestQuoteEndpoint:
+    """报价接口测试类"""
+
+    def test_quote_is_dry_run(self, client, Session):
+        body = {"venue_id": 1, "reservation_date": TODAY.isoformat(), "start_time": "18:00",
+                "end_time": "20:00", "duration": 120, "coupon_id": 1, "pay_type": "coin"}
+
+        quote = client.post("/member/reservations/quote", json=body).json()["data"]
+        assert (quote["venue_price"], quote["sss_discount"], quote["coupon_discount"]) == (160, 80, 30)
+        assert quote["actual_price"] == 50
+        with Session() as db:
+            assert db.query(func.count(Reservation.id)).scalar() == 1
+            assert db.query(CoinRecord).count() == 0
+            assert db.get(Member, 1).coin_balance == 500
+            assert db.get(MemberCoupon, 1).status == "unused"
+
+    def test_create_rejects_invalid_coupon_before_writing(self, client, Session):
+        body = {"venue_id": 1, "reservation_date": TODAY.isoformat(), "start_time": "18:00",
+                "end_time": "19:00", "duration": 60, "coupon_id": 99}
+        response = client.post("/member/reservations", json=body)
+        assert response.status_code == 400
+        assert response.json()["detail"] == "优惠券不存在或已使用"
+        with Session() as db:
+            assert db.query(func.count(Reservation.id)).scalar() == 1
+
+    def test_quote_bad_date(self, client):
+        assert client.post("/member/reservations/quote", json={"reservation_date": "x"}).status_code == 400
+
+
+class TestWechatPrepayFailure:
+    """微信预下单失败测试类"""
+
+    def test_cancel_releases_usage_and_coupon(self, client, Session, monkeypatch):
+        from app.api.v1.member import booking
+
+        def reservation(**kwargs):
+            # SQLite 的 Time 列只接受 time 对象（MySQL 接受接口传入的 "HH:MM"）
+            for key in ("start_time", "end_time"):
+                kwargs[key] = time.fromisoformat(kwargs[key])
+            return Reservation(**kwargs)
+
+        monkeypatch.setattr(booking, "Reservation", reservation)
+        with Session() as db:
+            db.get(Member, 1).openid = "openid-1"
+            db.commit()
+        monkeypatch.setattr(wechat_pay, "create_jsapi_order", lambda **kwargs: {"error": "下单失败"})
+        body = {"venue_id": 1, "reservation_date": TODAY.isoformat(), "start_time": "18:00",
+                "end_time": "20:00", "duration": 120, "coupon_id": 1, "pay_type": "wechat"}
+
+        response = client.post("/member/reservations", json=body)
+        assert response.status_code == 500
+        with Session() as db:
+            created = db.query(Reservation).filter(Reservation.reservation_no != "R0").one()
+            assert created.status == "cancelled"
+            assert db.get(MemberCoupon, 1).status == "unused"
+            assert daily_usage_service.get_used_minutes(db, 1, TODAY) == 60
@@ -0,0 +1,134 @@
+"""
+公开目录接口缓存测试
+
+- 场馆类型数量一次分组查询，命中缓存后不再查库
+- ETag/If-None-Match 返回 304，并带 Cache-Control
+- 后台修改场馆/轮播图后按标签失效
+"""
+from types import SimpleNamespace
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base, get_db
+from app.api.deps import get_current_user
+from app.api.v1 import member_api, venues, messages
+from app.models import Venue, VenueType
+from app.models.message import Banner
+from app.services.catalog_cache import CatalogCache, catalog_cache, TAG_BANNERS
+
+
+@pytest.fixture
+def env():
+    """挂载会员端目录接口与后台场馆/消息接口的测试应用"""
+    catalog_cache.clear()
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db = Session()
+    db.add_all([
+        VenueType(id=1, name="网球", sort=1, status=True),
+        VenueType(id=2, name="壁球", sort=2, status=True),
+        VenueType(id=3, name="高尔夫", sort=3, status=True),
+    ])
+    db.add_all([
+        Venue(id=1, name="1号场", type_id=1, price=100, status=1),
+        Venue(id=2, name="2号场", type_id=1, price=80, status=1),
+        Venue(id=3, name="壁球1号", type_id=2, price=60, status=1),
+    ])
+    db.add(Banner(id=1, title="开业", image="/uploads/b.jpg", sort_order=1))
+    db.commit()
+    db.close()
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(member_api.router, prefix="/member")
+    app.include_router(venues.router, prefix="/venues")
+    app.include_router(messages.router, prefix="/messages")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    with TestClient(app) as c:
+        yield c, statements
+    catalog_cache.clear()
+    engine.dispose()
+
+
+class TestCatalogCache:
+    """目录缓存测试类"""
+
+    def test_venue_types_counts_in_one_query_and_cached(self, env):
+        client, statements = env
+        resp = client.get("/member/venue-types")
+        counts = {t["name"]: t["venue_count"] for t in resp.json()["data"]}
+        assert counts == {"网球": 2, "壁球": 1, "高尔夫": 0}
+        # 类型列表 + 分组计数
+        assert len(statements) == 2
+
+        statements.clear()
+        assert client.get("/member/venue-types").json()["data"][0]["venue_count"] == 2
+        assert statements == []
+
+    def test_etag_and_cache_control(self, env):
+        client, statements = env
+        resp = client.get("/member/banners")
+        assert resp.headers["cache-control"].startswith("public, max-age=")
+        etag = resp.headers["etag"]
+
+        statements.clear()
+        resp = client.get("/member/banners", headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert statements == []
+
+    def test_admin_venue_change_invalidates(self, env):
+        client, _ = env
+        assert client.get("/member/venue-types").json()["data"][0]["venue_count"] == 2
+
+        assert client.put("/venues/2/status", params={"status": 0}).status_code == 200
+        assert client.get("/member/venue-types").json()["data"][0]["venue_count"] == 1
+
+    def test_admin_banner_change_invalidates(self, env):
+        client, _ = env
+        etag = client.get("/member/banners").headers["etag"]
+
+        assert client.delete("/messages/banners/1").status_code == 200
+        resp = client.get("/member/banners", headers={"If-None-Match": etag})
+        assert resp.status_code == 200
+        assert resp.json()["data"][0]["title"] == "欢迎来到运动社交"
+
+    def test_invalidation_during_build_is_not_cached(self):
+        cache = CatalogCache(ttl=60)
+
+        def builder():
+            # 构建期间后台修改数据
+            cache.invalidate(TAG_BANNERS)
+            return ["stale"]
+
+        cache.get_or_build("banners", (TAG_BANNERS,), builder)
+        assert cache.get("banners") is None
+        cache.get_or_build("banners", (TAG_BANNERS,), lambda: ["fresh"])
+        assert cache.get("banners") is not None
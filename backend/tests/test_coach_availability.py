@@ -0,0 +1,202 @@
+"""
+教练可用性索引测试
+
+- 会员端单日时段、教练端区间排期与原逐小时合并逻辑输出一致
+- 区间命中缓存后不再查询数据库
+- 排期编辑、下单、取消、确认/拒绝、支付回调的批量更新提交后失效对应日期；回滚不失效
+- 缓存为有界 LRU；会员端查询不存在的教练返回 404 且不写缓存，教练端区间倒置或超长时拒绝
+"""
+from datetime import date, time, timedelta
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.models import Coach, CoachScheduleException, CoachWeeklySchedule, Reservation
+from app.services import payment_notify_service
+from app.api.v1.coach_api import get_coach_schedule as coach_range_schedule
+from app.api.v1.member.booking import get_coach_schedule as member_day_schedule
+from app.services.coach_availability import (
+    CoachAvailability, coach_availability, member_day_slots, coach_range_view, build_vector, RESERVED, UNSET
+)
+
+DAY = date(2026, 5, 1)
+
+
+@pytest.fixture
+def factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        db.add(Coach(id=1, coach_no="C001", name="教练", phone="13900000000"))
+        db.add_all([
+            CoachScheduleException(coach_id=1, start_date=DAY, end_date=DAY,
+                                   available_mask=1 << 10, unavailable_mask=1 << 9),
+            CoachScheduleException(coach_id=1, start_date=DAY + timedelta(days=2), end_date=DAY + timedelta(days=2),
+                                   available_mask=1 << 8, unavailable_mask=0),
+        ])
+        db.add(Reservation(id=1, reservation_no="R1", member_id=1, venue_id=1, coach_id=1, reservation_date=DAY,
+                           start_time=time(10), end_time=time(12), duration=120, status="pending"))
+        db.add(Reservation(id=2, reservation_no="R2", member_id=1, venue_id=1, coach_id=1, out_trade_no="RV9",
+                           reservation_date=DAY + timedelta(days=1), start_time=time(14), end_time=time(15),
+                           duration=60, status="unpaid"))
+        db.commit()
+    coach_availability.clear()
+    engine.queries = []
+    event.listen(engine, "before_cursor_execute", lambda *args: engine.queries.append(args[2]))
+    yield Session, engine
+    coach_availability.clear()
+    engine.dispose()
+
+
+def statuses(Session, day=DAY):
+    with Session() as db:
+        return {s["time"]: s["status"] for s in member_day_slots(coach_availability.get_day(db, 1, day))}
+
+
+class TestViews:
+    """视图输出测试类"""
+
+    def test_member_day_slots(self, factory):
+        Session, _ = factory
+        with Session() as db:
+            slots = member_day_slots(coach_availability.get_day(db, 1, DAY))
+        assert len(slots) == 14
+        assert slots[0] == {"time": "08:00", "label": "08:00 - 09:00", "status": "available"}
+        assert [s["status"] for s in slots[1:5]] == ["unavailable", "reserved", "reserved", "available"]
+
+    def test_coach_range_view(self, factory):
+        Session, _ = factory
+        with Session() as db:
+            vectors = coach_availability.get_range(db, 1, DAY, DAY + timedelta(days=3))
+        assert coach_range_view(vectors) == {
+            "2026-05-01": {"09:00": "unavailable", "10:00": "reserved", "11:00": "reserved"},
+            "2026-05-03": {"08:00": "available"},
+        }
+
+    def test_reservation_overrides_schedule(self):
+        vector = build_vector((0, 1 << 10), [(time(9), time(11))])
+        assert (vector[9], vector[10], vector[11]) == (RESERVED, RESERVED, UNSET)
+
+
+class TestCache:
+    """缓存与失效测试类"""
+
+    def test_range_loaded_once(self, factory):
+        Session, engine = factory
+        with Session() as db:
+            coach_availability.get_range(db, 1, DAY, DAY + timedelta(days=30))
+            loads = len(engine.queries)
+            assert loads == 3  # 每周模板、排期例外、预约
+            coach_availability.get_range(db, 1, DAY, DAY + timedelta(days=30))
+            coach_availability.get_day(db, 1, DAY + timedelta(days=7))
+            assert len(engine.queries) == loads
+
+    def test_schedule_edit_invalidates(self, factory):
+        Session, _ = factory
+        assert statuses(Session)["08:00"] == "available"
+        with Session() as db:
+            db.add(CoachScheduleException(coach_id=1, start_date=DAY, end_date=DAY,
+                                          available_mask=0, unavailable_mask=1 << 8))
+            db.commit()
+        assert statuses(Session)["08:00"] == "unavailable"
+
+    def test_weekly_template_invalidates_all_days(self, factory):
+        Session, _ = factory
+        later = DAY + timedelta(days=14)
+        assert statuses(Session, later)["20:00"] == "available"
+        with Session() as db:
+            db.add(CoachWeeklySchedule(coach_id=1, weekday=later.weekday(), available_mask=0,
+                                       unavailable_mask=1 << 20))
+            db.commit()
+        assert statuses(Session, later)["20:00"] == "unavailable"
+
+    def test_booking_moved_invalidates_both_days(self, factory):
+        Session, _ = factory
+        next_day = DAY + timedelta(days=3)
+        assert statuses(Session)["10:00"] == "reserved"
+        assert statuses(Session, next_day)["10:00"] == "available"
+        with Session() as db:
+            db.get(Reservation, 1).reservation_date = next_day
+            db.commit()
+        assert statuses(Session)["10:00"] == "available"
+        assert statuses(Session, next_day)["10:00"] == "reserved"
+
+    def test_cancel_and_reject_free_slot(self, factory):
+        Session, _ = factory
+        assert statuses(Session)["11:00"] == "reserved"
+        with Session() as db:
+            db.get(Reservation, 1).status = "cancelled"
+            db.commit()
+        assert statuses(Session)["11:00"] == "available"
+
+    def test_rollback_keeps_cache(self, factory):
+        Session, engine = factory
+        statuses(Session)
+        with Session() as db:
+            db.get(Reservation, 1).status = "cancelled"
+            db.flush()
+            db.rollback()
+        loads = len(engine.queries)
+        assert statuses(Session)["11:00"] == "reserved"
+        assert len(engine.queries) == loads
+
+    def test_payment_bulk_update_invalidates(self, factory):
+        Session, _ = factory
+        day = DAY + timedelta(days=1)
+        assert statuses(Session, day)["14:00"] == "available"
+        with Session() as db:
+            assert payment_notify_service.complete_reservation(db, "RV9", "T9", None)
+            db.commit()
+        assert statuses(Session, day)["14:00"] == "reserved"
+
+
+class TestBounds:
+    """缓存容量与请求校验测试类"""
+
+    def test_lru_evicts_least_recently_used(self, factory):
+        Session, engine = factory
+        cache = CoachAvailability(ttl=60, max_days=5)
+        with Session() as db:
+            cache.get_range(db, 1, DAY, DAY + timedelta(days=3))
+            cache.get_day(db, 1, DAY)  # 最近访问，不被淘汰
+            cache.get_range(db, 1, DAY + timedelta(days=10), DAY + timedelta(days=11))
+            assert len(cache) == 5
+            loads = len(engine.queries)
+            cache.get_day(db, 1, DAY)
+            assert len(engine.queries) == loads
+            cache.get_day(db, 1, DAY + timedelta(days=1))
+            assert len(engine.queries) > loads
+            cache.get_range(db, 1, DAY, DAY + timedelta(days=40))
+            assert len(cache) == 5
+
+    def test_member_unknown_coach_404_without_caching(self, factory):
+        Session, _ = factory
+        with Session() as db:
+            with pytest.raises(HTTPException) as exc:
+                member_day_schedule(999, DAY.isoformat(), db)
+            assert exc.value.status_code == 404
+            assert len(coach_availability) == 0
+            assert member_day_schedule(1, DAY.isoformat(), db).data[0]["status"] == "available"
+
+    def test_coach_range_validated(self, factory):
+        Session, _ = factory
+        with Session() as db:
+            coach = db.get(Coach, 1)
+            for start, end in ((DAY, DAY - timedelta(days=1)), (date(2000, 1, 1), date(2100, 1, 1))):
+                with pytest.raises(HTTPException) as exc:
+                    coach_range_schedule(start.isoformat(), end.isoformat(), coach, db)
+                assert exc.value.status_code == 400
+            assert len(coach_availability) == 0
+            view = coach_range_schedule(DAY.isoformat(), (DAY + timedelta(days=3)).isoformat(), coach, db).data
+            assert view["2026-05-03"] == {"08:00": "available"}
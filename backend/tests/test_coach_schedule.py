@@ -0,0 +1,185 @@
+"""
+教练排期存储测试（每周模板 + 日期例外）
+
+- 掩码叠加：后写入的例外覆盖涉及的小时，其余小时沿用模板
+- 批量设置 90 天只写入常数行；单小时设置合并到当天的单日例外
+- 教练端接口：批量/单时段/每周模板写入后，区间排期读取结果正确
+- 迁移：已有库升级时旧按小时排期迁入例外表（例外表已被提前建好但为空时同样迁移）
+"""
+from datetime import date, datetime, timedelta
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alembic import command
+from alembic.script import ScriptDirectory
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401
+from app.api.deps import get_current_coach
+from app.core.database import Base, get_db
+from app.core.lifecycle import alembic_config
+from app.models import Coach, CoachScheduleException, CoachWeeklySchedule
+from app.services import coach_schedule_service as svc
+from app.services.coach_availability import coach_availability
+
+MONDAY = date(2026, 5, 4)
+
+
+@pytest.fixture
+def Session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine)
+    with factory() as db:
+        db.add(Coach(id=1, coach_no="C001", name="教练", phone="13900000000"))
+        db.commit()
+    coach_availability.clear()
+    yield factory
+    coach_availability.clear()
+    engine.dispose()
+
+
+def masks(Session, day):
+    with Session() as db:
+        return svc.resolve_range(db, 1, day, day)[day]
+
+
+class TestScheduleStore:
+    """模板与例外测试类"""
+
+    def test_exception_overrides_template(self, Session):
+        with Session() as db:
+            svc.set_weekly(db, 1, [0], "available")
+            db.commit()
+            svc.set_slot(db, 1, MONDAY, 9, "unavailable")
+            db.commit()
+            days = svc.resolve_range(db, 1, MONDAY, MONDAY + timedelta(days=7))
+
+        business = svc.hours_mask(svc.BUSINESS_HOURS)
+        assert days[MONDAY] == (business & ~(1 << 9), 1 << 9)
+        assert days[MONDAY + timedelta(days=1)] == (0, 0)
+        assert days[MONDAY + timedelta(days=7)] == (business, 0)
+
+    def test_batch_range_constant_writes(self, Session):
+        with Session() as db:
+            statements = []
+            event.listen(db.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+            svc.set_range(db, 1, MONDAY, MONDAY + timedelta(days=89), "available")
+            db.commit()
+            assert len([s for s in statements if s.startswith(("INSERT", "DELETE", "UPDATE"))]) == 2
+
+            svc.set_range(db, 1, MONDAY, MONDAY + timedelta(days=89), "unavailable")
+            db.commit()
+            assert db.query(CoachScheduleException).count() == 1
+
+    def test_slot_merges_into_single_day_exception(self, Session):
+        with Session() as db:
+            svc.set_range(db, 1, MONDAY, MONDAY + timedelta(days=6), "available")
+            db.commit()
+            for hour in (10, 11, 12):
+                svc.set_slot(db, 1, MONDAY, hour, "unavailable")
+                db.commit()
+            assert db.query(CoachScheduleException).count() == 2
+
+        available, unavailable = masks(Session, MONDAY)
+        assert unavailable == (1 << 10) | (1 << 11) | (1 << 12)
+        assert available >> 8 & 1 and not available >> 10 & 1
+
+    def test_weekly_update_merges_hours(self, Session):
+        with Session() as db:
+            svc.set_weekly(db, 1, [0, 2], "available", [8, 9])
+            svc.set_weekly(db, 1, [0], "unavailable", [9])
+            db.commit()
+            assert db.query(CoachWeeklySchedule).count() == 2
+        assert masks(Session, MONDAY) == (1 << 8, 1 << 9)
+
+
+class TestCoachEndpoints:
+    """教练端排期接口测试类"""
+
+    @pytest.fixture
+    def client(self, Session):
+        from app.api.v1 import coach_api
+
+        def override_db():
+            db = Session()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = FastAPI()
+        app.include_router(coach_api.router, prefix="/coach")
+        app.dependency_overrides[get_db] = override_db
+        app.dependency_overrides[get_current_coach] = lambda: Coach(id=1)
+        return TestClient(app)
+
+    def test_batch_then_slot_then_read(self, client):
+        end = MONDAY + timedelta(days=89)
+        params = {"start_date": MONDAY.isoformat(), "end_date": end.isoformat()}
+        assert client.get("/coach/schedule", params=params).json()["data"] == {}
+
+        assert client.post("/coach/schedule/batch", json={**params, "status": "available"}).json()["code"] == 200
+        assert client.post("/coach/schedule", json={
+            "date": MONDAY.isoformat(), "time": "09:00", "status": "unavailable"
+        }).json()["code"] == 200
+
+        data = client.get("/coach/schedule", params=params).json()["data"]
+        assert len(data) == 90
+        assert data[MONDAY.isoformat()]["09:00"] == "unavailable"
+        assert data[end.isoformat()] == {f"{h:02d}:00": "available" for h in svc.BUSINESS_HOURS}
+
+    def test_weekly_template(self, client):
+        assert client.post("/coach/schedule/weekly", json={
+            "weekdays": [0], "status": "unavailable", "times": ["20:00"]
+        }).json()["code"] == 200
+        assert client.get("/coach/schedule/weekly").json()["data"] == {"0": {"20:00": "unavailable"}}
+
+        params = {"start_date": MONDAY.isoformat(), "end_date": (MONDAY + timedelta(days=13)).isoformat()}
+        data = client.get("/coach/schedule", params=params).json()["data"]
+        assert set(data) == {MONDAY.isoformat(), (MONDAY + timedelta(days=7)).isoformat()}
+
+    def test_invalid_status_rejected(self, client):
+        response = client.post("/coach/schedule/batch", json={
+            "start_date": MONDAY.isoformat(), "end_date": MONDAY.isoformat(), "status": "reserved"
+        })
+        assert response.status_code == 400
+
+
+class TestLegacyMigration:
+    """旧排期迁移测试类"""
+
+    @pytest.mark.parametrize("precreated", [False, True])
+    def test_hourly_rows_copied(self, tmp_path, precreated):
+        url = f"sqlite:///{tmp_path}/legacy.db"
+        config = alembic_config(url)
+        baseline = ScriptDirectory.from_config(config).get_revision("0001_baseline_schema").module
+        engine = create_engine(url)
+        baseline.snapshot().create_all(engine)  # 接入 Alembic 前的库
+        now = datetime.now()
+        with engine.begin() as conn:
+            conn.execute(text(
+                "INSERT INTO coach (id, coach_no, name, phone, created_at, updated_at, is_deleted) "
+                "VALUES (1, 'C001', '教练', '13900000000', :now, :now, 0)"
+            ), {"now": now})
+            for slot, status in [("09:00", "available"), ("10:00", "unavailable"), ("10:00", "available"),
+                                 ("11:00", "reserved")]:
+                conn.execute(text(
+                    "INSERT INTO coach_schedule (coach_id, date, time_slot, status, created_at, updated_at) "
+                    "VALUES (1, :day, :slot, :status, :now, :now)"
+                ), {"day": MONDAY, "slot": slot, "status": status, "now": now})
+        if precreated:
+            CoachScheduleException.__table__.create(engine)
+
+        command.upgrade(config, "head")
+        factory = sessionmaker(bind=engine)
+        assert masks(factory, MONDAY) == ((1 << 9) | (1 << 10), 1 << 11)
+        engine.dispose()
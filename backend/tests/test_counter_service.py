@@ -0,0 +1,174 @@
+"""
+热点计数测试
+
+- 分片计数：按容量建分片，满员后拒绝；并发占位不超额；减到 0 为止
+- 分片合计回写业务表计数列；修改容量后 reset 按新容量重建
+- 行内条件增减（组队人数）：上限判断在 UPDATE 条件里，会话内对象同步新值
+- 报名接口：并发报名不超过名额，取消后名额可再用
+"""
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+
+import app.models  # noqa: F401
+from app.models import Activity, ActivityRegistration, CouponTemplate, CounterShard, Member, Team
+from app.services import counter_service
+from app.services.counter_service import (
+    ACTIVITY_PARTICIPANTS, COUPON_ISSUED, TEAM_MEMBERS, claim, counter_rollup, release, reset, total,
+)
+from app.api.v1.member.home import cancel_enrollment, enroll_activity
+
+MEMBERS = 30
+
+
+@pytest.fixture
+def Session(db_factory):
+    start = datetime.now() + timedelta(days=3)
+    with db_factory() as db:
+        db.add_all([
+            Member(id=i, nickname=f"会员{i}", phone=f"1370000{i:04d}", coin_balance=0)
+            for i in range(1, MEMBERS + 1)
+        ])
+        db.add(Activity(id=1, title="周末球赛", start_time=start, end_time=start + timedelta(hours=2),
+                        max_participants=10, current_participants=0, price=0, status="published"))
+        db.add(CouponTemplate(id=1, name="满减券", type="cash", total_count=0, issued_count=3))
+        db.add(Team(id=1, creator_id=1, title="网球约战", sport_type="tennis", activity_date="2099-01-01",
+                    activity_time="10:00", max_members=3, current_members=1))
+        db.commit()
+    yield db_factory
+    counter_rollup.shutdown()
+
+
+def column(Session, model, attr):
+    with Session() as db:
+        return getattr(db.get(model, 1), attr)
+
+
+class TestShardedCounter:
+    """分片计数测试类"""
+
+    def test_capacity_enforced(self, Session):
+        with Session() as db:
+            assert all(claim(db, ACTIVITY_PARTICIPANTS, 1) for _ in range(10))
+            assert not claim(db, ACTIVITY_PARTICIPANTS, 1)
+            db.commit()
+            assert db.query(CounterShard).count() == counter_service.settings.COUNTER_SHARDS
+            assert total(db, ACTIVITY_PARTICIPANTS, 1) == 10
+
+    def test_release_floor(self, Session):
+        with Session() as db:
+            assert claim(db, ACTIVITY_PARTICIPANTS, 1, 2)
+            assert release(db, ACTIVITY_PARTICIPANTS, 1)
+            assert release(db, ACTIVITY_PARTICIPANTS, 1)
+            assert not release(db, ACTIVITY_PARTICIPANTS, 1)
+            assert total(db, ACTIVITY_PARTICIPANTS, 1) == 0
+
+    def test_unlimited_keeps_existing_value(self, Session):
+        with Session() as db:
+            assert all(claim(db, COUPON_ISSUED, 1) for _ in range(50))
+            db.commit()
+            assert total(db, COUPON_ISSUED, 1) == 53
+
+    def test_concurrent_claims_never_overfill(self, Session):
+        barrier = threading.Barrier(MEMBERS)
+        results = []
+
+        def worker():
+            barrier.wait()
+            with Session() as db:
+                ok = claim(db, ACTIVITY_PARTICIPANTS, 1)
+                db.commit()
+                results.append(ok)
+
+        threads = [threading.Thread(target=worker) for _ in range(MEMBERS)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results.count(True) == 10
+        with Session() as db:
+            assert total(db, ACTIVITY_PARTICIPANTS, 1) == 10
+
+    def test_rollup_and_rollback(self, Session):
+        with Session() as db:
+            claim(db, ACTIVITY_PARTICIPANTS, 1, 3)
+            db.commit()
+            claim(db, ACTIVITY_PARTICIPANTS, 1, 2)
+            db.rollback()
+        counter_rollup.flush()
+        assert column(Session, Activity, "current_participants") == 3
+
+    def test_reset_rebuilds_with_new_capacity(self, Session):
+        with Session() as db:
+            assert claim(db, ACTIVITY_PARTICIPANTS, 1, 8)
+            db.commit()
+        with Session() as db:
+            reset(db, ACTIVITY_PARTICIPANTS, 1)
+            db.get(Activity, 1).max_participants = 9
+            db.commit()
+            assert db.query(CounterShard).count() == 0
+            assert db.get(Activity, 1).current_participants == 8
+        with Session() as db:
+            assert claim(db, ACTIVITY_PARTICIPANTS, 1)
+            assert not claim(db, ACTIVITY_PARTICIPANTS, 1)
+
+
+class TestRowCounter:
+    """行内条件增减测试类"""
+
+    def test_team_members_capped(self, Session):
+        with Session() as db:
+            team = db.get(Team, 1)
+            assert claim(db, TEAM_MEMBERS, 1)
+            assert team.current_members == 2
+            assert claim(db, TEAM_MEMBERS, 1)
+            assert not claim(db, TEAM_MEMBERS, 1)
+            assert team.current_members == 3
+            db.commit()
+        assert column(Session, Team, "current_members") == 3
+
+
+class TestEnrollEndpoint:
+    """活动报名接口测试类"""
+
+    def call(self, Session, handler, member_id):
+        with Session() as db:
+            member = db.get(Member, member_id)
+            try:
+                handler(1, db, member)
+                return "ok"
+            except HTTPException as e:
+                return e.detail
+
+    def test_concurrent_enroll_and_cancel(self, Session):
+        barrier = threading.Barrier(MEMBERS)
+        results = []
+
+        def worker(member_id):
+            barrier.wait()
+            results.append(self.call(Session, enroll_activity, member_id))
+
+        threads = [threading.Thread(target=worker, args=(m,)) for m in range(1, MEMBERS + 1)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert results.count("ok") == 10
+        assert set(results) == {"ok", "报名名额已满"}
+
+        with Session() as db:
+            enrolled = [r.member_id for r in db.query(ActivityRegistration)]
+        assert len(enrolled) == 10
+        assert self.call(Session, cancel_enrollment, enrolled[0]) == "ok"
+        waiting = next(m for m in range(1, MEMBERS + 1) if m not in enrolled)
+        assert self.call(Session, enroll_activity, waiting) == "ok"
+
+        counter_rollup.flush()
+        assert column(Session, Activity, "current_participants") == 10
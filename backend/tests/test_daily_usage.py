@@ -0,0 +1,175 @@
+"""
+会员每日预约时长台账测试
+
+- 下单、取消、删除、改期、改时长随 ORM 写入同事务增减；回滚不变
+- 支付失败的批量取消同步扣减；rebuild 与 SUM 一致
+- 并发下单：两笔同时占用最后一小时免费额度，只有一笔免费
+- 迁移：已有库升级时按现有预约回填台账（台账表已被提前建好但为空时同样回填）
+"""
+import threading
+import time as time_module
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alembic import command
+from alembic.script import ScriptDirectory
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.core.lifecycle import alembic_config
+from app.models import Member, Reservation, MemberDailyUsage
+from app.services import daily_usage_service, payment_notify_service
+
+DAY = date(2026, 5, 1)
+
+
+@pytest.fixture
+def Session(db_factory):
+    with db_factory() as db:
+        db.add(Member(id=1, nickname="会员", phone="13800000000"))
+        db.commit()
+    yield db_factory
+
+
+def reservation(no, minutes=60, day=DAY, **kwargs):
+    return Reservation(reservation_no=no, member_id=1, venue_id=1, reservation_date=day,
+                       start_time=time(10), end_time=time(11), duration=minutes, **kwargs)
+
+
+def used(Session, day=DAY):
+    with Session() as db:
+        return daily_usage_service.get_used_minutes(db, 1, day)
+
+
+class TestLedger:
+    """台账维护测试类"""
+
+    def test_booking_and_cancellation(self, Session):
+        with Session() as db:
+            db.add_all([reservation("R1", 60), reservation("R2", 90), reservation("R3", 30, status="cancelled")])
+            db.commit()
+        assert used(Session) == 150
+
+        with Session() as db:
+            db.query(Reservation).filter_by(reservation_no="R1").one().status = "cancelled"
+            db.commit()
+        assert used(Session) == 90
+
+        with Session() as db:
+            db.query(Reservation).filter_by(reservation_no="R2").one().is_deleted = True
+            db.commit()
+        assert used(Session) == 0
+
+    def test_reschedule_duration_and_delete(self, Session):
+        next_day = DAY + timedelta(days=1)
+        with Session() as db:
+            db.add(reservation("R1", 60))
+            db.commit()
+            r = db.query(Reservation).one()
+            r.reservation_date = next_day
+            r.duration = 120
+            db.commit()
+            assert (used(Session), used(Session, next_day)) == (0, 120)
+
+            db.delete(r)
+            db.commit()
+        assert used(Session, next_day) == 0
+
+    def test_rollback_leaves_ledger(self, Session):
+        with Session() as db:
+            db.add(reservation("R1", 60))
+            db.flush()
+            db.rollback()
+        assert used(Session) == 0
+        with Session() as db:
+            assert db.query(MemberDailyUsage).count() == 0
+
+    def test_payment_failure_releases_minutes(self, Session):
+        with Session() as db:
+            db.add(reservation("R1", 60, status="unpaid", out_trade_no="RV1"))
+            db.commit()
+        assert used(Session) == 60
+        with Session() as db:
+            assert payment_notify_service.cancel_unpaid_reservation(db, "RV1", None)
+            db.commit()
+        assert used(Session) == 0
+
+    def test_rebuild(self, Session):
+        with Session() as db:
+            db.add_all([reservation("R1", 60), reservation("R2", 45)])
+            db.commit()
+            db.query(MemberDailyUsage).update({"used_minutes": 999})
+            db.commit()
+            assert daily_usage_service.rebuild(db, 1, DAY) == 105
+            db.commit()
+        assert used(Session) == 105
+
+
+class TestQuotaClaim:
+    """免费额度并发占用测试类"""
+
+    def test_concurrent_bookings_share_last_free_hour(self, Session):
+        free_limit = 120
+        with Session() as db:
+            db.add(reservation("R0", 60))
+            db.commit()
+
+        barrier = threading.Barrier(2)
+        free = []
+
+        def book(no):
+            with Session() as db:
+                barrier.wait()
+                r = reservation(no, 60)
+                db.add(r)
+                used_before = daily_usage_service.claim_used_minutes(db, r, DAY)
+                free.append(min(60, max(0, free_limit - used_before)))
+                time_module.sleep(0.1)  # 持有台账行锁期间另一笔下单需等待
+                db.commit()
+
+        threads = [threading.Thread(target=book, args=(f"R{i}",)) for i in (1, 2)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert sorted(free) == [0, 60]
+        assert used(Session) == 180
+
+
+class TestLegacyMigration:
+    """台账回填迁移测试类"""
+
+    @pytest.mark.parametrize("precreated", [False, True])
+    def test_backfill_from_reservations(self, tmp_path, precreated):
+        url = f"sqlite:///{tmp_path}/legacy.db"
+        config = alembic_config(url)
+        baseline = ScriptDirectory.from_config(config).get_revision("0001_baseline_schema").module
+        engine = create_engine(url)
+        baseline.snapshot().create_all(engine)  # 接入 Alembic 前的库
+        now = datetime.now()
+        with engine.begin() as conn:
+            for no, member_id, duration, status, deleted in [
+                ("R1", 1, 60, "pending", 0), ("R2", 1, 30, "confirmed", 0), ("R3", 1, 90, "cancelled", 0),
+                ("R4", 1, 120, "pending", 1), ("R5", 2, 60, "completed", 0),
+            ]:
+                conn.execute(text(
+                    "INSERT INTO reservation (reservation_no, member_id, venue_id, reservation_date, start_time, "
+                    "end_time, duration, status, created_at, updated_at, is_deleted) "
+                    "VALUES (:no, :member_id, 1, :day, '10:00:00', '11:00:00', :duration, :status, :now, :now, :deleted)"
+                ), {"no": no, "member_id": member_id, "day": DAY, "duration": duration, "status": status,
+                    "now": now, "deleted": deleted})
+        if precreated:
+            MemberDailyUsage.__table__.create(engine)
+
+        command.upgrade(config, "head")
+        with sessionmaker(bind=engine)() as db:
+            assert daily_usage_service.get_used_minutes(db, 1, DAY) == 90
+            assert daily_usage_service.get_used_minutes(db, 2, DAY) == 60
+        engine.dispose()
@@ -0,0 +1,106 @@
+"""
+上传图片衍生图测试
+
+- 上传大图后生成 thumb/card/full 及 WebP 衍生图，尺寸受限
+- resolve_image_url 按场景返回衍生图，无衍生图时回退原图
+"""
+import asyncio
+import io
+import os
+from types import SimpleNamespace
+
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from PIL import Image
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base, get_async_db
+from app.api.deps import get_current_user
+from app.api.v1 import upload
+from app.api.v1.member_api import resolve_image_url
+from app.services.image_pipeline import IMAGE_VARIANTS, generate_derivatives
+
+
+def make_jpeg(width=3000, height=2000) -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (width, height), (30, 120, 60)).save(buf, "JPEG", quality=95)
+    return buf.getvalue()
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    """在临时目录下运行的上传接口"""
+    monkeypatch.chdir(tmp_path)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(setup())
+
+    async def override_get_async_db():
+        async with factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(upload.router, prefix="/upload")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    with TestClient(app) as c:
+        yield c
+    asyncio.run(engine.dispose())
+
+
+class TestImagePipeline:
+    """衍生图测试类"""
+
+    def test_generate_derivatives_sizes(self, tmp_path):
+        src = tmp_path / "a.jpg"
+        src.write_bytes(make_jpeg())
+        results = generate_derivatives(str(src))
+
+        for variant, size in IMAGE_VARIANTS.items():
+            with Image.open(results[variant]) as img:
+                assert max(img.size) == size
+                assert img.format == "JPEG"
+            with Image.open(results[f"{variant}_webp"]) as img:
+                assert img.format == "WEBP"
+        assert os.path.getsize(results["thumb"]) < src.stat().st_size / 10
+
+    def test_gif_is_left_untouched(self, tmp_path):
+        src = tmp_path / "a.gif"
+        Image.new("P", (50, 50)).save(src, "GIF")
+        assert generate_derivatives(str(src)) == {}
+
+    def test_upload_returns_variants_and_resolve_picks_context(self, client):
+        resp = client.post(
+            "/upload/image",
+            files={"file": ("big.jpg", make_jpeg(), "image/jpeg")},
+        )
+        data = resp.json()["data"]
+        url = data["url"]
+        assert data["variants"]["thumb"] == url[:-4] + ".thumb.jpg"
+        assert data["variants"]["card_webp"] == url[:-4] + ".card.webp"
+        assert os.path.exists(data["variants"]["full"].lstrip("/"))
+
+        assert resolve_image_url(url, "thumb") == data["variants"]["thumb"]
+        assert resolve_image_url(url) == url
+        # 历史图片无衍生图时回退原图
+        assert resolve_image_url("/uploads/images/old.jpg", "thumb") == "/uploads/images/old.jpg"
+
+    def test_delete_legacy_file_removes_derivatives(self, client):
+        os.makedirs("uploads/images")
+        with open("uploads/images/old.jpg", "wb") as f:
+            f.write(make_jpeg(800, 600))
+        generate_derivatives("uploads/images/old.jpg")
+
+        resp = client.delete("/upload/file", params={"path": "/uploads/images/old.jpg"})
+        assert resp.status_code == 200
+        assert os.listdir("uploads/images") == []
@@ -0,0 +1,135 @@
+"""
+路由按需加载测试
+
+- 导入应用不加载路由模块，也不导入重量级可选依赖（httpx/requests/Crypto/PIL/qrcode）
+- 首次请求落到前缀下才导入模块；前缀按路径段匹配（/members 不触发 /member）
+- 前缀下无匹配路由时继续交给后面的路由；方法不匹配返回 405
+- 依赖覆盖、OpenAPI 文档与急加载时一致
+"""
+import os
+import subprocess
+import types
+
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import APIRouter, Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.lazy_router import expand_routes, install_openapi, lazy_routers, mount_router, preload_routers
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def current_user():
+    return "real"
+
+
+def make_module(monkeypatch, name: str, router: APIRouter):
+    module = types.ModuleType(name)
+    module.router = router
+    monkeypatch.setitem(sys.modules, name, module)
+
+
+@pytest.fixture
+def lazy_app(monkeypatch):
+    member = APIRouter()
+
+    @member.get("/profile")
+    def profile(user: str = Depends(current_user)):
+        return {"user": user}
+
+    @member.post("/orders")
+    def create_order():
+        return {"created": True}
+
+    members = APIRouter()
+
+    @members.get("")
+    def member_list():
+        return {"list": []}
+
+    scan = APIRouter()
+
+    @scan.get("/member/scan/{code}")
+    def member_scan(code: str):
+        return {"scan": code}
+
+    make_module(monkeypatch, "fake_member_api", member)
+    make_module(monkeypatch, "fake_members", members)
+    make_module(monkeypatch, "fake_staff_scan", scan)
+
+    app = FastAPI()
+    mount_router(app, "fake_members", "/api/v1/members", ["会员管理"])
+    mount_router(app, "fake_member_api", "/api/v1/member", ["会员端API"])
+    mount_router(app, "fake_staff_scan", "/api/v1", ["前台扫码核销"])
+    install_openapi(app)
+    return app
+
+
+def loaded(app):
+    return {route.module for route in lazy_routers(app) if route.loaded}
+
+
+class TestLazyRouter:
+    """路由按需加载测试类"""
+
+    def test_import_app_loads_no_routers_or_heavy_modules(self):
+        code = (
+            "import sys, app.main as m\n"
+            "from app.core.lazy_router import lazy_routers\n"
+            "heavy = [n for n in ('httpx', 'requests', 'Crypto', 'PIL', 'qrcode') if n in sys.modules]\n"
+            "print(sum(r.loaded for r in lazy_routers(m.app)), len(lazy_routers(m.app)), heavy)\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=BACKEND_DIR,
+                                capture_output=True, text=True, timeout=120)
+        assert result.returncode == 0, result.stderr
+        loaded_count, total, heavy = result.stdout.strip().split(" ", 2)
+        assert loaded_count == "0" and int(total) > 20
+        assert heavy == "[]"
+
+    def test_module_loaded_on_first_request(self, lazy_app):
+        client = TestClient(lazy_app)
+        assert loaded(lazy_app) == set()
+
+        assert client.get("/api/v1/member/profile").json() == {"user": "real"}
+        assert loaded(lazy_app) == {"fake_member_api"}
+
+    def test_prefix_matches_whole_segment(self, lazy_app):
+        client = TestClient(lazy_app)
+        assert client.get("/api/v1/members").json() == {"list": []}
+        assert "fake_member_api" not in loaded(lazy_app)
+
+    def test_unmatched_path_falls_through_to_later_router(self, lazy_app):
+        client = TestClient(lazy_app)
+        assert client.get("/api/v1/member/scan/R1").json() == {"scan": "R1"}
+        assert client.get("/api/v1/member/unknown").status_code == 404
+
+    def test_method_mismatch_returns_405(self, lazy_app):
+        client = TestClient(lazy_app)
+        assert client.get("/api/v1/member/orders").status_code == 405
+        assert client.post("/api/v1/member/orders").json() == {"created": True}
+
+    def test_dependency_overrides_apply(self, lazy_app):
+        lazy_app.dependency_overrides[current_user] = lambda: "override"
+        client = TestClient(lazy_app)
+        assert client.get("/api/v1/member/profile").json() == {"user": "override"}
+
+    def test_openapi_and_preload_include_lazy_routes(self, lazy_app):
+        paths = TestClient(lazy_app).get("/openapi.json").json()["paths"]
+        assert {"/api/v1/members", "/api/v1/member/profile", "/api/v1/member/scan/{code}"} <= set(paths)
+        assert paths["/api/v1/member/profile"]["get"]["tags"] == ["会员端API"]
+        assert set(preload_routers(lazy_app, ["fake_members"])) == {"fake_members"}
+
+    def test_app_routes_match_eager_include(self):
+        from app.main import app
+
+        lazy_paths = [(r.path, sorted(r.methods)) for r in expand_routes(app.routes) if hasattr(r, "methods")]
+        eager = FastAPI()
+        for route in lazy_routers(app):
+            mount_router(eager, route.module, route.prefix, route.tags, lazy=False)
+        eager_paths = [(r.path, sorted(r.methods)) for r in eager.routes
+                       if hasattr(r, "methods") and r.path.startswith("/api/")]
+        assert [p for p in lazy_paths if p[0].startswith("/api/")] == eager_paths
@@ -0,0 +1,111 @@
+"""
+启动生命周期测试
+
+- 导入应用不连接数据库（数据库不可用时照常启动）
+- /health 只反映存活；/ready 需数据库可连、迁移到最新且预热完成
+- 预热失败后由就绪探针重试
+"""
+import os
+import subprocess
+
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alembic import command
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+
+import app.models  # noqa: F401
+from app.core import lifecycle
+from app.core.database import Base
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(autouse=True)
+def fresh_state(monkeypatch):
+    lifecycle.reset_state()
+    monkeypatch.setattr(lifecycle, "_warmup_hooks", [])
+    yield
+    lifecycle.reset_state()
+
+
+@pytest.fixture
+def migrated_engine(tmp_path):
+    url = f"sqlite:///{tmp_path}/migrated.db"
+    command.upgrade(lifecycle.alembic_config(url), "head")
+    eng = create_engine(url)
+    yield eng
+    eng.dispose()
+
+
+@pytest.fixture
+def client(monkeypatch):
+    from app import main
+    with TestClient(main.app) as c:
+        yield c, main
+
+
+class TestLifecycle:
+    """启动生命周期测试类"""
+
+    def test_import_does_not_connect_to_database(self):
+        env = dict(os.environ, DATABASE_URL="mysql+pymysql://u:p@127.0.0.1:1/unreachable")
+        result = subprocess.run(
+            [sys.executable, "-c", "import app.main"],
+            cwd=BACKEND_DIR, env=env, capture_output=True, text=True, timeout=120,
+        )
+        assert result.returncode == 0, result.stderr
+
+    def test_ready_requires_migrations(self, client, monkeypatch, tmp_path):
+        c, main = client
+        eng = create_engine(f"sqlite:///{tmp_path}/legacy.db")
+        Base.metadata.create_all(bind=eng)  # 旧方式建表，未执行 alembic
+        monkeypatch.setattr(main, "engine", eng)
+
+        assert c.get("/health").status_code == 200
+        resp = c.get("/ready")
+        assert resp.status_code == 503
+        assert "alembic upgrade head" in resp.json()["checks"]["schema"]
+        eng.dispose()
+
+    def test_ready_after_migration_and_warmup(self, client, monkeypatch, migrated_engine):
+        c, main = client
+        monkeypatch.setattr(main, "engine", migrated_engine)
+
+        resp = c.get("/ready")
+        assert resp.status_code == 200
+        assert resp.json()["checks"] == {"database": "ok", "schema": "ok", "warmup": "ok"}
+
+    def test_database_unavailable_is_not_ready(self, client, monkeypatch):
+        c, main = client
+        monkeypatch.setattr(main, "engine", create_engine("sqlite:////nonexistent-dir/x.db"))
+        resp = c.get("/ready")
+        assert resp.status_code == 503
+        assert resp.json()["checks"]["database"] != "ok"
+        assert c.get("/health").status_code == 200
+
+    def test_failed_warmup_is_retried_by_probe(self, client, monkeypatch, migrated_engine):
+        c, main = client
+        monkeypatch.setattr(main, "engine", migrated_engine)
+        calls = {"flaky": 0, "stable": 0}
+
+        def flaky():
+            calls["flaky"] += 1
+            if calls["flaky"] == 1:
+                raise ConnectionError("db starting")
+
+        def stable():
+            calls["stable"] += 1
+
+        monkeypatch.setattr(lifecycle, "_warmup_hooks", [("stable", stable), ("flaky", flaky)])
+        lifecycle.reset_state()  # 丢弃启动事件中（无钩子）的预热结果
+        resp = c.get("/ready")
+        assert resp.status_code == 503
+        assert "flaky" in resp.json()["checks"]["warmup"]
+
+        assert c.get("/ready").status_code == 200
+        # 已成功的钩子不重复执行
+        assert calls == {"flaky": 2, "stable": 1}
@@ -0,0 +1,301 @@
+"""
+积分商城库存测试
+
+- 普通商品条件扣减：不足时不扣；并发兑换不超卖
+- 限购台账：条件累加，超出限购拒绝，回滚不计入
+- 秒杀令牌池：预分配不超过库存；提交计入已售并异步回写，回滚退回池内，归还后 stock 复原
+- 令牌租约：后台改库存按其他进程持有的令牌折算（低于已预分配量拒绝）；下架后令牌归还；
+  崩溃进程的租约超时后扣除近期订单归还 stock，租约被回收的进程丢弃池内令牌
+- 兑换接口：并发兑换秒杀商品不超卖，失败请求不扣积分
+- 迁移：已有库升级时按现有订单回填限购台账（台账表已被提前建好但为空时同样回填）
+"""
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alembic import command
+from alembic.script import ScriptDirectory
+from fastapi import HTTPException
+from sqlalchemy import create_engine, text
+from sqlalchemy.orm import sessionmaker
+
+import app.models  # noqa: F401
+from app.core.lifecycle import alembic_config
+from app.models import FlashSaleLease, Member, PointRecord, Product, ProductOrder, MemberProductPurchase
+from app.services import mall_inventory
+from app.services.mall_inventory import (
+    FlashSalePool, OutOfStock, PurchaseLimitExceeded, claim_purchase_quota, flash_sale_pool, leased_stock,
+    reclaim_orphaned_leases, reserve_stock,
+)
+from app.api.v1.mall import update_product
+from app.api.v1.member.mall import MallExchangeRequest, exchange_mall_goods
+
+MEMBERS = 40
+
+
+@pytest.fixture
+def Session(db_factory):
+    with db_factory() as db:
+        db.add_all([
+            Member(id=i, nickname=f"会员{i}", phone=f"1380000{i:04d}", point_balance=100, coin_balance=0)
+            for i in range(1, MEMBERS + 1)
+        ])
+        db.add_all([
+            Product(id=1, category_id=1, name="水杯", points=10, price=0, stock=5, sales=0),
+            Product(id=2, category_id=1, name="限量球拍", points=10, price=0, stock=10, sales=0,
+                    is_flash_sale=True, purchase_limit=1),
+        ])
+        db.commit()
+    yield db_factory
+    flash_sale_pool.shutdown()
+
+
+def product(Session, product_id):
+    with Session() as db:
+        p = db.get(Product, product_id)
+        return p.stock, p.sales
+
+
+class TestConditionalStock:
+    """普通商品条件扣减测试类"""
+
+    def test_reserve_until_empty(self, Session):
+        with Session() as db:
+            reserve_stock(db, 1, 3)
+            reserve_stock(db, 1, 2)
+            with pytest.raises(OutOfStock):
+                reserve_stock(db, 1, 1)
+            db.commit()
+        assert product(Session, 1) == (0, 5)
+
+
+class TestPurchaseLimit:
+    """限购台账测试类"""
+
+    def test_limit_counts_across_orders(self, Session):
+        with Session() as db:
+            claim_purchase_quota(db, 1, 1, 1, 2)
+            claim_purchase_quota(db, 1, 1, 1, 2)
+            with pytest.raises(PurchaseLimitExceeded):
+                claim_purchase_quota(db, 1, 1, 1, 2)
+            with pytest.raises(PurchaseLimitExceeded):
+                claim_purchase_quota(db, 2, 1, 3, 2)
+            claim_purchase_quota(db, 2, 1, 5, 0)  # 不限购不写台账
+            db.commit()
+            assert [(r.member_id, r.quantity) for r in db.query(MemberProductPurchase)] == [(1, 2)]
+
+    def test_rollback_not_counted(self, Session):
+        with Session() as db:
+            claim_purchase_quota(db, 1, 1, 2, 2)
+            db.rollback()
+            claim_purchase_quota(db, 1, 1, 2, 2)
+            db.commit()
+
+
+class TestFlashSalePool:
+    """秒杀令牌池测试类"""
+
+    def test_commit_rollback_and_release(self, Session):
+        pool = FlashSalePool(batch=4, flush_interval=60)
+        with Session() as db:
+            assert pool.take(db, 2, 1)
+            db.commit()
+        assert product(Session, 2) == (6, 0)  # 预分配 4 个，已售待回写
+        assert pool.available(2) == 3
+
+        with Session() as db:
+            assert pool.take(db, 2, 2)
+            db.rollback()
+        assert pool.available(2) == 3
+
+        with Session() as db:
+            db.get(Product, 2)
+            assert pool.take(db, 2, 1)
+        # 未提交即关闭会话：令牌退回
+        assert pool.available(2) == 3
+
+        pool.flush()
+        assert product(Session, 2) == (6, 1)
+        pool.shutdown()
+        assert product(Session, 2) == (9, 1)
+
+    def test_pools_never_exceed_stock(self, Session):
+        pools = [FlashSalePool(batch=3, flush_interval=60) for _ in range(3)]
+        taken = 0
+        for _ in range(6):
+            for pool in pools:
+                with Session() as db:
+                    if pool.take(db, 2, 1):
+                        taken += 1
+                        db.commit()
+        assert taken == 10
+        assert product(Session, 2)[0] == 0
+        for pool in pools:
+            pool.shutdown()
+        assert product(Session, 2) == (0, 10)
+
+
+class TestFlashSaleLease:
+    """令牌租约测试类"""
+
+    def sell(self, Session, pool, qty=1):
+        with Session() as db:
+            assert pool.take(db, 2, qty)
+            db.commit()
+
+    def leased(self, Session):
+        with Session() as db:
+            return leased_stock(db, [2]).get(2, 0)
+
+    def test_admin_stock_accounts_for_other_workers(self, Session):
+        other = FlashSalePool(batch=4, flush_interval=60)
+        self.sell(Session, other)
+        other.flush()
+        assert product(Session, 2) == (6, 1) and self.leased(Session) == 3
+
+        with Session() as db:
+            assert update_product(2, {"stock": 2}, db, None).code == 400
+            assert update_product(2, {"stock": 5, "name": "限量球拍2"}, db, None).code == 200
+        assert product(Session, 2)[0] == 2  # 5 = 库存 2 + 其他进程令牌 3
+
+        sold = 0
+        while other.available(2) or product(Session, 2)[0]:
+            self.sell(Session, other)
+            sold += 1
+        assert sold == 5
+        other.shutdown()
+        assert product(Session, 2) == (0, 6)
+
+    def test_deactivated_product_tokens_returned(self, Session):
+        pool = FlashSalePool(batch=4, flush_interval=60)
+        self.sell(Session, pool)
+        with Session() as db:
+            db.get(Product, 2).is_active = False
+            db.commit()
+        pool.flush()
+        assert pool.available(2) == 0
+        assert product(Session, 2) == (9, 1) and self.leased(Session) == 0
+        pool.shutdown()
+
+    def test_orphaned_lease_reclaimed(self, Session):
+        crashed = FlashSalePool(batch=4, flush_interval=60, lease_ttl=30)
+        self.sell(Session, crashed)
+        with Session() as db:
+            # 崩溃前已售 1 件（有订单、未回写），心跳早已超时
+            db.add(ProductOrder(order_no="F1", member_id=1, product_id=2, quantity=1, status="pending",
+                                created_at=datetime.utcnow() - timedelta(seconds=40)))
+            db.query(FlashSaleLease).update({"heartbeat_at": datetime.utcnow() - timedelta(seconds=60)})
+            db.commit()
+            assert reclaim_orphaned_leases(db, 30) == 1
+            db.commit()
+        assert product(Session, 2)[0] == 9  # 4 个令牌扣除近期订单 1 件后归还
+        assert self.leased(Session) == 0
+
+        # 进程其实还活着：下次回写发现租约已被回收，丢弃池内令牌而不是再次归还
+        crashed.flush()
+        assert crashed.available(2) == 0
+        crashed.shutdown()
+        assert product(Session, 2)[0] == 9
+
+    def test_live_lease_not_reclaimed(self, Session):
+        pool = FlashSalePool(batch=4, flush_interval=60)
+        self.sell(Session, pool)
+        pool.flush()
+        with Session() as db:
+            assert reclaim_orphaned_leases(db, 30) == 0
+        pool.shutdown()
+        assert self.leased(Session) == 0
+
+
+class TestExchangeEndpoint:
+    """兑换接口并发测试类"""
+
+    def exchange(self, Session, member_id, product_id, qty=1):
+        with Session() as db:
+            member = db.get(Member, member_id)
+            try:
+                exchange_mall_goods(product_id, MallExchangeRequest(quantity=qty), db, member)
+                return "ok"
+            except HTTPException as e:
+                return e.detail
+
+    def run_parallel(self, Session, product_id, attempts):
+        barrier = threading.Barrier(len(attempts))
+        results = []
+
+        def worker(member_id):
+            barrier.wait()
+            results.append(self.exchange(Session, member_id, product_id))
+
+        threads = [threading.Thread(target=worker, args=(m,)) for m in attempts]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_plain_product_no_oversell(self, Session):
+        results = self.run_parallel(Session, 1, range(1, 21))
+        assert results.count("ok") == 5
+        assert set(results) == {"ok", "库存不足"}
+        assert product(Session, 1) == (0, 5)
+        with Session() as db:
+            assert db.query(ProductOrder).count() == 5
+            assert db.query(PointRecord).count() == 5
+
+    def test_flash_sale_no_oversell_and_limit(self, Session):
+        results = self.run_parallel(Session, 2, list(range(1, MEMBERS + 1)) + [1, 2])
+        sold = results.count("ok")
+        # 超出限购的请求退回的令牌可能晚于其他请求售罄判断，只保证不超卖且库存守恒
+        assert 8 <= sold <= 10
+        assert set(results) <= {"ok", "库存不足", "该商品每人限兑1件"}
+        mall_inventory.flash_sale_pool.shutdown()
+        assert product(Session, 2) == (10 - sold, sold)
+        with Session() as db:
+            assert db.query(ProductOrder).count() == sold
+            members = {o.member_id for o in db.query(ProductOrder)}
+            assert len(members) == sold
+            spent = db.query(Member).filter(Member.point_balance < 100).count()
+            assert spent == sold
+
+    def test_insufficient_points_returns_token(self, Session):
+        with Session() as db:
+            db.get(Member, 1).point_balance = 5
+            db.commit()
+        assert self.exchange(Session, 1, 2) == "积分不足"
+        assert flash_sale_pool.available(2) == 10  # 预分配了全部库存，失败的兑换令牌已退回
+        with Session() as db:
+            assert db.query(MemberProductPurchase).count() == 0
+
+
+class TestLegacyMigration:
+    """限购台账回填迁移测试类"""
+
+    @pytest.mark.parametrize("precreated", [False, True])
+    def test_backfill_from_orders(self, tmp_path, precreated):
+        url = f"sqlite:///{tmp_path}/legacy.db"
+        config = alembic_config(url)
+        baseline = ScriptDirectory.from_config(config).get_revision("0001_baseline_schema").module
+        engine = create_engine(url)
+        baseline.snapshot().create_all(engine)  # 接入 Alembic 前的库
+        now = datetime.now()
+        with engine.begin() as conn:
+            for no, member_id, quantity, status in [("M1", 1, 2, "pending"), ("M2", 1, 1, "completed"),
+                                                    ("M3", 1, 5, "cancelled"), ("M4", 2, None, "shipped")]:
+                conn.execute(text(
+                    "INSERT INTO product_order (order_no, member_id, product_id, quantity, status, created_at, updated_at) "
+                    "VALUES (:no, :member_id, 7, :quantity, :status, :now, :now)"
+                ), {"no": no, "member_id": member_id, "quantity": quantity, "status": status, "now": now})
+        if precreated:
+            MemberProductPurchase.__table__.create(engine)
+
+        command.upgrade(config, "head")
+        with sessionmaker(bind=engine)() as db:
+            quantities = {row.member_id: row.quantity for row in db.query(MemberProductPurchase)}
+        assert quantities == {1: 3, 2: 1}
+        engine.dispose()
@@ -0,0 +1,129 @@
+"""
+会员端功能路由拆分与共享序列化层测试
+
+- 每个功能模块的路由路径都登记在 FEATURES 中，且路径首段不被多个模块认领
+- 懒加载时请求只导入其路径所属的功能模块
+- 字段编码函数与原 strftime / json.loads 写法输出一致
+"""
+import importlib
+import os
+from datetime import date, datetime, time, timedelta, timezone
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api.v1.member import FEATURES, serializers
+from app.core.lazy_router import lazy_routers, mount_router
+
+PREFIX = "/api/v1/member"
+
+
+def claimed_by(path: str):
+    return [name for name, roots in FEATURES
+            if any(path == root or path.startswith(root + "/") for root in roots)]
+
+
+class TestFeatureRouters:
+    """功能路由拆分测试类"""
+
+    @pytest.mark.parametrize("name,roots", FEATURES)
+    def test_routes_registered_in_features(self, name, roots):
+        router = importlib.import_module(f"app.api.v1.member.{name}").router
+        for route in router.routes:
+            assert claimed_by(route.path) == [name], route.path
+
+    def test_roots_not_claimed_twice(self):
+        roots = [root for _, rs in FEATURES for root in rs]
+        assert len(roots) == len(set(roots))
+
+    def test_request_loads_only_its_feature(self):
+        app = FastAPI()
+        for name, roots in FEATURES:
+            mount_router(app, f"app.api.v1.member.{name}", PREFIX, ["会员端API"], paths=roots)
+        client = TestClient(app)
+
+        response = client.get(f"{PREFIX}/team-categories")
+        assert response.status_code == 200
+        assert response.json()["data"][0] == {"value": "all", "label": "全部"}
+        assert [r.module for r in lazy_routers(app) if r.loaded] == ["app.api.v1.member.teams"]
+
+    def test_compat_router_contains_all_features(self):
+        from app.api.v1.member_api import router
+
+        paths = {route.path for route in router.routes}
+        assert {"/venues", "/orders", "/teams", "/leaderboard", "/mall/goods"} <= paths
+
+
+class TestFieldEncoders:
+    """字段编码测试类"""
+
+    def test_json_list(self):
+        assert serializers.json_list(None) == []
+        assert serializers.json_list('["a", "b"]') == ["a", "b"]
+        assert serializers.json_list("a,b") == []
+        assert serializers.json_list("a,b", split_fallback=True) == ["a", "b"]
+
+    def test_json_list_returns_fresh_list(self):
+        first = serializers.json_list('["x"]')
+        first.append("y")
+        assert serializers.json_list('["x"]') == ["x"]
+
+    def test_first_image(self):
+        assert serializers.first_image('["/a.jpg", "/b.jpg"]') == "/a.jpg"
+        assert serializers.first_image(["/c.jpg"]) == "/c.jpg"
+        assert serializers.first_image("/single.jpg") == "/single.jpg"
+        assert serializers.first_image("[broken") is None
+        assert serializers.first_image("[]") is None
+
+    def test_datetime_formats_match_strftime(self):
+        value = datetime(2026, 3, 5, 7, 8, 9)
+        assert serializers.fmt_datetime(value) == value.strftime("%Y-%m-%d %H:%M")
+        assert serializers.fmt_datetime(value, seconds=True) == value.strftime("%Y-%m-%d %H:%M:%S")
+        aware = value.replace(tzinfo=timezone(timedelta(hours=8)))
+        assert serializers.fmt_datetime(aware) == aware.strftime("%Y-%m-%d %H:%M")
+        assert serializers.fmt_date(date(2026, 3, 5)) == "2026-03-05"
+        assert serializers.fmt_date(value) == "2026-03-05"
+        assert serializers.fmt_time(time(7, 8)) == "07:08"
+        assert serializers.fmt_time("09:30:00") == "09:30"
+        assert serializers.fmt_datetime(None) is None
+
+    def test_level_name(self):
+        assert serializers.level_name("SS") == "SS级会员"
+        assert serializers.level_name("TRIAL") == "S级会员"
+        assert serializers.level_name("TRIAL", None) is None
+
+
+class TestRowEncoders:
+    """实体行编码测试类"""
+
+    def test_venue_card(self):
+        venue = SimpleNamespace(id=1, name="1号场", type_id=2, images='["/uploads/v.jpg"]',
+                                venue_type=SimpleNamespace(name="网球"), location="2楼",
+                                price=Decimal("120.00"), status=1)
+        card = serializers.venue_card(venue)
+        assert card["type_name"] == "网球"
+        assert card["price"] == 120.0
+        assert card["image"].endswith("v.jpg")
+
+    def test_coach_detail_parses_columns_independently(self):
+        coach = SimpleNamespace(id=1, name="王教练", avatar=None, type="senior", type_name="高级教练",
+                                level="5", rating=4.9, price=None, introduction="", total_courses=None,
+                                skills="[broken", certificates='["证书"]', photos=None)
+        detail = serializers.coach_detail(coach)
+        assert detail["skills"] == []
+        assert detail["certificates"] == ["证书"]
+        assert detail["photos"] == []
+        assert detail["price"] == 0.0
+        assert list(detail)[-1] == "total_courses"
+
+    def test_leaderboard_entry_without_member(self):
+        entry = SimpleNamespace(rank=1, member_id=9, member=None, total_duration=60, check_count=1)
+        assert serializers.leaderboard_entry(entry)["nickname"] is None
+
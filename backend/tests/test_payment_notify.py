@@ -0,0 +1,186 @@
+"""
+支付回调幂等测试
+
+- 同一交易重复回调只入账一次；进程缓存清空后由去重账本兜底
+- 多线程并发投递同一通知，只有一次生效
+- 主动查单先完成支付时，回调记为 ignored 且不重复入账
+- 会员卡续期、赠送与销量；预约支付成功核销/失败解锁优惠券
+- 回调接口：已处理的通知ID跳过验签与解密
+"""
+import threading
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import func
+
+import app.models  # noqa: F401
+from app.core.database import get_db
+from app.models import Member, MemberCard, MemberCardOrder, CoinRecord, PointRecord, Reservation, MemberCoupon
+from app.models.finance import RechargeOrder, PaymentNotifyLog
+from app.services import payment_notify_service as svc
+
+
+@pytest.fixture
+def factory(db_factory):
+    """预置会员与订单（库由 conftest 的 db_factory 提供）"""
+    with db_factory() as db:
+        db.add(Member(id=1, nickname="测试会员", phone="13800000000", coin_balance=10, point_balance=0,
+                      member_expire_time=datetime.now() + timedelta(days=10)))
+        db.add(RechargeOrder(order_no="CZ001", member_id=1, amount=Decimal("100"), coins=1000, bonus_coins=150,
+                             status="pending"))
+        db.add(MemberCard(id=1, name="月卡", level_id=2, original_price=99, price=99, duration_days=30, sales_count=3))
+        db.add(MemberCardOrder(order_no="MC001", member_id=1, card_id=1, original_price=99, pay_amount=99,
+                               bonus_coins=Decimal("20"), bonus_points=50, level_id=2, duration_days=30,
+                               status="pending"))
+        for no in ("RV001", "RV002"):
+            db.add(Reservation(reservation_no=no, member_id=1, venue_id=1, out_trade_no=no,
+                               reservation_date=date.today(), start_time=time(10), end_time=time(11),
+                               duration=60, status="unpaid"))
+        db.add_all([MemberCoupon(id=1, template_id=1, member_id=1, status="locked"),
+                    MemberCoupon(id=2, template_id=1, member_id=1, status="locked")])
+        db.commit()
+    svc.clear_processed_cache()
+    yield db_factory
+    svc.clear_processed_cache()
+
+
+def notify(Session, out_trade_no, transaction_id="T1", trade_state="SUCCESS", attach=None):
+    with Session() as db:
+        return svc.handle_notify(db, {
+            "out_trade_no": out_trade_no, "transaction_id": transaction_id,
+            "trade_state": trade_state, "attach": attach,
+        })
+
+
+def scalar(Session, statement):
+    with Session() as db:
+        return db.execute(statement).scalar()
+
+
+class TestPaymentNotify:
+    """支付回调幂等测试类"""
+
+    def test_recharge_credited_once(self, factory):
+        for _ in range(3):
+            assert notify(factory, "CZ001") == svc.SUCCESS
+        svc.clear_processed_cache()  # 模拟其他 worker：只能依靠去重账本
+        assert notify(factory, "CZ001") == svc.SUCCESS
+
+        with factory() as db:
+            assert db.get(Member, 1).coin_balance == 1160
+            assert db.query(CoinRecord).count() == 1
+            assert db.query(CoinRecord).one().source == "充值"
+            log = db.query(PaymentNotifyLog).one()
+            assert (log.order_type, log.result) == ("recharge", "applied")
+
+    def test_concurrent_duplicate_deliveries(self, factory):
+        barrier = threading.Barrier(8)
+        results = []
+
+        def deliver():
+            barrier.wait()
+            results.append(notify(factory, "CZ001")["code"])
+
+        threads = [threading.Thread(target=deliver) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert results == ["SUCCESS"] * 8
+        assert scalar(factory, func.count(PaymentNotifyLog.id)) == 1
+        assert scalar(factory, func.count(CoinRecord.id)) == 1
+        with factory() as db:
+            assert db.get(Member, 1).coin_balance == 1160
+
+    def test_polling_path_then_notify(self, factory):
+        with factory() as db:
+            assert svc.complete_recharge(db, "CZ001", "T1") is True
+            db.commit()
+            assert svc.complete_recharge(db, "CZ001", "T1") is False
+
+        assert notify(factory, "CZ001") == svc.SUCCESS
+        with factory() as db:
+            assert db.get(Member, 1).coin_balance == 1160
+            assert db.query(PaymentNotifyLog).one().result == "ignored"
+
+    def test_unknown_order_fails_without_ledger(self, factory):
+        assert notify(factory, "CZ404")["code"] == "FAIL"
+        assert scalar(factory, func.count(PaymentNotifyLog.id)) == 0
+
+    def test_member_card_extends_and_rewards_once(self, factory):
+        with factory() as db:
+            old_expire = db.get(Member, 1).member_expire_time
+
+        assert notify(factory, "MC001", "T2") == svc.SUCCESS
+        svc.clear_processed_cache()
+        assert notify(factory, "MC001", "T2") == svc.SUCCESS
+
+        with factory() as db:
+            member = db.get(Member, 1)
+            assert member.member_expire_time == old_expire + timedelta(days=30)
+            assert (member.level_id, member.subscription_status) == (2, "active")
+            assert member.coin_balance == 30 and member.point_balance == 50
+            assert db.get(MemberCard, 1).sales_count == 4
+            assert db.query(PointRecord).count() == 1
+            order = db.query(MemberCardOrder).one()
+            assert (order.status, order.transaction_id) == ("paid", "T2")
+
+    def test_reservation_success_uses_coupon(self, factory):
+        assert notify(factory, "RV001", "T3", attach='{"coupon_id": 1}') == svc.SUCCESS
+        with factory() as db:
+            reservation = db.query(Reservation).filter_by(out_trade_no="RV001").one()
+            coupon = db.get(MemberCoupon, 1)
+            assert reservation.status == "pending"
+            assert (coupon.status, coupon.order_id) == ("used", reservation.id)
+
+    def test_reservation_failure_unlocks_coupon(self, factory):
+        assert notify(factory, "RV002", "T4", trade_state="PAYERROR", attach='{"coupon_id": 2}') == svc.SUCCESS
+        with factory() as db:
+            assert db.query(Reservation).filter_by(out_trade_no="RV002").one().status == "cancelled"
+            assert db.get(MemberCoupon, 2).status == "unused"
+
+
+class TestNotifyEndpoint:
+    """回调接口测试类"""
+
+    def test_processed_notify_skips_verification(self, factory, monkeypatch):
+        from app.api.v1 import payment
+
+        calls = []
+
+        def verify(*args):
+            calls.append("verify")
+            return True
+
+        monkeypatch.setattr(payment.wechat_pay, "verify_signature", verify)
+        monkeypatch.setattr(payment.wechat_pay, "decrypt_resource", lambda *args: {
+            "out_trade_no": "CZ001", "transaction_id": "T1", "trade_state": "SUCCESS",
+        })
+
+        def override_db():
+            db = factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app = FastAPI()
+        app.include_router(payment.router, prefix="/payment")
+        app.dependency_overrides[get_db] = override_db
+        client = TestClient(app)
+        body = {"id": "N-1", "resource": {"ciphertext": "x", "nonce": "n", "associated_data": "a"}}
+
+        for _ in range(3):
+            assert client.post("/payment/notify", json=body).json() == svc.SUCCESS
+        assert calls == ["verify"]
+        with factory() as db:
+            assert db.get(Member, 1).coin_balance == 1160
@@ -0,0 +1,65 @@
+"""
+核销二维码缓存测试
+
+- data_uri 输出与原实现一致，命中缓存后不再调用 qrcode
+- LRU 有界
+- svg/url 格式
+"""
+import base64
+import io
+import os
+from unittest.mock import patch
+
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import qrcode
+
+from app.core.config import settings
+from app.services import qrcode_cache
+from app.services.qrcode_cache import LRUCache, get_qrcode, verify_payload
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache(monkeypatch):
+    monkeypatch.setattr(qrcode_cache, "_cache", LRUCache(8))
+
+
+class TestQRCodeCache:
+    """核销二维码缓存测试类"""
+
+    def test_data_uri_matches_original_and_is_memoised(self):
+        payload = verify_payload("R202601010001")
+        buf = io.BytesIO()
+        qrcode.make(payload).save(buf, format="PNG")
+        expected = "data:image/png;base64," + base64.b64encode(buf.getvalue()).decode()
+
+        assert get_qrcode(payload) == expected
+        with patch("qrcode.make", side_effect=AssertionError("不应重新生成")):
+            assert get_qrcode(payload) == expected
+
+    def test_lru_is_bounded(self):
+        for i in range(20):
+            get_qrcode(verify_payload(f"R{i}"), "svg")
+        assert len(qrcode_cache._cache) == 8
+        # 最早的条目已被淘汰，最近的仍在
+        assert qrcode_cache._cache.get((verify_payload("R0"), "svg")) is None
+        assert qrcode_cache._cache.get((verify_payload("R19"), "svg")) is not None
+
+    def test_svg_is_compact(self):
+        svg = get_qrcode(verify_payload("R202601010001"), "svg")
+        assert svg.startswith("<svg")
+        assert svg.count("<path") == 1
+        assert len(svg) < 4096
+
+    def test_url_written_once_with_signed_name(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(settings, "UPLOAD_DIR", str(tmp_path))
+        payload = verify_payload("R202601010001")
+        url = get_qrcode(payload, "url")
+
+        assert url.startswith("/uploads/qrcodes/")
+        assert "R202601010001" not in url
+        file_path = tmp_path / url[len("/uploads/"):]
+        assert file_path.read_bytes().startswith(b"\x89PNG")
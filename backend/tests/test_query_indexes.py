@@ -0,0 +1,99 @@
+"""
+热点查询索引测试
+
+- 每个热点查询的执行计划命中预期复合索引（SQLite EXPLAIN QUERY PLAN）
+- 缺失索引可被检测到，且 EXPLAIN 随之不再命中
+- Alembic 迁移可在已有库上补齐索引，并可回退
+- 基线迁移为冻结快照：新库只建接入 Alembic 时的表，逐个迁移升级后与当前模型一致
+"""
+import os
+
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.pool import StaticPool
+
+import app.models  # noqa: F401
+from app.core.database import Base
+from app.core.lifecycle import alembic_config
+from app.core.indexes import (
+    check_hot_queries, create_index_if_missing, drop_index_if_exists,
+    existing_index_names, explain_indexes, hot_queries, missing_indexes,
+)
+
+
+@pytest.fixture
+def engine():
+    eng = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=eng)
+    yield eng
+    eng.dispose()
+
+
+class TestQueryIndexes:
+    """热点查询索引测试类"""
+
+    @pytest.mark.parametrize("name", sorted(hot_queries()))
+    def test_hot_query_uses_index(self, engine, name):
+        with engine.connect() as conn:
+            expected, used, hit = check_hot_queries(conn)[name]
+        assert hit, f"{name} 未命中 {expected}，实际 {used}"
+
+    def test_missing_index_detected(self, engine):
+        statement, expected = hot_queries()["gate_open_record"]
+        with engine.begin() as conn:
+            assert missing_indexes(conn) == []
+            assert drop_index_if_exists(conn, expected, "gate_check_record")
+
+            assert [index.name for index in missing_indexes(conn)] == [expected]
+            assert expected not in explain_indexes(conn, statement)
+
+    def test_create_index_if_missing_is_idempotent(self, engine):
+        with engine.begin() as conn:
+            drop_index_if_exists(conn, "idx_leaderboard_period_rank", "leaderboard")
+            columns = ["period_type", "period_key", "venue_type_id", "rank"]
+            assert create_index_if_missing(conn, "idx_leaderboard_period_rank", "leaderboard", columns)
+            assert not create_index_if_missing(conn, "idx_leaderboard_period_rank", "leaderboard", columns)
+            assert "idx_leaderboard_period_rank" in existing_index_names(conn, "leaderboard")
+
+    def test_alembic_upgrade_adds_indexes_to_existing_db(self, tmp_path):
+        url = f"sqlite:///{tmp_path}/existing.db"
+        eng = create_engine(url)
+        Base.metadata.create_all(bind=eng)
+        with eng.begin() as conn:
+            for name, table in [("idx_reservation_venue_date_status", "reservation"),
+                                ("idx_message_receiver_read", "message")]:
+                drop_index_if_exists(conn, name, table)
+
+        config = alembic_config(url)
+        command.upgrade(config, "head")
+        with eng.connect() as conn:
+            assert missing_indexes(conn) == []
+
+        command.downgrade(config, "0001_baseline_schema")
+        with eng.connect() as conn:
+            assert "idx_reservation_venue_date_status" not in existing_index_names(conn, "reservation")
+        eng.dispose()
+
+    def test_fresh_db_upgrade_matches_models(self, tmp_path):
+        url = f"sqlite:///{tmp_path}/fresh.db"
+        eng = create_engine(url)
+        config = alembic_config(url)
+
+        command.upgrade(config, "0001_baseline_schema")
+        with eng.connect() as conn:
+            tables = set(inspect(conn).get_table_names())
+            assert "reservation" in tables
+            assert "counter_shard" not in tables  # 由 0007 建表
+            assert "starts_at" not in {c["name"] for c in inspect(conn).get_columns("team")}
+
+        command.upgrade(config, "head")
+        with eng.connect() as conn:
+            assert compare_metadata(MigrationContext.configure(conn), Base.metadata) == []
+        eng.dispose()
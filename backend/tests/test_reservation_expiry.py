@@ -0,0 +1,252 @@
+"""
+未支付预约超时关闭测试
+
+- 时间轮：按截止时间取出、超过一圈的留到下一圈、取消与改期、落后多圈时一次取出
+- 批量取消：unpaid -> cancelled、回退免费额度台账、解锁优惠券；已支付的订单不动
+- 关单：未接入微信支付直接取消；关单失败查单为已支付时补偿完成支付，结果未知时释放认领、稍后重试
+- 认领：多个 worker 同时拿到同一批订单时每单只调用一次微信关单；认领过期后由其他 worker 接手
+- 到期与兜底：登记的订单到期后自动关闭；未登记（重启前/其他 worker）的超时订单由兜底扫描关闭
+- 索引：兜底扫描命中 idx_reservation_status_created
+"""
+import json
+import threading
+import time as clock
+from datetime import date, datetime, time, timedelta
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+import app.models  # noqa: F401
+from app.core.config import settings
+from app.core.indexes import explain_indexes, hot_queries
+from app.core.wechat_pay import wechat_pay
+from app.models import Member, MemberCoupon, Reservation
+from app.services import daily_usage_service
+from app.services.reservation_expiry import ReservationExpiry, TimingWheel, cancel_expired
+
+TODAY = date.today()
+
+
+@pytest.fixture
+def Session(db_factory):
+    with db_factory() as db:
+        db.add(Member(id=1, nickname="测试会员", phone="13700000000"))
+        db.add_all([MemberCoupon(id=i, template_id=1, member_id=1, status="locked") for i in (1, 2)])
+        db.commit()
+    yield db_factory
+
+
+def reserve(Session, no, status="unpaid", coupon_id=None, age=0, hour=10):
+    with Session() as db:
+        db.add(Reservation(reservation_no=no, member_id=1, venue_id=1, out_trade_no=no, pay_type="wechat",
+                           reservation_date=TODAY, start_time=time(hour), end_time=time(hour + 1), duration=60,
+                           status=status, remark=json.dumps({"coupon_id": coupon_id}) if coupon_id else None,
+                           created_at=datetime.utcnow() - timedelta(seconds=age)))
+        db.commit()
+
+
+def state(Session):
+    with Session() as db:
+        return (
+            {r.out_trade_no: r.status for r in db.query(Reservation)},
+            {c.id: c.status for c in db.query(MemberCoupon)},
+            daily_usage_service.get_used_minutes(db, 1, TODAY),
+        )
+
+
+@pytest.fixture
+def expiry():
+    service = ReservationExpiry(timeout=1, tick=3600, slots=8, batch=2, workers=4,
+                                retry_delay=60, recovery_interval=3600, claim_ttl=60)
+    yield service
+    service.shutdown()
+
+
+class TestTimingWheel:
+    """时间轮测试类"""
+
+    def test_due_in_order_and_next_lap(self):
+        wheel = TimingWheel(tick=1, slots=4, start=100)
+        wheel.schedule("a", 101.5)
+        wheel.schedule("b", 102.2)
+        wheel.schedule("c", 106.0)  # 超过一圈，与 a 同格
+        assert wheel.advance(100.9) == []
+        assert wheel.advance(101.0) == ["a"]
+        assert wheel.advance(103.0) == ["b"]
+        assert len(wheel) == 1
+        assert wheel.advance(106.0) == ["c"]
+
+    def test_cancel_reschedule_and_catch_up(self):
+        wheel = TimingWheel(tick=1, slots=4, start=100)
+        wheel.schedule("a", 101)
+        wheel.schedule("b", 102)
+        wheel.cancel("a")
+        wheel.schedule("b", 110)
+        wheel.schedule("late", 50)  # 已过期：下一次推进取出
+        assert wheel.advance(101) == ["late"]
+        assert wheel.advance(105) == []
+        assert wheel.advance(200) == ["b"]  # 落后多圈
+        assert len(wheel) == 0
+
+
+class TestCancelExpired:
+    """批量取消测试类"""
+
+    def test_cancel_releases_usage_and_coupons(self, Session):
+        reserve(Session, "RV1", coupon_id=1)
+        reserve(Session, "RV2", hour=12)
+        reserve(Session, "RV3", status="pending", coupon_id=2, hour=14)
+        assert state(Session)[2] == 180
+
+        with Session() as db:
+            assert cancel_expired(db, ["RV1", "RV2", "RV3"]) == 2
+            db.commit()
+        statuses, coupons, used = state(Session)
+        assert statuses == {"RV1": "cancelled", "RV2": "cancelled", "RV3": "pending"}
+        assert coupons == {1: "unused", 2: "locked"}
+        assert used == 60
+
+        with Session() as db:
+            assert cancel_expired(db, ["RV1"]) == 0
+
+
+class TestCloseBatch:
+    """关单测试类"""
+
+    def test_without_wechat_pay_cancels(self, Session, expiry, monkeypatch):
+        monkeypatch.setattr(settings, "WECHAT_MCH_ID", "")
+        for i in range(3):
+            reserve(Session, f"RV{i}", coupon_id=1 if i == 0 else None, hour=10 + i)
+        with Session() as db:
+            expiry.recover(db)
+        expiry.close_batch(["RV0", "RV1", "RV2"])
+        statuses, coupons, used = state(Session)
+        assert set(statuses.values()) == {"cancelled"}
+        assert coupons[1] == "unused"
+        assert used == 0
+
+    def test_paid_completed_and_unknown_retried(self, Session, expiry, monkeypatch):
+        monkeypatch.setattr(settings, "WECHAT_MCH_ID", "1900000000")
+        monkeypatch.setattr(wechat_pay, "close_order", lambda no: no == "RV_CLOSE")
+        trade = {"RV_PAID": {"trade_state": "SUCCESS", "transaction_id": "T1"},
+                 "RV_WAIT": {"trade_state": "USERPAYING"}}
+        monkeypatch.setattr(wechat_pay, "query_order", lambda no: trade[no])
+        reserve(Session, "RV_CLOSE", age=120, hour=10)
+        reserve(Session, "RV_PAID", coupon_id=1, age=120, hour=12)
+        reserve(Session, "RV_WAIT", age=120, hour=14)
+
+        with Session() as db:
+            expiry.recover(db)
+        expiry.close_batch(["RV_CLOSE", "RV_PAID", "RV_WAIT"])
+        statuses, coupons, _ = state(Session)
+        assert statuses == {"RV_CLOSE": "cancelled", "RV_PAID": "pending", "RV_WAIT": "unpaid"}
+        assert coupons[1] == "used"
+        assert expiry.pending() == 1  # RV_WAIT 改期重试
+        with Session() as db:
+            assert db.query(Reservation).filter_by(out_trade_no="RV_WAIT").one().close_claimed_at is None
+
+
+class TestCloseClaim:
+    """关单认领测试类"""
+
+    def test_workers_close_each_order_once(self, Session, monkeypatch):
+        monkeypatch.setattr(settings, "WECHAT_MCH_ID", "1900000000")
+        calls, guard = [], threading.Lock()
+
+        def close_order(no):
+            with guard:
+                calls.append(no)
+            clock.sleep(0.05)
+            return True
+
+        monkeypatch.setattr(wechat_pay, "close_order", close_order)
+        nos = [f"RV{i}" for i in range(4)]
+        for i, no in enumerate(nos):
+            reserve(Session, no, coupon_id=1 if i == 0 else None, age=120, hour=8 + i)
+
+        workers = [ReservationExpiry(timeout=1, tick=3600, slots=8, batch=10, workers=4,
+                                     retry_delay=60, recovery_interval=3600, claim_ttl=60) for _ in range(3)]
+        try:
+            for worker in workers:
+                with Session() as db:
+                    worker.recover(db)
+            threads = [threading.Thread(target=worker.close_batch, args=(nos,)) for worker in workers]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            for worker in workers:
+                worker.shutdown()
+        assert sorted(calls) == nos
+        statuses, coupons, used = state(Session)
+        assert set(statuses.values()) == {"cancelled"}
+        assert coupons[1] == "unused"
+        assert used == 0
+
+    def test_live_claim_skipped_and_stale_claim_taken_over(self, Session, expiry, monkeypatch):
+        monkeypatch.setattr(settings, "WECHAT_MCH_ID", "1900000000")
+        calls = []
+        monkeypatch.setattr(wechat_pay, "close_order", lambda no: calls.append(no) or True)
+        reserve(Session, "RV_LIVE", age=120, hour=10)
+        reserve(Session, "RV_STALE", age=120, hour=12)
+        with Session() as db:
+            db.query(Reservation).filter_by(out_trade_no="RV_LIVE").update({"close_claimed_at": datetime.utcnow()})
+            db.query(Reservation).filter_by(out_trade_no="RV_STALE").update(
+                {"close_claimed_at": datetime.utcnow() - timedelta(seconds=120)})  # 认领的 worker 已崩溃
+            db.commit()
+            expiry.recover(db)
+        assert expiry._overdue() == {"RV_STALE"}
+        expiry.close_batch(["RV_LIVE", "RV_STALE"])
+        assert calls == ["RV_STALE"]
+        assert state(Session)[0] == {"RV_LIVE": "unpaid", "RV_STALE": "cancelled"}
+
+
+class TestExpiryLoop:
+    """到期与兜底扫描测试类"""
+
+    def wait_until(self, predicate, timeout=5.0):
+        deadline = clock.time() + timeout
+        while clock.time() < deadline:
+            if predicate():
+                return True
+            clock.sleep(0.05)
+        return predicate()
+
+    def test_tracked_order_closed_at_deadline(self, Session, monkeypatch):
+        monkeypatch.setattr(settings, "WECHAT_MCH_ID", "")
+        service = ReservationExpiry(timeout=1, tick=0.05, slots=64, batch=10, workers=2,
+                                    retry_delay=60, recovery_interval=3600, claim_ttl=60)
+        try:
+            reserve(Session, "RV1", coupon_id=1)
+            with Session() as db:
+                service.track(db, "RV1", db.query(Reservation).one().created_at)
+            assert state(Session)[0]["RV1"] == "unpaid"
+            assert self.wait_until(lambda: state(Session)[0]["RV1"] == "cancelled")
+            assert state(Session)[1][1] == "unused"
+        finally:
+            service.shutdown()
+
+    def test_recovery_scan_closes_untracked_overdue(self, Session, monkeypatch):
+        monkeypatch.setattr(settings, "WECHAT_MCH_ID", "")
+        service = ReservationExpiry(timeout=60, tick=0.05, slots=64, batch=10, workers=2,
+                                    retry_delay=60, recovery_interval=3600, claim_ttl=60)
+        try:
+            reserve(Session, "RV_OLD", age=120)
+            reserve(Session, "RV_NEW", age=5, hour=12)
+            with Session() as db:
+                service.recover(db)
+            assert service.pending() == 1  # 只装载未到期的 RV_NEW
+            assert self.wait_until(lambda: state(Session)[0]["RV_OLD"] == "cancelled")
+            assert state(Session)[0]["RV_NEW"] == "unpaid"
+        finally:
+            service.shutdown()
+
+    def test_recovery_scan_uses_index(self, Session):
+        statement, expected = hot_queries()["unpaid_reservation_expiry"]
+        with Session() as db:
+            assert expected in explain_indexes(db.connection(), statement)
@@ -0,0 +1,92 @@
+"""
+JSON 响应编码测试
+
+- encode_response 与 ResponseModel 默认响应路径输出一致（Decimal、日期时间、中文、嵌套模型）
+- data 为已编码 bytes 时原样拼入统一响应结构
+- FastJSONResponse 作为默认响应类时，response_model 接口输出不变
+"""
+import json
+import os
+from datetime import date, datetime
+from decimal import Decimal
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from pydantic import BaseModel
+
+from app.core.responses import FastJSONResponse, dumps, encode_response, json_response
+from app.schemas.common import ResponseModel, PageParams
+
+
+def default_body(data) -> dict:
+    return json.loads(JSONResponse(jsonable_encoder(ResponseModel(data=data))).body)
+
+
+SAMPLE = [{
+    "name": "中文名称",
+    "amount": Decimal("12.50"),
+    "created_at": datetime(2026, 3, 5, 7, 8, 9),
+    "date": date(2026, 3, 5),
+    "tags": ("a", "b"),
+    "page": PageParams(page=2),
+    "empty": None,
+}]
+
+
+class TestEncodeResponse:
+    """统一响应编码测试类"""
+
+    def test_matches_response_model_output(self):
+        assert json.loads(encode_response(SAMPLE)) == default_body(SAMPLE)
+
+    def test_utf8_without_escape(self):
+        assert "中文名称".encode("utf-8") in encode_response(SAMPLE)
+
+    def test_non_str_keys(self):
+        assert json.loads(dumps({1: "a"})) == {"1": "a"}
+
+    def test_custom_code_and_message(self):
+        body = json.loads(encode_response(None, code=400, message="参数错误"))
+        assert body == {"code": 400, "message": "参数错误", "data": None}
+
+    def test_prebuilt_bytes_spliced(self):
+        encoded = dumps(SAMPLE)
+        body = encode_response(encoded)
+        assert body.endswith(encoded + b"}")
+        assert json.loads(body) == default_body(SAMPLE)
+
+    def test_json_response(self):
+        response = json_response({"list": []}, headers={"Cache-Control": "no-cache"})
+        assert response.media_type == "application/json"
+        assert response.headers["cache-control"] == "no-cache"
+        assert json.loads(response.body) == {"code": 200, "message": "success", "data": {"list": []}}
+
+
+class TestFastJSONResponse:
+    """默认响应类测试类"""
+
+    def test_response_model_output_unchanged(self):
+        class Item(BaseModel):
+            price: Decimal
+            at: datetime
+
+        outputs = []
+        for response_class in (JSONResponse, FastJSONResponse):
+            app = FastAPI(default_response_class=response_class)
+
+            @app.get("/items", response_model=ResponseModel)
+            def items():
+                return ResponseModel(data=[Item(price=Decimal("9.90"), at=datetime(2026, 1, 1)), *SAMPLE])
+
+            outputs.append(TestClient(app).get("/items").json())
+        assert outputs[0] == outputs[1]
+
+    def test_app_uses_fast_response_class(self):
+        from app.main import app
+
+        assert app.router.default_response_class is FastJSONResponse
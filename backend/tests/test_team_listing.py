@@ -0,0 +1,115 @@
+"""
+组队广场测试
+
+- 开始时间解析：兼容未补零写法，非法输入返回 None
+- 列表：按 starts_at 过滤已开始的组队并升序；发起人随列表一次查询加载
+- 缓存：列表短时缓存，创建/加入/退出组队后失效
+- 索引：列表查询命中 idx_team_status_sport_starts
+"""
+import json
+from datetime import datetime, timedelta
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from sqlalchemy import event
+
+import app.models  # noqa: F401
+from app.core.indexes import explain_indexes, hot_queries
+from app.models import Member, Team
+from app.services.counter_service import counter_rollup
+from app.services.team_listing import parse_starts_at, schedule_fields, team_list_cache
+from app.api.v1.member.teams import TeamCreate, create_team, get_teams, join_team
+
+
+@pytest.fixture
+def Session(db_factory):
+    now = datetime.now().replace(second=0, microsecond=0)
+    with db_factory() as db:
+        db.add_all([Member(id=i, nickname=f"会员{i}", phone=f"1350000{i:04d}") for i in range(1, 6)])
+        db.add_all([
+            Team(id=1, creator_id=1, title="明早网球", sport_type="tennis", max_members=2, current_members=1,
+                 status="recruiting", **schedule_fields(now + timedelta(hours=12))),
+            Team(id=2, creator_id=2, title="下周高尔夫", sport_type="golf", max_members=4, current_members=1,
+                 status="recruiting", **schedule_fields(now + timedelta(days=7))),
+            Team(id=3, creator_id=3, title="已开始", sport_type="tennis", max_members=4, current_members=1,
+                 status="recruiting", **schedule_fields(now - timedelta(hours=1))),
+        ])
+        db.commit()
+    team_list_cache.clear()
+    yield db_factory
+    team_list_cache.clear()
+    counter_rollup.shutdown()
+
+
+def listing(Session, **params):
+    with Session() as db:
+        return json.loads(get_teams(db=db, **{"sport_type": None, "status": "recruiting", "page": 1,
+                                              "limit": 20, **params}).body)["data"]
+
+
+class TestParseStartsAt:
+    """开始时间解析测试类"""
+
+    def test_formats(self):
+        assert parse_starts_at("2026-3-7", "9:05") == datetime(2026, 3, 7, 9, 5)
+        assert parse_starts_at("2026/03/27", "18:30:00") == datetime(2026, 3, 27, 18, 30)
+        assert parse_starts_at("2026-02-30", "10:00") is None
+        assert parse_starts_at("明天", "10:00") is None
+        assert parse_starts_at(None, None) is None
+
+
+class TestTeamListing:
+    """组队列表测试类"""
+
+    def test_range_filter_and_order(self, Session):
+        assert [t["id"] for t in listing(Session)] == [1, 2]
+        assert [t["id"] for t in listing(Session, sport_type="tennis")] == [1]
+        assert listing(Session)[0]["creator_name"] == "会员1"
+
+    def test_creator_eager_loaded(self, Session):
+        team_list_cache.clear()
+        statements = []
+        with Session() as db:
+            event.listen(db.get_bind(), "before_cursor_execute",
+                         lambda *args: statements.append(args[2]))
+            get_teams(sport_type=None, status="recruiting", page=1, limit=20, db=db)
+        assert len(statements) == 1
+
+    def test_create_normalizes_and_invalidates(self, Session):
+        assert [t["id"] for t in listing(Session)] == [1, 2]
+        day = (datetime.now() + timedelta(days=2)).date()
+        data = TeamCreate(title="周末壁球", sport_type="squash",
+                          activity_date=f"{day.year}-{day.month}-{day.day}", activity_time="9:00")
+        with Session() as db:
+            team_id = create_team(data, db.get(Member, 4), db).data["id"]
+        created = next(t for t in listing(Session) if t["id"] == team_id)
+        assert created["activity_date"] == day.strftime("%Y-%m-%d")
+        assert created["activity_time"] == "09:00"
+
+        with Session() as db:
+            with pytest.raises(HTTPException):
+                create_team(TeamCreate(title="x", sport_type="golf", activity_date="下周", activity_time="9:00"),
+                            db.get(Member, 4), db)
+
+    def test_join_invalidates(self, Session):
+        assert listing(Session, sport_type="tennis")[0]["current_members"] == 1
+        with Session() as db:
+            join_team(1, db.get(Member, 5), db)
+        assert listing(Session, sport_type="tennis") == []  # 满员后不再是招募中
+        assert listing(Session, sport_type="tennis", status="full")[0]["current_members"] == 2
+
+    def test_expired_team_cannot_be_joined(self, Session):
+        with Session() as db:
+            with pytest.raises(HTTPException) as e:
+                join_team(3, db.get(Member, 5), db)
+        assert e.value.detail == "该组队活动已过期"
+
+    def test_listing_uses_index(self, Session):
+        statement, expected = hot_queries()["team_listing"]
+        with Session() as db:
+            assert expected in explain_indexes(db.connection(), statement)
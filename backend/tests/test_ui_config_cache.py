@@ -0,0 +1,132 @@
+"""
+UI配置缓存测试
+
+- 发布后 /member/ui-config 返回预编译字节及 ETag
+- 携带 If-None-Match 时返回 304 且不执行任何 SQL
+- 回滚后 ETag 变化，旧 ETag 不再命中
+"""
+import gzip
+import json
+from types import SimpleNamespace
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.config import settings
+from app.core.database import Base, get_db
+from app.api.deps import get_current_user
+from app.api.v1 import member_api, ui_editor
+from app.models.ui_editor import UIPageConfig, UIBlockConfig
+from app.services.ui_config_cache import ui_config_cache
+
+
+@pytest.fixture
+def env(monkeypatch):
+    """挂载会员端 ui-config 与编辑器发布/回滚接口的测试应用"""
+    monkeypatch.setattr(settings, "ASYNC_BLOCKING_GUARD", "off")
+    monkeypatch.setattr(ui_config_cache, "ttl", 3600)
+    ui_config_cache.invalidate()
+
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    db = Session()
+    db.add(UIPageConfig(page_code="home", page_name="首页", status="draft"))
+    db.add(UIBlockConfig(block_code="banner", block_name="轮播图", page_code="home", block_type="banner"))
+    db.commit()
+    db.close()
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _count(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    def override_get_db():
+        db = Session()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(member_api.router, prefix="/member")
+    app.include_router(ui_editor.router, prefix="/ui-editor")
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    with TestClient(app) as c:
+        yield c, statements
+    ui_config_cache.invalidate()
+    engine.dispose()
+
+
+class TestUIConfigCache:
+    """UI配置缓存测试类"""
+
+    def test_published_config_served_with_etag_and_304(self, env):
+        client, statements = env
+        assert client.post("/ui-editor/publish").status_code == 200
+
+        resp = client.get("/member/ui-config", params={"page_code": "home"})
+        assert resp.status_code == 200
+        etag = resp.headers["etag"]
+        data = resp.json()["data"]
+        assert data["version"] == 1
+        assert [b["block_code"] for b in data["blocks"]] == ["banner"]
+
+        statements.clear()
+        resp = client.get("/member/ui-config", params={"page_code": "home"},
+                          headers={"If-None-Match": etag})
+        assert resp.status_code == 304
+        assert resp.content == b""
+        assert statements == []
+
+    def test_gzip_body_is_precompressed(self, env):
+        client, _ = env
+        client.post("/ui-editor/publish")
+        payload = ui_config_cache._compiled.get(None)
+        assert json.loads(gzip.decompress(payload.gzip_body)) == json.loads(payload.body)
+
+        resp = client.get("/member/ui-config", headers={"Accept-Encoding": "gzip"})
+        assert resp.headers["content-encoding"] == "gzip"
+        assert resp.json()["data"]["pages"][0]["page_code"] == "home"
+
+    def test_rollback_changes_etag(self, env):
+        client, _ = env
+        client.post("/ui-editor/publish")
+        first = client.get("/member/ui-config").headers["etag"]
+        client.post("/ui-editor/publish")
+        assert client.get("/member/ui-config").headers["etag"] != first
+
+        versions = client.get("/ui-editor/versions").json()["data"]
+        v1 = next(v for v in versions if v["version"] == 1)
+        assert client.post(f"/ui-editor/versions/{v1['id']}/rollback").status_code == 200
+        resp = client.get("/member/ui-config", headers={"If-None-Match": first})
+        assert resp.status_code == 304
+
+    def test_cache_reloads_when_other_worker_publishes(self, env, monkeypatch):
+        client, _ = env
+        client.post("/ui-editor/publish")
+        first = client.get("/member/ui-config").headers["etag"]
+
+        # 模拟其他 worker 发布：本进程缓存仍指向旧版本，TTL 到期后重新校验版本号
+        compiled = ui_config_cache._compiled
+        client.post("/ui-editor/publish")
+        ui_config_cache._compiled = compiled
+        assert client.get("/member/ui-config").headers["etag"] == first
+
+        monkeypatch.setattr(ui_config_cache, "ttl", 0)
+        assert client.get("/member/ui-config").headers["etag"] != first
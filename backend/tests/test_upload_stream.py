@@ -0,0 +1,122 @@
+"""
+流式上传测试
+
+- 分块读取，单次上传内存峰值不随文件大小增长
+- 超过大小限制立即中止且不留下残余文件
+- 首块检测文件头，伪装成图片的文件被拒绝
+- 返回的 SHA-256 与文件内容一致
+"""
+import asyncio
+import hashlib
+import os
+import tracemalloc
+from types import SimpleNamespace
+
+import pytest
+
+import sys
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base, get_async_db
+from app.api.deps import get_current_user
+from app.api.v1 import upload
+from app.api.v1.upload import UPLOAD_CHUNK_SIZE, save_upload_stream
+
+PNG_HEADER = b"\x89PNG\r\n\x1a\n" + b"\x00" * 8
+
+
+class FakeUpload:
+    """按需生成内容的上传文件（不在内存中持有完整内容）"""
+
+    def __init__(self, total: int, header: bytes = PNG_HEADER):
+        self.total = total
+        self.header = header
+        self.sent = 0
+        self.filename = "x.png"
+        self.content_type = "image/png"
+        self.read_sizes = []
+
+    async def read(self, size: int = -1) -> bytes:
+        self.read_sizes.append(size)
+        n = min(size, self.total - self.sent)
+        if n <= 0:
+            return b""
+        chunk = (self.header + b"\x01" * n)[:n] if self.sent == 0 else b"\x01" * n
+        self.sent += n
+        return chunk
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path}/test.db")
+    factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    asyncio.run(setup())
+
+    async def override_get_async_db():
+        async with factory() as db:
+            yield db
+
+    app = FastAPI()
+    app.include_router(upload.router, prefix="/upload")
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_current_user] = lambda: SimpleNamespace(id=1)
+    with TestClient(app) as c:
+        yield c
+    asyncio.run(engine.dispose())
+
+
+class TestUploadStream:
+    """流式上传测试类"""
+
+    def test_memory_bounded_by_chunk_size(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        fake = FakeUpload(total=upload.MAX_FILE_SIZE - 1)
+
+        tracemalloc.start()
+        saved = asyncio.run(save_upload_stream(fake, image_only=True))
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        assert saved["size"] == upload.MAX_FILE_SIZE - 1
+        assert set(fake.read_sizes) == {UPLOAD_CHUNK_SIZE}
+        assert peak < UPLOAD_CHUNK_SIZE * 8
+
+    def test_oversized_upload_rejected_without_leftovers(self, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        fake = FakeUpload(total=upload.MAX_FILE_SIZE * 3)
+        with pytest.raises(HTTPException) as exc:
+            asyncio.run(save_upload_stream(fake, image_only=True))
+        assert exc.value.status_code == 400
+        # 超限后不再继续读取
+        assert fake.sent <= upload.MAX_FILE_SIZE + UPLOAD_CHUNK_SIZE
+        assert os.listdir(tmp_path / "uploads" / "tmp") == []
+
+    def test_fake_image_rejected(self, client):
+        resp = client.post(
+            "/upload/image",
+            files={"file": ("evil.jpg", b"<?php echo 1; ?>" * 10, "image/jpeg")},
+        )
+        assert resp.status_code == 400
+
+    def test_sha256_and_real_extension(self, client):
+        content = PNG_HEADER + os.urandom(UPLOAD_CHUNK_SIZE * 2 + 17)
+        resp = client.post(
+            "/upload/file",
+            files={"file": ("photo.jpg", content, "image/jpeg")},
+        )
+        data = resp.json()["data"]
+        assert data["sha256"] == hashlib.sha256(content).hexdigest()
+        assert data["size"] == len(content)
+        assert data["filename"].endswith(".png")
+        with open(data["url"].lstrip("/"), "rb") as f:
+            assert f.read() == content
@@ -0,0 +1,172 @@
+"""
+会员钱包测试
+
+- 条件扣减：余额不足不扣、不写流水；会话内 Member 对象同步新余额
+- 批量入账：一条 UPDATE 多会员累加，同一会员合并，不存在的会员跳过
+- 批量发放接口：积分非整数、金币超过两位小数、会员数超过上限时拒绝，不写流水
+- 并发：多线程同时扣减/入账不丢失更新，余额不为负，流水合计与余额一致
+"""
+import threading
+from decimal import Decimal
+from types import SimpleNamespace
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import HTTPException
+from sqlalchemy import event, func
+
+import app.models  # noqa: F401
+from app.api.v1.members import batch_recharge
+from app.core.config import settings
+from app.models import Member, CoinRecord, PointRecord
+from app.schemas import BatchRechargeRequest
+from app.services import wallet_service
+from app.services.wallet_service import COIN, POINT, InsufficientBalance
+
+
+@pytest.fixture
+def Session(db_factory):
+    with db_factory() as db:
+        db.add_all([
+            Member(id=1, nickname="甲", phone="13800000001", coin_balance=100, point_balance=50),
+            Member(id=2, nickname="乙", phone="13800000002", coin_balance=0, point_balance=0),
+        ])
+        db.commit()
+    yield db_factory
+
+
+def balances(Session, member_id=1):
+    with Session() as db:
+        member = db.get(Member, member_id)
+        return member.coin_balance, member.point_balance
+
+
+class TestDebitCredit:
+    """单会员扣减/入账测试类"""
+
+    def test_debit_writes_record_and_syncs_member(self, Session):
+        with Session() as db:
+            member = db.get(Member, 1)
+            balance = wallet_service.debit(db, 1, COIN, 30.5, source="预约消费", remark="R1")
+            assert balance == Decimal("69.50")
+            assert member.coin_balance == Decimal("69.50")
+            assert member not in db.dirty
+            db.commit()
+
+        assert balances(Session) == (Decimal("69.50"), 50)
+        with Session() as db:
+            record = db.query(CoinRecord).one()
+            assert (record.type, record.amount, record.balance, record.source) == ("expense", Decimal("30.50"), Decimal("69.50"), "预约消费")
+
+    def test_insufficient_balance_changes_nothing(self, Session):
+        with Session() as db:
+            with pytest.raises(InsufficientBalance) as exc:
+                wallet_service.debit(db, 1, POINT, 51, source="mall_exchange")
+            assert exc.value.balance == 50
+            assert str(exc.value) == "积分不足"
+            db.commit()
+            assert db.query(PointRecord).count() == 0
+        assert balances(Session) == (Decimal("100.00"), 50)
+
+    def test_zero_debit_still_records(self, Session):
+        with Session() as db:
+            assert wallet_service.debit(db, 1, POINT, 0, source="mall_exchange") == 50
+            db.commit()
+            assert db.query(PointRecord).one().amount == 0
+
+    def test_unknown_member(self, Session):
+        with Session() as db:
+            with pytest.raises(ValueError, match="会员不存在"):
+                wallet_service.debit(db, 99, COIN, 1, source="x")
+            assert wallet_service.credit(db, 99, COIN, 1, source="x") is None
+            assert db.query(CoinRecord).count() == 0
+
+
+class TestCreditMany:
+    """批量入账测试类"""
+
+    def test_single_update_for_all_members(self, Session):
+        with Session() as db:
+            statements = []
+            event.listen(db.get_bind(), "before_cursor_execute",
+                         lambda conn, cursor, sql, *args: statements.append(sql))
+            result = wallet_service.credit_many(db, POINT, [(1, 10), (2, 5), (1, 3), (99, 7)], source="后台发放")
+            db.commit()
+
+        assert result == {1: 63, 2: 5}
+        updates = [sql for sql in statements if sql.lstrip().upper().startswith("UPDATE")]
+        inserts = [sql for sql in statements if sql.lstrip().upper().startswith("INSERT")]
+        assert len(updates) == 1 and len(inserts) == 1
+        assert balances(Session, 2) == (Decimal("0.00"), 5)
+        with Session() as db:
+            assert sorted((r.member_id, r.amount, r.balance) for r in db.query(PointRecord)) == [(1, 13, 63), (2, 5, 5)]
+
+
+class TestBatchRecharge:
+    """批量发放接口测试类"""
+
+    def recharge(self, Session, **fields):
+        with Session() as db:
+            try:
+                return batch_recharge(BatchRechargeRequest(**fields), db, SimpleNamespace(id=1)).message
+            except HTTPException as e:
+                return e.detail
+
+    def test_rejects_amounts_that_would_be_truncated(self, Session):
+        assert self.recharge(Session, member_ids=[1, 2], kind=POINT, amount="0.5") == "积分数量必须为整数"
+        assert self.recharge(Session, member_ids=[1, 2], kind=POINT, amount="10.9") == "积分数量必须为整数"
+        assert self.recharge(Session, member_ids=[1], kind=COIN, amount="0.001") == "金币数量最多保留两位小数"
+        with Session() as db:
+            assert db.query(PointRecord).count() == 0
+            assert db.query(CoinRecord).count() == 0
+
+        assert self.recharge(Session, member_ids=[1, 2], kind=POINT, amount="10") == "发放成功"
+        assert self.recharge(Session, member_ids=[2], kind=COIN, amount="1.25") == "发放成功"
+        assert balances(Session, 2) == (Decimal("1.25"), 10)
+
+    def test_member_count_limited(self, Session, monkeypatch):
+        monkeypatch.setattr(settings, "MEMBER_BATCH_RECHARGE_MAX", 2)
+        assert self.recharge(Session, member_ids=[1, 2, 3], kind=POINT, amount=1) == "单次最多发放2个会员"
+        assert self.recharge(Session, member_ids=[1, 2], kind=POINT, amount=1) == "发放成功"
+
+
+class TestConcurrency:
+    """并发不丢失更新测试类"""
+
+    def test_parallel_debits_and_credits(self, Session):
+        workers, rounds = 8, 10
+        barrier = threading.Barrier(workers)
+        failed = []
+
+        def run(index):
+            barrier.wait()
+            for _ in range(rounds):
+                with Session() as db:
+                    try:
+                        if index % 2:
+                            wallet_service.credit(db, 1, COIN, 1, source="test")
+                        else:
+                            wallet_service.debit(db, 1, COIN, 3, source="test")
+                        db.commit()
+                    except InsufficientBalance:
+                        db.rollback()
+                        failed.append(index)
+
+        threads = [threading.Thread(target=run, args=(i,)) for i in range(workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        coin, _ = balances(Session)
+        with Session() as db:
+            income = db.query(func.coalesce(func.sum(CoinRecord.amount), 0)).filter(CoinRecord.type == "income").scalar()
+            expense = db.query(func.coalesce(func.sum(CoinRecord.amount), 0)).filter(CoinRecord.type == "expense").scalar()
+            count = db.query(CoinRecord).count()
+        assert coin >= 0
+        assert count + len(failed) == workers * rounds
+        assert Decimal(str(coin)) == Decimal("100") + Decimal(str(income)) - Decimal(str(expense))
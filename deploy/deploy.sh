@@ -57,7 +57,8 @@ deploy_backend() {
         echo -e "${YELLOW}.env 已存在，跳过${NC}"
     fi
 
-    print_step "4/5" "初始化数据库..."
+    print_step "4/5" "数据库迁移并初始化数据..."
+    alembic upgrade head
     python init_data.py
 
     print_step "5/5" "配置并启动 systemd 服务..."
@@ -31,7 +31,8 @@ else
     echo -e "${YELLOW}.env 文件已存在，跳过${NC}"
 fi
 
-echo -e "\n${YELLOW}[4/5] 初始化数据库...${NC}"
+echo -e "\n${YELLOW}[4/5] 数据库迁移并初始化数据...${NC}"
+alembic upgrade head
 python init_data.py
 
 echo -e "\n${YELLOW}[5/5] 配置 Systemd 服务...${NC}"